@@ -8,6 +8,10 @@ Contract:
 - Side Effects: Executes LLM calls via amplifier-core
 """
 
+from .context_snapshot import add_messages
+from .plan_diff import MountPlanDiff
+from .plan_diff import diff_mount_plans
+from .response import ResponseBuffer
 from .runner import ExecutionRunner
 
-__all__ = ["ExecutionRunner"]
+__all__ = ["ExecutionRunner", "MountPlanDiff", "ResponseBuffer", "add_messages", "diff_mount_plans"]
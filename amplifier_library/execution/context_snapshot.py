@@ -0,0 +1,165 @@
+"""Persisted context state for fast runner rehydration.
+
+Contract:
+- Inputs: Context messages at the end of a turn, the session's message count
+- Outputs: Messages to restore into a new context, or None if stale
+- Side Effects: Writes context_snapshot.json in the session directory
+
+A runner rebuilt for an existing session (after eviction, a restart or a
+mount plan change) restores its context from the snapshot with a single
+set_messages() call, instead of replaying the transcript message by
+message. The snapshot also carries what the transcript doesn't: injected
+profile and runtime context, and tool calls.
+
+A snapshot is only used if it matches the session's current state: the
+transcript message count at the time it was written, and the profile
+context it was built with. Anything else (a deleted message, a turn run
+without snapshotting, a changed profile) falls back to transcript replay.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "context_snapshot.json"
+PROFILE_CONTEXT_FILENAME = "profile_context_messages.json"
+SNAPSHOT_VERSION = 1
+
+
+def profile_context_digest(session_dir: Path) -> str | None:
+    """Get a digest of the session's profile context messages file.
+
+    Args:
+        session_dir: Session state directory
+
+    Returns:
+        SHA-256 of the file contents, or None if the session has none
+    """
+    try:
+        return hashlib.sha256((session_dir / PROFILE_CONTEXT_FILENAME).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def read_profile_context(session_dir: Path) -> tuple[list[dict[str, Any]], str | None]:
+    """Read the session's profile context messages.
+
+    Args:
+        session_dir: Session state directory
+
+    Returns:
+        (messages, profile_context_digest()); ([], None) if the session has none
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file isn't valid JSON
+    """
+    try:
+        raw = (session_dir / PROFILE_CONTEXT_FILENAME).read_bytes()
+    except FileNotFoundError:
+        return [], None
+    messages = json.loads(raw)
+    return (messages if isinstance(messages, list) else []), hashlib.sha256(raw).hexdigest()
+
+
+def save_context_snapshot(
+    session_dir: Path,
+    messages: list[dict[str, Any]],
+    message_count: int,
+    profile_context: str | None,
+) -> None:
+    """Persist the context state at the end of a turn.
+
+    Written to a temporary file and renamed, so readers never see a partial
+    snapshot. Messages that aren't JSON-serializable leave no snapshot.
+
+    Args:
+        session_dir: Session state directory
+        messages: All context messages (context.get_messages())
+        message_count: Transcript message count after the turn
+        profile_context: profile_context_digest() of the injected profile context, if any
+    """
+    path = session_dir / SNAPSHOT_FILENAME
+    try:
+        data = json.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "message_count": message_count,
+                "profile_context": profile_context,
+                "messages": messages,
+            }
+        )
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Context of {session_dir.name} is not serializable, not snapshotting: {e}")
+        path.unlink(missing_ok=True)
+        return
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to save context snapshot for {session_dir.name}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_context_snapshot(
+    session_dir: Path,
+    message_count: int,
+    profile_context: str | None,
+) -> list[dict[str, Any]] | None:
+    """Load the context snapshot if it matches the session's current state.
+
+    Args:
+        session_dir: Session state directory
+        message_count: Current transcript message count
+        profile_context: Current profile_context_digest()
+
+    Returns:
+        Context messages, or None if there is no usable snapshot
+    """
+    path = session_dir / SNAPSHOT_FILENAME
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable context snapshot {path}: {e}")
+        return None
+
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("message_count") != message_count
+        or snapshot.get("profile_context") != profile_context
+        or not isinstance(snapshot.get("messages"), list)
+    ):
+        logger.debug(f"Context snapshot for {session_dir.name} is stale, replaying transcript")
+        return None
+    return snapshot["messages"]
+
+
+async def add_messages(context: Any, messages: list[dict[str, Any]]) -> None:
+    """Append several messages to a context module in one call where possible.
+
+    Uses the module's add_messages() if it has one, else a single
+    set_messages() with the combined list, else add_message() per message.
+
+    Args:
+        context: Context manager module (coordinator.get("context"))
+        messages: Messages to append, in order
+    """
+    if not messages:
+        return
+    if hasattr(context, "add_messages"):
+        await context.add_messages(messages)
+    elif hasattr(context, "set_messages") and hasattr(context, "get_messages"):
+        await context.set_messages([*(await context.get_messages()), *messages])
+    else:
+        for message in messages:
+            await context.add_message(message)
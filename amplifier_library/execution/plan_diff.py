@@ -0,0 +1,82 @@
+"""Structural diff of mount plans.
+
+Decides whether a live AmplifierSession can be kept when its mount plan
+is re-applied: only an equivalent plan keeps it, any change rebuilds it.
+
+Contract:
+- Inputs: Old and new mount plan dicts
+- Outputs: MountPlanDiff describing the changes
+- Side Effects: None
+
+Module lists (providers, tools, hooks) are matched by module id (and
+instance_id for providers), so a change is reported at the most specific
+path: the section, the module, or the module's "config". Config changes
+are not applied in place: amplifier-core caches each module's mount
+function (built with its original config) and gives no handle on a
+mounted module's cleanup, so a remount could keep the old config and
+leak the old instance.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+MODULE_SECTIONS = ("providers", "tools", "hooks")
+
+
+@dataclass
+class MountPlanDiff:
+    """Differences between two mount plans."""
+
+    changes: list[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Check whether the plans are equivalent."""
+        return not self.changes
+
+
+def _module_key(module: dict[str, Any]) -> tuple[str, str | None]:
+    return (module.get("module") or module.get("id") or "", module.get("instance_id"))
+
+
+def diff_mount_plans(old: dict[str, Any], new: dict[str, Any]) -> MountPlanDiff:
+    """Compare two mount plans.
+
+    Args:
+        old: Mount plan the session was built from
+        new: Mount plan to apply
+
+    Returns:
+        MountPlanDiff with the changed parts as dotted paths
+    """
+    diff = MountPlanDiff()
+
+    for key in sorted(set(old) | set(new)):
+        if key in MODULE_SECTIONS or old.get(key) == new.get(key):
+            continue
+        diff.changes.append(key)
+
+    for section in MODULE_SECTIONS:
+        old_modules = old.get(section) or []
+        new_modules = new.get(section) or []
+        if old_modules == new_modules:
+            continue
+
+        if [_module_key(m) for m in old_modules] != [_module_key(m) for m in new_modules]:
+            diff.changes.append(section)
+            continue
+
+        for old_module, new_module in zip(old_modules, new_modules, strict=True):
+            if old_module == new_module:
+                continue
+
+            name = _module_key(new_module)[0]
+            old_rest = {k: v for k, v in old_module.items() if k != "config"}
+            new_rest = {k: v for k, v in new_module.items() if k != "config"}
+            if old_rest != new_rest:
+                diff.changes.append(f"{section}.{name}")
+            else:
+                diff.changes.append(f"{section}.{name}.config")
+
+    return diff
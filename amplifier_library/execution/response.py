@@ -0,0 +1,54 @@
+"""Accumulation of streamed response text.
+
+Contract:
+- Inputs: Response chunks as they are streamed
+- Outputs: The full response text
+- Side Effects: None
+
+Chunks are kept in a list and joined once when the text is read, instead
+of growing a string per token (which copies the whole response on every
+append). One ResponseBuffer is filled by ExecutionRunner.execute_stream
+and read by its callers, so a response is accumulated only once.
+"""
+
+
+class ResponseBuffer:
+    """Streamed response chunks, joined on demand.
+
+    Example:
+        >>> response = ResponseBuffer()
+        >>> response.append("Hel")
+        >>> response.append("lo")
+        >>> response.text
+        'Hello'
+    """
+
+    def __init__(self: "ResponseBuffer") -> None:
+        """Initialize an empty buffer."""
+        self._chunks: list[str] = []
+        self._length = 0
+
+    def append(self: "ResponseBuffer", chunk: str) -> None:
+        """Add a chunk to the end of the response.
+
+        Args:
+            chunk: Streamed text
+        """
+        if chunk:
+            self._chunks.append(chunk)
+            self._length += len(chunk)
+
+    @property
+    def text(self: "ResponseBuffer") -> str:
+        """Full response text (joined once, then cached until the next append)."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def __len__(self: "ResponseBuffer") -> int:
+        """Length of the response text in characters."""
+        return self._length
+
+    def __bool__(self: "ResponseBuffer") -> bool:
+        """Check whether any text was received."""
+        return self._length > 0
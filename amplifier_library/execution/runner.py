@@ -5,18 +5,27 @@ Handles executing user prompts and streaming responses.
 Contract:
 - Inputs: Session objects, user prompts, configuration data
 - Outputs: Async stream of execution results
-- Side Effects: Creates AmplifierSession, makes LLM calls
+- Side Effects: Creates AmplifierSession, makes LLM calls, records each turn's
+  messages in one transcript/metadata write batch, snapshots the context
+  state after each streamed turn
 """
 
 import asyncio
 import logging
 from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 
 from ..models import Session
 from ..sessions.manager import SessionManager
-from ..sessions.state import add_message
+from ..sessions.state import session_turn
+from .context_snapshot import add_messages
+from .context_snapshot import load_context_snapshot
+from .context_snapshot import profile_context_digest
+from .context_snapshot import read_profile_context
+from .context_snapshot import save_context_snapshot
+from .response import ResponseBuffer
 
 if TYPE_CHECKING:
     from amplifier_core import AmplifierSession
@@ -63,27 +72,30 @@ class ExecutionRunner:
         self._session_id = session_id
         self._session: AmplifierSession | None = None
         self._execution_lock = asyncio.Lock()
+        # Approximate size of the text held in the session's context (for memory budgets)
+        self.context_bytes = 0
+        # Profile context is injected once per context; digest of what was injected
+        self._profile_context_injected = False
+        self._profile_context: str | None = None
 
-    async def _load_transcript_history(self: "ExecutionRunner") -> list[dict[str, Any]]:
-        """Load historical messages from transcript, excluding current message.
+    async def _load_transcript_history(self: "ExecutionRunner", current_messages: int = 0) -> list[dict[str, Any]]:
+        """Load historical messages from transcript, excluding the current turn's.
+
+        Args:
+            current_messages: Trailing transcript messages recorded by the current turn
 
         Returns:
             List of message dicts in format {"role": str, "content": str}
             Empty list if no transcript exists or on error.
-
-        Notes:
-            Excludes the most recent message (already added to session state in execute_stream).
         """
         try:
             # Get all messages from storage
             messages = self.session_manager.get_transcript(self._session_id)
+            if current_messages:
+                messages = messages[:-current_messages]
 
             # Convert SessionMessage objects to dict format for context
-            # Exclude the last message (current user message already in state)
-            if messages and len(messages) > 1:
-                # Return all but the last message
-                return [{"role": msg.role, "content": msg.content} for msg in messages[:-1]]
-            return []
+            return [{"role": msg.role, "content": msg.content} for msg in messages]
 
         except FileNotFoundError:
             # Fresh session, no history
@@ -94,12 +106,20 @@ class ExecutionRunner:
             logger.warning(f"Failed to load transcript for session {self._session_id}: {e}")
             return []
 
-    async def _ensure_session(self: "ExecutionRunner") -> None:
+    def _session_dir(self: "ExecutionRunner") -> Path:
+        return Path(self.session_manager.storage_dir) / self._session_id
+
+    async def _ensure_session(self: "ExecutionRunner", current_messages: int = 0) -> None:
         """Ensure AmplifierSession exists and is initialized.
 
         Creates and initializes the AmplifierSession if it doesn't exist.
-        Loads conversation history from transcript into context.
+        Restores the context from the last turn's snapshot, or else loads
+        conversation history from the transcript into context.
         Idempotent - safe to call multiple times.
+
+        Args:
+            current_messages: Messages the current turn already appended to the
+                transcript (its user message), left out of the history
         """
         if self._session is not None:
             return
@@ -132,20 +152,90 @@ class ExecutionRunner:
         self._session.coordinator.register_capability("session_manager", self.session_manager)
         logger.debug(f"Registered session_manager capability for session {self._session_id}")
 
+        # New context: nothing injected yet
+        self.context_bytes = 0
+        self._profile_context_injected = False
+        self._profile_context = None
+
+        # Restore the context as of the last turn in one load when the snapshot is current
+        if await self._restore_context_snapshot():
+            return
+
         # Load transcript history into context
-        historical_messages = await self._load_transcript_history()
+        historical_messages = await self._load_transcript_history(current_messages)
         if historical_messages:
             context = self._session.coordinator.get("context")
             if context:
                 logger.info(f"Loading {len(historical_messages)} historical messages into context")
-                for msg in historical_messages:
-                    await context.add_message(msg)
+                await add_messages(context, historical_messages)
+                self.context_bytes = sum(_text_size(msg["content"]) for msg in historical_messages)
                 logger.debug(f"Context initialized with {len(historical_messages)} historical messages")
             else:
                 logger.warning("No context module found - cannot load transcript history")
         else:
             logger.debug("No historical messages to load (fresh session or empty transcript)")
 
+    async def _restore_context_snapshot(self: "ExecutionRunner") -> bool:
+        """Restore the context from its snapshot.
+
+        Returns:
+            True if the context was restored, False if the transcript must be replayed
+        """
+        assert self._session is not None
+        try:
+            session_dir = self._session_dir()
+            metadata = self.session_manager.get_session(self._session_id)
+        except Exception as e:
+            logger.debug(f"No context snapshot for session {self._session_id}: {e}")
+            return False
+        if metadata is None:
+            return False
+
+        profile_context = profile_context_digest(session_dir)
+        messages = load_context_snapshot(session_dir, metadata.message_count, profile_context)
+        context = self._session.coordinator.get("context")
+        if messages is None or not context or not hasattr(context, "set_messages"):
+            return False
+
+        await context.set_messages(messages)
+        # The snapshot was taken with the current profile context (if any) already injected
+        self._profile_context_injected = True
+        self._profile_context = profile_context
+        self.context_bytes = sum(_text_size(msg.get("content")) for msg in messages if isinstance(msg, dict))
+        logger.info(f"Restored {len(messages)} context messages for session {self._session_id} from snapshot")
+        return True
+
+    async def _inject_profile_context(self: "ExecutionRunner", context: Any) -> None:
+        """Inject the session's cached profile context messages, once per context."""
+        try:
+            messages, digest = read_profile_context(self._session_dir())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load profile context messages: {e}")
+            return
+
+        await add_messages(context, messages)
+        self.context_bytes += sum(_text_size(msg.get("content")) for msg in messages)
+        self._profile_context_injected = True
+        self._profile_context = digest
+        if messages:
+            logger.debug(f"Injected {len(messages)} profile context messages")
+
+    async def _save_context_snapshot(self: "ExecutionRunner") -> None:
+        """Snapshot the context at the end of a turn (best effort)."""
+        context = self._session.coordinator.get("context") if self._session is not None else None
+        if not context or not hasattr(context, "get_messages"):
+            return
+        try:
+            metadata = self.session_manager.get_session(self._session_id)
+            if metadata is None:
+                return
+            messages = await context.get_messages()
+            await asyncio.to_thread(
+                save_context_snapshot, self._session_dir(), messages, metadata.message_count, self._profile_context
+            )
+        except Exception as e:
+            logger.warning(f"Failed to snapshot context for session {self._session_id}: {e}")
+
     async def execute(
         self: "ExecutionRunner",
         session: Session,
@@ -178,30 +268,34 @@ class ExecutionRunner:
             >>> asyncio.run(run())
         """
         async with self._execution_lock:
-            # Add user message
-            add_message(session, role="user", content=user_input)
+            # Record the turn's messages in one write batch
+            with session_turn(session) as turn:
+                # Add user message (written right away, so it's kept even if the session fails to start)
+                turn.add_message(role="user", content=user_input)
 
-            # Ensure session exists
-            await self._ensure_session()
-            assert self._session is not None  # Type guard - guaranteed by _ensure_session()
+                # Ensure session exists (loads history from previous turns)
+                await self._ensure_session(current_messages=1)
+                assert self._session is not None  # Type guard - guaranteed by _ensure_session()
 
-            # Execute
-            try:
-                response = await self._session.execute(user_input)
-                if response:
-                    add_message(session, role="assistant", content=response)
-                return response
-            except Exception as e:
-                error_msg = f"Execution error: {e!s}"
-                logger.error(error_msg)
-                add_message(session, role="assistant", content=error_msg)
-                return error_msg
+                # Execute
+                try:
+                    response = await self._session.execute(user_input)
+                    self.context_bytes += _text_size(user_input) + _text_size(response)
+                    if response:
+                        turn.add_message(role="assistant", content=response)
+                    return response
+                except Exception as e:
+                    error_msg = f"Execution error: {e!s}"
+                    logger.error(error_msg)
+                    turn.add_message(role="assistant", content=error_msg)
+                    return error_msg
 
     async def execute_stream(
         self: "ExecutionRunner",
         session: Session,
         user_input: str,
         runtime_context_messages: list[Any] | None = None,
+        response: ResponseBuffer | None = None,
     ) -> AsyncIterator[str]:
         """Execute user input and stream response tokens in real-time.
 
@@ -210,80 +304,83 @@ class ExecutionRunner:
             user_input: User's prompt/message
             runtime_context_messages: Optional list of context messages to inject
                 before user message (e.g., from @mentions in AGENTS.md or user message)
+            response: Optional buffer that receives every yielded token, so callers
+                can read the full text afterwards without accumulating it themselves
 
         Yields:
             Response tokens as they're generated
 
         Example:
-            >>> async for token in runner.execute_stream(session, "Hello"):
+            >>> response = ResponseBuffer()
+            >>> async for token in runner.execute_stream(session, "Hello", response=response):
             ...     print(token, end='', flush=True)
+            >>> response.text
         """
-        async with self._execution_lock:
-            # Add user message
-            add_message(session, role="user", content=user_input)
+        if response is None:
+            response = ResponseBuffer()
 
-            # Ensure session exists
-            await self._ensure_session()
-            assert self._session is not None  # Type guard - guaranteed by _ensure_session()
+        async with self._execution_lock:
+            # Record the turn's messages in one write batch (committed on exit, even if cancelled)
+            with session_turn(session) as turn:
+                # Add user message (written right away, so it's kept even if the session fails to start)
+                turn.add_message(role="user", content=user_input)
 
-            # Load cached profile context messages
-            import json
-            from pathlib import Path
+                # Ensure session exists (loads history from previous turns)
+                await self._ensure_session(current_messages=1)
+                assert self._session is not None  # Type guard - guaranteed by _ensure_session()
 
-            session_dir = Path(self.session_manager.storage_dir) / session.session_id
-            profile_context_path = session_dir / "profile_context_messages.json"
-            if profile_context_path.exists():
-                try:
-                    with open(profile_context_path) as f:
-                        profile_context_data = json.load(f)
-                    # Inject profile context
-                    context = self._session.coordinator.get("context")
-                    if context and profile_context_data:
-                        for msg_data in profile_context_data:
-                            await context.add_message(msg_data)
-                        logger.debug(f"Injected {len(profile_context_data)} profile context messages")
-                except (OSError, json.JSONDecodeError) as e:
-                    logger.warning(f"Failed to load profile context messages: {e}")
-
-            # Inject runtime context messages into coordinator context
-            if runtime_context_messages:
+                # Inject cached profile context messages (they stay in the context across turns)
                 context = self._session.coordinator.get("context")
-                if context:
-                    for ctx_msg in runtime_context_messages:
-                        # Convert ContextMessage to dict format if needed
-                        if hasattr(ctx_msg, "role") and hasattr(ctx_msg, "content"):
-                            msg_dict = {"role": ctx_msg.role, "content": ctx_msg.content}
-                        else:
-                            msg_dict = ctx_msg
-                        await context.add_message(msg_dict)
+                if context and not self._profile_context_injected:
+                    await self._inject_profile_context(context)
+
+                # Inject runtime context messages into coordinator context
+                if runtime_context_messages and context:
+                    # Convert ContextMessage to dict format if needed
+                    runtime_messages = [
+                        {"role": ctx_msg.role, "content": ctx_msg.content}
+                        if hasattr(ctx_msg, "role") and hasattr(ctx_msg, "content")
+                        else ctx_msg
+                        for ctx_msg in runtime_context_messages
+                    ]
+                    await add_messages(context, runtime_messages)
+                    self.context_bytes += sum(_text_size(msg.get("content")) for msg in runtime_messages)
                     logger.debug(f"Injected {len(runtime_context_messages)} runtime context messages")
 
-            # Stream execution
-            try:
-                orchestrator = self._session.coordinator.get("orchestrator")
-                if not orchestrator:
-                    raise RuntimeError("No orchestrator mounted")
-
-                context = self._session.coordinator.get("context")
-                providers = self._session.coordinator.get("providers")
-                tools = self._session.coordinator.get("tools") or {}
-                hooks = self._session.coordinator.get("hooks")
-
-                full_response = ""
-                async for token, _ in orchestrator._execute_stream(
-                    user_input, context, providers, tools, hooks, self._session.coordinator
-                ):
-                    full_response += token
-                    yield token
-
-                if full_response:
-                    add_message(session, role="assistant", content=full_response)
+                # Stream execution
+                try:
+                    orchestrator = self._session.coordinator.get("orchestrator")
+                    if not orchestrator:
+                        raise RuntimeError("No orchestrator mounted")
 
-            except Exception as e:
-                error_msg = f"Execution error: {e!s}"
-                logger.error(error_msg)
-                add_message(session, role="assistant", content=error_msg)
-                yield error_msg
+                    context = self._session.coordinator.get("context")
+                    providers = self._session.coordinator.get("providers")
+                    tools = self._session.coordinator.get("tools") or {}
+                    hooks = self._session.coordinator.get("hooks")
+
+                    async for token, _ in orchestrator._execute_stream(
+                        user_input, context, providers, tools, hooks, self._session.coordinator
+                    ):
+                        response.append(token)
+                        yield token
+
+                    self.context_bytes += _text_size(user_input) + len(response)
+                    if response:
+                        turn.add_message(role="assistant", content=response.text)
+                    completed = True
+
+                except Exception as e:
+                    error_msg = f"Execution error: {e!s}"
+                    logger.error(error_msg)
+                    turn.add_message(role="assistant", content=error_msg)
+                    response.append(error_msg)
+                    completed = False
+                    yield error_msg
+
+            # Turn committed: persist the context state so a rebuilt runner can restore it in one load
+            # (after a failed turn the context and transcript may disagree; the old snapshot goes stale)
+            if completed:
+                await self._save_context_snapshot()
 
     async def change_profile(self: "ExecutionRunner", new_config: dict[str, Any]) -> None:
         """Change profile by recreating AmplifierSession.
@@ -312,6 +409,7 @@ class ExecutionRunner:
                 if self._session is not None:
                     await self._session.cleanup()
                     self._session = None
+                    self.context_bytes = 0
                     logger.debug("Cleaned up old AmplifierSession")
 
                 # Update config
@@ -337,6 +435,18 @@ class ExecutionRunner:
             >>> asyncio.run(runner.cleanup())
         """
         if self._session is not None:
-            # AmplifierSession cleanup if needed
+            # Release mounted modules and their resources; the next execute() rebuilds the session
+            try:
+                await self._session.cleanup()
+            except Exception as e:
+                logger.warning(f"AmplifierSession cleanup failed for {self._session_id}: {e}")
             self._session = None
+            self.context_bytes = 0
             logger.debug("ExecutionRunner cleaned up")
+
+
+def _text_size(content: Any) -> int:
+    """Approximate in-memory size of message content."""
+    if content is None:
+        return 0
+    return len(content) if isinstance(content, str) else len(str(content))
@@ -88,22 +88,46 @@ class SessionIndexEntry(CamelCaseModel):
     """Lightweight entry in session index.
 
     Used for fast lookups without loading full session metadata.
-    Enables queries like "list all active sessions" or "find sessions by profile".
+    Enables queries like "list all active sessions" or "find sessions by profile",
+    and carries every field the session list views filter, sort or display on
+    so listing never has to open session.json.
     """
 
     session_id: str = Field(description="Session identifier")
+    name: str | None = Field(default=None, description="User-defined session name")
+    parent_session_id: str | None = Field(default=None, description="Parent session ID for sub-sessions")
     amplified_dir: str = Field(default=".", description="Relative path to amplified directory")
     status: SessionStatus = Field(description="Current session status")
     profile_name: str = Field(description="Profile used for this session")
     created_at: datetime = Field(description="Session creation timestamp")
     ended_at: datetime | None = Field(default=None, description="Session end timestamp")
     message_count: int = Field(default=0, description="Number of messages exchanged")
+    token_usage: int | None = Field(default=None, description="Total tokens consumed")
+    is_unread: bool = Field(default=False, description="Whether session has unread content")
+
+    @classmethod
+    def from_metadata(cls, metadata: SessionMetadata) -> "SessionIndexEntry":
+        """Build the index entry for a session's metadata."""
+        return cls(
+            session_id=metadata.session_id,
+            name=metadata.name,
+            parent_session_id=metadata.parent_session_id,
+            amplified_dir=metadata.amplified_dir,
+            status=metadata.status,
+            profile_name=metadata.profile_name,
+            created_at=metadata.created_at,
+            ended_at=metadata.ended_at,
+            message_count=metadata.message_count,
+            token_usage=metadata.token_usage,
+            is_unread=metadata.is_unread,
+        )
 
 
 class SessionIndex(CamelCaseModel):
     """Index of all sessions for fast queries.
 
-    Stored in state/sessions/index.json and rebuilt on session changes.
+    Stored in state/sessions/index.json as a periodically compacted snapshot;
+    changes since the last compaction live in index.journal.jsonl.
     Provides O(1) lookup by session_id and enables fast filtering by status/profile.
     """
 
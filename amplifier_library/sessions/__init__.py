@@ -7,12 +7,18 @@ from amplifier_library.models.sessions import SessionMessage
 from amplifier_library.models.sessions import SessionMetadata
 from amplifier_library.models.sessions import SessionStatus
 
+from .filesystem_store import FilesystemSessionStore
 from .manager import SessionManager
+from .manager import get_session_manager
 from .spawner import AgentNotFoundError
 from .spawner import ExecutionError
 from .spawner import SessionNotFoundError
 from .spawner import resume_spawned_agent
 from .spawner import spawn_agent
+from .sqlite_store import SQLiteSessionStore
+from .store import SessionStore
+from .store import configure_session_store
+from .store import create_session_store
 
 # Alias for backward compatibility with amplifierd
 SessionStateService = SessionManager
@@ -20,12 +26,18 @@ SessionStateService = SessionManager
 __all__ = [
     "SessionManager",
     "SessionStateService",
+    "get_session_manager",
     "Session",
     "SessionMetadata",
     "SessionMessage",
     "SessionStatus",
     "SessionIndex",
     "SessionIndexEntry",
+    "SessionStore",
+    "FilesystemSessionStore",
+    "SQLiteSessionStore",
+    "configure_session_store",
+    "create_session_store",
     "spawn_agent",
     "resume_spawned_agent",
     "AgentNotFoundError",
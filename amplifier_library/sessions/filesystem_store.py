@@ -0,0 +1,259 @@
+"""Filesystem session store.
+
+Directory-per-session JSON layout used by SessionManager since the start.
+
+Storage structure:
+    state/sessions/
+        index.json + index.journal.jsonl   # Journaled index (see index.py)
+        {session_id}/
+            session.json                   # SessionMetadata
+            transcript.jsonl               # One SessionMessage per line
+            transcript.idx                 # Message offset index (see transcript.py)
+"""
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+from amplifier_library.models.sessions import SessionIndexEntry
+from amplifier_library.models.sessions import SessionMessage
+from amplifier_library.models.sessions import SessionMetadata
+from amplifier_library.models.sessions import SessionStatus
+
+from .index import get_session_index
+from .store import message_range
+from .transcript import TranscriptFile
+
+logger = logging.getLogger(__name__)
+
+
+class FilesystemSessionStore:
+    """SessionStore backed by per-session JSON files and the journaled index.
+
+    Uses tmp + rename for metadata writes and append-only transcripts.
+    """
+
+    def __init__(self, sessions_dir: Path) -> None:
+        """Initialize with sessions directory.
+
+        Args:
+            sessions_dir: Directory containing one subdirectory per session
+        """
+        self.sessions_dir = Path(sessions_dir)
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self._index = get_session_index(self.sessions_dir)
+        self._backfill_index()
+
+    # --- Metadata ---
+
+    def exists(self, session_id: str) -> bool:
+        """Check whether session.json exists."""
+        return self._session_path(session_id).exists()
+
+    def create(self, metadata: SessionMetadata) -> None:
+        """Write session.json, an empty transcript and the index entry."""
+        session_dir = self.sessions_dir / metadata.session_id
+        session_dir.mkdir(parents=True, exist_ok=True)
+
+        self._write_metadata(metadata)
+        (session_dir / "transcript.jsonl").touch()
+        self._update_index(metadata)
+
+    def get(self, session_id: str) -> SessionMetadata | None:
+        """Load session.json."""
+        session_path = self._session_path(session_id)
+
+        if not session_path.exists():
+            return None
+
+        return SessionMetadata.model_validate_json(session_path.read_text())
+
+    def update(self, session_id: str, update_fn: Callable[[SessionMetadata], None]) -> SessionMetadata:
+        """Atomically update session.json.
+
+        Uses tmp + rename pattern for atomic updates.
+        Updates index after successful write.
+        """
+        session_path = self._session_path(session_id)
+
+        if not session_path.exists():
+            raise FileNotFoundError(f"Session {session_id} not found")
+
+        # Read
+        metadata = SessionMetadata.model_validate_json(session_path.read_text())
+
+        # Modify
+        update_fn(metadata)
+
+        # Write atomically
+        self._write_metadata(metadata)
+
+        # Update index
+        self._update_index(metadata)
+        return metadata
+
+    def delete(self, session_id: str) -> bool:
+        """Remove session.json, transcript and index entry."""
+        session_path = self._session_path(session_id)
+        existed = session_path.exists()
+
+        session_path.unlink(missing_ok=True)
+        self._transcript(session_id).unlink()
+        self._index.remove(session_id)
+        return existed
+
+    # --- Queries ---
+
+    def query(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionMetadata]:
+        """Filter, sort and limit on the index, then load metadata for the page only."""
+        entries = self.query_index(
+            status=status,
+            profile_name=profile_name,
+            amplified_dir=amplified_dir,
+            since=since,
+            parent_session_id=parent_session_id,
+            limit=limit,
+        )
+
+        results: list[SessionMetadata] = []
+        for entry in entries:
+            metadata = self.get(entry.session_id)
+            if metadata:
+                results.append(metadata)
+        return results
+
+    def query_index(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionIndexEntry]:
+        """Filter, sort and limit using only the in-memory index."""
+        results: list[SessionIndexEntry] = []
+        for entry in self._index.entries():
+            if status is not None and entry.status != status:
+                continue
+            if profile_name is not None and entry.profile_name != profile_name:
+                continue
+            if amplified_dir is not None and entry.amplified_dir != amplified_dir:
+                continue
+            if since is not None and entry.created_at < since:
+                continue
+            if parent_session_id is not None and entry.parent_session_id != parent_session_id:
+                continue
+            results.append(entry)
+
+        # Sort by created_at descending (most recent first)
+        results.sort(key=lambda e: e.created_at, reverse=True)
+
+        # Apply limit if provided
+        if limit is not None:
+            return results[:limit]
+        return results
+
+    def get_tree(self, session_id: str) -> list[SessionIndexEntry]:
+        """Walk the index's parent -> children map from a session."""
+        return self._index.subtree(session_id)
+
+    def list_index(self) -> list[SessionIndexEntry]:
+        """Get all entries from the in-memory index."""
+        return self._index.entries()
+
+    def unread_counts(self) -> dict[str, int]:
+        """Count unread sessions per amplified directory from the index."""
+        counts: dict[str, int] = {}
+        for entry in self._index.entries():
+            if entry.is_unread:
+                counts[entry.amplified_dir] = counts.get(entry.amplified_dir, 0) + 1
+        return counts
+
+    # --- Transcript ---
+
+    def append_messages(self, session_id: str, messages: list[SessionMessage], fsync: bool = False) -> None:
+        """Append lines to transcript.jsonl and its offset index."""
+        self._transcript(session_id).append([message.model_dump_json() for message in messages], fsync=fsync)
+
+    def get_messages(
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before: int | None = None,
+        after: int | None = None,
+        reverse: bool = False,
+    ) -> list[SessionMessage]:
+        """Read only the requested lines of transcript.jsonl via the offset index."""
+        transcript = self._transcript(session_id)
+        start, end = message_range(transcript.count(), limit, before, after)
+
+        messages = [SessionMessage.model_validate_json(line) for line in transcript.read(start, end)]
+        if reverse:
+            messages.reverse()
+        return messages
+
+    def delete_last_message(self, session_id: str) -> SessionMessage | None:
+        """Truncate transcript.jsonl at the last message's offset."""
+        line = self._transcript(session_id).pop()
+        if line is None:
+            return None
+        return SessionMessage.model_validate_json(line)
+
+    def copy_messages(self, source_session_id: str, target_session_id: str) -> None:
+        """Copy transcript.jsonl and its offset index from source to target."""
+        self._transcript(source_session_id).copy_to(self._transcript(target_session_id))
+
+    # --- Helpers ---
+
+    def _session_path(self, session_id: str) -> Path:
+        return self.sessions_dir / session_id / "session.json"
+
+    def _transcript_path(self, session_id: str) -> Path:
+        return self.sessions_dir / session_id / "transcript.jsonl"
+
+    def _transcript(self, session_id: str) -> TranscriptFile:
+        return TranscriptFile(self._transcript_path(session_id))
+
+    def _write_metadata(self, metadata: SessionMetadata) -> None:
+        session_path = self._session_path(metadata.session_id)
+        tmp_path = session_path.with_suffix(".tmp")
+        tmp_path.write_text(metadata.model_dump_json(indent=2))
+        tmp_path.rename(session_path)
+
+    def _update_index(self, metadata: SessionMetadata) -> None:
+        """Update index entry for session (appends one journal record)."""
+        self._index.put(SessionIndexEntry.from_metadata(metadata))
+
+    def _backfill_index(self) -> None:
+        """Fill list-view fields missing from entries written by older versions.
+
+        Older index entries lack parent_session_id, name, is_unread and
+        token_usage. They are refreshed from session.json once and folded into
+        a new snapshot, after which listing never opens session files. Entries
+        whose session.json is gone are dropped, so the next start finds
+        nothing to backfill.
+        """
+        stale = [entry for entry in self._index.entries() if "is_unread" not in entry.model_fields_set]
+        if not stale:
+            return
+
+        orphaned = 0
+        for entry in stale:
+            metadata = self.get(entry.session_id)
+            if metadata:
+                self._index.put(SessionIndexEntry.from_metadata(metadata))
+            else:
+                self._index.remove(entry.session_id)
+                orphaned += 1
+        self._index.compact()
+        logger.info(f"Backfilled {len(stale) - orphaned} session index entries, dropped {orphaned} orphaned")
@@ -0,0 +1,336 @@
+"""Journaled session index.
+
+Keeps the session index in memory and persists it as a snapshot plus an
+append-only journal of entry changes, so a mutation costs one appended line
+instead of rewriting the whole index.
+
+Contract:
+- Inputs: Sessions directory (state/sessions)
+- Outputs: In-memory map of session_id -> SessionIndexEntry, parent -> children adjacency
+- Side Effects: Appends to index.journal.jsonl, periodically rewrites index.json
+
+Storage structure:
+    state/sessions/
+        index.json            # Snapshot (SessionIndex, compatible with older versions)
+        index.journal.jsonl   # Append-only deltas applied on top of the snapshot
+"""
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+
+from amplifier_library.models.sessions import SessionIndex
+from amplifier_library.models.sessions import SessionIndexEntry
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "index.json"
+JOURNAL_FILENAME = "index.journal.jsonl"
+
+# Compact once the journal holds more records than this or than the number of
+# indexed sessions, whichever is larger - keeps compaction amortized O(1).
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+
+class SessionIndexJournal:
+    """In-memory session index backed by a snapshot and an append-only journal.
+
+    Journal records are either ``{"op": "put", "entry": {...}}`` or
+    ``{"op": "delete", "session_id": "..."}``. Replaying them in order on top
+    of the snapshot reproduces the current index; replay is idempotent, so a
+    crash between writing a snapshot and truncating the journal is harmless.
+
+    Changes made by other processes are picked up by checking the files'
+    stat signatures before each operation and replaying only the new tail.
+
+    A parent -> children adjacency map is maintained alongside the entries so
+    sub-session trees can be walked without scanning the whole index.
+    """
+
+    def __init__(self, sessions_dir: Path, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD) -> None:
+        """Initialize and load the index from disk.
+
+        Args:
+            sessions_dir: Directory holding index.json and the journal
+            compact_threshold: Minimum journal length before compaction
+        """
+        self.sessions_dir = Path(sessions_dir)
+        self.snapshot_path = self.sessions_dir / SNAPSHOT_FILENAME
+        self.journal_path = self.sessions_dir / JOURNAL_FILENAME
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._entries: dict[str, SessionIndexEntry] = {}
+        self._children: dict[str, set[str]] = {}
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._journal_inode: int | None = None
+        self._snapshot_signature: tuple[int, int] | None = None
+
+        with self._lock:
+            self._reload()
+
+    # --- Queries ---
+
+    def get(self, session_id: str) -> SessionIndexEntry | None:
+        """Get index entry for a session."""
+        with self._lock:
+            self._refresh()
+            return self._entries.get(session_id)
+
+    def entries(self) -> list[SessionIndexEntry]:
+        """Get a snapshot list of all index entries."""
+        with self._lock:
+            self._refresh()
+            return list(self._entries.values())
+
+    def children(self, session_id: str) -> list[SessionIndexEntry]:
+        """Get direct sub-sessions of a session, oldest first."""
+        with self._lock:
+            self._refresh()
+            return self._sorted_children(session_id)
+
+    def subtree(self, session_id: str) -> list[SessionIndexEntry]:
+        """Get a session and all its descendants in one pass.
+
+        Entries are in breadth-first order, so every parent precedes its
+        children. Returns an empty list if the session is not indexed.
+        """
+        with self._lock:
+            self._refresh()
+            root = self._entries.get(session_id)
+            if root is None:
+                return []
+
+            tree = [root]
+            seen = {session_id}
+            i = 0
+            while i < len(tree):
+                for child in self._sorted_children(tree[i].session_id):
+                    if child.session_id not in seen:
+                        seen.add(child.session_id)
+                        tree.append(child)
+                i += 1
+            return tree
+
+    def to_index(self) -> SessionIndex:
+        """Get the current index as a SessionIndex model."""
+        with self._lock:
+            self._refresh()
+            return SessionIndex(sessions=dict(self._entries), last_updated=datetime.now(UTC))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    # --- Mutations ---
+
+    def put(self, entry: SessionIndexEntry) -> None:
+        """Insert or replace an index entry (no-op if unchanged).
+
+        An equal entry loaded from an older format (missing fields) is still
+        replaced, so the missing fields get written.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            current = self._entries.get(entry.session_id)
+            if current is not None and current == entry and current.model_fields_set >= entry.model_fields_set:
+                return
+            self._append({"op": "put", "entry": entry.model_dump(mode="json")})
+            self._set_entry(entry)
+            self._maybe_compact()
+
+    def remove(self, session_id: str) -> None:
+        """Remove an index entry (no-op if absent)."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            if session_id not in self._entries:
+                return
+            self._append({"op": "delete", "session_id": session_id})
+            self._drop_entry(session_id)
+            self._maybe_compact()
+
+    def compact(self) -> None:
+        """Write the in-memory index as a new snapshot and truncate the journal."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._compact()
+
+    # --- Persistence ---
+
+    def _append(self, record: dict) -> None:
+        """Append one journal record with a single write."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            self._journal_offset = f.tell()
+        self._journal_inode = self.journal_path.stat().st_ino
+        self._journal_records += 1
+
+    def _maybe_compact(self) -> None:
+        if self._journal_records > max(self.compact_threshold, len(self._entries)):
+            self._compact()
+
+    def _compact(self) -> None:
+        index = SessionIndex(sessions=dict(self._entries), last_updated=datetime.now(UTC))
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        tmp_path.write_text(index.model_dump_json(indent=2))
+        tmp_path.rename(self.snapshot_path)
+
+        # Truncate after the snapshot is in place; replaying a stale journal is idempotent
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._journal_inode = self.journal_path.stat().st_ino
+        self._snapshot_signature = self._stat_signature(self.snapshot_path)
+        logger.debug(f"Compacted session index ({len(self._entries)} entries)")
+
+    def _reload(self) -> None:
+        """Load snapshot and replay the whole journal."""
+        self._entries = {}
+        self._children = {}
+        self._snapshot_signature = self._stat_signature(self.snapshot_path)
+        if self._snapshot_signature is not None:
+            try:
+                snapshot = SessionIndex.model_validate_json(self.snapshot_path.read_text())
+                for entry in snapshot.sessions.values():
+                    self._set_entry(entry)
+            except Exception as e:
+                logger.error(f"Failed to load session index snapshot: {e}")
+
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._journal_inode = None
+        self._replay_journal()
+
+    def _refresh(self) -> None:
+        """Pick up changes written by other processes."""
+        if self._stat_signature(self.snapshot_path) != self._snapshot_signature:
+            self._reload()
+            return
+
+        try:
+            stat = self.journal_path.stat()
+        except FileNotFoundError:
+            if self._journal_inode is not None:
+                self._reload()
+            return
+
+        if stat.st_ino != self._journal_inode or stat.st_size < self._journal_offset:
+            self._reload()
+        elif stat.st_size > self._journal_offset:
+            self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        """Apply journal records from the current offset to end of file."""
+        if not self.journal_path.exists():
+            return
+
+        with open(self.journal_path, "rb") as f:
+            self._journal_inode = os.fstat(f.fileno()).st_ino
+            f.seek(self._journal_offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Partial trailing write - leave it for the next refresh
+                    break
+                self._journal_offset += len(raw)
+                self._journal_records += 1
+                try:
+                    self._apply(json.loads(raw))
+                except Exception as e:
+                    logger.warning(f"Skipping malformed session index journal record: {e}")
+
+    def _apply(self, record: dict) -> None:
+        op = record.get("op")
+        if op == "put":
+            self._set_entry(SessionIndexEntry.model_validate(record["entry"]))
+        elif op == "delete":
+            self._drop_entry(record["session_id"])
+        else:
+            raise ValueError(f"Unknown op: {op}")
+
+    def _set_entry(self, entry: SessionIndexEntry) -> None:
+        """Store an entry and keep the adjacency map in sync."""
+        self._drop_entry(entry.session_id)
+        self._entries[entry.session_id] = entry
+        if entry.parent_session_id is not None:
+            self._children.setdefault(entry.parent_session_id, set()).add(entry.session_id)
+
+    def _drop_entry(self, session_id: str) -> None:
+        """Remove an entry and its link from its parent (children keep theirs)."""
+        entry = self._entries.pop(session_id, None)
+        if entry is None or entry.parent_session_id is None:
+            return
+        siblings = self._children.get(entry.parent_session_id)
+        if siblings is not None:
+            siblings.discard(session_id)
+            if not siblings:
+                del self._children[entry.parent_session_id]
+
+    def _sorted_children(self, session_id: str) -> list[SessionIndexEntry]:
+        entries = [self._entries[child_id] for child_id in self._children.get(session_id, ())]
+        entries.sort(key=lambda e: e.created_at)
+        return entries
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize journal writers across processes (no-op where flock is unavailable)."""
+        if fcntl is None:
+            yield
+            return
+
+        lock_path = self.sessions_dir / f"{JOURNAL_FILENAME}.lock"
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat_signature(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns)
+
+
+_indexes: dict[Path, SessionIndexJournal] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_session_index(sessions_dir: Path) -> SessionIndexJournal:
+    """Get the process-wide index for a sessions directory.
+
+    The index is loaded from disk once per process and shared by every
+    SessionManager pointing at the same directory.
+
+    Args:
+        sessions_dir: Directory holding index.json and the journal
+
+    Returns:
+        Shared SessionIndexJournal instance
+    """
+    key = Path(sessions_dir).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SessionIndexJournal(key)
+            _indexes[key] = index
+        return index
@@ -2,39 +2,76 @@
 
 import logging
 import shutil
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
-from amplifier_library.models.sessions import SessionIndex
 from amplifier_library.models.sessions import SessionIndexEntry
 from amplifier_library.models.sessions import SessionMessage
 from amplifier_library.models.sessions import SessionMetadata
 from amplifier_library.models.sessions import SessionStatus
 
+from .store import SessionStore
+from .store import create_session_store
+from .turn import FsyncPolicy
+from .turn import SessionTurn
+from .turn import get_fsync_policy
+
 logger = logging.getLogger(__name__)
 
+# Number of SessionMetadata objects kept in memory per manager
+DEFAULT_METADATA_CACHE_SIZE = 1024
+
 
 class SessionManager:
     """Manages session lifecycle and persistence.
 
     Handles session state transitions, transcript management, and queries.
-    Uses atomic file operations and append-only patterns for reliability.
+    Metadata, index and transcripts are persisted by a pluggable SessionStore
+    (filesystem JSON by default, SQLite optionally); per-session artifacts such
+    as mount_plan.json always live in the session directory.
+
+    Recently used SessionMetadata is kept in an in-memory LRU cache that is
+    updated by every write made through this manager, so get_session() on hot
+    paths doesn't touch disk. Use get_session_manager() to share one manager
+    (and its cache) across the process.
     """
 
-    def __init__(self, storage_dir: Path) -> None:
+    def __init__(
+        self,
+        storage_dir: Path,
+        store: SessionStore | None = None,
+        fsync_policy: FsyncPolicy | None = None,
+        metadata_cache_size: int = DEFAULT_METADATA_CACHE_SIZE,
+    ) -> None:
         """Initialize with storage directory.
 
         Args:
             storage_dir: Path to parent directory - will create sessions/ subdirectory
                         (e.g., .amplifierd/state for daemon, .amplifier for CLI)
+            store: Optional persistence backend (default: the backend set by
+                   configure_session_store(), falling back to filesystem)
+            fsync_policy: When transcript writes are fsynced (default: the policy set
+                          by configure_transcript_fsync(), falling back to none)
+            metadata_cache_size: Maximum number of cached SessionMetadata (0 disables caching)
         """
         self.storage_dir = Path(storage_dir) / "sessions"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.index_path = self.storage_dir / "index.json"
+        self.store = store if store is not None else create_session_store(self.storage_dir)
+        self.fsync_policy = fsync_policy if fsync_policy is not None else get_fsync_policy()
+
+        self._metadata_cache: OrderedDict[str, SessionMetadata] = OrderedDict()
+        self._metadata_cache_size = metadata_cache_size
+        self._cache_lock = threading.Lock()
+        self._change_listeners: list[Callable[[str], None]] = []
 
     # --- Lifecycle Management ---
 
@@ -66,16 +103,13 @@ class SessionManager:
             ValueError: If session_id already exists (idempotency)
 
         Side Effects:
-            Creates session directory with:
-            - mount_plan.json (full mount plan)
-            - session.json (metadata)
-            - transcript.jsonl (empty)
-            Updates index.json
+            Creates session directory with mount_plan.json (full mount plan)
+            Persists metadata, index entry and empty transcript via the store
         """
         session_dir = self.storage_dir / session_id
 
         # Check idempotency
-        if session_dir.exists():
+        if session_dir.exists() or self.store.exists(session_id):
             raise ValueError(f"Session {session_id} already exists")
 
         try:
@@ -116,18 +150,10 @@ class SessionManager:
                 last_read_at=now if created_by == "user" else None,
             )
 
-            # Write session.json atomically
-            session_path = session_dir / "session.json"
-            tmp_path = session_path.with_suffix(".tmp")
-            tmp_path.write_text(metadata.model_dump_json(indent=2))
-            tmp_path.rename(session_path)
-
-            # Create empty transcript.jsonl
-            transcript_path = session_dir / "transcript.jsonl"
-            transcript_path.touch()
-
-            # Update index
-            self._update_index(metadata)
+            # Persist metadata, index entry and empty transcript
+            self.store.create(metadata)
+            self._cache_put(metadata)
+            self._notify_change(session_id)
 
             logger.info(f"Created session {session_id} with profile {profile_name}")
             return metadata
@@ -152,6 +178,7 @@ class SessionManager:
             ValueError: If session is in terminal state
             FileNotFoundError: If session not found
         """
+
         def update(metadata: SessionMetadata) -> None:
             # Already active? No-op (common path after this change)
             if metadata.status == SessionStatus.ACTIVE:
@@ -252,6 +279,9 @@ class SessionManager:
     ) -> None:
         """Append message to transcript (efficient append-only).
 
+        A single-message turn; use turn() to record several messages with
+        one metadata write.
+
         Args:
             session_id: Session identifier
             role: Message role ("user" | "assistant" | "system")
@@ -260,33 +290,56 @@ class SessionManager:
             token_count: Optional token count
 
         Side Effects:
-            Appends line to transcript.jsonl
-            Updates message_count in session.json
+            Appends message to the transcript
+            Updates message_count in session metadata
             Updates token_usage if token_count provided
         """
-        transcript_path = self.storage_dir / session_id / "transcript.jsonl"
-
-        # Ensure session directory exists
-        transcript_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Create SessionMessage
-        message = SessionMessage(
-            timestamp=datetime.now(UTC),
-            role=role,
-            content=content,
-            agent=agent,
-            token_count=token_count,
-        )
+        with self.turn(session_id) as turn:
+            turn.add_message(role=role, content=content, agent=agent, token_count=token_count)
+
+    @contextmanager
+    def turn(self, session_id: str) -> Iterator[SessionTurn]:
+        """Batch transcript writes and counter updates for one turn.
+
+        Messages added to the yielded SessionTurn are appended according to
+        the fsync policy; message_count and token_usage are committed in one
+        atomic metadata write when the block exits (also on error).
 
-        # Append to transcript.jsonl
-        with open(transcript_path, "a") as f:
-            f.write(message.model_dump_json() + "\n")
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            SessionTurn to record messages on
+
+        Example:
+            >>> with manager.turn(session_id) as turn:
+            ...     turn.add_message("user", prompt)
+            ...     turn.add_message("assistant", response)
+        """
+        turn = SessionTurn(self, session_id, self.fsync_policy)
+        try:
+            yield turn
+        finally:
+            turn.commit()
+
+    def add_turn_counts(self, session_id: str, message_count: int, token_usage: int = 0) -> None:
+        """Add a committed turn's messages and tokens to the session counters.
+
+        Called by SessionTurn.commit() after the turn's messages are appended.
+
+        Args:
+            session_id: Session identifier
+            message_count: Messages appended by the turn
+            token_usage: Tokens used by the turn
+
+        Raises:
+            FileNotFoundError: If session not found
+        """
 
-        # Update metadata counts
         def update(metadata: SessionMetadata) -> None:
-            metadata.message_count += 1
-            if token_count:
-                metadata.token_usage = (metadata.token_usage or 0) + token_count
+            metadata.message_count += message_count
+            if token_usage:
+                metadata.token_usage = (metadata.token_usage or 0) + token_usage
 
         self._update_session(session_id, update)
 
@@ -297,25 +350,10 @@ class SessionManager:
 
         Note: Caller must ensure no active execution is in progress.
         """
-        transcript_path = self.storage_dir / session_id / "transcript.jsonl"
-        if not transcript_path.exists():
+        deleted_message = self.store.delete_last_message(session_id)
+        if deleted_message is None:
             return None
 
-        lines = transcript_path.read_text().strip().split("\n")
-        if not lines or lines == [""]:
-            return None
-
-        # Parse the message we're about to delete
-        deleted_message = SessionMessage.model_validate_json(lines[-1])
-
-        # Remove last line
-        remaining = lines[:-1]
-
-        # Rewrite file atomically
-        tmp_path = transcript_path.with_suffix(".tmp")
-        tmp_path.write_text("\n".join(remaining) + "\n" if remaining else "")
-        tmp_path.rename(transcript_path)
-
         # Update message_count
         def update(metadata: SessionMetadata) -> None:
             metadata.message_count = max(0, metadata.message_count - 1)
@@ -324,36 +362,52 @@ class SessionManager:
 
         return deleted_message
 
-    def get_transcript(self, session_id: str, limit: int | None = None) -> list[SessionMessage]:
-        """Read transcript (optionally limited to last N messages)."""
-        transcript_path = self.storage_dir / session_id / "transcript.jsonl"
+    def get_transcript(
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before: int | None = None,
+        after: int | None = None,
+        reverse: bool = False,
+    ) -> list[SessionMessage]:
+        """Read transcript, optionally a page of it.
 
-        if not transcript_path.exists():
-            return []
+        Only the requested messages are read from storage. Messages are
+        addressed by their 0-based position in the transcript.
 
-        # Read all lines
-        lines = transcript_path.read_text().strip().split("\n")
-        if not lines or lines == [""]:
-            return []
+        Args:
+            session_id: Session ID
+            limit: Maximum number of messages; the last N unless paging forward with ``after``
+            before: Only messages positioned before this one (exclusive)
+            after: Only messages positioned after this one (exclusive)
+            reverse: Return newest first
 
-        # Parse each line as SessionMessage
-        messages = [SessionMessage.model_validate_json(line) for line in lines if line]
+        Returns:
+            List of messages in chronological order (or reverse)
+        """
+        return self.store.get_messages(session_id, limit=limit, before=before, after=after, reverse=reverse)
+
+    def copy_transcript(self, source_session_id: str, target_session_id: str) -> None:
+        """Replace a session's transcript with a copy of another session's.
 
-        # Return last N if limit provided
-        if limit is not None:
-            return messages[-limit:]
-        return messages
+        Args:
+            source_session_id: Session to copy from
+            target_session_id: Session to copy into
+        """
+        self.store.copy_messages(source_session_id, target_session_id)
 
     # --- Queries ---
 
     def get_session(self, session_id: str) -> SessionMetadata | None:
-        """Get session metadata by ID."""
-        session_path = self.storage_dir / session_id / "session.json"
+        """Get session metadata by ID (served from the metadata cache when possible)."""
+        cached = self._cache_get(session_id)
+        if cached is not None:
+            return cached
 
-        if not session_path.exists():
-            return None
-
-        return SessionMetadata.model_validate_json(session_path.read_text())
+        metadata = self.store.get(session_id)
+        if metadata is not None:
+            self._cache_put(metadata)
+        return metadata
 
     def list_sessions(
         self,
@@ -366,7 +420,8 @@ class SessionManager:
     ) -> list[SessionMetadata]:
         """Query sessions with filters.
 
-        Uses index for fast filtering, then loads full metadata.
+        Filtering, sorting and limit are applied on the index; full metadata
+        is loaded only for the returned page.
 
         Args:
             status: Optional filter by session status
@@ -379,72 +434,95 @@ class SessionManager:
         Returns:
             List of session metadata matching filters, sorted by creation time descending
         """
-        # Load index
-        index = self._load_index()
+        return self.store.query(
+            status=status,
+            profile_name=profile_name,
+            amplified_dir=amplified_dir,
+            since=since,
+            parent_session_id=parent_session_id,
+            limit=limit,
+        )
 
-        # Apply filters to index entries (fast filtering using index)
-        filtered_ids: list[str] = []
-        for entry in index.sessions.values():
-            if status is not None and entry.status != status:
-                continue
-            if profile_name is not None and entry.profile_name != profile_name:
-                continue
-            if amplified_dir is not None and entry.amplified_dir != amplified_dir:
-                continue
-            if since is not None and entry.created_at < since:
-                continue
-            filtered_ids.append(entry.session_id)
-
-        # Load full metadata for matches
-        results: list[SessionMetadata] = []
-        for session_id in filtered_ids:
-            metadata = self.get_session(session_id)
-            if metadata:
-                # Apply parent_session_id filter (requires full metadata)
-                if parent_session_id is not None and metadata.parent_session_id != parent_session_id:
-                    continue
-                results.append(metadata)
-
-        # Sort by created_at descending (most recent first)
-        results.sort(key=lambda m: m.created_at, reverse=True)
-
-        # Apply limit if provided
-        if limit is not None:
-            return results[:limit]
-        return results
+    def list_session_entries(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        limit: int | None = None,
+        parent_session_id: str | None = None,
+    ) -> list[SessionIndexEntry]:
+        """Query index entries with filters, without reading any session files.
+
+        Takes the same filters as list_sessions(); use it when the index fields
+        (status, name, parent, counts, unread flag) are all a caller needs.
+
+        Returns:
+            List of index entries matching filters, sorted by creation time descending
+        """
+        return self.store.query_index(
+            status=status,
+            profile_name=profile_name,
+            amplified_dir=amplified_dir,
+            since=since,
+            parent_session_id=parent_session_id,
+            limit=limit,
+        )
+
+    def get_session_tree(self, session_id: str) -> list[SessionIndexEntry]:
+        """Get a session and all its sub-sessions (recursively) in one pass.
+
+        Uses the index's parent -> children map; no session files are read.
+
+        Args:
+            session_id: Root session ID
+
+        Returns:
+            Index entries with the root first and every parent before its
+            children; empty if the session is not indexed
+        """
+        return self.store.get_tree(session_id)
 
     def get_active_sessions(self) -> list[SessionMetadata]:
         """Get all ACTIVE sessions."""
         return self.list_sessions(status=SessionStatus.ACTIVE)
 
+    def get_unread_counts(self) -> dict[str, int]:
+        """Count unread sessions per amplified directory.
+
+        Returns:
+            Dictionary mapping amplified_dir to number of unread sessions
+        """
+        return self.store.unread_counts()
+
     # --- Management ---
 
     def delete_session(self, session_id: str) -> bool:
         """Delete session directory, all subsessions, and remove from index.
 
-        Cascades deletion to all child sessions (subsessions) recursively.
+        Cascades deletion to all child sessions (subsessions) recursively,
+        using the session tree from the index.
         """
         session_dir = self.storage_dir / session_id
 
-        if not session_dir.exists():
+        if not session_dir.exists() and not self.store.exists(session_id):
             return False
 
         try:
-            # Delete subsessions first (recursive cascade)
-            children = self.list_sessions(parent_session_id=session_id)
-            for child in children:
-                self.delete_session(child.session_id)
-
-            # Remove directory
-            shutil.rmtree(session_dir)
-
-            # Update index
-            index = self._load_index()
-            if session_id in index.sessions:
-                del index.sessions[session_id]
-                self._save_index(index)
-
-            logger.info(f"Deleted session {session_id}")
+            # Delete deepest subsessions first so a failure never orphans children
+            tree_ids = [entry.session_id for entry in self.get_session_tree(session_id)] or [session_id]
+            for tree_id in reversed(tree_ids):
+                # Remove metadata, index entry and transcript
+                self._cache_invalidate(tree_id)
+                self.store.delete(tree_id)
+                self._notify_change(tree_id)
+
+                # Remove directory (mount plan, events, other artifacts)
+                tree_dir = self.storage_dir / tree_id
+                if tree_dir.exists():
+                    shutil.rmtree(tree_dir)
+
+            logger.info(f"Deleted session {session_id} ({len(tree_ids) - 1} subsessions)")
             return True
 
         except Exception as e:
@@ -473,10 +551,9 @@ class SessionManager:
         cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
 
         # Iterate index
-        index = self._load_index()
         to_delete: list[str] = []
 
-        for entry in index.sessions.values():
+        for entry in self.store.list_index():
             # Skip protected statuses
             if entry.status in keep_statuses:
                 continue
@@ -497,70 +574,100 @@ class SessionManager:
 
         return deleted_count
 
-    # --- Helpers ---
+    # --- Cross-process Cache Coherence ---
 
-    def _update_session(self, session_id: str, update_fn: Callable[[SessionMetadata], None]) -> None:
-        """Atomically update session metadata.
+    def add_change_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the session_id after each metadata write.
+
+        Processes sharing the same store use this to tell each other to drop
+        stale cached metadata (see invalidate).
 
-        Uses tmp + rename pattern for atomic updates.
-        Updates index after successful write.
+        Args:
+            listener: Callback receiving the changed session_id
         """
-        session_path = self.storage_dir / session_id / "session.json"
-
-        if not session_path.exists():
-            raise FileNotFoundError(f"Session {session_id} not found")
-
-        # Read
-        metadata = SessionMetadata.model_validate_json(session_path.read_text())
-
-        # Modify
-        update_fn(metadata)
-
-        # Write atomically
-        tmp_path = session_path.with_suffix(".tmp")
-        tmp_path.write_text(metadata.model_dump_json(indent=2))
-        tmp_path.rename(session_path)
-
-        # Update index
-        self._update_index(metadata)
-
-    def _load_index(self) -> SessionIndex:
-        """Load session index from disk."""
-        if not self.index_path.exists():
-            return SessionIndex(sessions={}, last_updated=datetime.now(UTC))
-
-        return SessionIndex.model_validate_json(self.index_path.read_text())
-
-    def _save_index(self, index: SessionIndex) -> None:
-        """Save session index to disk atomically."""
-        # Update last_updated
-        index.last_updated = datetime.now(UTC)
-
-        # Write to tmp file
-        tmp_path = self.index_path.with_suffix(".tmp")
-        tmp_path.write_text(index.model_dump_json(indent=2))
-
-        # Rename to index.json (atomic)
-        tmp_path.rename(self.index_path)
-
-    def _update_index(self, metadata: SessionMetadata) -> None:
-        """Update index entry for session."""
-        # Load index
-        index = self._load_index()
-
-        # Create SessionIndexEntry from metadata
-        entry = SessionIndexEntry(
-            session_id=metadata.session_id,
-            amplified_dir=metadata.amplified_dir,
-            profile_name=metadata.profile_name,
-            status=metadata.status,
-            created_at=metadata.created_at,
-            ended_at=metadata.ended_at,
-            message_count=metadata.message_count,
-        )
+        self._change_listeners.append(listener)
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop cached metadata for a session changed outside this manager.
 
-        # Update sessions dict
-        index.sessions[metadata.session_id] = entry
+        Args:
+            session_id: Session identifier
+        """
+        self._cache_invalidate(session_id)
 
-        # Save index
-        self._save_index(index)
+    # --- Helpers ---
+
+    def _update_session(self, session_id: str, update_fn: Callable[[SessionMetadata], None]) -> None:
+        """Atomically update session metadata and its index entry.
+
+        The metadata cache is refreshed with the written metadata.
+
+        Raises:
+            FileNotFoundError: If session not found
+        """
+        try:
+            metadata = self.store.update(session_id, update_fn)
+        except Exception:
+            self._cache_invalidate(session_id)
+            raise
+        self._cache_put(metadata)
+        self._notify_change(session_id)
+
+    def _notify_change(self, session_id: str) -> None:
+        for listener in self._change_listeners:
+            try:
+                listener(session_id)
+            except Exception as e:
+                logger.warning(f"Session change listener failed for {session_id}: {e}")
+
+    def _cache_get(self, session_id: str) -> SessionMetadata | None:
+        """Get a copy of cached metadata (callers may mutate what they get)."""
+        with self._cache_lock:
+            metadata = self._metadata_cache.get(session_id)
+            if metadata is None:
+                return None
+            self._metadata_cache.move_to_end(session_id)
+        return metadata.model_copy(deep=True)
+
+    def _cache_put(self, metadata: SessionMetadata) -> None:
+        if self._metadata_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._metadata_cache[metadata.session_id] = metadata.model_copy(deep=True)
+            self._metadata_cache.move_to_end(metadata.session_id)
+            while len(self._metadata_cache) > self._metadata_cache_size:
+                self._metadata_cache.popitem(last=False)
+
+    def _cache_invalidate(self, session_id: str) -> None:
+        with self._cache_lock:
+            self._metadata_cache.pop(session_id, None)
+
+
+_managers: dict[Path, SessionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_session_manager(storage_dir: Path | None = None) -> SessionManager:
+    """Get the process-wide SessionManager for a state directory.
+
+    Every caller in the process shares one manager, and therefore one
+    metadata cache that sees all writes.
+
+    Args:
+        storage_dir: State directory (default: get_state_dir())
+
+    Returns:
+        Shared SessionManager instance
+    """
+    if storage_dir is None:
+        from amplifier_library.storage.paths import get_state_dir
+
+        storage_dir = get_state_dir()
+
+    key = Path(storage_dir).resolve()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = SessionManager(storage_dir=key)
+            _managers[key] = manager
+        return manager
@@ -0,0 +1,429 @@
+"""SQLite session store.
+
+Keeps session metadata, the index and transcripts in a single SQLite
+database (WAL mode) so list, unread-count and subsession queries are single
+indexed queries instead of one file read per session.
+
+Storage structure:
+    state/sessions/
+        sessions.db          # sessions + messages tables
+        {session_id}/        # Artifacts only (mount_plan.json, events.jsonl, ...)
+
+Sessions written by the filesystem backend in the same directory are
+imported the first time the database is used (see import_filesystem_sessions),
+so switching backends doesn't hide existing sessions.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from amplifier_library.models.sessions import SessionIndexEntry
+from amplifier_library.models.sessions import SessionMessage
+from amplifier_library.models.sessions import SessionMetadata
+from amplifier_library.models.sessions import SessionStatus
+
+from .store import message_range
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    parent_session_id TEXT,
+    amplified_dir TEXT NOT NULL,
+    profile_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    ended_at REAL,
+    is_unread INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status);
+CREATE INDEX IF NOT EXISTS idx_sessions_profile_name ON sessions(profile_name);
+CREATE INDEX IF NOT EXISTS idx_sessions_amplified_dir ON sessions(amplified_dir);
+CREATE INDEX IF NOT EXISTS idx_sessions_parent_session_id ON sessions(parent_session_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_unread ON sessions(amplified_dir) WHERE is_unread = 1;
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id);
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    imported_at REAL NOT NULL,
+    session_count INTEGER NOT NULL
+);
+"""
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    """Convert datetime to a sortable epoch timestamp (naive values are UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class SQLiteSessionStore:
+    """SessionStore backed by a single SQLite database in WAL mode.
+
+    Full metadata is stored as JSON; the fields used for filtering and
+    sorting are mirrored into indexed columns. One connection is shared by
+    all threads of the process and serialized with a lock.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """Open (and migrate) the database.
+
+        Args:
+            db_path: Path to sessions.db
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one IMMEDIATE transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _fetchall(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- Metadata ---
+
+    def exists(self, session_id: str) -> bool:
+        """Check whether a session row exists."""
+        return bool(self._fetchall("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)))
+
+    def create(self, metadata: SessionMetadata) -> None:
+        """Insert a session row."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, parent_session_id, amplified_dir, profile_name, status,"
+                " created_at, ended_at, is_unread, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(metadata),
+            )
+
+    def get(self, session_id: str) -> SessionMetadata | None:
+        """Load session metadata."""
+        rows = self._fetchall("SELECT metadata FROM sessions WHERE session_id = ?", (session_id,))
+        if not rows:
+            return None
+        return SessionMetadata.model_validate_json(rows[0][0])
+
+    def update(self, session_id: str, update_fn: Callable[[SessionMetadata], None]) -> SessionMetadata:
+        """Read, modify and write metadata in one transaction."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT metadata FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Session {session_id} not found")
+
+            metadata = SessionMetadata.model_validate_json(row[0])
+            update_fn(metadata)
+
+            values = self._row(metadata)
+            conn.execute(
+                "UPDATE sessions SET parent_session_id = ?, amplified_dir = ?, profile_name = ?, status = ?,"
+                " created_at = ?, ended_at = ?, is_unread = ?, metadata = ? WHERE session_id = ?",
+                (*values[1:], session_id),
+            )
+            return metadata
+
+    def delete(self, session_id: str) -> bool:
+        """Delete the session row and its messages."""
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            return cursor.rowcount > 0
+
+    # --- Queries ---
+
+    def query(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionMetadata]:
+        """Single indexed query, newest first."""
+        sql, params = self._select(status, profile_name, amplified_dir, since, parent_session_id, limit)
+        return [SessionMetadata.model_validate_json(row[0]) for row in self._fetchall(sql, params)]
+
+    def query_index(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionIndexEntry]:
+        """Same query as query(), returned as index entries."""
+        sql, params = self._select(status, profile_name, amplified_dir, since, parent_session_id, limit)
+        return [
+            SessionIndexEntry.from_metadata(SessionMetadata.model_validate_json(row[0]))
+            for row in self._fetchall(sql, params)
+        ]
+
+    @staticmethod
+    def _select(
+        status: SessionStatus | None,
+        profile_name: str | None,
+        amplified_dir: str | None,
+        since: datetime | None,
+        parent_session_id: str | None,
+        limit: int | None,
+    ) -> tuple[str, tuple[Any, ...]]:
+        """Build the filtered, newest-first SELECT for query()/query_index()."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(SessionStatus(status).value)
+        if profile_name is not None:
+            clauses.append("profile_name = ?")
+            params.append(profile_name)
+        if amplified_dir is not None:
+            clauses.append("amplified_dir = ?")
+            params.append(amplified_dir)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_timestamp(since))
+        if parent_session_id is not None:
+            clauses.append("parent_session_id = ?")
+            params.append(parent_session_id)
+
+        sql = "SELECT metadata FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, tuple(params)
+
+    def get_tree(self, session_id: str) -> list[SessionIndexEntry]:
+        """Recursive query over parent_session_id, breadth-first."""
+        rows = self._fetchall(
+            """
+            WITH RECURSIVE tree(session_id, depth) AS (
+                SELECT session_id, 0 FROM sessions WHERE session_id = ?
+                UNION
+                SELECT s.session_id, t.depth + 1
+                FROM sessions s JOIN tree t ON s.parent_session_id = t.session_id
+            )
+            SELECT s.metadata FROM tree t JOIN sessions s ON s.session_id = t.session_id
+            ORDER BY t.depth, s.created_at
+            """,
+            (session_id,),
+        )
+        return [SessionIndexEntry.from_metadata(SessionMetadata.model_validate_json(row[0])) for row in rows]
+
+    def list_index(self) -> list[SessionIndexEntry]:
+        """Build index entries from stored metadata."""
+        return [
+            SessionIndexEntry.from_metadata(SessionMetadata.model_validate_json(data))
+            for (data,) in self._fetchall("SELECT metadata FROM sessions")
+        ]
+
+    def unread_counts(self) -> dict[str, int]:
+        """Count unread sessions per amplified directory."""
+        rows = self._fetchall("SELECT amplified_dir, COUNT(*) FROM sessions WHERE is_unread = 1 GROUP BY amplified_dir")
+        return dict(rows)
+
+    # --- Transcript ---
+
+    def append_messages(self, session_id: str, messages: list[SessionMessage], fsync: bool = False) -> None:
+        """Insert message rows in one transaction (synchronous=FULL if fsync requested)."""
+        with self._lock:
+            if fsync:
+                self._conn.execute("PRAGMA synchronous=FULL")
+            try:
+                with self._transaction() as conn:
+                    if conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone() is None:
+                        raise FileNotFoundError(f"Session {session_id} not found")
+                    conn.executemany(
+                        "INSERT INTO messages (session_id, data) VALUES (?, ?)",
+                        [(session_id, message.model_dump_json()) for message in messages],
+                    )
+            finally:
+                if fsync:
+                    self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def get_messages(
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before: int | None = None,
+        after: int | None = None,
+        reverse: bool = False,
+    ) -> list[SessionMessage]:
+        """Read a range of messages using the (session_id, id) index."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            start, end = message_range(count, limit, before, after)
+            if start >= end:
+                return []
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (session_id, end - start, start),
+            ).fetchall()
+
+        messages = [SessionMessage.model_validate_json(row[0]) for row in rows]
+        if reverse:
+            messages.reverse()
+        return messages
+
+    def delete_last_message(self, session_id: str) -> SessionMessage | None:
+        """Delete the newest message row."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, data FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT 1", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM messages WHERE id = ?", (row[0],))
+            return SessionMessage.model_validate_json(row[1])
+
+    def copy_messages(self, source_session_id: str, target_session_id: str) -> None:
+        """Replace the target's messages with the source's."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (target_session_id,))
+            conn.execute(
+                "INSERT INTO messages (session_id, data) SELECT ?, data FROM messages WHERE session_id = ? ORDER BY id",
+                (target_session_id, source_session_id),
+            )
+
+    # --- Migration ---
+
+    def import_filesystem_sessions(self, sessions_dir: Path) -> int:
+        """Copy sessions stored by the filesystem backend into the database, once.
+
+        Runs in a single IMMEDIATE transaction that records the import, so
+        concurrent workers import at most once and later calls are a lookup.
+        Sessions already in the database are left as they are. The
+        filesystem files are not removed.
+
+        Args:
+            sessions_dir: Sessions directory holding {session_id}/session.json
+
+        Returns:
+            Number of sessions imported
+        """
+        if self._fetchall("SELECT 1 FROM imports WHERE source = 'filesystem'"):
+            return 0
+
+        from .filesystem_store import FilesystemSessionStore
+
+        imported = 0
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM imports WHERE source = 'filesystem'").fetchone() is not None:
+                return 0
+
+            session_ids = sorted(path.parent.name for path in Path(sessions_dir).glob("*/session.json"))
+            if session_ids:
+                source = FilesystemSessionStore(sessions_dir)
+                for session_id in session_ids:
+                    if conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone():
+                        continue
+                    metadata = source.get(session_id)
+                    if metadata is None:
+                        continue
+                    conn.execute(
+                        "INSERT INTO sessions (session_id, parent_session_id, amplified_dir, profile_name, status,"
+                        " created_at, ended_at, is_unread, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._row(metadata),
+                    )
+                    conn.executemany(
+                        "INSERT INTO messages (session_id, data) VALUES (?, ?)",
+                        [(session_id, message.model_dump_json()) for message in source.get_messages(session_id)],
+                    )
+                    imported += 1
+
+            conn.execute(
+                "INSERT INTO imports (source, imported_at, session_count) VALUES ('filesystem', ?, ?)",
+                (datetime.now(UTC).timestamp(), imported),
+            )
+
+        if imported:
+            logger.info(f"Imported {imported} filesystem sessions into {self.db_path}")
+        return imported
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _row(metadata: SessionMetadata) -> tuple[Any, ...]:
+        return (
+            metadata.session_id,
+            metadata.parent_session_id,
+            metadata.amplified_dir,
+            metadata.profile_name,
+            SessionStatus(metadata.status).value,
+            _timestamp(metadata.created_at),
+            _timestamp(metadata.ended_at),
+            int(metadata.is_unread),
+            metadata.model_dump_json(),
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_stores: dict[Path, SQLiteSessionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_sqlite_store(db_path: Path) -> SQLiteSessionStore:
+    """Get the process-wide store for a database path.
+
+    Args:
+        db_path: Path to sessions.db
+
+    Returns:
+        Shared SQLiteSessionStore instance
+    """
+    key = Path(db_path).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SQLiteSessionStore(key)
+            _stores[key] = store
+            logger.info(f"Opened SQLite session store at {key}")
+        return store
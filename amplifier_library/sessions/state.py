@@ -3,20 +3,23 @@
 This module provides backward-compatible functions that wrap SessionStateService.
 """
 
+from contextlib import AbstractContextManager
+
 from amplifier_library.models.sessions import Session
 from amplifier_library.models.sessions import SessionMessage
-from amplifier_library.storage.paths import get_state_dir
 
 from .manager import SessionManager as SessionStateService
+from .manager import get_session_manager
+from .turn import SessionTurn
 
 
 def _get_service() -> SessionStateService:
-    """Get SessionStateService instance.
+    """Get the process-wide SessionStateService.
 
     Returns:
-        SessionStateService configured with state directory
+        SessionStateService shared for the state directory
     """
-    return SessionStateService(storage_dir=get_state_dir())
+    return get_session_manager()
 
 
 def add_message(
@@ -64,6 +67,23 @@ def add_message(
     )
 
 
+def session_turn(session: Session) -> AbstractContextManager[SessionTurn]:
+    """Batch a turn's transcript writes and counter updates.
+
+    Args:
+        session: Session object
+
+    Returns:
+        Context manager yielding a SessionTurn; commits when the block exits
+
+    Example:
+        >>> with session_turn(session) as turn:
+        ...     turn.add_message("user", prompt)
+        ...     turn.add_message("assistant", response)
+    """
+    return _get_service().turn(session.session_id)
+
+
 def get_transcript(session_id: str) -> list[SessionMessage]:
     """Get session transcript.
 
@@ -0,0 +1,198 @@
+"""Pluggable persistence backends for SessionManager.
+
+A SessionStore owns session metadata, the session index and transcripts.
+Per-session artifacts written by other components (mount_plan.json,
+events.jsonl, profile_context_messages.json) always live in the session
+directory and are managed by SessionManager, whatever the backend.
+
+Contract:
+- Inputs: Sessions directory, backend name
+- Outputs: SessionStore implementation
+- Side Effects: Backends create their files under the sessions directory
+
+Backends:
+- filesystem: session.json + transcript.jsonl per session, journaled index (default)
+- sqlite: single sessions.db in WAL mode with indexed metadata columns
+
+The backend is chosen by the daemon's session_store setting through
+configure_session_store(). Switching to sqlite imports existing filesystem
+sessions once.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+
+from amplifier_library.models.sessions import SessionIndexEntry
+from amplifier_library.models.sessions import SessionMessage
+from amplifier_library.models.sessions import SessionMetadata
+from amplifier_library.models.sessions import SessionStatus
+
+SESSION_STORE_BACKENDS = ("filesystem", "sqlite")
+
+_default_backend = "filesystem"
+
+
+class SessionStore(Protocol):
+    """Persistence backend for session metadata, index and transcripts.
+
+    Missing sessions are reported by returning None/False from queries and by
+    raising FileNotFoundError from mutations, matching SessionManager's API.
+    """
+
+    def exists(self, session_id: str) -> bool:
+        """Check whether a session is stored."""
+        ...
+
+    def create(self, metadata: SessionMetadata) -> None:
+        """Persist a new session with an empty transcript."""
+        ...
+
+    def get(self, session_id: str) -> SessionMetadata | None:
+        """Load session metadata."""
+        ...
+
+    def update(self, session_id: str, update_fn: Callable[[SessionMetadata], None]) -> SessionMetadata:
+        """Atomically read, modify and write session metadata."""
+        ...
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session's metadata, index entry and transcript."""
+        ...
+
+    def query(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionMetadata]:
+        """Query sessions, newest first."""
+        ...
+
+    def query_index(
+        self,
+        status: SessionStatus | None = None,
+        profile_name: str | None = None,
+        amplified_dir: str | None = None,
+        since: datetime | None = None,
+        parent_session_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[SessionIndexEntry]:
+        """Query index entries only (no per-session reads), newest first."""
+        ...
+
+    def get_tree(self, session_id: str) -> list[SessionIndexEntry]:
+        """Get a session and all its descendants, parents before children."""
+        ...
+
+    def list_index(self) -> list[SessionIndexEntry]:
+        """Get index entries for all sessions."""
+        ...
+
+    def unread_counts(self) -> dict[str, int]:
+        """Count unread sessions per amplified directory."""
+        ...
+
+    def append_messages(self, session_id: str, messages: list[SessionMessage], fsync: bool = False) -> None:
+        """Append messages to the transcript in one write (fsynced if requested)."""
+        ...
+
+    def get_messages(
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before: int | None = None,
+        after: int | None = None,
+        reverse: bool = False,
+    ) -> list[SessionMessage]:
+        """Read a range of the transcript (see message_range for cursor semantics)."""
+        ...
+
+    def delete_last_message(self, session_id: str) -> SessionMessage | None:
+        """Remove and return the last transcript message."""
+        ...
+
+    def copy_messages(self, source_session_id: str, target_session_id: str) -> None:
+        """Replace the target's transcript with a copy of the source's."""
+        ...
+
+
+def message_range(count: int, limit: int | None, before: int | None, after: int | None) -> tuple[int, int]:
+    """Resolve transcript cursors to a [start, end) range of message numbers.
+
+    Message numbers are 0-based positions in the transcript. ``after`` and
+    ``before`` are exclusive bounds. ``limit`` keeps the messages closest to
+    the cursor: the first N after ``after`` when paging forward, otherwise
+    the last N (before ``before`` or at the end of the transcript).
+
+    Args:
+        count: Number of messages in the transcript
+        limit: Optional maximum number of messages
+        before: Only messages with a number lower than this
+        after: Only messages with a number higher than this
+
+    Returns:
+        Tuple of (start, end) with 0 <= start <= end <= count
+    """
+    start = 0 if after is None else max(0, after + 1)
+    end = count if before is None else max(0, min(before, count))
+    start = min(start, end)
+
+    if limit is not None:
+        if after is not None and before is None:
+            end = min(end, start + limit)
+        else:
+            start = max(start, end - limit)
+    return start, end
+
+
+def configure_session_store(backend: str) -> None:
+    """Set the backend used by stores created without an explicit backend.
+
+    Args:
+        backend: "filesystem" or "sqlite"
+
+    Raises:
+        ValueError: If backend is unknown
+    """
+    global _default_backend
+
+    backend = backend.lower()
+    if backend not in SESSION_STORE_BACKENDS:
+        raise ValueError(
+            f"Unknown session store backend: {backend} (expected one of {', '.join(SESSION_STORE_BACKENDS)})"
+        )
+    _default_backend = backend
+
+
+def create_session_store(sessions_dir: Path, backend: str | None = None) -> SessionStore:
+    """Create a session store for a sessions directory.
+
+    Args:
+        sessions_dir: Sessions directory (e.g., .amplifierd/state/sessions)
+        backend: "filesystem" or "sqlite" (default: the configured backend, filesystem unless configured)
+
+    Returns:
+        SessionStore implementation
+
+    Raises:
+        ValueError: If backend is unknown
+    """
+    backend = (backend or _default_backend).lower()
+
+    if backend == "filesystem":
+        from .filesystem_store import FilesystemSessionStore
+
+        return FilesystemSessionStore(sessions_dir)
+    if backend == "sqlite":
+        from .sqlite_store import get_sqlite_store
+
+        store = get_sqlite_store(Path(sessions_dir) / "sessions.db")
+        store.import_filesystem_sessions(Path(sessions_dir))
+        return store
+
+    raise ValueError(f"Unknown session store backend: {backend} (expected one of {', '.join(SESSION_STORE_BACKENDS)})")
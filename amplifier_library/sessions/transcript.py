@@ -0,0 +1,256 @@
+"""Append-only transcript file with a sidecar offset index.
+
+transcript.jsonl holds one SessionMessage per line. transcript.idx holds the
+byte offset of each line as a fixed-width little-endian uint64, so message N
+starts at offset idx[N] and ranges can be read with two seeks instead of
+parsing the whole transcript.
+
+Contract:
+- Inputs: Path to transcript.jsonl
+- Outputs: Raw JSON lines for a message range, message count
+- Side Effects: Appends to / truncates transcript.jsonl and transcript.idx, rebuilds the index when stale
+
+Storage structure:
+    state/sessions/{session_id}/
+        transcript.jsonl   # One SessionMessage per line
+        transcript.idx     # uint64 start offset per message (derived, rebuilt if missing)
+
+The transcript is always changed before the index, so after a crash the index
+can only disagree with the transcript's tail. Every operation first compares
+the (transcript size, index size) pair against the last pair known to be
+consistent; only when it changed does it check that the last indexed message
+ends exactly at end of file (one seek + one line read), and it rebuilds the
+index from the transcript if it doesn't.
+"""
+
+import logging
+import os
+import shutil
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+
+_OFFSET = struct.Struct("<Q")
+
+# Most transcripts whose consistent (transcript size, index size) pair is remembered
+MAX_VERIFIED_TRANSCRIPTS = 256
+
+# Last pair known to be consistent per transcript path, least recently used first
+_verified_sizes: OrderedDict[Path, tuple[int, int]] = OrderedDict()
+_verified_sizes_lock = threading.Lock()
+
+
+def _sizes_verified(path: Path, sizes: tuple[int, int]) -> bool:
+    with _verified_sizes_lock:
+        if _verified_sizes.get(path) != sizes:
+            return False
+        _verified_sizes.move_to_end(path)
+        return True
+
+
+def _remember_sizes(path: Path, sizes: tuple[int, int] | None) -> None:
+    with _verified_sizes_lock:
+        if sizes is None:
+            _verified_sizes.pop(path, None)
+            return
+        _verified_sizes[path] = sizes
+        _verified_sizes.move_to_end(path)
+        while len(_verified_sizes) > MAX_VERIFIED_TRANSCRIPTS:
+            _verified_sizes.popitem(last=False)
+
+
+class TranscriptFile:
+    """Transcript JSONL file plus its message offset index."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize for a transcript path.
+
+        Args:
+            path: Path to transcript.jsonl
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(INDEX_SUFFIX)
+
+    def count(self) -> int:
+        """Get the number of messages, rebuilding a stale index first."""
+        if self._index_is_stale():
+            return len(self._rebuild_index())
+        return self._indexed_count()
+
+    def append(self, lines: list[str], fsync: bool = False) -> None:
+        """Append JSON lines (without trailing newlines) and index them.
+
+        Args:
+            lines: Serialized messages to append, in order
+            fsync: Flush both files to stable storage before returning
+        """
+        if not lines:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count()  # Bring a stale index up to date before extending it
+
+        encoded = [line.encode("utf-8") + b"\n" for line in lines]
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(b"".join(encoded))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        offsets: list[int] = []
+        for data in encoded:
+            offsets.append(offset)
+            offset += len(data)
+        with open(self.index_path, "ab") as f:
+            f.write(b"".join(_OFFSET.pack(o) for o in offsets))
+            index_size = f.tell()
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        _remember_sizes(self.path, (offset, index_size))
+
+    def read(self, start: int, end: int) -> list[str]:
+        """Read messages [start, end) as raw JSON lines.
+
+        Args:
+            start: First message number (0-based, inclusive)
+            end: Last message number (exclusive)
+
+        Returns:
+            JSON lines in transcript order
+        """
+        count = self.count()
+        start = max(0, start)
+        end = min(end, count)
+        if start >= end:
+            return []
+
+        with open(self.index_path, "rb") as f:
+            f.seek(start * _OFFSET.size)
+            first = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+            if end < count:
+                f.seek(end * _OFFSET.size)
+                stop = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+            else:
+                stop = self.path.stat().st_size
+
+        with open(self.path, "rb") as f:
+            f.seek(first)
+            data = f.read(stop - first)
+
+        return [line.decode("utf-8") for line in data.split(b"\n") if line.strip()]
+
+    def pop(self) -> str | None:
+        """Remove the last message by truncating both files at its offset.
+
+        Costs the same regardless of transcript length. Truncation is atomic,
+        and a crash between truncating the transcript and the index leaves an
+        index entry pointing at end of file, which is detected as stale.
+
+        Returns:
+            The removed JSON line, or None if the transcript is empty
+        """
+        count = self.count()
+        if count == 0:
+            return None
+
+        with open(self.index_path, "rb") as f:
+            f.seek((count - 1) * _OFFSET.size)
+            last = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+
+        with open(self.path, "rb") as f:
+            f.seek(last)
+            line = f.read().decode("utf-8").strip()
+
+        os.truncate(self.path, last)
+        os.truncate(self.index_path, (count - 1) * _OFFSET.size)
+        _remember_sizes(self.path, (last, (count - 1) * _OFFSET.size))
+        return line
+
+    def copy_to(self, target: "TranscriptFile") -> None:
+        """Replace another transcript (and its index) with a copy of this one."""
+        if not self.path.exists():
+            return
+
+        self.count()
+        _remember_sizes(target.path, None)
+        target.path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.path, target.path)
+        if self.index_path.exists():
+            shutil.copyfile(self.index_path, target.index_path)
+        else:
+            target.index_path.unlink(missing_ok=True)
+
+    def unlink(self) -> None:
+        """Delete the transcript and its index."""
+        _remember_sizes(self.path, None)
+        self.path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+
+    # --- Index maintenance ---
+
+    def _indexed_count(self) -> int:
+        try:
+            return self.index_path.stat().st_size // _OFFSET.size
+        except FileNotFoundError:
+            return 0
+
+    def _index_is_stale(self) -> bool:
+        """Check whether the index is missing or doesn't match the transcript."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+
+        try:
+            index_size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return size > 0
+
+        if _sizes_verified(self.path, (size, index_size)):
+            return False
+        if self._index_matches(size, index_size):
+            _remember_sizes(self.path, (size, index_size))
+            return False
+        return True
+
+    def _index_matches(self, size: int, index_size: int) -> bool:
+        """Check that the last indexed message ends exactly at end of file."""
+        if index_size % _OFFSET.size:
+            return False
+        if index_size == 0:
+            return size == 0
+
+        with open(self.index_path, "rb") as f:
+            f.seek(index_size - _OFFSET.size)
+            last = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+        if last >= size:
+            return False
+
+        with open(self.path, "rb") as f:
+            f.seek(last)
+            return last + len(f.readline()) == size
+
+    def _rebuild_index(self) -> list[int]:
+        """Rebuild the offset index by scanning the transcript."""
+        offsets: list[int] = []
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        offsets.append(offset)
+                    offset += len(line)
+
+        tmp_path = self.index_path.with_suffix(".idx.tmp")
+        tmp_path.write_bytes(b"".join(_OFFSET.pack(o) for o in offsets))
+        tmp_path.rename(self.index_path)
+        logger.debug(f"Rebuilt transcript index for {self.path} ({len(offsets)} messages)")
+        return offsets
@@ -0,0 +1,152 @@
+"""Turn-scoped write batching for session transcripts.
+
+A turn (user message, assistant response, anything in between) is recorded
+through a SessionTurn. Messages are buffered and appended to the transcript
+together, and the session's counters (message_count, token_usage) are
+committed with a single metadata write when the turn ends.
+
+Contract:
+- Inputs: SessionManager, session ID, fsync policy
+- Outputs: SessionTurn batch
+- Side Effects: Appends to the transcript and updates session metadata on commit
+
+Fsync policies (daemon.transcript_fsync, applied with configure_transcript_fsync()):
+- message: every message is appended and fsynced as soon as it is added
+- turn: messages are appended and fsynced once when the turn ends
+- none: messages are appended when the turn ends, durability is left to the OS (default)
+
+Whatever the policy, a user message is appended as soon as it is added, so a
+crash mid-turn doesn't lose the prompt; under "turn" it is synced by the
+commit's fsync along with the rest of the turn.
+"""
+
+import logging
+from datetime import UTC
+from datetime import datetime
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from amplifier_library.models.sessions import SessionMessage
+
+if TYPE_CHECKING:
+    from .manager import SessionManager
+
+logger = logging.getLogger(__name__)
+
+
+class FsyncPolicy(StrEnum):
+    """When transcript writes are flushed to stable storage."""
+
+    MESSAGE = "message"
+    TURN = "turn"
+    NONE = "none"
+
+
+_fsync_policy = FsyncPolicy.NONE
+
+
+def configure_transcript_fsync(policy: FsyncPolicy | str) -> None:
+    """Set the fsync policy used by SessionManagers created afterwards.
+
+    Args:
+        policy: Fsync policy (FsyncPolicy or its value)
+
+    Raises:
+        ValueError: If the policy is unknown
+    """
+    global _fsync_policy
+
+    _fsync_policy = FsyncPolicy(policy)
+
+
+def get_fsync_policy() -> FsyncPolicy:
+    """Get the configured fsync policy.
+
+    Returns:
+        Policy set by configure_transcript_fsync() (default: none)
+    """
+    return _fsync_policy
+
+
+class SessionTurn:
+    """Buffered transcript writes and counter updates for one turn.
+
+    Use through SessionManager.turn(), which commits when the block exits,
+    including on errors and cancellation, so nothing recorded is lost.
+    """
+
+    def __init__(self, manager: "SessionManager", session_id: str, fsync_policy: FsyncPolicy) -> None:
+        """Initialize an empty turn.
+
+        Args:
+            manager: SessionManager owning the session
+            session_id: Session identifier
+            fsync_policy: When to fsync transcript writes
+        """
+        self.manager = manager
+        self.session_id = session_id
+        self.fsync_policy = fsync_policy
+
+        self._pending: list[SessionMessage] = []
+        self._message_count = 0
+        self._token_usage = 0
+
+    def add_message(
+        self,
+        role: str,
+        content: str,
+        agent: str | None = None,
+        token_count: int | None = None,
+    ) -> SessionMessage:
+        """Record a message in this turn.
+
+        Args:
+            role: Message role ("user" | "assistant" | "system")
+            content: Message content
+            agent: Optional agent identifier
+            token_count: Optional token count
+
+        Returns:
+            The recorded SessionMessage
+        """
+        message = SessionMessage(
+            timestamp=datetime.now(UTC),
+            role=role,
+            content=content,
+            agent=agent,
+            token_count=token_count,
+        )
+
+        if self.fsync_policy == FsyncPolicy.MESSAGE:
+            self.manager.store.append_messages(self.session_id, [message], fsync=True)
+        elif role == "user":
+            # Persist the prompt (and anything buffered before it) before the turn runs
+            pending, self._pending = [*self._pending, message], []
+            self.manager.store.append_messages(self.session_id, pending, fsync=False)
+        else:
+            self._pending.append(message)
+
+        self._message_count += 1
+        if token_count:
+            self._token_usage += token_count
+        return message
+
+    def commit(self) -> None:
+        """Append buffered messages, then write the counters in one metadata update.
+
+        Raises:
+            FileNotFoundError: If session not found
+        """
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.manager.store.append_messages(self.session_id, pending, fsync=self.fsync_policy == FsyncPolicy.TURN)
+
+        if not self._message_count:
+            return
+
+        message_count, token_usage = self._message_count, self._token_usage
+        self._message_count = 0
+        self._token_usage = 0
+
+        self.manager.add_turn_counts(self.session_id, message_count, token_usage)
+        logger.debug(f"Committed turn for session {self.session_id} ({message_count} messages)")
@@ -13,6 +13,23 @@ import os
 from pathlib import Path
 
 
+def _ensure_dir(path: Path) -> Path:
+    """Create a directory (and parents) if it doesn't exist.
+
+    Checked on every call, so a directory removed while the daemon runs is
+    recreated; an existing directory costs one stat instead of a mkdir.
+
+    Args:
+        path: Directory to create
+
+    Returns:
+        The same path
+    """
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def get_home_dir() -> Path:
     """Get AMPLIFIERD_HOME from environment.
 
@@ -37,8 +54,7 @@ def get_config_dir() -> Path:
     if env_override is not None:
         config_dir = Path(env_override).resolve()
 
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir
+    return _ensure_dir(config_dir)
 
 
 def get_share_dir() -> Path:
@@ -61,8 +77,7 @@ def get_share_dir() -> Path:
     if env_override is not None:
         share_dir = Path(env_override).resolve()
 
-    share_dir.mkdir(parents=True, exist_ok=True)
-    return share_dir
+    return _ensure_dir(share_dir)
 
 
 def get_state_dir() -> Path:
@@ -77,8 +92,7 @@ def get_state_dir() -> Path:
     if env_override is not None:
         state_dir = Path(env_override).resolve()
 
-    state_dir.mkdir(parents=True, exist_ok=True)
-    return state_dir
+    return _ensure_dir(state_dir)
 
 
 def get_log_dir() -> Path:
@@ -101,8 +115,7 @@ def get_log_dir() -> Path:
     if env_override is not None:
         log_dir = Path(env_override).resolve()
 
-    log_dir.mkdir(parents=True, exist_ok=True)
-    return log_dir
+    return _ensure_dir(log_dir)
 
 
 def get_cache_dir() -> Path:
@@ -117,8 +130,7 @@ def get_cache_dir() -> Path:
     if env_override is not None:
         cache_dir = Path(env_override).resolve()
 
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir
+    return _ensure_dir(cache_dir)
 
 
 def get_git_cache_dir() -> Path:
@@ -128,8 +140,25 @@ def get_git_cache_dir() -> Path:
         Path to git cache ($AMPLIFIERD_HOME/cache/git)
     """
     git_cache_dir = get_cache_dir() / "git"
-    git_cache_dir.mkdir(parents=True, exist_ok=True)
-    return git_cache_dir
+    return _ensure_dir(git_cache_dir)
+
+
+def get_mount_plan_cache_dir() -> Path:
+    """Get compiled mount plan cache directory.
+
+    Returns:
+        Path to mount plan cache ($AMPLIFIERD_HOME/cache/mount_plans)
+    """
+    return _ensure_dir(get_cache_dir() / "mount_plans")
+
+
+def get_blob_cache_dir() -> Path:
+    """Get content-addressed file store directory.
+
+    Returns:
+        Path to blob store ($AMPLIFIERD_HOME/cache/blobs)
+    """
+    return _ensure_dir(get_cache_dir() / "blobs")
 
 
 def get_profiles_dir() -> Path:
@@ -139,8 +168,7 @@ def get_profiles_dir() -> Path:
         Path to profile cache ($AMPLIFIERD_HOME/share/profiles)
     """
     profile_cache_dir = get_share_dir() / "profiles"
-    profile_cache_dir.mkdir(parents=True, exist_ok=True)
-    return profile_cache_dir
+    return _ensure_dir(profile_cache_dir)
 
 
 def get_compiled_profiles_dir() -> Path:
@@ -150,5 +178,4 @@ def get_compiled_profiles_dir() -> Path:
         Path to compiled profiles ($AMPLIFIERD_HOME/share/profiles)
     """
     compiled_dir = get_share_dir() / "profiles"
-    compiled_dir.mkdir(parents=True, exist_ok=True)
-    return compiled_dir
+    return _ensure_dir(compiled_dir)
@@ -195,16 +195,54 @@ def _apply_env_overrides(config: Config) -> Config:
         "watch_interval_seconds",
         "cache_ttl_hours",
         "enable_metrics",
+        "session_store",
+        "transcript_fsync",
+        "stream_queue_size",
+        "stream_overflow_policy",
+        "stream_replay_size",
+        "stream_coalesce_ms",
+        "stream_coalesce_bytes",
+        "event_bus",
+        "event_bus_socket",
+        "execution_workers",
+        "session_idle_timeout_seconds",
+        "max_warm_sessions",
+        "max_warm_session_bytes",
+        "session_reaper_interval_seconds",
+        "git_ref_ttl_seconds",
     ]:
         env_var = f"AMPLIFIERD_DAEMON_{key.upper()}"
         if env_var in os.environ:
             value = os.environ[env_var]
             # Parse value based on type
-            if key == "port" or key == "workers" or key == "watch_interval_seconds":
+            if key in (
+                "port",
+                "workers",
+                "watch_interval_seconds",
+                "stream_queue_size",
+                "stream_replay_size",
+                "stream_coalesce_ms",
+                "stream_coalesce_bytes",
+                "execution_workers",
+                "session_idle_timeout_seconds",
+                "max_warm_sessions",
+                "max_warm_session_bytes",
+                "session_reaper_interval_seconds",
+                "git_ref_ttl_seconds",
+            ):
                 daemon_overrides[key] = int(value)
             elif key == "cache_ttl_hours":
                 daemon_overrides[key] = int(value) if value.lower() != "none" else None
-            elif key in ("host", "log_level", "timezone"):
+            elif key in (
+                "host",
+                "log_level",
+                "timezone",
+                "session_store",
+                "transcript_fsync",
+                "stream_overflow_policy",
+                "event_bus",
+                "event_bus_socket",
+            ):
                 daemon_overrides[key] = value
             elif key == "cors_origins":
                 # Parse comma-separated list
@@ -7,6 +7,7 @@ including startup behavior, cache management, and daemon settings.
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel
 from pydantic import Field
@@ -105,6 +106,96 @@ class DaemonConfig(BaseModel):
         description="Enable collection of performance metrics",
     )
 
+    # Session persistence
+    session_store: Literal["filesystem", "sqlite"] = Field(
+        default="filesystem",
+        description="Session metadata and transcript backend: filesystem (JSON files per session) or sqlite "
+        "(sessions.db); switching to sqlite imports existing filesystem sessions once",
+    )
+    transcript_fsync: Literal["message", "turn", "none"] = Field(
+        default="none",
+        description="When transcript writes are fsynced: after every message, once per turn, or never "
+        "(left to the OS); user messages are always written as soon as they are received",
+    )
+
+    # SSE subscriber buffering
+    stream_queue_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum buffered events per SSE subscriber before the overflow policy applies",
+    )
+    stream_overflow_policy: Literal["drop_oldest", "coalesce", "disconnect"] = Field(
+        default="coalesce",
+        description="What a full SSE subscriber buffer does: drop oldest event, coalesce content deltas, or disconnect",
+    )
+    stream_replay_size: int = Field(
+        default=2000,
+        ge=0,
+        description="Recent events kept per session stream so reconnecting clients (Last-Event-ID) can resume",
+    )
+    stream_coalesce_ms: int = Field(
+        default=20,
+        ge=0,
+        description="Longest time content deltas are batched before being sent to SSE subscribers (0 disables)",
+    )
+    stream_coalesce_bytes: int = Field(
+        default=1024,
+        ge=1,
+        description="Batched content size that is sent to SSE subscribers immediately",
+    )
+
+    # Cross-worker event delivery
+    event_bus: Literal["auto", "local", "unix"] = Field(
+        default="auto",
+        description="How stream events reach other workers: local (single process), unix (Unix domain socket), "
+        "or auto (unix when workers > 1 or execution workers are used)",
+    )
+    event_bus_socket: str | None = Field(
+        default=None,
+        description="Unix socket for the unix event bus (default: event_bus.sock in the state directory)",
+    )
+
+    # Multi-process execution
+    execution_workers: int = Field(
+        default=0,
+        ge=0,
+        le=64,
+        description="Child processes that run session executions, each owning the runners of its share of "
+        "sessions (0 = run executions in the API process)",
+    )
+
+    # Warm session eviction
+    session_idle_timeout_seconds: int = Field(
+        default=3600,
+        ge=0,
+        description="Evict a session's runner (and its stream manager, if no client is connected) after this long "
+        "without use (0 = never)",
+    )
+    max_warm_sessions: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum sessions kept warm in memory per process; least recently used are evicted first "
+        "(0 = unlimited)",
+    )
+    max_warm_session_bytes: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum context text held by warm sessions per process, in bytes (0 = unlimited)",
+    )
+    session_reaper_interval_seconds: int = Field(
+        default=60,
+        ge=1,
+        description="Interval between session eviction passes",
+    )
+
+    # Git source resolution
+    git_ref_ttl_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="How long a git branch's looked-up commit is trusted before asking the remote again; "
+        "the last known commit is still used when the remote can't be reached (0 = always ask)",
+    )
+
     @field_validator("timezone")
     @classmethod
     def validate_timezone(cls, v: str) -> str:
@@ -0,0 +1,336 @@
+"""Pluggable event bus that carries stream events between daemon workers.
+
+With daemon.workers > 1, uvicorn runs several processes and each has its
+own session stream managers and global event emitter. An SSE client
+connected to one worker must still see events emitted by an execution
+running in another, so emitters with a channel (see streaming.py) also
+publish their events on the bus, and events from other workers are
+delivered to the local emitter for the same channel.
+
+Contract:
+- Inputs: Backend name, socket path
+- Outputs: EventBus implementation
+- Side Effects: The unix backend binds or connects to a Unix domain socket
+
+Backends:
+- local: in-process only, publishing is a no-op (default for a single worker)
+- unix: workers exchange events over a Unix domain socket. The worker
+  holding an flock on "{socket}.lock" serves the socket as hub and relays
+  each event to every other worker; the rest connect to it. If the hub
+  exits, the lock is released and a remaining worker takes over. Where
+  flock is unavailable, create_event_bus() falls back to local.
+
+Delivery is best effort, like SSE itself: events published while a worker
+is (re)connecting are dropped, and a worker whose connection backs up
+beyond MAX_PEER_BUFFER is disconnected rather than slowing down the rest.
+Execution state (runners) is not shared; it stays in the worker that ran
+the request.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from typing import Protocol
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_BACKENDS = ("local", "unix")
+
+# Largest single event frame accepted from the socket
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# Unsent bytes a peer may accumulate before it is disconnected
+MAX_PEER_BUFFER = 16 * 1024 * 1024
+RECONNECT_DELAY_SECONDS = 0.5
+
+EventHandler = Callable[[str, str, dict[str, Any]], None]
+
+
+class EventBus(Protocol):
+    """Transport for stream events between worker processes."""
+
+    def set_handler(self, handler: EventHandler) -> None:
+        """Set the callback receiving (channel, event_type, data) from other workers."""
+        ...
+
+    def publish(self, channel: str, event_type: str, data: dict[str, Any]) -> None:
+        """Send an event emitted in this worker to the other workers (never blocks)."""
+        ...
+
+    async def start(self) -> None:
+        """Start the transport."""
+        ...
+
+    async def stop(self) -> None:
+        """Stop the transport and release its resources."""
+        ...
+
+
+class LocalEventBus:
+    """Single-process bus: there are no other workers to reach."""
+
+    def set_handler(self: "LocalEventBus", handler: EventHandler) -> None:
+        """Ignore the handler; nothing is ever received."""
+
+    def publish(self: "LocalEventBus", channel: str, event_type: str, data: dict[str, Any]) -> None:
+        """Do nothing; local subscribers are fed by the emitter itself."""
+
+    async def start(self: "LocalEventBus") -> None:
+        """Nothing to start."""
+
+    async def stop(self: "LocalEventBus") -> None:
+        """Nothing to stop."""
+
+
+class UnixSocketEventBus:
+    """Bus over a Unix domain socket, with one worker acting as hub.
+
+    Frames are newline-delimited JSON objects {"channel", "event", "data"}.
+    """
+
+    def __init__(self: "UnixSocketEventBus", socket_path: Path) -> None:
+        """Initialize bus.
+
+        Args:
+            socket_path: Socket shared by all workers of the daemon
+
+        Raises:
+            RuntimeError: If flock (used to elect the hub) is unavailable on this platform
+        """
+        if fcntl is None:
+            raise RuntimeError("The unix event bus needs fcntl.flock, which this platform lacks")
+        self.socket_path = Path(socket_path)
+        self.lock_path = self.socket_path.with_name(self.socket_path.name + ".lock")
+
+        self._handler: EventHandler | None = None
+        self._lock_fd: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+        # Hub: connected workers; client: the connection to the hub
+        self._peers: set[asyncio.StreamWriter] = set()
+        self._upstream: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def is_hub(self: "UnixSocketEventBus") -> bool:
+        """Whether this worker is serving the socket."""
+        return self._server is not None
+
+    def set_handler(self: "UnixSocketEventBus", handler: EventHandler) -> None:
+        """Set the callback receiving events from other workers."""
+        self._handler = handler
+
+    def publish(self: "UnixSocketEventBus", channel: str, event_type: str, data: dict[str, Any]) -> None:
+        """Send an event to the other workers."""
+        frame = json.dumps({"channel": channel, "event": event_type, "data": data}).encode() + b"\n"
+        if self.is_hub:
+            self._broadcast(frame, exclude=None)
+        elif self._upstream is not None:
+            self._write(self._upstream, frame)
+
+    async def start(self: "UnixSocketEventBus") -> None:
+        """Become the hub or connect to it.
+
+        Raises:
+            ValueError: If the socket path is too long for a Unix socket
+        """
+        if len(os.fsencode(self.socket_path)) > 100:
+            raise ValueError(f"Event bus socket path is too long for a Unix socket: {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._stopping = False
+        await self._join()
+
+    async def stop(self: "UnixSocketEventBus") -> None:
+        """Leave the bus, handing the hub role to another worker if held."""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        for writer in [*self._peers, *([self._upstream] if self._upstream else [])]:
+            writer.close()
+        self._peers.clear()
+        self._upstream = None
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                self.socket_path.unlink()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _join(self: "UnixSocketEventBus") -> None:
+        """Serve the socket if no other worker does, otherwise connect to the hub."""
+        if self._try_lock():
+            await self._serve()
+        else:
+            self._task = asyncio.create_task(self._client_loop())
+
+    async def _serve(self: "UnixSocketEventBus") -> None:
+        """Become the hub (the caller holds the lock)."""
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._serve_peer, path=str(self.socket_path), limit=MAX_FRAME_SIZE
+        )
+        logger.info(f"Event bus hub listening on {self.socket_path}")
+
+    def _try_lock(self: "UnixSocketEventBus") -> bool:
+        if fcntl is None:
+            # __init__ refuses to create the bus without flock
+            return False
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _client_loop(self: "UnixSocketEventBus") -> None:
+        """Stay connected to the hub, taking over if it goes away."""
+        while not self._stopping:
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(self.socket_path), limit=MAX_FRAME_SIZE)
+            except OSError:
+                # Hub not listening yet, or gone; take over if its lock was released
+                if self._try_lock():
+                    self._task = None
+                    await self._serve()
+                    return
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                continue
+
+            logger.info(f"Connected to event bus hub at {self.socket_path}")
+            self._upstream = writer
+            try:
+                await self._read_frames(reader, writer)
+            finally:
+                self._upstream = None
+                writer.close()
+            if not self._stopping:
+                logger.warning("Lost connection to event bus hub, reconnecting")
+
+    async def _serve_peer(
+        self: "UnixSocketEventBus", reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Hub side of one worker connection."""
+        self._peers.add(writer)
+        try:
+            await self._read_frames(reader, writer)
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _read_frames(
+        self: "UnixSocketEventBus", reader: asyncio.StreamReader, source: asyncio.StreamWriter
+    ) -> None:
+        """Deliver frames from a connection until it closes (hub relays them to the other workers)."""
+        while True:
+            try:
+                frame = await reader.readline()
+            except (ValueError, OSError) as e:
+                logger.warning(f"Event bus connection failed: {e}")
+                return
+            if not frame:
+                return
+
+            if self.is_hub:
+                self._broadcast(frame, exclude=source)
+            self._deliver(frame)
+
+    def _deliver(self: "UnixSocketEventBus", frame: bytes) -> None:
+        if self._handler is None:
+            return
+        try:
+            message = json.loads(frame)
+            self._handler(message["channel"], message["event"], message["data"])
+        except Exception as e:
+            logger.warning(f"Failed to deliver event bus frame: {e}")
+
+    def _broadcast(self: "UnixSocketEventBus", frame: bytes, exclude: asyncio.StreamWriter | None) -> None:
+        for writer in list(self._peers):
+            if writer is not exclude:
+                self._write(writer, frame)
+
+    def _write(self: "UnixSocketEventBus", writer: asyncio.StreamWriter, frame: bytes) -> None:
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > MAX_PEER_BUFFER:
+            logger.warning("Disconnecting event bus peer that fell behind")
+            writer.close()
+            self._peers.discard(writer)
+            return
+        writer.write(frame)
+
+
+def create_event_bus(backend: str, socket_path: Path | None = None) -> EventBus:
+    """Create an event bus.
+
+    Args:
+        backend: "local" or "unix"
+        socket_path: Socket for the unix backend
+
+    Returns:
+        EventBus implementation (local for "unix" where flock is unavailable)
+
+    Raises:
+        ValueError: If backend is unknown or the unix backend has no socket path
+    """
+    backend = backend.lower()
+    if backend == "local":
+        return LocalEventBus()
+    if backend == "unix":
+        if socket_path is None:
+            raise ValueError("The unix event bus requires a socket path")
+        if fcntl is None:
+            logger.warning("flock is unavailable on this platform, events stay within each worker")
+            return LocalEventBus()
+        return UnixSocketEventBus(socket_path)
+
+    raise ValueError(f"Unknown event bus backend: {backend} (expected one of {', '.join(EVENT_BUS_BACKENDS)})")
+
+
+_event_bus: EventBus = LocalEventBus()
+
+
+def get_event_bus() -> EventBus:
+    """Get this worker's event bus (local until start_event_bus is called)."""
+    return _event_bus
+
+
+async def start_event_bus(bus: EventBus, handler: EventHandler) -> None:
+    """Start a bus and make it this worker's event bus.
+
+    Args:
+        bus: Bus from create_event_bus
+        handler: Callback receiving events from other workers
+    """
+    global _event_bus
+
+    bus.set_handler(handler)
+    await bus.start()
+    _event_bus = bus
+
+
+async def stop_event_bus() -> None:
+    """Stop this worker's event bus and fall back to the local bus."""
+    global _event_bus
+
+    bus, _event_bus = _event_bus, LocalEventBus()
+    await bus.stop()
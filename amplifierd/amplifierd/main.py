@@ -4,6 +4,7 @@ This module creates and configures the FastAPI application that exposes
 the amplifier_library via REST API with SSE streaming.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -12,6 +13,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from amplifier_library.config.loader import load_config
+from amplifier_library.sessions.store import configure_session_store
+from amplifier_library.sessions.turn import configure_transcript_fsync
 
 from .config.loader import load_config as load_daemon_config
 from .routers import amplified_directories_router
@@ -27,6 +30,10 @@ from .routers import sessions_router
 from .routers import settings_router
 from .routers import status_router
 from .routers import stream_router
+from .services.git_ref_cache import configure_git_ref_cache
+from .streaming import configure_content_coalescing
+from .streaming import configure_replay_ring
+from .streaming import configure_subscriber_queues
 
 # Configure logging
 logging.basicConfig(
@@ -95,18 +102,84 @@ async def lifespan(app: FastAPI):
         logger.error(f"Startup cache handling failed: {e}")
         # Don't fail startup, just log the error
 
+    # Drop stored profile files that no profile links to any more (deleted or rebuilt profiles)
+    try:
+        from .services.blob_store import get_blob_store
+
+        await asyncio.to_thread(get_blob_store().gc)
+    except Exception as e:
+        logger.error(f"Blob store GC failed: {e}")
+
+    # Share stream events with the other workers
+    try:
+        from amplifier_library.storage import get_state_dir
+
+        from .event_bus import LocalEventBus
+        from .event_bus import create_event_bus
+        from .event_bus import start_event_bus
+        from .services.session_sync import handle_bus_event
+        from .services.session_sync import share_session_changes
+
+        bus_backend = daemon_config.daemon.event_bus
+        if bus_backend == "auto":
+            multi_process = daemon_config.daemon.workers > 1 or daemon_config.daemon.execution_workers > 0
+            bus_backend = "unix" if multi_process else "local"
+        bus_socket = daemon_config.daemon.event_bus_socket
+        bus_socket_path = Path(bus_socket) if bus_socket else get_state_dir() / "event_bus.sock"
+
+        bus = create_event_bus(bus_backend, bus_socket_path)
+        if isinstance(bus, LocalEventBus):
+            bus_backend = "local"
+        await start_event_bus(bus, handle_bus_event)
+        if bus_backend != "local":
+            share_session_changes()
+        logger.info(f"Event bus started: {bus_backend}")
+    except Exception as e:
+        bus_backend = "local"
+        logger.error(f"Failed to start event bus, events stay within this worker: {e}")
+        # Don't fail startup, just log the error
+
+    # Run session executions in worker processes (routed by session)
+    if daemon_config.daemon.execution_workers > 0:
+        if bus_backend == "unix":
+            try:
+                from .services.execution_pool import start_execution_pool
+
+                await start_execution_pool(
+                    daemon_config.daemon.execution_workers, get_state_dir() / "exec", bus_socket_path
+                )
+                logger.info(f"Execution pool started with {daemon_config.daemon.execution_workers} workers")
+            except Exception as e:
+                logger.error(f"Failed to start execution pool, executions run in this worker: {e}")
+                # Don't fail startup, just log the error
+        else:
+            logger.error("Execution workers need the unix event bus, executions run in this worker")
+
+    # Evict idle and over-budget warm sessions
+    try:
+        from .services.session_stream_registry import start_session_reaper
+
+        start_session_reaper(
+            daemon_config.daemon.session_reaper_interval_seconds,
+            idle_timeout=daemon_config.daemon.session_idle_timeout_seconds or None,
+            max_warm=daemon_config.daemon.max_warm_sessions or None,
+            max_bytes=daemon_config.daemon.max_warm_session_bytes or None,
+        )
+    except Exception as e:
+        logger.error(f"Failed to start session reaper: {e}")
+
     # Initialize automation scheduler
     scheduler = None
     try:
         from amplifier_library.automations.manager import AutomationManager
-        from amplifier_library.sessions.manager import SessionManager
+        from amplifier_library.sessions.manager import get_session_manager
         from amplifier_library.storage import get_state_dir
 
         from .services.automation_scheduler import AutomationScheduler
 
         state_dir = get_state_dir()
         automation_manager = AutomationManager(storage_dir=state_dir)
-        session_manager = SessionManager(storage_dir=state_dir)
+        session_manager = get_session_manager(state_dir)
 
         # Get timezone from daemon config (already loaded above)
         scheduler_timezone = daemon_config.daemon.timezone if daemon_config else "UTC"
@@ -138,6 +211,30 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to stop automation scheduler: {e}")
 
+    # Stop evicting sessions
+    try:
+        from .services.session_stream_registry import stop_session_reaper
+
+        await stop_session_reaper()
+    except Exception as e:
+        logger.error(f"Failed to stop session reaper: {e}")
+
+    # Stop execution workers spawned by this process (cancels their executions)
+    try:
+        from .services.execution_pool import stop_execution_pool
+
+        await stop_execution_pool()
+    except Exception as e:
+        logger.error(f"Failed to stop execution pool: {e}")
+
+    # Leave the event bus (hands the hub role to another worker if held)
+    try:
+        from .event_bus import stop_event_bus
+
+        await stop_event_bus()
+    except Exception as e:
+        logger.error(f"Failed to stop event bus: {e}")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -158,6 +255,18 @@ app.add_middleware(
 )
 logger.info(f"CORS enabled for origins: {daemon_config.daemon.cors_origins}")
 
+# Select the session persistence backend and fsync policy before any SessionManager is created
+configure_session_store(daemon_config.daemon.session_store)
+configure_transcript_fsync(daemon_config.daemon.transcript_fsync)
+
+# Bound SSE subscriber buffers, session replay rings and content batching (applies to emitters created from here on)
+configure_subscriber_queues(daemon_config.daemon.stream_queue_size, daemon_config.daemon.stream_overflow_policy)
+configure_replay_ring(daemon_config.daemon.stream_replay_size)
+configure_content_coalescing(daemon_config.daemon.stream_coalesce_ms, daemon_config.daemon.stream_coalesce_bytes)
+
+# Share git ref lookups across resolution services for the configured TTL
+configure_git_ref_cache(daemon_config.daemon.git_ref_ttl_seconds)
+
 # Include routers
 app.include_router(amplified_directories_router)
 app.include_router(automations_router)
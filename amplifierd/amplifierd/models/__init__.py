@@ -15,6 +15,7 @@ from .errors import ValidationErrorDetail
 from .modules import ModuleDetails
 from .modules import ModuleInfo
 from .mount_plans import EmbeddedMount
+from .mount_plans import GitRefRefreshResponse
 from .mount_plans import MountPlan
 from .mount_plans import MountPlanRequest
 from .mount_plans import MountPlanSummary
@@ -53,6 +54,7 @@ __all__ = [
     "ReferencedMount",
     "MountPoint",
     "SessionConfig",
+    "GitRefRefreshResponse",
     "MountPlan",
     "MountPlanRequest",
     "MountPlanSummary",
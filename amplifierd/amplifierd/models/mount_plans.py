@@ -345,3 +345,16 @@ class MountPlanSummary(CamelCaseModel):
         default_factory=dict,
         description="Count of each module type (e.g., {'agent': 3, 'provider': 2})",
     )
+
+
+class GitRefRefreshResponse(CamelCaseModel):
+    """Result of refreshing cached git ref lookups.
+
+    Attributes:
+        moved: Refs that now point to a different commit ("{repo_url}@{ref}" → commit)
+    """
+
+    moved: dict[str, str] = Field(
+        default_factory=dict,
+        description="Refs that now point to a different commit, keyed by '{repo_url}@{ref}'",
+    )
@@ -15,6 +15,7 @@ from sse_starlette import ServerSentEvent
 from sse_starlette.sse import EventSourceResponse
 
 from amplifierd.services.global_events import get_global_events
+from amplifierd.streaming import encode_sse_event
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/events", tags=["events"])
@@ -69,11 +70,8 @@ async def global_event_stream() -> EventSourceResponse:
                 try:
                     # Wait for events with timeout (allows keepalive + cancellation)
                     event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    # Use ServerSentEvent with JSON-serialized data
-                    yield ServerSentEvent(
-                        data=json.dumps(event["data"]),
-                        event=event["event"],
-                    )
+                    # Encoded once per event and shared by every subscriber
+                    yield encode_sse_event(event)
 
                 except TimeoutError:
                     # Send keepalive to prevent connection timeout
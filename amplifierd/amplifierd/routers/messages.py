@@ -3,7 +3,6 @@
 Handles message operations: send message, get transcript, send message for execution.
 """
 
-import asyncio
 import logging
 from typing import Annotated
 
@@ -14,16 +13,24 @@ from pydantic import BaseModel
 
 from amplifier_library.execution.runner import ExecutionRunner
 from amplifier_library.sessions.manager import SessionManager as SessionStateService
-from amplifier_library.storage import get_state_dir
+from amplifier_library.sessions.manager import get_session_manager
 
 from ..models import MessageResponse
 from ..models import SendMessageRequest
 from ..models import TranscriptResponse
+from ..services.execution_pool import get_execution_pool
+from ..services.session_execution import approval_responses
+from ..services.session_execution import cancel_session_execution
+from ..services.session_execution import evict_session_runner
+from ..services.session_execution import has_active_execution
+from ..services.session_execution import pending_approvals
+from ..services.session_execution import resolve_approval
+from ..services.session_execution import start_session_execution
 
 logger = logging.getLogger(__name__)
 
-# Keep ExecutionRunner in scope for test mocking
-__test_exports__ = [ExecutionRunner]
+# Keep ExecutionRunner in scope for test mocking; approval state re-exported for existing importers
+__test_exports__ = [ExecutionRunner, approval_responses, pending_approvals]
 
 router = APIRouter(prefix="/api/v1/sessions/{session_id}", tags=["messages"])
 
@@ -34,8 +41,7 @@ def get_session_state_service() -> SessionStateService:
     Returns:
         SessionStateService instance configured with state directory
     """
-    state_dir = get_state_dir()
-    return SessionStateService(storage_dir=state_dir)
+    return get_session_manager()
 
 
 @router.post("/messages", response_model=MessageResponse, status_code=201)
@@ -117,181 +123,19 @@ async def send_message_for_execution(
     """
     try:
         # Check session exists
-        metadata = service.get_session(session_id)
-        if metadata is None:
+        if service.get_session(session_id) is None:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
-        # Convert to library SessionMetadata
-        import json
-        from datetime import UTC
-        from datetime import datetime
-
-        from amplifier_library.models.sessions import SessionMetadata as LibrarySessionMetadata
-        from amplifier_library.storage import get_state_dir
-
-        from ..services.session_stream_registry import get_stream_registry
-
-        session = LibrarySessionMetadata(**metadata.model_dump())
-
-        # Get config and paths
-        from pathlib import Path
-
-        from amplifier_library.config.loader import load_config
-        from amplifier_library.storage.paths import get_profiles_dir
-        from amplifier_library.storage.paths import get_share_dir
-
-        from ..services.mention_resolver import MentionResolver
-        from ..services.mount_plan_service import MountPlanService
-        from .sessions import _inject_runtime_config
-
-        config = load_config()
-        data_dir = Path(config.data_path)
-        state_dir = get_state_dir()
-        share_dir = get_share_dir()
-
-        # Get amplified_dir and profile_name from session metadata
-        amplified_dir = Path(metadata.amplified_dir) if metadata.amplified_dir else Path(".")
-        if not amplified_dir.is_absolute():
-            amplified_dir = data_dir / amplified_dir
-        profile_name = metadata.profile_name
-
-        # Generate mount plan fresh from profile (single source of truth)
-        mount_plan_service = MountPlanService(share_dir=share_dir)
-        mount_plan = mount_plan_service.generate_mount_plan(profile_name, amplified_dir)
-
-        # Inject runtime configuration (working_dir, session_log_template, etc.)
-        _inject_runtime_config(mount_plan, session_id, str(amplified_dir))
-
-        # Save mount_plan.json for observability (snapshot of what was used)
-        mount_plan_path = state_dir / "sessions" / session_id / "mount_plan.json"
-        mount_plan_path.write_text(json.dumps(mount_plan, indent=2))
-        logger.info(f"Generated and saved fresh mount plan for session {session_id}")
-
-        # Get compiled profile directory for mention resolution
-        compiled_profile_dir = get_profiles_dir() / profile_name
-
-        # Resolve runtime mentions (AGENTS.md + user message)
-        resolver = MentionResolver(
-            compiled_profile_dir=compiled_profile_dir,
-            amplified_dir=amplified_dir,
-            data_dir=data_dir,
-        )
-        runtime_context_messages = resolver.resolve_runtime_mentions(request.content)
-        logger.info(f"Resolved {len(runtime_context_messages)} runtime context messages")
-
-        # Get stream registry and update/create manager with fresh mount plan
-        registry = get_stream_registry()
-        existing_manager = registry.get(session_id)
-        if existing_manager:
-            # Update existing manager with fresh mount plan (invalidates runner)
-            await existing_manager.update_mount_plan(mount_plan)
-            manager = existing_manager
-            logger.debug(f"Updated existing manager with fresh mount plan for session {session_id}")
-        else:
-            # Create new manager
-            manager = await registry.get_or_create(session_id, mount_plan)
-
-        # Note: Don't save user message here - ExecutionRunner.execute_stream() does it
-        # to avoid duplicates in transcript
-
-        # Emit user_message_saved to ALL subscribers
-        await manager.emitter.emit(
-            "user_message_saved",
-            {"role": "user", "content": request.content, "timestamp": datetime.now(UTC).isoformat()},
-        )
-
-        # Get runner (handles hook mounting internally via _hooks_mounted flag)
-        runner = await manager.get_runner(session)
-
-        # Emit assistant_message_start to SSE subscribers
-        await manager.emitter.emit(
-            "assistant_message_start",
-            {"timestamp": datetime.now(UTC).isoformat()},
-        )
-
-        # Also emit through hooks system for ExecutionTraceHook
-        if manager.hook_registry:
-            await manager.hook_registry.emit(
-                "assistant_message:start",
-                {"user_message": request.content, "timestamp": datetime.now(UTC).isoformat()},
-            )
-
-        # Execute in background task - don't block response
-        async def execute_and_emit():
-            try:
-                full_response = ""
-                async for token in runner.execute_stream(session, request.content, runtime_context_messages):
-                    full_response += token
-                    # Emit each token to ALL subscribers
-                    await manager.emitter.emit("content", {"type": "content", "content": token})
-
-                # Note: Don't save assistant message here - ExecutionRunner.execute_stream() does it
-                # to avoid duplicates in transcript
-
-                # Emit completion to ALL subscribers
-                if full_response:
-                    await manager.emitter.emit(
-                        "assistant_message_complete",
-                        {
-                            "role": "assistant",
-                            "content": full_response,
-                            "timestamp": datetime.now(UTC).isoformat(),
-                        },
-                    )
-
-                    # Also emit through hooks system for ExecutionTraceHook
-                    if manager.hook_registry:
-                        await manager.hook_registry.emit(
-                            "assistant_message:complete",
-                            {"content": full_response, "timestamp": datetime.now(UTC).isoformat()},
-                        )
-
-                    # Mark session as unread so user sees badge when viewing another session
-                    # Only mark unread if:
-                    # 1. No one is currently viewing (no active SSE subscribers)
-                    # 2. Session was previously read (avoid unnecessary writes)
-                    has_active_viewers = len(manager.emitter.queues) > 0
-                    if not has_active_viewers:
-                        current_session = service.get_session(session_id)
-                        if current_session and not current_session.is_unread:
-                            service.update_session_fields(session_id, is_unread=True)
-                            # Import here to avoid circular imports at module level
-                            from ..models.events import SessionUpdatedEvent
-                            from ..services.global_events import GlobalEventService
-
-                            await GlobalEventService.emit(
-                                SessionUpdatedEvent(
-                                    project_id=current_session.amplified_dir,
-                                    session_id=session_id,
-                                    fields_changed=["is_unread"],
-                                )
-                            )
-                            logger.debug(f"Marked session {session_id} as unread after assistant response")
-                    else:
-                        logger.debug(f"Session {session_id} has active viewers, not marking as unread")
-            except asyncio.CancelledError:
-                logger.info(f"Execution cancelled for session {session_id}")
-                await manager.emitter.emit(
-                    "execution_cancelled",
-                    {"timestamp": datetime.now(UTC).isoformat()},
-                )
-                raise  # Re-raise to properly terminate the task
-            except Exception as e:
-                logger.error(f"Execution error in background task: {e}")
-                await manager.emitter.emit("execution_error", {"error": str(e)})
-            finally:
-                manager.clear_execution_task()
-
-            # Start execution in background and track the task
-
-        task = asyncio.create_task(execute_and_emit())
-        manager.set_execution_task(task)
-
-        # Return immediately
-        return {"status": "executing", "session_id": session_id}
+        # Run in the session's execution worker, or in this process without a pool
+        pool = get_execution_pool()
+        if pool is not None:
+            return await pool.send_message(session_id, request.content)
+        return await start_session_execution(session_id, request.content, service)
 
     except HTTPException:
         raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found") from e
     except Exception as e:
         logger.error(f"Failed to send message to session {session_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error") from e
@@ -322,15 +166,8 @@ async def cancel_execution(
         if service.get_session(session_id) is None:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
-        from ..services.session_stream_registry import get_stream_registry
-
-        registry = get_stream_registry()
-        manager = registry.get(session_id)
-
-        if manager is None:
-            return {"status": "no_active_execution", "session_id": session_id}
-
-        cancelled = manager.cancel_execution()
+        pool = get_execution_pool()
+        cancelled = await pool.cancel(session_id) if pool is not None else cancel_session_execution(session_id)
 
         if cancelled:
             return {"status": "cancelled", "session_id": session_id}
@@ -370,11 +207,10 @@ async def delete_last_message(
 
         from ..services.session_stream_registry import get_stream_registry
 
-        registry = get_stream_registry()
-        manager = registry.get(session_id)
-
         # Check no active execution
-        if manager and manager.has_active_execution():
+        pool = get_execution_pool()
+        active = await pool.has_active_execution(session_id) if pool is not None else has_active_execution(session_id)
+        if active:
             raise HTTPException(
                 status_code=409,
                 detail="Cannot delete message while execution is active",
@@ -382,6 +218,14 @@ async def delete_last_message(
 
         deleted = service.delete_last_message(session_id)
 
+        if deleted:
+            # The warm runner's context still holds the deleted message; rebuild it from the transcript
+            if pool is not None:
+                await pool.evict_runner(session_id)
+            else:
+                await evict_session_runner(session_id)
+
+        manager = get_stream_registry().get(session_id)
         if deleted and manager:
             # Emit SSE event for cross-client sync
             await manager.emitter.emit(
@@ -418,15 +262,21 @@ async def delete_last_message(
 async def get_messages(
     session_id: str,
     service: Annotated[SessionStateService, Depends(get_session_state_service)],
+    limit: int | None = None,
+    before: int | None = None,
+    after: int | None = None,
 ) -> TranscriptResponse:
     """Get session transcript.
 
     Args:
         session_id: Session ID
         service: SessionStateService dependency
+        limit: Optional maximum number of messages (last N, or first N after ``after``)
+        before: Only messages positioned before this one (0-based)
+        after: Only messages positioned after this one (0-based)
 
     Returns:
-        Session transcript with all messages
+        Session transcript with all (or the requested) messages
 
     Raises:
         HTTPException: 404 if session not found
@@ -437,7 +287,7 @@ async def get_messages(
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
         # Get transcript
-        messages = service.get_transcript(session_id)
+        messages = service.get_transcript(session_id, limit=limit, before=before, after=after)
 
         return TranscriptResponse(
             session_id=session_id,
@@ -458,11 +308,6 @@ async def get_messages(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-# Approval management (in-memory for simplicity)
-pending_approvals: dict[str, asyncio.Event] = {}
-approval_responses: dict[str, str] = {}
-
-
 class ApprovalResponse(BaseModel):
     """User's response to approval prompt."""
 
@@ -487,13 +332,13 @@ async def submit_approval_response(
     Raises:
         HTTPException: If approval not found or expired
     """
-    if response.approval_id not in pending_approvals:
+    # Executions (and the approvals they wait on) live in the execution workers when pooled
+    pool = get_execution_pool()
+    if pool is not None:
+        resolved = await pool.resolve_approval(response.approval_id, response.response)
+    else:
+        resolved = resolve_approval(response.approval_id, response.response)
+    if not resolved:
         raise HTTPException(status_code=404, detail="Approval not found or expired")
 
-    # Store response
-    approval_responses[response.approval_id] = response.response
-
-    # Signal waiting execution
-    pending_approvals[response.approval_id].set()
-
     return {"status": "received", "approval_id": response.approval_id}
@@ -1,5 +1,6 @@
 """Mount plan generation API endpoints."""
 
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter
@@ -8,8 +9,10 @@ from fastapi import HTTPException
 
 from amplifier_library.storage import get_share_dir
 
+from ..models.mount_plans import GitRefRefreshResponse
 from ..models.mount_plans import MountPlan
 from ..models.mount_plans import MountPlanRequest
+from ..services.git_ref_cache import get_git_ref_cache
 from ..services.mount_plan_service import MountPlanService
 
 router = APIRouter(prefix="/api/v1/mount-plans", tags=["mount-plans"])
@@ -73,3 +76,21 @@ async def generate_mount_plan(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to generate mount plan: {str(exc)}") from exc
+
+
+@router.post("/refresh-refs", response_model=GitRefRefreshResponse)
+async def refresh_git_refs(repo_url: str | None = None) -> GitRefRefreshResponse:
+    """Look up cached git refs on their remotes now.
+
+    Git branches are resolved to commits from a cache that is only checked
+    against the remote once its TTL expires. This forces the check, so the
+    next mount plan picks up branches that moved.
+
+    Args:
+        repo_url: Only refresh refs of this repository (default: all)
+
+    Returns:
+        Refs that now point to a different commit
+    """
+    moved = await asyncio.to_thread(get_git_ref_cache().refresh, repo_url)
+    return GitRefRefreshResponse(moved=moved)
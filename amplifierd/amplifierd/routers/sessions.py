@@ -25,6 +25,7 @@ from amplifier_library.models.sessions import SessionMessage
 from amplifier_library.models.sessions import SessionMetadata
 from amplifier_library.models.sessions import SessionStatus
 from amplifier_library.sessions.manager import SessionManager as SessionStateService
+from amplifier_library.sessions.manager import get_session_manager
 from amplifier_library.storage import get_state_dir
 
 from ..models.context_messages import ContextMessage
@@ -117,10 +118,9 @@ def get_session_state_service() -> SessionStateService:
     """Get session state service instance.
 
     Returns:
-        SessionStateService instance configured with state directory
+        Process-wide SessionStateService for the state directory
     """
-    state_dir = get_state_dir()
-    return SessionStateService(storage_dir=state_dir)
+    return get_session_manager()
 
 
 # --- Request/Response Models ---
@@ -422,12 +422,9 @@ def _clone_single_session(
     new_session_dir = state_dir / "sessions" / new_session_id
     new_session_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy transcript if it exists
-    source_transcript = source_session_dir / "transcript.jsonl"
-    if source_transcript.exists():
-        new_transcript = new_session_dir / "transcript.jsonl"
-        new_transcript.write_text(source_transcript.read_text())
-        logger.debug(f"Copied transcript from {source_session.session_id} to {new_session_id}")
+    # Copy transcript
+    session_service.copy_transcript(source_session.session_id, new_session_id)
+    logger.debug(f"Copied transcript from {source_session.session_id} to {new_session_id}")
 
     # Copy events log if it exists
     source_events = source_session_dir / "events.jsonl"
@@ -458,62 +455,80 @@ def _clone_single_session(
     return updated
 
 
-async def _clone_session_recursive(
+async def _clone_session_tree(
     source_session_id: str,
     new_parent_session_id: str | None,
     session_service: SessionStateService,
     add_copy_suffix: bool = True,
-) -> SessionMetadata:
-    """Recursively clone a session and all its subsessions.
+) -> tuple[SessionMetadata, int]:
+    """Clone a session and all its subsessions.
+
+    The whole subtree is fetched once from the session index; parents are
+    always cloned before their children so each clone can point at its
+    cloned parent.
 
     Args:
         source_session_id: Source session ID to clone
         new_parent_session_id: Parent session ID for the clone (None for root)
         session_service: Session state service
-        add_copy_suffix: Whether to add " (copy)" to the name
+        add_copy_suffix: Whether to add " (copy)" to the root's name
 
     Returns:
-        Cloned root session metadata
+        Tuple of (cloned root session metadata, number of subsessions cloned)
     """
     from ..models.events import SessionCreatedEvent
 
-    # Get source session
-    source_session = session_service.get_session(source_session_id)
-    if not source_session:
+    tree = session_service.get_session_tree(source_session_id)
+    if not tree:
         raise ValueError(f"Session {source_session_id} not found")
 
-    # Clone this session
-    cloned_session = _clone_single_session(
-        source_session=source_session,
-        new_parent_session_id=new_parent_session_id,
-        session_service=session_service,
-        add_copy_suffix=add_copy_suffix,
-    )
-
-    # Emit session:created event
-    await GlobalEventService.emit(
-        SessionCreatedEvent(
-            session_id=cloned_session.session_id,
-            session_name=cloned_session.name,
-            project_id=cloned_session.amplified_dir,
-            is_unread=cloned_session.is_unread,
-            created_by="user",
+    # Map source session IDs to their clones' IDs
+    cloned_ids: dict[str, str] = {}
+    cloned_root: SessionMetadata | None = None
+
+    for entry in tree:
+        is_root = entry.session_id == source_session_id
+        if is_root:
+            parent_id = new_parent_session_id
+        elif entry.parent_session_id in cloned_ids:
+            parent_id = cloned_ids[entry.parent_session_id]
+        else:
+            # Parent was skipped, so skip its descendants too
+            continue
+
+        source_session = session_service.get_session(entry.session_id)
+        if not source_session:
+            if is_root:
+                raise ValueError(f"Session {source_session_id} not found")
+            logger.warning(f"Skipping missing subsession {entry.session_id} while cloning {source_session_id}")
+            continue
+
+        cloned_session = _clone_single_session(
+            source_session=source_session,
+            new_parent_session_id=parent_id,
+            session_service=session_service,
+            add_copy_suffix=add_copy_suffix and is_root,  # Don't add (copy) to subsession names
         )
-    )
+        cloned_ids[entry.session_id] = cloned_session.session_id
+        if is_root:
+            cloned_root = cloned_session
 
-    logger.info(f"Cloned session {source_session_id} to {cloned_session.session_id}")
-
-    # Find and clone all subsessions
-    subsessions = session_service.list_sessions(parent_session_id=source_session_id)
-    for subsession in subsessions:
-        await _clone_session_recursive(
-            source_session_id=subsession.session_id,
-            new_parent_session_id=cloned_session.session_id,
-            session_service=session_service,
-            add_copy_suffix=False,  # Don't add (copy) to subsession names
+        # Emit session:created event
+        await GlobalEventService.emit(
+            SessionCreatedEvent(
+                session_id=cloned_session.session_id,
+                session_name=cloned_session.name,
+                project_id=cloned_session.amplified_dir,
+                is_unread=cloned_session.is_unread,
+                created_by="user",
+            )
         )
 
-    return cloned_session
+        logger.info(f"Cloned session {entry.session_id} to {cloned_session.session_id}")
+
+    if cloned_root is None:
+        raise ValueError(f"Failed to clone session {source_session_id}")
+    return cloned_root, len(cloned_ids) - 1
 
 
 @router.post("/{session_id}/clone", response_model=SessionMetadata, status_code=201)
@@ -553,16 +568,14 @@ async def clone_session(
         if not source_session:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
-        # Recursively clone session and all subsessions
-        cloned_session = await _clone_session_recursive(
+        # Clone session and all subsessions
+        cloned_session, subsession_count = await _clone_session_tree(
             source_session_id=session_id,
             new_parent_session_id=None,  # Clone is standalone (no parent)
             session_service=session_service,
             add_copy_suffix=True,
         )
 
-        # Count subsessions cloned
-        subsession_count = len(session_service.list_sessions(parent_session_id=session_id))
         if subsession_count > 0:
             logger.info(f"Cloned {subsession_count} subsessions for {session_id}")
 
@@ -771,18 +784,7 @@ async def get_unread_counts(
             - 500 for errors
     """
     try:
-        counts: dict[str, int] = {}
-
-        # Get all sessions
-        all_sessions = manager.list_sessions()
-
-        # Count unread sessions by project
-        for session in all_sessions:
-            if session.is_unread:
-                project_id = session.amplified_dir
-                counts[project_id] = counts.get(project_id, 0) + 1
-
-        return counts
+        return manager.get_unread_counts()
 
     except Exception as exc:
         logger.error(f"Failed to get unread counts: {exc}")
@@ -947,15 +949,22 @@ async def get_transcript(
     session_id: str,
     service: Annotated[SessionStateService, Depends(get_session_state_service)],
     limit: int | None = None,
+    before: int | None = None,
+    after: int | None = None,
+    reverse: bool = False,
 ) -> list[SessionMessage]:
     """Get session transcript.
 
     Retrieves conversation history for session. Optionally limited to
-    last N messages.
+    last N messages, or a page of messages around a cursor. Cursors are
+    0-based message positions; only the requested messages are read.
 
     Args:
         session_id: Session identifier
-        limit: Optional maximum number of messages (most recent first)
+        limit: Optional maximum number of messages (last N, or first N after ``after``)
+        before: Only messages positioned before this one
+        after: Only messages positioned after this one
+        reverse: Return newest first
         service: Session state service dependency
 
     Returns:
@@ -969,6 +978,7 @@ async def get_transcript(
     Example:
         ```
         GET /api/v1/sessions/{session_id}/transcript?limit=10
+        GET /api/v1/sessions/{session_id}/transcript?limit=10&before=40
         ```
     """
     try:
@@ -976,7 +986,7 @@ async def get_transcript(
         if service.get_session(session_id) is None:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
-        return service.get_transcript(session_id, limit=limit)
+        return service.get_transcript(session_id, limit=limit, before=before, after=after, reverse=reverse)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1303,29 +1313,6 @@ class SessionEventsResponse(BaseModel):
     model_config = {"populate_by_name": True}
 
 
-def _read_events_from_file(events_file: Path, session_id: str) -> list[dict[str, Any]]:
-    """Read events from a JSONL file and ensure session_id is present."""
-    events: list[dict[str, Any]] = []
-    if not events_file.exists():
-        return events
-
-    with open(events_file, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                # Ensure session_id is present for filtering
-                if "session_id" not in event:
-                    event["session_id"] = session_id
-                events.append(event)
-            except json.JSONDecodeError:
-                # Skip malformed lines
-                continue
-    return events
-
-
 @router.get("/{session_id}/events")
 async def get_session_events(
     session_id: str,
@@ -1347,7 +1334,7 @@ async def get_session_events(
         offset: Number of events to skip (default 0)
         level: Filter by log level (INFO, DEBUG, WARNING, ERROR)
         event_type: Filter by event type prefix (e.g., "tool:", "llm:")
-        include_children: If true, include events from child/subsessions
+        include_children: If true, include events from all child/subsessions (recursively)
 
     Returns:
         SessionEventsResponse with events array, total count, and hasMore flag
@@ -1369,32 +1356,15 @@ async def get_session_events(
         session_ids_to_load = [session_id]
 
         if include_children:
-            # Find child sessions
-            child_sessions = service.list_sessions(parent_session_id=session_id)
-            session_ids_to_load.extend(child.session_id for child in child_sessions)
-
-        # Read and aggregate events from all sessions
-        all_events: list[dict[str, Any]] = []
-        for sid in session_ids_to_load:
-            events_file = sessions_dir / sid / "events.jsonl"
-            all_events.extend(_read_events_from_file(events_file, sid))
-
-        # Sort by timestamp if we aggregated multiple sessions
-        if include_children and len(session_ids_to_load) > 1:
-            all_events.sort(key=lambda e: e.get("ts", ""))
-
-        # Apply filters
-        filtered_events = all_events
-        if level:
-            level_upper = level.upper()
-            filtered_events = [e for e in filtered_events if e.get("lvl", "").upper() == level_upper]
-        if event_type:
-            # Support prefix matching (e.g., "tool:" matches "tool:pre", "tool:post")
-            filtered_events = [e for e in filtered_events if e.get("event", "").startswith(event_type)]
-
-        # Pagination
-        total = len(filtered_events)
-        paginated = filtered_events[offset : offset + limit]
+            # All subsessions (recursively) from the index tree; root is first
+            session_ids_to_load = [entry.session_id for entry in service.get_session_tree(session_id)] or [session_id]
+
+        # Page through the sidecar indexes; only the returned events are read from disk.
+        # Several sessions are merged by timestamp.
+        from ..services.event_index import query_events
+
+        sources = [(sid, sessions_dir / sid / "events.jsonl") for sid in session_ids_to_load]
+        paginated, total = query_events(sources, limit=limit, offset=offset, level=level, event_type=event_type)
         has_more = offset + limit < total
 
         return SessionEventsResponse(events=paginated, total=total, hasMore=has_more)
@@ -9,19 +9,39 @@ import logging
 from datetime import UTC
 from datetime import datetime
 from typing import Annotated
+from typing import Any
 
-from amplifier_library.sessions.manager import SessionManager as SessionStateService
-from amplifier_library.storage import get_state_dir
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import Header
 from fastapi import HTTPException
 from sse_starlette.event import ServerSentEvent
 from sse_starlette.sse import EventSourceResponse
 
+from amplifier_library.sessions.manager import SessionManager as SessionStateService
+from amplifier_library.sessions.manager import get_session_manager
+from amplifier_library.storage import get_state_dir
+
 from ..services.session_stream_registry import get_stream_registry
+from ..streaming import encode_sse_event
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_last_event_id(last_event_id: str | None) -> tuple[str, int] | None:
+    """Split a Last-Event-ID of the form "{stream_id}-{seq}".
+
+    Returns:
+        (stream_id, seq), or None if absent or malformed
+    """
+    if not last_event_id:
+        return None
+    stream_id, _, seq = last_event_id.rpartition("-")
+    if not stream_id or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
 router = APIRouter(prefix="/api/v1/sessions", tags=["sessions"])
 
 
@@ -31,14 +51,14 @@ def get_session_state_service() -> SessionStateService:
     Returns:
         SessionStateService instance configured with state directory
     """
-    state_dir = get_state_dir()
-    return SessionStateService(storage_dir=state_dir)
+    return get_session_manager()
 
 
 @router.get("/{session_id}/stream")
 async def stream_session_events(
     session_id: str,
     service: Annotated[SessionStateService, Depends(get_session_state_service)],
+    last_event_id: Annotated[str | None, Header()] = None,
 ) -> EventSourceResponse:
     """Persistent SSE stream for session events.
 
@@ -52,11 +72,14 @@ async def stream_session_events(
     Connection lifecycle:
     - Connect: Creates/reuses SessionStreamManager
     - Disconnect: Keeps manager alive for reconnection
+    - Reconnect: Events carry ids ("{stream_id}-{seq}"); a Last-Event-ID header
+      replays only the events emitted since, from the session's replay ring
     - Session end: Manager cleaned up by lifecycle endpoints
 
     Args:
         session_id: Session identifier
         service: Session state service dependency
+        last_event_id: Last-Event-ID header sent by a reconnecting EventSource
 
     Returns:
         SSE EventSourceResponse streaming session events
@@ -69,6 +92,7 @@ async def stream_session_events(
     Events:
         - connected: Initial connection established
         - keepalive: Periodic heartbeat (every 30s)
+        - resync: Missed events could not be replayed; client should reload state
         - hook:*: Hook events from execution
         - error: Stream error occurred
     """
@@ -92,8 +116,15 @@ async def stream_session_events(
         registry = get_stream_registry()
         manager = await registry.get_or_create(session_id, mount_plan)
 
-        # Subscribe to event stream
-        queue = manager.subscribe()
+        # Subscribe to event stream, replaying what a reconnecting client missed
+        resume = _parse_last_event_id(last_event_id)
+        if resume is not None and resume[0] == manager.emitter.stream_id:
+            queue = manager.subscribe(after_id=resume[1])
+        else:
+            queue = manager.subscribe()
+            # Ids from another stream (daemon restart, manager recreated) or malformed can't be resumed
+            queue.replay_complete = last_event_id is None
+        stream_id = manager.emitter.stream_id
 
         try:
             # Send initial connection event using ServerSentEvent for proper JSON serialization
@@ -109,16 +140,20 @@ async def stream_session_events(
 
             logger.info(f"SSE stream connected for session {session_id}")
 
+            if not queue.replay_complete:
+                yield ServerSentEvent(
+                    data=json.dumps({"session_id": session_id, "last_event_id": last_event_id}),
+                    event="resync",
+                )
+                logger.info(f"SSE stream for {session_id} could not resume from {last_event_id}, requested resync")
+
             # Stream events indefinitely (until disconnect)
             while True:
                 try:
                     # Wait for events with timeout (allows keepalive + cancellation)
                     event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    # Use ServerSentEvent with JSON-serialized data
-                    yield ServerSentEvent(
-                        data=json.dumps(event["data"]),
-                        event=event["event"],
-                    )
+                    # Encoded once per event and shared by every subscriber
+                    yield encode_sse_event(event, stream_id)
 
                 except TimeoutError:
                     # Send keepalive to prevent connection timeout
@@ -150,3 +185,19 @@ async def stream_session_events(
             logger.info(f"Unsubscribed from events for session {session_id}")
 
     return EventSourceResponse(event_generator())
+
+
+@router.get("/{session_id}/stream/stats")
+async def get_stream_stats(session_id: str) -> dict[str, Any]:
+    """Get SSE subscriber buffer metrics for a session.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        Per-subscriber lag (buffered, unconsumed events), delivered/dropped/coalesced
+        counts and overflow settings. Empty subscriber list if nothing is streaming.
+    """
+    manager = get_stream_registry().get(session_id)
+    subscribers = manager.emitter.stats() if manager else []
+    return {"session_id": session_id, "subscribers": subscribers}
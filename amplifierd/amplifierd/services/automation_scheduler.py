@@ -24,6 +24,7 @@ from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from amplifier_library.automations.manager import AutomationManager
+from amplifier_library.execution.response import ResponseBuffer
 from amplifier_library.models.automations import Automation
 from amplifier_library.sessions.manager import SessionManager
 
@@ -479,11 +480,13 @@ class AutomationScheduler:
 
             # Execute the message (this saves messages to transcript)
             logger.info(f"Executing automation message for {automation_id} in session {session_id}")
-            full_response = ""
-            async for token in runner.execute_stream(session, automation.message, runtime_context_messages):
-                full_response += token
+            response = ResponseBuffer()
+            async for _ in runner.execute_stream(
+                session, automation.message, runtime_context_messages, response=response
+            ):
+                pass
 
-            logger.info(f"Automation {automation_id} execution complete - response length: {len(full_response)}")
+            logger.info(f"Automation {automation_id} execution complete - response length: {len(response)}")
 
             # Record successful execution
             self.automation_manager.record_execution(
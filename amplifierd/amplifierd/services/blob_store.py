@@ -0,0 +1,192 @@
+"""Content-addressed file store for profile trees.
+
+Compiled profiles contain their own copy of every module, agent and
+context they use (session/ and behaviors/*/ trees). Profiles sharing the
+same modules would hold identical copies; instead each distinct file is
+stored once under cache/blobs/ and profile trees are assembled from links
+to it.
+
+Contract:
+- Inputs: Source files and directories (git/fsspec caches, registry sources)
+- Outputs: Destination trees whose files are links to (or clones of) blobs
+- Side Effects: Writes cache/blobs/, creates destination trees
+
+Files are placed with, in order of preference:
+- a hardlink to the blob (same filesystem);
+- a reflink (copy-on-write clone) where the filesystem supports it;
+- a plain copy.
+
+Blobs are read-only, so a hardlinked file can't be edited in place and
+change every profile that shares it. A blob is referenced exactly when it
+has links besides its own (reflinks and copies are independent files), so
+gc() needs no reference index: it removes blobs whose link count is 1.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import time
+import uuid
+from pathlib import Path
+
+from amplifier_library.storage.paths import get_blob_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# ioctl that clones a file's extents (Linux: btrfs, xfs, ...)
+FICLONE = 0x40049409
+# Unlinked blobs younger than this are kept, so gc() can't race a tree being assembled
+DEFAULT_GC_MIN_AGE_SECONDS = 300
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Store of file contents keyed by SHA-256, linked into destination trees."""
+
+    def __init__(self, root: Path):
+        """Initialize store.
+
+        Args:
+            root: Store directory (blobs live in two-character fan-out subdirectories)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def add(self, path: Path) -> Path:
+        """Store a file's contents, if not already stored.
+
+        Args:
+            path: Regular file to store
+
+        Returns:
+            Path to the blob
+        """
+        executable = bool(path.stat().st_mode & stat.S_IXUSR)
+        digest = hashlib.sha256(b"x" if executable else b"-")
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        key = digest.hexdigest()
+
+        blob_path = self.root / key[:2] / key[2:]
+        if blob_path.exists():
+            return blob_path
+
+        blob_path.parent.mkdir(exist_ok=True)
+        tmp_path = blob_path.with_name(f".{blob_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            shutil.copyfile(path, tmp_path)
+            tmp_path.chmod(0o555 if executable else 0o444)
+            os.replace(tmp_path, blob_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return blob_path
+
+    def place_file(self, source: Path, dest: Path) -> None:
+        """Put a file's contents at dest by linking it to its blob.
+
+        Args:
+            source: Regular file
+            dest: Path to create (must not exist)
+        """
+        for _ in range(2):
+            blob_path = self.add(source)
+            try:
+                os.link(blob_path, dest)
+                return
+            except FileNotFoundError:
+                # Collected by gc() between add() and link(): store it again
+                continue
+            except OSError:
+                # Other filesystem, link limit reached, or links not permitted
+                break
+
+        if not _reflink(blob_path, dest):
+            shutil.copyfile(source, dest)
+        dest.chmod(0o555 if source.stat().st_mode & stat.S_IXUSR else 0o444)
+
+    def place_tree(self, source: Path, dest: Path) -> int:
+        """Recreate a directory tree at dest with its files linked to blobs.
+
+        Symlinks are recreated as symlinks; empty directories are kept.
+
+        Args:
+            source: Directory to replicate
+            dest: Directory to create (must not exist)
+
+        Returns:
+            Number of files placed
+        """
+        placed = 0
+        dest.mkdir(parents=True)
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel = Path(dirpath).relative_to(source)
+            target_dir = dest / rel
+            for name in dirnames:
+                entry = Path(dirpath) / name
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry), target_dir / name)
+                else:
+                    (target_dir / name).mkdir()
+            for name in filenames:
+                entry = Path(dirpath) / name
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry), target_dir / name)
+                else:
+                    self.place_file(entry, target_dir / name)
+                    placed += 1
+        return placed
+
+    def gc(self, min_age_seconds: float = DEFAULT_GC_MIN_AGE_SECONDS) -> tuple[int, int]:
+        """Remove blobs that no tree links to any more.
+
+        Args:
+            min_age_seconds: Keep unlinked blobs changed more recently than this
+
+        Returns:
+            (blobs removed, bytes freed)
+        """
+        removed = 0
+        freed = 0
+        cutoff = time.time() - min_age_seconds
+        for fanout in self.root.iterdir():
+            if not fanout.is_dir():
+                continue
+            for blob_path in fanout.iterdir():
+                try:
+                    blob_stat = blob_path.lstat()
+                    if blob_stat.st_nlink > 1 or blob_stat.st_ctime > cutoff:
+                        continue
+                    blob_path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += blob_stat.st_size
+
+        logger.info(f"Blob store GC removed {removed} blobs ({freed} bytes)")
+        return removed, freed
+
+
+def _reflink(source: Path, dest: Path) -> bool:
+    """Clone a file copy-on-write; False where unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def get_blob_store() -> BlobStore:
+    """Get the blob store in the current cache directory (cache/blobs)."""
+    return BlobStore(get_blob_cache_dir())
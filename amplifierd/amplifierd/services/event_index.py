@@ -0,0 +1,330 @@
+"""Sidecar index over session events.jsonl files.
+
+Lets the events endpoint page and filter raw events without reading the
+whole log: the index holds each event's byte offset, length, timestamp,
+type and level, so only the events being returned are read and parsed.
+
+Contract:
+- Inputs: events.jsonl paths (written by hooks-logging in amplifier_core)
+- Outputs: Filtered, paginated events; event counts
+- Side Effects: Writes events.jsonl.idx next to each indexed file
+
+The index is extended incrementally: each lookup indexes only lines
+appended since the previous one (a trailing partial line is left until
+it is complete) and appends their records to the sidecar, so a daemon
+restart resumes from the sidecar instead of rescanning the log.
+events.jsonl is append-only; if it shrinks, the index is rebuilt.
+
+Sidecar format (text, one record per consumed line):
+    # events-index v1 {inode of events.jsonl}
+    {offset}\t{length}\t{valid}\t{ts_us}\t{lvl}\t{event}
+Blank and malformed lines get valid=0 records so the consumed offset is
+always the end of the last record.
+"""
+
+import heapq
+import json
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = "v1"
+# Most events files whose index is kept in memory; the rest reload from their sidecar
+MAX_CACHED_INDEXES = 64
+
+
+def _parse_ts(ts: Any) -> int:
+    """Parse an ISO timestamp to microseconds since epoch (0 if missing or invalid)."""
+    if not isinstance(ts, str) or not ts:
+        return 0
+    try:
+        return int(datetime.fromisoformat(ts).timestamp() * 1_000_000)
+    except ValueError:
+        return 0
+
+
+def _field(value: Any) -> str:
+    """Make a value safe for a tab-separated sidecar field."""
+    text = value if isinstance(value, str) else ""
+    return text.replace("\t", " ").replace("\n", " ")
+
+
+class EventIndex:
+    """In-memory index of one events.jsonl file, backed by its sidecar.
+
+    Event types and levels are stored as small integer codes into
+    per-index name tables, so an index costs a few dozen bytes per event.
+    Not thread-safe on its own; query_events serializes access.
+    """
+
+    def __init__(self: "EventIndex", events_file: Path) -> None:
+        """Initialize an empty index.
+
+        Args:
+            events_file: Path to events.jsonl file
+        """
+        self.events_file = events_file
+        self.index_file = events_file.with_name(events_file.name + INDEX_SUFFIX)
+        self.header = ""
+        self.reset()
+
+    def reset(self: "EventIndex") -> None:
+        """Discard everything indexed so far."""
+        self.consumed = 0
+        self.offsets = array("q")
+        self.lengths = array("q")
+        self.timestamps = array("q")
+        self.type_codes = array("H")
+        self.level_codes = array("H")
+        self.type_names: list[str] = []
+        self.level_names: list[str] = []
+        self._type_lookup: dict[str, int] = {}
+        self._level_lookup: dict[str, int] = {}
+
+    def __len__(self: "EventIndex") -> int:
+        """Number of indexed events."""
+        return len(self.offsets)
+
+    def update(self: "EventIndex") -> None:
+        """Index lines appended since the last update."""
+        try:
+            stat = self.events_file.stat()
+        except FileNotFoundError:
+            self.reset()
+            self.header = ""
+            return
+
+        size = stat.st_size
+        header = f"# events-index {INDEX_VERSION} {stat.st_ino}\n"
+        if header != self.header:
+            # First use, or events.jsonl was replaced
+            self.reset()
+            self.header = header
+            self._load_sidecar(size)
+        if size < self.consumed:
+            logger.info(f"{self.events_file} shrank, rebuilding event index")
+            self.reset()
+            self._write_sidecar_header()
+        if size == self.consumed:
+            return
+
+        records: list[str] = []
+        with open(self.events_file, "rb") as f:
+            f.seek(self.consumed)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+
+                offset = self.consumed
+                self.consumed += len(raw)
+                try:
+                    event = json.loads(raw) if raw.strip() else None
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    event = None
+
+                if not isinstance(event, dict):
+                    records.append(f"{offset}\t{len(raw)}\t0\t0\t\t\n")
+                    continue
+
+                ts = _parse_ts(event.get("ts"))
+                level = _field(event.get("lvl")).upper()
+                event_type = _field(event.get("event"))
+                self._add(offset, len(raw), ts, level, event_type)
+                records.append(f"{offset}\t{len(raw)}\t1\t{ts}\t{level}\t{event_type}\n")
+
+        self._append_sidecar(records)
+
+    def matching(self: "EventIndex", level: str | None = None, event_type: str | None = None) -> list[int]:
+        """Get positions of indexed events that pass the filters.
+
+        Args:
+            level: Exact log level (case-insensitive)
+            event_type: Event type prefix (e.g., "tool:")
+
+        Returns:
+            Positions (in file order) usable with timestamps and read_events
+        """
+        if not level and not event_type:
+            return list(range(len(self)))
+
+        types = None
+        if event_type:
+            types = {code for code, name in enumerate(self.type_names) if name.startswith(event_type)}
+        level_code = self._level_lookup.get(level.upper(), -1) if level else None
+
+        return [
+            i
+            for i in range(len(self))
+            if (types is None or self.type_codes[i] in types)
+            and (level_code is None or self.level_codes[i] == level_code)
+        ]
+
+    def read_events(self: "EventIndex", positions: list[int], session_id: str) -> list[dict[str, Any]]:
+        """Read and parse the events at the given positions.
+
+        Args:
+            positions: Positions from matching()
+            session_id: Session id added to events that don't carry one
+
+        Returns:
+            Parsed events, in the order of positions
+        """
+        events: list[dict[str, Any]] = []
+        with open(self.events_file, "rb") as f:
+            for i in positions:
+                f.seek(self.offsets[i])
+                event = json.loads(f.read(self.lengths[i]))
+                # Ensure session_id is present for filtering
+                event.setdefault("session_id", session_id)
+                events.append(event)
+        return events
+
+    def _add(self: "EventIndex", offset: int, length: int, ts: int, level: str, event_type: str) -> None:
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.timestamps.append(ts)
+        self.type_codes.append(self._code(event_type, self.type_names, self._type_lookup))
+        self.level_codes.append(self._code(level, self.level_names, self._level_lookup))
+
+    @staticmethod
+    def _code(name: str, names: list[str], lookup: dict[str, int]) -> int:
+        code = lookup.get(name)
+        if code is None:
+            code = lookup[name] = len(names)
+            names.append(name)
+        return code
+
+    def _load_sidecar(self: "EventIndex", size: int) -> None:
+        """Resume from the sidecar if it is valid for the current file."""
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                if f.readline() != self.header:
+                    raise ValueError("index is for another version or file")
+                for line in f:
+                    offset, length, valid, ts, level, event_type = line.rstrip("\n").split("\t")
+                    if int(offset) != self.consumed:
+                        raise ValueError(f"gap at offset {offset}")
+                    self.consumed += int(length)
+                    if valid == "1":
+                        self._add(int(offset), int(length), int(ts), level, event_type)
+        except FileNotFoundError:
+            self._write_sidecar_header()
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding event index {self.index_file}: {e}")
+            self.reset()
+            self._write_sidecar_header()
+            return
+
+        if self.consumed > size:
+            logger.info(f"Event index {self.index_file} is ahead of its log, rebuilding")
+            self.reset()
+            self._write_sidecar_header()
+
+    def _write_sidecar_header(self: "EventIndex") -> None:
+        try:
+            self.index_file.write_text(self.header, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to write event index {self.index_file}: {e}")
+
+    def _append_sidecar(self: "EventIndex", records: list[str]) -> None:
+        if not records:
+            return
+        try:
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.writelines(records)
+        except OSError as e:
+            # The in-memory index is still correct; the sidecar is rebuilt on the next load
+            logger.warning(f"Failed to update event index {self.index_file}: {e}")
+
+
+# Indexes by events file, least recently used first
+_indexes: OrderedDict[Path, EventIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _get_index(events_file: Path) -> EventIndex | None:
+    key = events_file.resolve()
+    if not events_file.exists():
+        _indexes.pop(key, None)
+        return None
+
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = EventIndex(events_file)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    else:
+        _indexes.move_to_end(key)
+    index.update()
+    return index
+
+
+def query_events(
+    sources: list[tuple[str, Path]],
+    limit: int = 500,
+    offset: int = 0,
+    level: str | None = None,
+    event_type: str | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Get a page of events from one or more sessions' events.jsonl files.
+
+    With several sources, events are merged by timestamp (ties keep source
+    order, then file order) with a streaming k-way merge, so only the
+    events up to the end of the page are visited.
+
+    Args:
+        sources: (session_id, events.jsonl path) pairs
+        limit: Maximum events to return
+        offset: Number of matching events to skip
+        level: Filter by log level
+        event_type: Filter by event type prefix
+
+    Returns:
+        (events, total matching events)
+    """
+    with _indexes_lock:
+        selections: list[tuple[str, EventIndex, list[int]]] = []
+        for session_id, events_file in sources:
+            index = _get_index(events_file)
+            if index is not None:
+                selections.append((session_id, index, index.matching(level, event_type)))
+
+        total = sum(len(positions) for _, _, positions in selections)
+        if limit <= 0 or offset >= total:
+            return [], total
+
+        if len(selections) == 1:
+            session_id, index, positions = selections[0]
+            return index.read_events(positions[offset : offset + limit], session_id), total
+
+        def stream(source: int) -> Iterator[tuple[int, int, int]]:
+            timestamps = selections[source][1].timestamps
+            for i in selections[source][2]:
+                yield timestamps[i], source, i
+
+        page: dict[int, list[int]] = {}
+        order: list[tuple[int, int]] = []
+        merged = heapq.merge(*(stream(source) for source in range(len(selections))))
+        for n, (_, source, i) in enumerate(merged):
+            if n >= offset + limit:
+                break
+            if n >= offset:
+                page.setdefault(source, []).append(i)
+                order.append((source, i))
+
+        read: dict[tuple[int, int], dict[str, Any]] = {}
+        for source, positions in page.items():
+            session_id, index, _ = selections[source]
+            for i, event in zip(positions, index.read_events(positions, session_id), strict=True):
+                read[(source, i)] = event
+
+        return [read[key] for key in order], total
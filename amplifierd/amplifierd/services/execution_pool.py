@@ -0,0 +1,440 @@
+"""Pool of execution worker processes with session affinity.
+
+Session executions are CPU-heavy (prompt assembly, tool orchestration,
+response parsing) and used to share the API process's event loop. With
+daemon.execution_workers > 0, they run in child processes instead: each
+worker hosts the runners of a fixed share of sessions, chosen by hashing
+the session_id, so a session's runner (and its warm context) always lives
+in the same worker. API processes route send-message, cancel and approval
+calls to the owning worker; the worker's stream events come back over the
+event bus (event_bus.py), where the API process's emitter for the session
+channel fans them out to SSE subscribers.
+
+Contract:
+- Inputs: Session IDs, user messages, approval responses
+- Outputs: Execution status from the owning worker
+- Side Effects: Spawns worker processes, listens on / connects to Unix sockets
+
+Topology:
+- Worker i listens on "{socket_dir}/worker-{i}.sock".
+- The API process holding an flock on "{socket_dir}/pool.lock" spawns the
+  workers and stops them on shutdown; other API processes only connect.
+  If the spawner goes away, the next API process that cannot reach a
+  worker takes the lock and spawns a new pool.
+- Workers exit when the process that spawned them does.
+- The spawner lock needs flock; without it the pool is not started and
+  executions run in the API process.
+
+Protocol: one request per connection. The caller sends a JSON line
+{"op", ...}; the worker answers with one JSON line, {"result": ...} or
+{"error": "not_found" | "failed", "detail": str}.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import zlib
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Largest request or reply line (messages can carry large pasted content)
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+WORKER_START_TIMEOUT_SECONDS = 60.0
+WORKER_STOP_TIMEOUT_SECONDS = 10.0
+PARENT_CHECK_INTERVAL_SECONDS = 2.0
+
+
+def worker_index(session_id: str, size: int) -> int:
+    """Get the worker that owns a session.
+
+    Stable across processes and restarts, so every API process routes a
+    session to the same worker.
+
+    Args:
+        session_id: Session identifier
+        size: Number of workers
+
+    Returns:
+        Worker index in [0, size)
+    """
+    return zlib.crc32(session_id.encode()) % size
+
+
+class ExecutionPool:
+    """Routes execution calls to the worker process owning each session."""
+
+    def __init__(self: "ExecutionPool", size: int, socket_dir: Path, bus_socket: Path) -> None:
+        """Initialize pool.
+
+        Args:
+            size: Number of worker processes
+            socket_dir: Directory for worker sockets and the spawner lock
+            bus_socket: Event bus socket the workers join
+
+        Raises:
+            ValueError: If size is not positive or socket paths are too long for Unix sockets
+        """
+        if size < 1:
+            raise ValueError(f"Execution pool size must be positive, got {size}")
+        self.size = size
+        self.socket_dir = Path(socket_dir)
+        self.bus_socket = Path(bus_socket)
+        self.lock_path = self.socket_dir / "pool.lock"
+        if len(os.fsencode(self.socket_path(size - 1))) > 100:
+            raise ValueError(f"Execution pool socket path is too long for a Unix socket: {self.socket_dir}")
+
+        self._lock_fd: int | None = None
+        self._processes: list[BaseProcess] = []
+        self._spawn_lock = asyncio.Lock()
+
+    def socket_path(self: "ExecutionPool", index: int) -> Path:
+        """Get the socket worker index listens on."""
+        return self.socket_dir / f"worker-{index}.sock"
+
+    @property
+    def is_spawner(self: "ExecutionPool") -> bool:
+        """Whether this process owns the worker processes."""
+        return self._lock_fd is not None
+
+    async def start(self: "ExecutionPool") -> None:
+        """Spawn the workers, unless another API process already did."""
+        self.socket_dir.mkdir(parents=True, exist_ok=True)
+        await self._ensure_workers()
+
+    async def stop(self: "ExecutionPool") -> None:
+        """Stop the workers this process spawned and release the spawner lock."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            await asyncio.to_thread(process.join, WORKER_STOP_TIMEOUT_SECONDS)
+            if process.is_alive():
+                logger.warning(f"Execution worker {process.name} did not stop, killing it")
+                process.kill()
+        self._processes.clear()
+
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def send_message(self: "ExecutionPool", session_id: str, content: str) -> dict[str, str]:
+        """Start executing a user message in the session's worker.
+
+        Raises:
+            FileNotFoundError: If session not found
+            RuntimeError: If the worker failed to start the execution
+            ConnectionError: If the worker cannot be reached
+        """
+        return await self._call(session_id, {"op": "send_message", "session_id": session_id, "content": content})
+
+    async def cancel(self: "ExecutionPool", session_id: str) -> bool:
+        """Cancel the session's execution; True if one was running."""
+        return await self._call(session_id, {"op": "cancel", "session_id": session_id})
+
+    async def evict_runner(self: "ExecutionPool", session_id: str) -> bool:
+        """Drop the session's warm runner in its worker; True if one was evicted."""
+        return await self._call(session_id, {"op": "evict", "session_id": session_id})
+
+    async def has_active_execution(self: "ExecutionPool", session_id: str) -> bool:
+        """Check whether the session's worker is executing for it."""
+        return await self._call(session_id, {"op": "active", "session_id": session_id})
+
+    async def resolve_approval(self: "ExecutionPool", approval_id: str, response: str) -> bool:
+        """Deliver an approval decision to whichever worker is waiting on it.
+
+        Approval ids don't carry their session, so every worker is asked.
+
+        Returns:
+            True if a worker was waiting on the approval
+        """
+        request = {"op": "approval", "approval_id": approval_id, "response": response}
+        results = await asyncio.gather(*(self._request(i, request) for i in range(self.size)))
+        return any(results)
+
+    async def _call(self: "ExecutionPool", session_id: str, request: dict[str, Any]) -> Any:
+        return await self._request(worker_index(session_id, self.size), request)
+
+    async def _request(self: "ExecutionPool", index: int, request: dict[str, Any]) -> Any:
+        """Send one request to a worker, respawning the pool once if it is unreachable.
+
+        Only a failed connect is retried: once the request is sent, the
+        worker may have acted on it (a send_message retried after a dropped
+        reply would run the turn twice).
+        """
+        try:
+            reader, writer = await self._connect(index)
+        except OSError:
+            await self._ensure_workers()
+            reader, writer = await self._connect(index)
+        reply = await self._exchange(index, reader, writer, request)
+
+        error = reply.get("error")
+        if error == "not_found":
+            raise FileNotFoundError(reply.get("detail", ""))
+        if error is not None:
+            raise RuntimeError(f"Execution worker {index}: {reply.get('detail', error)}")
+        return reply.get("result")
+
+    async def _connect(self: "ExecutionPool", index: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_unix_connection(str(self.socket_path(index)), limit=MAX_MESSAGE_SIZE)
+
+    async def _exchange(
+        self: "ExecutionPool",
+        index: int,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        request: dict[str, Any],
+    ) -> dict[str, Any]:
+        try:
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+        finally:
+            writer.close()
+        if not line:
+            raise ConnectionError(f"Execution worker {index} closed the connection")
+        return json.loads(line)
+
+    async def _ensure_workers(self: "ExecutionPool") -> None:
+        """Spawn the workers if no live API process owns them.
+
+        Raises:
+            ConnectionError: If the spawned workers don't come up in time
+        """
+        async with self._spawn_lock:
+            if self.is_spawner:
+                # Replace workers that died
+                for index, process in enumerate(self._processes):
+                    if not process.is_alive():
+                        logger.warning(f"Execution worker {index} exited ({process.exitcode}), restarting it")
+                        self._processes[index] = self._spawn(index)
+            elif self._try_lock():
+                logger.info(f"Starting {self.size} execution workers in {self.socket_dir}")
+                self._processes = [self._spawn(index) for index in range(self.size)]
+            else:
+                return
+            await self._wait_until_listening()
+
+    def _try_lock(self: "ExecutionPool") -> bool:
+        if fcntl is None:
+            # start_execution_pool refuses to start without flock
+            return False
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _spawn(self: "ExecutionPool", index: int) -> BaseProcess:
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path(index).unlink()
+        # spawn: workers must not inherit the API process's event loop, sockets or threads
+        process = multiprocessing.get_context("spawn").Process(
+            target=run_worker,
+            args=(index, str(self.socket_path(index)), str(self.bus_socket), os.getpid()),
+            name=f"amplifierd-exec-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    async def _wait_until_listening(self: "ExecutionPool") -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + WORKER_START_TIMEOUT_SECONDS
+        pending = set(range(self.size))
+        while pending:
+            for index in list(pending):
+                with contextlib.suppress(OSError):
+                    _, writer = await asyncio.open_unix_connection(str(self.socket_path(index)))
+                    writer.close()
+                    pending.discard(index)
+            if not pending:
+                return
+            if loop.time() > deadline:
+                raise ConnectionError(f"Execution workers {sorted(pending)} did not start")
+            await asyncio.sleep(0.1)
+
+
+# --- Worker process ---
+
+
+def run_worker(index: int, socket_path: str, bus_socket: str, parent_pid: int) -> None:
+    """Entry point of an execution worker process.
+
+    Args:
+        index: Worker index
+        socket_path: Socket to serve requests on
+        bus_socket: Event bus socket to join
+        parent_pid: Process that spawned the worker; the worker exits with it
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s - exec-{index} - %(name)s - %(levelname)s - %(message)s",
+        force=True,
+    )
+    asyncio.run(_serve_worker(Path(socket_path), Path(bus_socket), parent_pid))
+
+
+async def _serve_worker(socket_path: Path, bus_socket: Path, parent_pid: int) -> None:
+    from amplifier_library.sessions.store import configure_session_store
+    from amplifier_library.sessions.turn import configure_transcript_fsync
+
+    from ..config.loader import load_config
+    from ..event_bus import UnixSocketEventBus
+    from ..event_bus import start_event_bus
+    from ..event_bus import stop_event_bus
+    from ..streaming import configure_content_coalescing
+    from ..streaming import configure_replay_ring
+    from ..streaming import configure_subscriber_queues
+    from .git_ref_cache import configure_git_ref_cache
+    from .session_stream_registry import get_stream_registry
+    from .session_stream_registry import start_session_reaper
+    from .session_stream_registry import stop_session_reaper
+    from .session_sync import handle_bus_event
+    from .session_sync import share_session_changes
+
+    daemon = load_config().daemon
+    configure_session_store(daemon.session_store)
+    configure_transcript_fsync(daemon.transcript_fsync)
+    configure_subscriber_queues(daemon.stream_queue_size, daemon.stream_overflow_policy)
+    configure_replay_ring(daemon.stream_replay_size)
+    configure_content_coalescing(daemon.stream_coalesce_ms, daemon.stream_coalesce_bytes)
+    configure_git_ref_cache(daemon.git_ref_ttl_seconds)
+    start_session_reaper(
+        daemon.session_reaper_interval_seconds,
+        idle_timeout=daemon.session_idle_timeout_seconds or None,
+        max_warm=daemon.max_warm_sessions or None,
+        max_bytes=daemon.max_warm_session_bytes or None,
+    )
+
+    await start_event_bus(UnixSocketEventBus(bus_socket), handle_bus_event)
+    share_session_changes()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stopping.set)
+    loop.add_signal_handler(signal.SIGINT, stopping.set)
+
+    async def watch_parent() -> None:
+        while os.getppid() == parent_pid:
+            await asyncio.sleep(PARENT_CHECK_INTERVAL_SECONDS)
+        logger.warning("Spawning process exited, stopping execution worker")
+        stopping.set()
+
+    server = await asyncio.start_unix_server(_handle_request, path=str(socket_path), limit=MAX_MESSAGE_SIZE)
+    watcher = asyncio.create_task(watch_parent())
+    logger.info(f"Execution worker listening on {socket_path}")
+    try:
+        await stopping.wait()
+    finally:
+        watcher.cancel()
+        server.close()
+        await server.wait_closed()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        await stop_session_reaper()
+        await get_stream_registry().cleanup_all()
+        await stop_event_bus()
+
+
+async def _handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve one request from an API process."""
+    try:
+        line = await reader.readline()
+        if line:
+            reply = await _dispatch(json.loads(line))
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+    except (ValueError, OSError) as e:
+        logger.warning(f"Bad execution request: {e}")
+    finally:
+        writer.close()
+
+
+async def _dispatch(request: dict[str, Any]) -> dict[str, Any]:
+    from amplifier_library.sessions.manager import get_session_manager
+
+    from .session_execution import cancel_session_execution
+    from .session_execution import evict_session_runner
+    from .session_execution import has_active_execution
+    from .session_execution import resolve_approval
+    from .session_execution import start_session_execution
+
+    op = request.get("op")
+    try:
+        if op == "send_message":
+            result = await start_session_execution(request["session_id"], request["content"], get_session_manager())
+        elif op == "cancel":
+            result = cancel_session_execution(request["session_id"])
+        elif op == "evict":
+            result = await evict_session_runner(request["session_id"])
+        elif op == "active":
+            result = has_active_execution(request["session_id"])
+        elif op == "approval":
+            result = resolve_approval(request["approval_id"], request["response"])
+        else:
+            return {"error": "failed", "detail": f"Unknown operation: {op}"}
+    except FileNotFoundError as e:
+        return {"error": "not_found", "detail": str(e)}
+    except Exception as e:
+        logger.error(f"Execution request {op} failed: {e}")
+        return {"error": "failed", "detail": str(e)}
+    return {"result": result}
+
+
+# --- Process-wide pool ---
+
+_pool: ExecutionPool | None = None
+
+
+def get_execution_pool() -> ExecutionPool | None:
+    """Get this process's execution pool (None when executions run in-process)."""
+    return _pool
+
+
+async def start_execution_pool(size: int, socket_dir: Path, bus_socket: Path) -> ExecutionPool:
+    """Create and start the process-wide execution pool.
+
+    Args:
+        size: Number of worker processes
+        socket_dir: Directory for worker sockets
+        bus_socket: Event bus socket the workers join
+
+    Returns:
+        Started pool
+
+    Raises:
+        RuntimeError: If flock (used to elect the spawning process) is unavailable on this platform
+    """
+    global _pool
+
+    if fcntl is None:
+        raise RuntimeError("The execution pool needs fcntl.flock, which this platform lacks")
+    pool = ExecutionPool(size, socket_dir, bus_socket)
+    await pool.start()
+    _pool = pool
+    return pool
+
+
+async def stop_execution_pool() -> None:
+    """Stop the process-wide execution pool, if any."""
+    global _pool
+
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.stop()
@@ -0,0 +1,261 @@
+"""Process-wide cache of git ref → commit lookups.
+
+`git ls-remote` is a network round trip (100-300ms) per git source. The
+ref cache remembers each (repo_url, ref) → commit lookup for a TTL, shares
+it across all RefResolutionService instances in the process, and keeps it
+on disk (cache/git/refs.json) so it survives restarts and is shared by
+daemon workers.
+
+Contract:
+- Inputs: Git repository URLs and refs
+- Outputs: Commit hashes
+- Side Effects: Runs git ls-remote, writes cache/git/refs.json
+
+Lookup rules:
+- A ref that is already a 40-character commit hash is returned as is,
+  without any network call.
+- A cached commit younger than the TTL is returned without a network call.
+- Otherwise ls-remote is run; if it fails (offline, unknown ref), the last
+  known commit is returned however old it is, so resolution keeps working
+  offline once the cache is warm.
+- refresh() re-runs ls-remote for cached refs regardless of age.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from amplifier_library.storage.paths import get_git_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REF_TTL_SECONDS = 300
+REF_CACHE_FILENAME = "refs.json"
+REF_CACHE_VERSION = 1
+LS_REMOTE_TIMEOUT_SECONDS = 10
+
+_COMMIT_SHA = re.compile(r"[0-9a-fA-F]{40}")
+
+
+def is_commit_sha(ref: str) -> bool:
+    """Whether a ref is a full (40-character) commit hash."""
+    return _COMMIT_SHA.fullmatch(ref) is not None
+
+
+def ls_remote(repo_url: str, ref: str) -> str | None:
+    """Get the commit a branch or tag points to on the remote, without cloning.
+
+    A branch wins over a tag of the same name (as with git clone --branch);
+    annotated tags resolve to the commit they tag.
+
+    Args:
+        repo_url: Git repository URL (clean URL without git+ or fragments)
+        ref: Branch or tag name
+
+    Returns:
+        40-character commit hash if successful, None if the command fails or the ref doesn't exist
+    """
+    branch, tag = f"refs/heads/{ref}", f"refs/tags/{ref}"
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", repo_url, branch, tag, f"{tag}^{{}}"],
+            capture_output=True,
+            text=True,
+            timeout=LS_REMOTE_TIMEOUT_SECONDS,
+            check=False,
+        )
+
+        # Parse output: "<hash>\t<refname>" per line
+        if result.returncode == 0 and result.stdout.strip():
+            refs: dict[str, str] = {}
+            for line in result.stdout.splitlines():
+                sha, _, name = line.partition("\t")
+                refs[name] = sha
+            commit_hash = refs.get(branch) or refs.get(f"{tag}^{{}}") or refs.get(tag)
+            if commit_hash:
+                logger.debug(f"Remote commit hash for {repo_url}@{ref}: {commit_hash}")
+                return commit_hash
+
+        logger.debug(
+            f"git ls-remote failed for {repo_url}@{ref}: rc={result.returncode}, stderr={result.stderr.strip()}"
+        )
+        return None
+
+    except subprocess.TimeoutExpired:
+        logger.warning(f"git ls-remote timeout for {repo_url}@{ref}")
+        return None
+    except Exception as e:
+        logger.debug(f"git ls-remote error for {repo_url}@{ref}: {e}")
+        return None
+
+
+class GitRefCache:
+    """TTL cache of (repo_url, ref) → commit, persisted to a JSON file.
+
+    Thread-safe. Entries written by other processes are picked up when the
+    file changes.
+    """
+
+    def __init__(self: "GitRefCache", path: Path, ttl_seconds: float = DEFAULT_REF_TTL_SECONDS) -> None:
+        """Initialize cache.
+
+        Args:
+            path: JSON file holding the cache
+            ttl_seconds: Age after which a cached commit is looked up again
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._file_state: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def lookup(self: "GitRefCache", repo_url: str, ref: str, refresh: bool = False) -> str | None:
+        """Get the commit a ref points to.
+
+        Args:
+            repo_url: Git repository URL (clean URL without git+ or fragments)
+            ref: Branch name or commit hash
+            refresh: Ignore the TTL and ask the remote
+
+        Returns:
+            Commit hash, or None if the ref is unknown and the remote can't tell
+        """
+        if is_commit_sha(ref):
+            return ref.lower()
+
+        key = _key(repo_url, ref)
+        with self._lock:
+            self._reload()
+            entry = self._entries.get(key)
+        if entry is not None and not refresh and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            logger.debug(f"Ref cache hit for {repo_url}@{ref}")
+            return entry["commit"]
+
+        commit_hash = ls_remote(repo_url, ref)
+        if commit_hash is None:
+            if entry is not None:
+                logger.info(f"Could not look up {repo_url}@{ref}, using last known commit {entry['commit'][:8]}")
+                return entry["commit"]
+            return None
+
+        self.record(repo_url, ref, commit_hash)
+        return commit_hash
+
+    def record(self: "GitRefCache", repo_url: str, ref: str, commit_hash: str) -> None:
+        """Remember the commit a ref was found to point to (e.g. by a clone).
+
+        Args:
+            repo_url: Git repository URL
+            ref: Branch name
+            commit_hash: Commit the ref points to
+        """
+        if is_commit_sha(ref):
+            return
+        with self._lock:
+            self._reload()
+            self._entries[_key(repo_url, ref)] = {
+                "repo_url": repo_url,
+                "ref": ref,
+                "commit": commit_hash,
+                "fetched_at": time.time(),
+            }
+            self._save()
+
+    def refresh(self: "GitRefCache", repo_url: str | None = None) -> dict[str, str]:
+        """Look up cached refs on their remotes now, regardless of age.
+
+        Args:
+            repo_url: Only refresh refs of this repository (default: all)
+
+        Returns:
+            "{repo_url}@{ref}" → new commit, for refs that moved
+        """
+        with self._lock:
+            self._reload()
+            entries = [dict(e) for e in self._entries.values() if repo_url is None or e["repo_url"] == repo_url]
+
+        moved: dict[str, str] = {}
+        for entry in entries:
+            commit_hash = self.lookup(entry["repo_url"], entry["ref"], refresh=True)
+            if commit_hash is not None and commit_hash != entry["commit"]:
+                moved[_key(entry["repo_url"], entry["ref"])] = commit_hash
+
+        logger.info(f"Refreshed {len(entries)} git refs, {len(moved)} moved")
+        return moved
+
+    def _reload(self: "GitRefCache") -> None:
+        """Re-read the file if another process changed it (caller holds the lock)."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        state = (stat.st_mtime_ns, stat.st_size)
+        if state == self._file_state:
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable git ref cache {self.path}: {e}")
+            return
+        if isinstance(data, dict) and data.get("version") == REF_CACHE_VERSION:
+            self._entries.update(data.get("refs", {}))
+        self._file_state = state
+
+    def _save(self: "GitRefCache") -> None:
+        """Write the cache atomically (caller holds the lock)."""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps({"version": REF_CACHE_VERSION, "refs": self._entries}, indent=2), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+            stat = self.path.stat()
+            self._file_state = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logger.warning(f"Failed to save git ref cache {self.path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+def _key(repo_url: str, ref: str) -> str:
+    return f"{repo_url}@{ref}"
+
+
+_ttl_seconds: float = DEFAULT_REF_TTL_SECONDS
+_caches: dict[Path, GitRefCache] = {}
+_caches_lock = threading.Lock()
+
+
+def configure_git_ref_cache(ttl_seconds: float) -> None:
+    """Set how long looked-up commits are trusted before asking the remote again.
+
+    Args:
+        ttl_seconds: Cache TTL in seconds (0 = always ask, falling back to the cache offline)
+
+    Raises:
+        ValueError: If ttl_seconds is negative
+    """
+    global _ttl_seconds
+
+    if ttl_seconds < 0:
+        raise ValueError(f"Git ref cache TTL must not be negative, got {ttl_seconds}")
+    _ttl_seconds = ttl_seconds
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.ttl_seconds = ttl_seconds
+
+
+def get_git_ref_cache() -> GitRefCache:
+    """Get the ref cache for the current git cache directory (cache/git/refs.json)."""
+    path = (get_git_cache_dir() / REF_CACHE_FILENAME).resolve()
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = GitRefCache(path, _ttl_seconds)
+        return cache
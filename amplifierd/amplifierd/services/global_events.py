@@ -4,10 +4,9 @@ This service provides a singleton EventQueueEmitter for global events that can b
 subscribed to by multiple clients via the global SSE endpoint.
 """
 
-import asyncio
-
 from amplifierd.models.events import GlobalEvent
 from amplifierd.streaming import EventQueueEmitter
+from amplifierd.streaming import SubscriberQueue
 
 
 class GlobalEventService:
@@ -19,7 +18,7 @@ class GlobalEventService:
     def get_instance(cls) -> EventQueueEmitter:
         """Get the singleton EventQueueEmitter instance."""
         if cls._instance is None:
-            cls._instance = EventQueueEmitter()
+            cls._instance = EventQueueEmitter(channel="global")
         return cls._instance
 
     @classmethod
@@ -32,7 +31,7 @@ class GlobalEventService:
         await cls.get_instance().emit(event.event_type, event.model_dump(mode="json"))
 
     @classmethod
-    def subscribe(cls) -> asyncio.Queue:
+    def subscribe(cls) -> SubscriberQueue:
         """Subscribe to global event stream.
 
         Returns:
@@ -41,7 +40,7 @@ class GlobalEventService:
         return cls.get_instance().subscribe()
 
     @classmethod
-    def unsubscribe(cls, queue: asyncio.Queue) -> None:
+    def unsubscribe(cls, queue: SubscriberQueue) -> None:
         """Unsubscribe from global event stream.
 
         Args:
@@ -0,0 +1,98 @@
+"""Fingerprints of profile compilation inputs.
+
+Profile compilation (the compile manifest in each profile directory) and
+the mount plan cache (cache/mount_plans/) both skip work when the inputs
+of a previous compilation are unchanged. They record the same fingerprint:
+
+    {"inputs_hash": ..., "sources": [[repo_url, ref, commit], ...]}
+
+where inputs_hash covers the local inputs (profile, config, registries)
+and sources lists the commit every git source resolved to.
+
+Contract:
+- Inputs: Local input hashes, RefResolutionService (resolved_commits, resolve_commit)
+- Outputs: Fingerprint dicts, whether a recorded fingerprint still matches
+- Side Effects: Reads/writes fingerprint JSON files, git ls-remote via the ref cache
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from amplifierd.services.ref_resolution import RefResolutionService
+
+logger = logging.getLogger(__name__)
+
+
+def digest(value: Any) -> str:
+    """Stable hash of a JSON-like value (dict key order doesn't matter)."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def take_fingerprint(inputs_hash: str, ref_resolution: "RefResolutionService") -> dict[str, Any]:
+    """Fingerprint a compilation that just ran.
+
+    Args:
+        inputs_hash: Hash of the local inputs
+        ref_resolution: Service the compilation resolved its sources with
+
+    Returns:
+        Fingerprint dict (inputs_hash and sources)
+    """
+    sources = sorted([url, ref, commit] for (url, ref), commit in ref_resolution.resolved_commits.items())
+    return {"inputs_hash": inputs_hash, "sources": sources}
+
+
+def is_fingerprint_current(
+    fingerprint: dict[str, Any], inputs_hash: str, ref_resolution: "RefResolutionService"
+) -> bool:
+    """Check whether a recorded fingerprint still matches the inputs.
+
+    Git sources whose ref can't be looked up (offline) keep their recorded
+    commit. When current, the recorded commits are added to
+    ref_resolution.resolved_commits, as if the sources had been resolved.
+
+    Args:
+        fingerprint: Fingerprint recorded by take_fingerprint()
+        inputs_hash: Hash of the current local inputs
+        ref_resolution: Service used to look up where each git ref points now
+
+    Returns:
+        True if the recorded compilation's output is still valid
+    """
+    if fingerprint.get("inputs_hash") != inputs_hash:
+        return False
+
+    sources = fingerprint.get("sources", [])
+    for repo_url, ref, commit_hash in sources:
+        current = ref_resolution.resolve_commit(repo_url, ref)
+        if current is not None and current != commit_hash:
+            logger.info(f"Source {repo_url}@{ref} moved to {current[:8]}, recompiling")
+            return False
+
+    for repo_url, ref, commit_hash in sources:
+        ref_resolution.resolved_commits[(repo_url, ref)] = commit_hash
+    return True
+
+
+def load_json(path: Path) -> dict[str, Any] | None:
+    """Read a manifest file; None if it is missing or unreadable."""
+    try:
+        value = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def save_json(path: Path, value: Any) -> None:
+    """Write a JSON file (temporary file + rename, so readers never see a partial one)."""
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(value, indent=2))
+    tmp_path.rename(path)
@@ -2,17 +2,74 @@
 
 This service compiles profiles from source profile.yaml at session creation time.
 Mount plans are generated in-memory and not persisted to profile directories.
+
+Compiled plans are cached by content: the key is the hash of profile.yaml,
+registries.yaml and the commits every git source resolved to. A per-profile
+manifest records those inputs (the same fingerprint profile compilation
+records, see input_fingerprint), so a later request only re-checks the
+source commits (git ls-remote) instead of re-running the whole compilation.
+
+Cache structure:
+    cache/mount_plans/
+        {profile_key}.manifest.json  # Inputs of the last compilation + plan key
+        {plan_key}.json              # Compiled mount plan (without session context)
+
+profile_key is the hash of the profile ID, since IDs such as
+"foundation/base" aren't valid file names. The MAX_CACHED_PLANS most
+recently used plans are also kept in memory.
 """
 
+import copy
+import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 
 import yaml
 
+from amplifierd.services.input_fingerprint import digest
+from amplifierd.services.input_fingerprint import is_fingerprint_current
+from amplifierd.services.input_fingerprint import load_json
+from amplifierd.services.input_fingerprint import save_json
+from amplifierd.services.input_fingerprint import take_fingerprint
+
+if TYPE_CHECKING:
+    from amplifierd.services.ref_resolution import RefResolutionService
+
 logger = logging.getLogger(__name__)
 
+# Most compiled plans kept in memory; the rest reload from cache/mount_plans/
+MAX_CACHED_PLANS = 64
+
+# Compiled plans shared by all MountPlanService instances, keyed by plan key, least recently used first
+_plan_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _cache_plan(plan_key: str, mount_plan: dict[str, Any]) -> None:
+    with _plan_cache_lock:
+        _plan_cache[plan_key] = mount_plan
+        _plan_cache.move_to_end(plan_key)
+        while len(_plan_cache) > MAX_CACHED_PLANS:
+            _plan_cache.popitem(last=False)
+
+
+def _cached_plan(plan_key: str) -> dict[str, Any] | None:
+    with _plan_cache_lock:
+        mount_plan = _plan_cache.get(plan_key)
+        if mount_plan is not None:
+            _plan_cache.move_to_end(plan_key)
+        return mount_plan
+
+
+def _manifest_path(cache_dir: Path, profile_id: str) -> Path:
+    """Get a profile's manifest file (named by hash: profile IDs may contain "/")."""
+    return cache_dir / f"{hashlib.sha256(profile_id.encode()).hexdigest()}.manifest.json"
+
 
 class MountPlanService:
     """Service for compiling profiles on-demand from source profile.yaml (v3)."""
@@ -77,34 +134,42 @@ class MountPlanService:
             raise FileNotFoundError(f"No profile.yaml or mount_plan.json for profile: {profile_id}")
 
         logger.debug(f"Loading profile.yaml from: {profile_yaml_path}")
-        profile_yaml = yaml.safe_load(profile_yaml_path.read_text())
-        config_yaml = {}  # Modern format has config inline
+        profile_source = profile_yaml_path.read_bytes()
+        inputs_hash = self._hash_inputs(profile_source)
 
-        # Initialize compilation service
         cache_dir = get_cache_dir()
-        registry_service = RegistryService(share_dir=self.share_dir)
         ref_resolution = RefResolutionService(state_dir=cache_dir)
-        compilation_service = ProfileCompilationService(
-            share_dir=self.share_dir,
-            cache_dir=cache_dir,
-            ref_resolution=ref_resolution,
-            registry_service=registry_service,
-        )
-
-        # Compile profile (creates mount_plan.json in profile directory)
-        logger.debug(f"Compiling profile '{profile_id}' with session context")
-        compiled_profile_dir = compilation_service.compile_profile(
-            profile_id=profile_id, profile_yaml=profile_yaml, config_yaml=config_yaml
-        )
-
-        # Read the compiled mount_plan
-        mount_plan_path = compiled_profile_dir / "mount_plan.json"
-        mount_plan = json.loads(mount_plan_path.read_text())
-
-        # Delete mount_plan.json from profile directory (it's for session only)
-        if mount_plan_path.exists():
-            logger.debug(f"Removing compiled mount_plan from profile directory: {mount_plan_path}")
-            mount_plan_path.unlink()
+
+        mount_plan = self._load_cached_plan(profile_id, inputs_hash, ref_resolution)
+        if mount_plan is None:
+            profile_yaml = yaml.safe_load(profile_source)
+            config_yaml = {}  # Modern format has config inline
+
+            # Initialize compilation service
+            registry_service = RegistryService(share_dir=self.share_dir)
+            compilation_service = ProfileCompilationService(
+                share_dir=self.share_dir,
+                cache_dir=cache_dir,
+                ref_resolution=ref_resolution,
+                registry_service=registry_service,
+            )
+
+            # Compile profile (creates mount_plan.json in profile directory)
+            logger.debug(f"Compiling profile '{profile_id}' with session context")
+            compiled_profile_dir = compilation_service.compile_profile(
+                profile_id=profile_id, profile_yaml=profile_yaml, config_yaml=config_yaml
+            )
+
+            # Read the compiled mount_plan
+            mount_plan_path = compiled_profile_dir / "mount_plan.json"
+            mount_plan = json.loads(mount_plan_path.read_text())
+
+            # Delete mount_plan.json from profile directory (it's for session only)
+            if mount_plan_path.exists():
+                logger.debug(f"Removing compiled mount_plan from profile directory: {mount_plan_path}")
+                mount_plan_path.unlink()
+
+            self._store_cached_plan(profile_id, inputs_hash, ref_resolution, mount_plan)
 
         # Add session-specific context
         if "session" not in mount_plan:
@@ -118,3 +183,73 @@ class MountPlanService:
 
         logger.info(f"Mount plan compiled successfully for profile '{profile_id}'")
         return mount_plan
+
+    def _hash_inputs(self, profile_source: bytes) -> str:
+        """Hash the local compilation inputs (profile.yaml and registries.yaml)."""
+        hasher = hashlib.sha256(profile_source)
+        registries_file = self.share_dir / "registries.yaml"
+        if registries_file.exists():
+            hasher.update(b"\0")
+            hasher.update(registries_file.read_bytes())
+        return hasher.hexdigest()
+
+    def _load_cached_plan(
+        self, profile_id: str, inputs_hash: str, ref_resolution: "RefResolutionService"
+    ) -> dict[str, Any] | None:
+        """Get the cached plan for a profile if none of its inputs changed.
+
+        Git sources whose ref can't be looked up (offline, tags, pinned
+        commits) keep their recorded commit.
+
+        Returns:
+            Copy of the cached mount plan, or None if it must be recompiled
+        """
+        from amplifier_library.storage.paths import get_mount_plan_cache_dir
+
+        cache_dir = get_mount_plan_cache_dir()
+        manifest = load_json(_manifest_path(cache_dir, profile_id))
+        if manifest is None or "plan_key" not in manifest:
+            return None
+        if not is_fingerprint_current(manifest, inputs_hash, ref_resolution):
+            logger.info(f"Inputs of profile '{profile_id}' changed, recompiling mount plan")
+            return None
+
+        plan_key = manifest["plan_key"]
+        mount_plan = _cached_plan(plan_key)
+        if mount_plan is None:
+            plan_path = cache_dir / f"{plan_key}.json"
+            if not plan_path.exists():
+                return None
+            mount_plan = json.loads(plan_path.read_text())
+            _cache_plan(plan_key, mount_plan)
+
+        logger.info(f"Using cached mount plan for profile '{profile_id}' ({plan_key[:12]})")
+        return copy.deepcopy(mount_plan)
+
+    def _store_cached_plan(
+        self,
+        profile_id: str,
+        inputs_hash: str,
+        ref_resolution: "RefResolutionService",
+        mount_plan: dict[str, Any],
+    ) -> None:
+        """Cache a freshly compiled plan under its content key.
+
+        Plans that depend on local paths or fsspec/http sources aren't cached,
+        since there is no commit to detect when those change.
+        """
+        from amplifier_library.storage.paths import get_mount_plan_cache_dir
+
+        if ref_resolution.unpinned_refs:
+            logger.debug(f"Not caching mount plan for '{profile_id}': unpinned sources {ref_resolution.unpinned_refs}")
+            return
+
+        fingerprint = take_fingerprint(inputs_hash, ref_resolution)
+        plan_key = digest(fingerprint)
+
+        cache_dir = get_mount_plan_cache_dir()
+        save_json(cache_dir / f"{plan_key}.json", mount_plan)
+        save_json(_manifest_path(cache_dir, profile_id), {**fingerprint, "plan_key": plan_key})
+
+        _cache_plan(plan_key, copy.deepcopy(mount_plan))
+        logger.debug(f"Cached mount plan for profile '{profile_id}' ({plan_key[:12]})")
@@ -2,11 +2,27 @@
 
 Compiles v3 profile definitions into mount plans for the Amplifier system.
 Uses the same algorithm as compile_profile.py with all stages.
+
+Each compilation writes a manifest of its inputs and outputs to
+{profile_dir}/.compile_manifest.json: the fingerprint of its inputs (see
+input_fingerprint: a hash of the profile/config YAML and registries, and
+the commits git sources resolved to), the source each component was placed
+from, and the mount plan. The next compilation:
+- returns the previous output without running any stage if the profile,
+  config and registries are unchanged and no git source moved;
+- otherwise runs all stages, but only re-places (and reinstalls the
+  dependencies of) components whose source changed, and removes components
+  the profile no longer uses. Narrowing is per component source: a
+  changed behavior definition re-places only the components whose source
+  it changed.
+Profiles with local-path or fsspec/http sources are never short-circuited,
+since there is no commit to tell when those change.
 """
 
 import json
 import logging
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -14,10 +30,22 @@ from typing import Any
 import yaml
 
 from amplifier_library.services.registry_service import RegistryService
+from amplifierd.services.blob_store import BlobStore
+from amplifierd.services.input_fingerprint import digest
+from amplifierd.services.input_fingerprint import is_fingerprint_current
+from amplifierd.services.input_fingerprint import load_json
+from amplifierd.services.input_fingerprint import save_json
+from amplifierd.services.input_fingerprint import take_fingerprint
 from amplifierd.services.ref_resolution import RefResolutionService
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent source fetches (git ls-remote/clone, downloads) per compilation
+DEFAULT_MAX_PARALLEL_FETCHES = 8
+
+COMPILE_MANIFEST_FILENAME = ".compile_manifest.json"
+COMPILE_MANIFEST_VERSION = 2
+
 
 class ProfileCompilationError(Exception):
     """Raised when profile compilation fails."""
@@ -47,19 +75,23 @@ class ProfileCompilationService:
         cache_dir: Path,
         ref_resolution: RefResolutionService,
         registry_service: RegistryService,
+        max_parallel_fetches: int = DEFAULT_MAX_PARALLEL_FETCHES,
     ):
         """Initialize profile compilation service.
 
         Args:
             share_dir: Share directory (compiled profiles output here)
-            cache_dir: Cache directory (for intermediate assets)
+            cache_dir: Cache directory (for intermediate assets and the blob store profile trees link to)
             ref_resolution: RefResolutionService for downloading refs
             registry_service: RegistryService for amp:// URI resolution
+            max_parallel_fetches: Maximum component sources fetched concurrently
         """
         self.share_dir = Path(share_dir)
         self.cache_dir = Path(cache_dir)
+        self.blob_store = BlobStore(self.cache_dir / "blobs")
         self.ref_resolution = ref_resolution
         self.registry_service = registry_service
+        self.max_parallel_fetches = max_parallel_fetches
         self.logger = logging.getLogger(__name__)
 
     def compile_profile(self, profile_id: str, profile_yaml: dict, config_yaml: dict) -> Path:
@@ -77,11 +109,21 @@ class ProfileCompilationService:
             ProfileCompilationError: If compilation fails
         """
         try:
-            self.logger.info(f"Compiling profile '{profile_id}'")
-
             # Load registries
             registries = self.registry_service.load_registries()
 
+            # Stage 0: Reuse the previous compilation if none of its inputs changed
+            profile_dir = self.share_dir / "profiles" / profile_id
+            inputs_hash = digest([profile_yaml, config_yaml, registries])
+            manifest = self._load_compile_manifest(profile_dir)
+            if manifest is not None and self._is_compilation_current(manifest, profile_dir, inputs_hash):
+                self.logger.info(f"Profile '{profile_id}' unchanged, reusing previous compilation")
+                (profile_dir / "mount_plan.json").write_text(json.dumps(manifest["mount_plan"], indent=2))
+                return profile_dir
+
+            self.logger.info(f"Compiling profile '{profile_id}'")
+            previous_components: dict[str, str] = manifest.get("components", {}) if manifest else {}
+
             # Stage 1: Load behavior definitions (recursive)
             behavior_items = profile_yaml.get("behaviors", [])
             behavior_defs = {}
@@ -102,14 +144,21 @@ class ProfileCompilationService:
             self.logger.info("Resolving assets...")
             asset_map = self._resolve_assets(refs, registries)
 
-            # Stage 5: Copy to profile cache
-            profile_dir = self.share_dir / "profiles" / profile_id
+            # Stage 5: Copy to profile cache (only components whose source changed)
             self.logger.info("Copying components to profile cache...")
-            asset_map = self._copy_to_profile_cache(profile_yaml, asset_map, refs, profile_dir)
+            source_map = asset_map
+            asset_map, placed = self._copy_to_profile_cache(
+                profile_yaml, asset_map, refs, profile_dir, previous_components
+            )
 
-            # Stage 5b: Install module dependencies
+            # Stage 5b: Install module dependencies (new or changed components, and ones that failed before)
             self.logger.info("Installing module dependencies...")
-            self._install_module_dependencies(asset_map)
+            pending = {
+                ref_id: path
+                for ref_id, path in asset_map.items()
+                if ref_id in placed or self._component_key(path, profile_dir) not in previous_components
+            }
+            failed = self._install_module_dependencies(pending)
 
             # Stage 6: Merge configs
             self.logger.info("Merging configurations...")
@@ -128,6 +177,24 @@ class ProfileCompilationService:
             mount_plan_path = profile_dir / "mount_plan.json"
             mount_plan_path.write_text(json.dumps(mount_plan, indent=2))
 
+            # Stage 9: Record inputs for the next compilation
+            self._save_compile_manifest(
+                profile_dir,
+                {
+                    "version": COMPILE_MANIFEST_VERSION,
+                    **take_fingerprint(inputs_hash, self.ref_resolution),
+                    "pinned": not self.ref_resolution.unpinned_refs,
+                    # Components whose dependencies failed to install are left out, so they are retried
+                    "components": {
+                        self._component_key(path, profile_dir): str(source_map[ref_id])
+                        for ref_id, path in asset_map.items()
+                        if ref_id not in failed and path != source_map[ref_id]
+                    },
+                    "complete": not failed,
+                    "mount_plan": mount_plan,
+                },
+            )
+
             self.logger.info(f"✓ Profile '{profile_id}' compiled successfully")
             return profile_dir
 
@@ -415,6 +482,8 @@ class ProfileCompilationService:
         """Download/cache all assets and return local paths.
 
         All component sources are inline in ComponentRefInternal objects.
+        Distinct sources are fetched concurrently, up to max_parallel_fetches
+        at a time; each is fetched once however many components use it.
 
         Args:
             refs: List of component references (each has inline source)
@@ -426,8 +495,8 @@ class ProfileCompilationService:
         Raises:
             ProfileCompilationError: If component has no source or download fails
         """
-        asset_map = {}
-
+        # Resolve amp:// URIs up front, so identical sources can be fetched once
+        sources: list[tuple[ComponentRefInternal, str]] = []
         for ref in refs:
             if not ref.source:
                 raise ProfileCompilationError(
@@ -435,38 +504,65 @@ class ProfileCompilationService:
                 )
 
             try:
-                # Resolve amp:// URIs before fetching
-                resolved_uri = self.registry_service.resolve_amp_uri(ref.source)
-
-                self.logger.info(f"Resolving {ref.type} '{ref.id}' from {resolved_uri}")
-                resolved_path = self.ref_resolution.resolve_ref(resolved_uri)
-                asset_map[ref.id] = resolved_path
-                self.logger.debug(f"  → {resolved_path}")
+                sources.append((ref, self.registry_service.resolve_amp_uri(ref.source)))
             except Exception as e:
                 raise ProfileCompilationError(
                     f"Failed to resolve component '{ref.id}' from source '{ref.source}': {e}"
                 ) from e
 
+        # Fetch concurrently; refs to the same repository are serialized (and deduplicated) by its fetch lock
+        unique_uris = list(dict.fromkeys(uri for _, uri in sources))
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_parallel_fetches, len(unique_uris)))) as executor:
+            futures = {uri: executor.submit(self.ref_resolution.resolve_ref, uri) for uri in unique_uris}
+
+            asset_map = {}
+            for ref, resolved_uri in sources:
+                self.logger.info(f"Resolving {ref.type} '{ref.id}' from {resolved_uri}")
+                try:
+                    resolved_path = futures[resolved_uri].result()
+                except Exception as e:
+                    for future in futures.values():
+                        future.cancel()
+                    raise ProfileCompilationError(
+                        f"Failed to resolve component '{ref.id}' from source '{ref.source}': {e}"
+                    ) from e
+                asset_map[ref.id] = resolved_path
+                self.logger.debug(f"  → {resolved_path}")
+
         return asset_map
 
     def _copy_to_profile_cache(
-        self, profile: dict, asset_map: dict[str, Path], refs: list[ComponentRefInternal], cache_dir: Path
-    ) -> dict[str, Path]:
+        self,
+        profile: dict,
+        asset_map: dict[str, Path],
+        refs: list[ComponentRefInternal],
+        cache_dir: Path,
+        previous: dict[str, str] | None = None,
+    ) -> tuple[dict[str, Path], set[str]]:
         """Copy all components to profile-specific cache for self-contained profiles.
 
+        Files are linked from the content-addressed blob store rather than
+        copied, so profiles sharing components share their files on disk.
+        A component already in place is kept unless the previous compilation
+        placed it from a different source; components the previous
+        compilation placed that are no longer used are removed.
+
         Args:
             profile: Profile YAML dictionary
             asset_map: Mapping of component IDs to their cached locations
             refs: List of all component references
             cache_dir: Profile output directory (not .cache/)
+            previous: Components placed by the previous compilation (profile-relative path → source path)
 
         Returns:
-            Updated asset_map with profile cache paths
+            (updated asset_map with profile cache paths, IDs of components placed by this call)
         """
         self.logger.info(f"Creating self-contained profile cache at {cache_dir}")
         cache_dir.mkdir(parents=True, exist_ok=True)
+        previous = previous or {}
 
         profile_asset_map = {}
+        placed: set[str] = set()
 
         for ref in refs:
             if ref.id not in asset_map:
@@ -485,18 +581,23 @@ class ProfileCompilationService:
 
             # Copy component to profile cache
             try:
-                if dest_path.exists():
+                recorded_source = previous.get(self._component_key(dest_path, cache_dir))
+                if dest_path.exists() and recorded_source in (None, str(source_path)):
                     self.logger.debug(f"Profile cache path exists, skipping: {dest_path}")
                 else:
+                    if dest_path.exists():
+                        self.logger.info(f"Source of '{ref.id}' changed, replacing {dest_path}")
+                        shutil.rmtree(dest_path)
                     dest_path.parent.mkdir(parents=True, exist_ok=True)
 
                     if source_path.is_dir():
-                        shutil.copytree(source_path, dest_path)
-                        self.logger.debug(f"Copied directory: {ref.id} -> {dest_path}")
+                        self.blob_store.place_tree(source_path, dest_path)
+                        self.logger.debug(f"Linked directory: {ref.id} -> {dest_path}")
                     else:
                         dest_path.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(source_path, dest_path / source_path.name)
-                        self.logger.debug(f"Copied file: {ref.id} -> {dest_path}")
+                        self.blob_store.place_file(source_path, dest_path / source_path.name)
+                        self.logger.debug(f"Linked file: {ref.id} -> {dest_path}")
+                    placed.add(ref.id)
 
                 profile_asset_map[ref.id] = dest_path
 
@@ -505,8 +606,52 @@ class ProfileCompilationService:
                 # Fall back to shared cache path
                 profile_asset_map[ref.id] = source_path
 
-        self.logger.info(f"Profile cache complete with {len(profile_asset_map)} components")
-        return profile_asset_map
+        # Remove components the previous compilation placed that this one doesn't use
+        current = {self._component_key(path, cache_dir) for path in profile_asset_map.values()}
+        for key in previous.keys() - current:
+            stale_path = cache_dir / key
+            if not Path(key).is_absolute() and stale_path.is_dir():
+                self.logger.info(f"Removing component no longer used: {stale_path}")
+                shutil.rmtree(stale_path)
+
+        self.logger.info(f"Profile cache complete with {len(profile_asset_map)} components ({len(placed)} placed)")
+        return profile_asset_map, placed
+
+    @staticmethod
+    def _component_key(path: Path, profile_dir: Path) -> str:
+        """Manifest key of a component: its path relative to the profile directory."""
+        try:
+            return path.relative_to(profile_dir).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _load_compile_manifest(self, profile_dir: Path) -> dict[str, Any] | None:
+        """Read the previous compilation's manifest, if there is a usable one."""
+        manifest = load_json(profile_dir / COMPILE_MANIFEST_FILENAME)
+        if manifest is None or manifest.get("version") != COMPILE_MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _save_compile_manifest(self, profile_dir: Path, manifest: dict[str, Any]) -> None:
+        """Write the compile manifest (atomically, so readers never see a partial one)."""
+        save_json(profile_dir / COMPILE_MANIFEST_FILENAME, manifest)
+
+    def _is_compilation_current(self, manifest: dict[str, Any], profile_dir: Path, inputs_hash: str) -> bool:
+        """Check whether the previous compilation's output is still valid.
+
+        Args:
+            manifest: Previous compilation's manifest
+            profile_dir: Profile output directory
+            inputs_hash: Digest of the profile and config YAML and the loaded registries
+
+        Returns:
+            True if the previous output can be returned as is
+        """
+        if not manifest.get("pinned") or not manifest.get("complete") or "mount_plan" not in manifest:
+            return False
+        if any(not (profile_dir / key).exists() for key in manifest.get("components", {})):
+            return False
+        return is_fingerprint_current(manifest, inputs_hash, self.ref_resolution)
 
     def _deep_merge(self, base: dict, override: dict) -> dict:
         """Recursively merge two dicts (lists are replaced, dicts merged).
@@ -766,7 +911,7 @@ class ProfileCompilationService:
 
         return mount_plan
 
-    def _install_module_dependencies(self, asset_map: dict[str, Path]) -> None:
+    def _install_module_dependencies(self, asset_map: dict[str, Path]) -> set[str]:
         """Install Python dependencies for modules that have pyproject.toml.
 
         Uses `uv pip install` to install dependencies from each module's pyproject.toml
@@ -774,11 +919,16 @@ class ProfileCompilationService:
 
         Args:
             asset_map: Dictionary mapping component IDs to their local paths
+
+        Returns:
+            IDs of modules whose dependencies failed to install
         """
         import subprocess
         import sys
 
         installed_modules: set[str] = set()
+        failed_modules: set[str] = set()
+        failed: set[str] = set()
 
         for module_id, module_path in asset_map.items():
             if not module_path.is_dir():
@@ -792,8 +942,13 @@ class ProfileCompilationService:
             # (same module might appear in multiple behaviors)
             module_key = str(module_path.resolve())
             if module_key in installed_modules:
+                if module_key in failed_modules:
+                    failed.add(module_id)
                 continue
             installed_modules.add(module_key)
+            # Cleared once the install succeeds
+            failed_modules.add(module_key)
+            failed.add(module_id)
 
             self.logger.info(f"Installing dependencies for module '{module_id}'...")
 
@@ -819,8 +974,12 @@ class ProfileCompilationService:
                     self.logger.warning(f"Failed to install dependencies for '{module_id}': {result.stderr.strip()}")
                 else:
                     self.logger.debug(f"Dependencies installed for '{module_id}'")
+                    failed_modules.discard(module_key)
+                    failed.discard(module_id)
 
             except subprocess.TimeoutExpired:
                 self.logger.warning(f"Timeout installing dependencies for '{module_id}'")
             except Exception as e:
                 self.logger.warning(f"Error installing dependencies for '{module_id}': {e}")
+
+        return failed
@@ -1,7 +1,8 @@
 """Reference resolution service.
 
 Resolves references (git URLs, fsspec paths, local paths) to local filesystem paths, supporting:
-- git+ URLs: Clone/checkout to cache/git/{commit}/
+- git+ URLs: Export to cache/git/{commit}/ from a bare mirror per remote (cache/git/mirrors/),
+  with ref lookups cached in cache/git/refs.json
 - fsspec paths: Resolve to local path
 - local paths: Validate and return resolved path
 """
@@ -9,18 +10,30 @@ Resolves references (git URLs, fsspec paths, local paths) to local filesystem pa
 import hashlib
 import logging
 import shutil
-import subprocess
+import tarfile
 import urllib.parse
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from git import GitCommandError
 from git import Repo
 
 from amplifier_library.storage.paths import get_cache_dir
 from amplifier_library.utils.git_url import parse_git_url
+from amplifierd.services.git_ref_cache import get_git_ref_cache
+from amplifierd.services.git_ref_cache import is_commit_sha
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+MIRRORS_DIRNAME = "mirrors"
+
 
 class RefResolutionError(Exception):
     """Raised when reference resolution fails."""
@@ -30,7 +43,7 @@ class RefResolutionService:
     """Resolves references to local filesystem paths.
 
     Supports:
-      - git+ URLs: Clone/checkout to cache/git/{commit}/
+      - git+ URLs: Export to cache/git/{commit}/ from a bare mirror per remote
       - fsspec paths: Resolve to local path
       - local paths: Validate and return resolved path
     """
@@ -48,8 +61,10 @@ class RefResolutionService:
         self.fsspec_cache_dir = cache_dir / "fsspec"
         self.fsspec_cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Session cache for commit hash lookups
-        self._session_cache: dict[tuple[str, str], str] = {}
+        # Sources resolved through this instance, so callers can tell what a result depended on:
+        # git (repo_url, ref) -> commit hash, and refs with no commit to pin (paths, fsspec, http)
+        self.resolved_commits: dict[tuple[str, str], str] = {}
+        self.unpinned_refs: set[str] = set()
 
     def resolve_ref(self, source_ref: str) -> Path:
         """Resolve reference to local filesystem path.
@@ -68,7 +83,7 @@ class RefResolutionService:
             Path to reference content on local filesystem
 
         Side Effects:
-            - Git clone/checkout to cache/git/{commit}/
+            - Git fetch/export to cache/git/{commit}/
             - May download remote fsspec resources
 
         Raises:
@@ -146,13 +161,16 @@ class RefResolutionService:
                         f"Absolute path does not exist: {source_ref}\nThe path does not exist on the filesystem."
                     )
                 logger.debug(f"Resolved absolute path {source_ref} → {path}")
+                self.unpinned_refs.add(source_ref)
                 return path
 
             # Handle HTTP(S) URLs
             if source_ref.startswith(("https://", "http://")):
+                self.unpinned_refs.add(source_ref)
                 return self._resolve_http_url(source_ref)
 
             # Treat everything else as fsspec path
+            self.unpinned_refs.add(source_ref)
             return self._resolve_fsspec(source_ref)
 
         except RefResolutionError:
@@ -162,7 +180,7 @@ class RefResolutionService:
             raise RefResolutionError(f"Failed to resolve reference {source_ref}: {e}") from e
 
     def _fetch_git(self, repo_url: str, ref: str = "main") -> Path:
-        """Clone/checkout git repo to cache/git/{commit}/.
+        """Export a git ref's files to cache/git/{commit}/.
 
         Args:
             repo_url: Git repository URL (may include git+ prefix, @ref, and #subdirectory=path)
@@ -172,12 +190,12 @@ class RefResolutionService:
             Path to cache/git/{commit-hash}/ or subdirectory within if #subdirectory= specified
 
         Side Effects:
-            Git clone (shallow) if not cached
+            Git fetch into the repository's mirror if not cached, holding cache/git/locks/{repo}.lock
 
         Caching Strategy:
             - Commit hash used as cache key
             - If commit hash exists, return cached path
-            - Otherwise, clone and cache
+            - Otherwise, fetch the commit into the mirror (if it isn't there already) and export it
         """
         # Parse git+ URL using shared utility
         parsed = parse_git_url(repo_url)
@@ -186,49 +204,61 @@ class RefResolutionService:
         ref = parsed.ref
         subdirectory = parsed.subdirectory
 
-        # Try remote lookup before cloning
-        commit_hash = self._get_remote_commit_hash(repo_url, ref)
+        # One fetch per repository at a time, across threads and processes, so concurrent
+        # compilations reuse each other's checkouts instead of racing on temp dirs and renames
+        with self._repo_lock(repo_url):
+            return self._checkout(original_url, repo_url, ref, subdirectory)
+
+    def _checkout(self, original_url: str, repo_url: str, ref: str, subdirectory: str | None) -> Path:
+        """Get the cached export of a ref, fetching it if needed (caller holds the repo lock).
+
+        Args:
+            original_url: Reference as given, for error messages
+            repo_url: Git repository URL (clean URL without git+ or fragments)
+            ref: Branch name or commit hash
+            subdirectory: Optional subdirectory of the repository to cache
+
+        Returns:
+            Path to cache/git/{commit-hash}/ or cache/git/{commit-hash}_{subdirectory}/
+        """
+        # Try cached/remote lookup before cloning
+        commit_hash = self.resolve_commit(repo_url, ref)
 
         if commit_hash:
             cache_key = self._compute_cache_key(commit_hash, subdirectory)
             cache_dir = self.git_cache_dir / cache_key
 
             if cache_dir.exists():
-                logger.info(f"Using cached ref (no clone needed): {cache_key}")
+                logger.info(f"Using cached ref (no fetch needed): {cache_key}")
+                self.resolved_commits[(repo_url, ref)] = commit_hash
                 return cache_dir
 
-        # Create temporary directory for clone
+        # Export the tree from the repository's mirror into a temporary directory, then rename into place
         temp_dir = self.git_cache_dir / f"temp_{uuid.uuid4().hex[:8]}"
 
         try:
-            logger.info(f"Cloning {repo_url} ref={ref}" + (f" subdirectory={subdirectory}" if subdirectory else ""))
-
-            # Shallow clone to get commit hash
-            repo = Repo.clone_from(
-                repo_url,
-                temp_dir,
-                branch=ref,
-                depth=1,  # Shallow clone for speed
-            )
-
-            commit_hash = repo.head.commit.hexsha
-            logger.debug(f"Git clone resulted in commit: {commit_hash}")
+            mirror = self._get_mirror(repo_url)
+            commit_hash = self._fetch_commit(mirror, repo_url, ref, commit_hash)
+            self.resolved_commits[(repo_url, ref)] = commit_hash
+            get_git_ref_cache().record(repo_url, ref, commit_hash)
 
             # Build cache key including subdirectory if specified
-            cache_key = commit_hash if not subdirectory else f"{commit_hash}_{subdirectory.replace('/', '_')}"
+            cache_key = self._compute_cache_key(commit_hash, subdirectory)
             cache_dir = self.git_cache_dir / cache_key
 
             # Check if already cached
             if cache_dir.exists():
                 logger.info(f"Using cached ref: {cache_key}")
-                shutil.rmtree(temp_dir)
                 return cache_dir
 
-            # If subdirectory specified, extract it
+            treeish = commit_hash
             if subdirectory:
-                source_subdir = temp_dir / subdirectory
-                if not source_subdir.exists():
-                    shutil.rmtree(temp_dir)
+                treeish = f"{commit_hash}:{subdirectory.strip('/')}"
+                try:
+                    is_tree = mirror.git.cat_file("-t", treeish) == "tree"
+                except GitCommandError:
+                    is_tree = False
+                if not is_tree:
                     raise RefResolutionError(
                         f"Subdirectory '{subdirectory}' not found in repository\n"
                         f"Repository URL: {repo_url}\n"
@@ -236,13 +266,9 @@ class RefResolutionService:
                         f"Subdirectory: {subdirectory}"
                     )
 
-                # Move subdirectory to cache location
-                logger.info(f"Extracting subdirectory '{subdirectory}' to cache at {cache_key}")
-                shutil.move(str(source_subdir), str(cache_dir))
-                shutil.rmtree(temp_dir)
-                return cache_dir
+            logger.info(f"Exporting {repo_url}@{commit_hash[:8]}" + (f":{subdirectory}" if subdirectory else ""))
+            self._export_tree(mirror, treeish, temp_dir)
 
-            # Move entire repo to cache location
             logger.info(f"Caching ref at {cache_key}")
             temp_dir.rename(cache_dir)
             return cache_dir
@@ -264,59 +290,134 @@ class RefResolutionService:
                 f"  4. Try manual git clone: git clone {repo_url} -b {ref}"
             ) from e
 
-    def _get_remote_commit_hash(self, repo_url: str, ref: str) -> str | None:
-        """Get commit hash from remote without cloning using git ls-remote.
+    def _get_mirror(self, repo_url: str) -> Repo:
+        """Get the bare mirror of a repository, creating it if needed (caller holds the repo lock).
+
+        Each remote has one bare repository under cache/git/mirrors/ that
+        accumulates the commits fetched from it, so later commits only
+        transfer what changed.
 
         Args:
             repo_url: Git repository URL (clean URL without git+ or fragments)
-            ref: Git ref (branch, tag, or commit)
 
         Returns:
-            40-character commit hash if successful, None if command fails
+            Bare repository with the remote configured as origin
+        """
+        mirror_dir = self.git_cache_dir / MIRRORS_DIRNAME / f"{hashlib.sha256(repo_url.encode()).hexdigest()[:16]}.git"
+        if (mirror_dir / "HEAD").exists():
+            return Repo(mirror_dir)
 
-        Side Effects:
-            None - reads remote state only, no local operations
+        if mirror_dir.exists():
+            # Left behind by an interrupted initialization
+            shutil.rmtree(mirror_dir)
+        logger.info(f"Creating mirror of {repo_url}")
+        mirror = Repo.init(mirror_dir, bare=True, mkdir=True)
+        mirror.create_remote("origin", repo_url)
+        return mirror
 
-        Performance:
-            Typically 100-300ms network call vs 2-10s clone
-            Session cache provides instant lookup for repeated references
+    def _fetch_commit(self, mirror: Repo, repo_url: str, ref: str, commit_hash: str | None) -> str:
+        """Make sure the mirror has the commit a ref points to, fetching only if it doesn't.
+
+        Args:
+            mirror: Bare mirror of the repository
+            repo_url: Git repository URL, for logging
+            ref: Branch name, tag name or commit hash
+            commit_hash: Commit the ref is known to point to, if any
+
+        Returns:
+            Commit hash the ref points to
+
+        Raises:
+            GitCommandError: If the fetch fails (the ref is neither a branch nor a tag)
         """
-        # Check session cache first
-        cache_key = (repo_url, ref)
-        if cache_key in self._session_cache:
-            logger.debug(f"Session cache hit for {repo_url}@{ref}")
-            return self._session_cache[cache_key]
+        if commit_hash and self._has_commit(mirror, commit_hash):
+            logger.debug(f"Mirror of {repo_url} already has {commit_hash[:8]}")
+            return commit_hash
+
+        if is_commit_sha(ref):
+            logger.info(f"Fetching {repo_url} commit {ref[:8]}")
+            mirror.git.fetch("origin", ref)
+            return mirror.git.rev_parse(f"{ref}^{{commit}}")
 
+        logger.info(f"Fetching {repo_url} ref={ref}")
         try:
-            # Run git ls-remote to query commit hash
-            result = subprocess.run(
-                ["git", "ls-remote", repo_url, f"refs/heads/{ref}"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                check=False,
-            )
-
-            # Parse output: "<hash>\trefs/heads/<ref>"
-            if result.returncode == 0 and result.stdout.strip():
-                commit_hash = result.stdout.split()[0]
-                logger.debug(f"Remote commit hash for {repo_url}@{ref}: {commit_hash}")
-
-                # Store in session cache
-                self._session_cache[cache_key] = commit_hash
-                return commit_hash
-
-            logger.debug(
-                f"git ls-remote failed for {repo_url}@{ref}: rc={result.returncode}, stderr={result.stderr.strip()}"
-            )
-            return None
-
-        except subprocess.TimeoutExpired:
-            logger.warning(f"git ls-remote timeout for {repo_url}@{ref}")
-            return None
-        except Exception as e:
-            logger.debug(f"git ls-remote error for {repo_url}@{ref}: {e}")
-            return None
+            mirror.git.fetch("origin", f"+refs/heads/{ref}:refs/heads/{ref}")
+            return mirror.git.rev_parse(f"refs/heads/{ref}^{{commit}}")
+        except GitCommandError:
+            # Not a branch; try a tag of that name (git clone --branch accepts both)
+            logger.debug(f"{repo_url} has no branch {ref}, fetching it as a tag")
+        mirror.git.fetch("origin", f"+refs/tags/{ref}:refs/tags/{ref}")
+        return mirror.git.rev_parse(f"refs/tags/{ref}^{{commit}}")
+
+    @staticmethod
+    def _has_commit(mirror: Repo, commit_hash: str) -> bool:
+        try:
+            mirror.git.cat_file("-e", f"{commit_hash}^{{commit}}")
+        except GitCommandError:
+            return False
+        return True
+
+    @staticmethod
+    def _export_tree(mirror: Repo, treeish: str, dest: Path) -> None:
+        """Write the files of a tree (git archive) into a new directory.
+
+        Args:
+            mirror: Repository holding the tree
+            treeish: Commit, or commit:path for a subdirectory
+            dest: Directory to create
+        """
+        dest.mkdir()
+        archive_path = dest.with_name(f"{dest.name}.tar")
+        try:
+            with open(archive_path, "wb") as archive:
+                mirror.archive(archive, treeish, format="tar")
+            with tarfile.open(archive_path) as tar:
+                # Entries come from git archive (no absolute or ../ paths); keep symlinks as in a checkout
+                if hasattr(tarfile, "tar_filter"):
+                    tar.extractall(dest, filter="tar")
+                else:
+                    tar.extractall(dest)
+        finally:
+            archive_path.unlink(missing_ok=True)
+
+    def resolve_commit(self, repo_url: str, ref: str, refresh: bool = False) -> str | None:
+        """Get the commit a git ref points to, without fetching.
+
+        Lookups go through the process-wide ref cache (see git_ref_cache), so
+        a ref is looked up on the remote at most once per TTL across all
+        instances, pinned commit hashes need no lookup at all, and the last
+        known commit is used when the remote can't be reached.
+
+        Args:
+            repo_url: Git repository URL (clean URL without git+ or fragments)
+            ref: Git ref (branch or commit hash)
+            refresh: Ask the remote even if the cached commit is still fresh
+
+        Returns:
+            40-character commit hash if known, None otherwise
+
+        Performance:
+            Cache hit is a dict lookup; a miss is a 100-300ms git ls-remote
+        """
+        return get_git_ref_cache().lookup(repo_url, ref, refresh=refresh)
+
+    @contextmanager
+    def _repo_lock(self, repo_url: str) -> Iterator[None]:
+        """Serialize fetches of a repository across threads and processes (no-op where flock is unavailable)."""
+        if fcntl is None:
+            yield
+            return
+
+        lock_dir = self.git_cache_dir / "locks"
+        lock_dir.mkdir(exist_ok=True)
+        lock_path = lock_dir / f"{hashlib.sha256(repo_url.encode()).hexdigest()[:16]}.lock"
+        # Each open() is its own lock holder, so this also serializes threads of one process
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
     def _compute_cache_key(self, commit_hash: str, subdirectory: str | None) -> str:
         """Compute cache key from commit hash and optional subdirectory.
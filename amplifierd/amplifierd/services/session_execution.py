@@ -0,0 +1,290 @@
+"""Starting and controlling session executions.
+
+The send-message flow (mount plan, runtime mentions, stream manager,
+background execution task) lives here rather than in the router so it can
+run either in the API process or in an execution worker process (see
+execution_pool.py) that owns the session's runner.
+
+Contract:
+- Inputs: Session IDs, user messages
+- Outputs: Execution status
+- Side Effects: Creates stream managers and runners, starts background
+  execution tasks, emits stream events, resolves pending approvals
+"""
+
+import asyncio
+import logging
+
+from amplifier_library.execution.response import ResponseBuffer
+from amplifier_library.sessions.manager import SessionManager
+
+logger = logging.getLogger(__name__)
+
+# Approval management (in-memory for simplicity; lives in the process running the execution)
+pending_approvals: dict[str, asyncio.Event] = {}
+approval_responses: dict[str, str] = {}
+
+
+async def start_session_execution(session_id: str, content: str, service: SessionManager) -> dict[str, str]:
+    """Trigger execution of a user message in the background.
+
+    All events (user message, content, completion) are broadcast via the
+    session's SessionStreamManager to /stream subscribers.
+
+    Args:
+        session_id: Session ID
+        content: User message
+        service: Session manager
+
+    Returns:
+        Status confirmation
+
+    Raises:
+        FileNotFoundError: If session not found
+    """
+    metadata = service.get_session(session_id)
+    if metadata is None:
+        raise FileNotFoundError(f"Session {session_id} not found")
+
+    # Convert to library SessionMetadata
+    import json
+    from datetime import UTC
+    from datetime import datetime
+
+    from amplifier_library.models.sessions import SessionMetadata as LibrarySessionMetadata
+    from amplifier_library.storage import get_state_dir
+
+    from .session_stream_registry import get_stream_registry
+
+    session = LibrarySessionMetadata(**metadata.model_dump())
+
+    # Get config and paths
+    from pathlib import Path
+
+    from amplifier_library.config.loader import load_config
+    from amplifier_library.storage.paths import get_profiles_dir
+    from amplifier_library.storage.paths import get_share_dir
+
+    from ..routers.sessions import _inject_runtime_config
+    from .mention_resolver import MentionResolver
+    from .mount_plan_service import MountPlanService
+
+    config = load_config()
+    data_dir = Path(config.data_path)
+    state_dir = get_state_dir()
+    share_dir = get_share_dir()
+
+    # Get amplified_dir and profile_name from session metadata
+    amplified_dir = Path(metadata.amplified_dir) if metadata.amplified_dir else Path(".")
+    if not amplified_dir.is_absolute():
+        amplified_dir = data_dir / amplified_dir
+    profile_name = metadata.profile_name
+
+    # Get mount plan from profile (single source of truth, cached until the profile changes)
+    mount_plan_service = MountPlanService(share_dir=share_dir)
+    mount_plan = mount_plan_service.generate_mount_plan(profile_name, amplified_dir)
+
+    # Inject runtime configuration (working_dir, session_log_template, etc.)
+    _inject_runtime_config(mount_plan, session_id, str(amplified_dir))
+
+    registry = get_stream_registry()
+    existing_manager = registry.get(session_id)
+    mount_plan_changed = existing_manager is None or existing_manager.mount_plan != mount_plan
+
+    # Save mount_plan.json for observability (snapshot of what was used)
+    if mount_plan_changed:
+        mount_plan_path = state_dir / "sessions" / session_id / "mount_plan.json"
+        mount_plan_path.write_text(json.dumps(mount_plan, indent=2))
+        logger.info(f"Saved mount plan for session {session_id}")
+
+    # Get compiled profile directory for mention resolution
+    compiled_profile_dir = get_profiles_dir() / profile_name
+
+    # Resolve runtime mentions (AGENTS.md + user message)
+    resolver = MentionResolver(
+        compiled_profile_dir=compiled_profile_dir,
+        amplified_dir=amplified_dir,
+        data_dir=data_dir,
+    )
+    runtime_context_messages = resolver.resolve_runtime_mentions(content)
+    logger.info(f"Resolved {len(runtime_context_messages)} runtime context messages")
+
+    # Update/create stream manager with the mount plan
+    if existing_manager:
+        # Keep the warm runner unless the mount plan actually changed
+        if mount_plan_changed:
+            await existing_manager.update_mount_plan(mount_plan)
+            logger.debug(f"Updated existing manager with new mount plan for session {session_id}")
+        manager = existing_manager
+    else:
+        # Create new manager
+        manager = await registry.get_or_create(session_id, mount_plan)
+
+    # Note: Don't save user message here - ExecutionRunner.execute_stream() does it
+    # to avoid duplicates in transcript
+
+    # Emit user_message_saved to ALL subscribers
+    await manager.emitter.emit(
+        "user_message_saved",
+        {"role": "user", "content": content, "timestamp": datetime.now(UTC).isoformat()},
+    )
+
+    # Get runner (handles hook mounting internally via _hooks_mounted flag)
+    runner = await manager.get_runner(session)
+
+    # Emit assistant_message_start to SSE subscribers
+    await manager.emitter.emit(
+        "assistant_message_start",
+        {"timestamp": datetime.now(UTC).isoformat()},
+    )
+
+    # Also emit through hooks system for ExecutionTraceHook
+    if manager.hook_registry:
+        await manager.hook_registry.emit(
+            "assistant_message:start",
+            {"user_message": content, "timestamp": datetime.now(UTC).isoformat()},
+        )
+
+    # Execute in background task - don't block response
+    async def execute_and_emit():
+        failed = False
+        try:
+            response = ResponseBuffer()
+            async for token in runner.execute_stream(session, content, runtime_context_messages, response=response):
+                # Emit each token to ALL subscribers
+                await manager.emitter.emit("content", {"type": "content", "content": token})
+
+            # Note: Don't save assistant message here - ExecutionRunner.execute_stream() does it
+            # to avoid duplicates in transcript
+
+            # Emit completion to ALL subscribers
+            if response:
+                full_response = response.text
+                await manager.emitter.emit(
+                    "assistant_message_complete",
+                    {
+                        "role": "assistant",
+                        "content": full_response,
+                        "timestamp": datetime.now(UTC).isoformat(),
+                    },
+                )
+
+                # Also emit through hooks system for ExecutionTraceHook
+                if manager.hook_registry:
+                    await manager.hook_registry.emit(
+                        "assistant_message:complete",
+                        {"content": full_response, "timestamp": datetime.now(UTC).isoformat()},
+                    )
+
+                # Mark session as unread so user sees badge when viewing another session
+                # Only mark unread if:
+                # 1. No one is currently viewing (no active SSE subscribers in any daemon process)
+                # 2. Session was previously read (avoid unnecessary writes)
+                has_active_viewers = manager.has_viewers()
+                if not has_active_viewers:
+                    current_session = service.get_session(session_id)
+                    if current_session and not current_session.is_unread:
+                        service.update_session_fields(session_id, is_unread=True)
+                        # Import here to avoid circular imports at module level
+                        from ..models.events import SessionUpdatedEvent
+                        from .global_events import GlobalEventService
+
+                        await GlobalEventService.emit(
+                            SessionUpdatedEvent(
+                                project_id=current_session.amplified_dir,
+                                session_id=session_id,
+                                fields_changed=["is_unread"],
+                            )
+                        )
+                        logger.debug(f"Marked session {session_id} as unread after assistant response")
+                else:
+                    logger.debug(f"Session {session_id} has active viewers, not marking as unread")
+        except asyncio.CancelledError:
+            failed = True
+            logger.info(f"Execution cancelled for session {session_id}")
+            await manager.emitter.emit(
+                "execution_cancelled",
+                {"timestamp": datetime.now(UTC).isoformat()},
+            )
+            raise  # Re-raise to properly terminate the task
+        except Exception as e:
+            failed = True
+            logger.error(f"Execution error in background task: {e}")
+            await manager.emitter.emit("execution_error", {"error": str(e)})
+        finally:
+            manager.clear_execution_task()
+            if failed:
+                # The context may hold a partial turn; rebuild it from the transcript next time
+                await manager.evict_runner()
+
+    # Start execution in background and track the task
+    task = asyncio.create_task(execute_and_emit())
+    manager.set_execution_task(task)
+
+    # Return immediately
+    return {"status": "executing", "session_id": session_id}
+
+
+def cancel_session_execution(session_id: str) -> bool:
+    """Cancel the session's background execution, if any.
+
+    Args:
+        session_id: Session ID
+
+    Returns:
+        True if an execution was cancelled
+    """
+    from .session_stream_registry import get_stream_registry
+
+    manager = get_stream_registry().get(session_id)
+    return manager is not None and manager.cancel_execution()
+
+
+async def evict_session_runner(session_id: str) -> bool:
+    """Drop the session's warm runner so the next execution rebuilds its context.
+
+    Used after the transcript is changed outside an execution (e.g. the last
+    message deleted), which the live context would otherwise still hold.
+
+    Args:
+        session_id: Session ID
+
+    Returns:
+        True if a runner was evicted
+    """
+    from .session_stream_registry import get_stream_registry
+
+    manager = get_stream_registry().get(session_id)
+    return manager is not None and await manager.evict_runner()
+
+
+def has_active_execution(session_id: str) -> bool:
+    """Check whether the session has a background execution running.
+
+    Args:
+        session_id: Session ID
+    """
+    from .session_stream_registry import get_stream_registry
+
+    manager = get_stream_registry().get(session_id)
+    return manager is not None and manager.has_active_execution()
+
+
+def resolve_approval(approval_id: str, response: str) -> bool:
+    """Deliver a user's approval decision to the execution waiting on it.
+
+    Args:
+        approval_id: Approval identifier
+        response: User's decision
+
+    Returns:
+        True if an execution in this process was waiting on the approval
+    """
+    event = pending_approvals.get(approval_id)
+    if event is None:
+        return False
+
+    # Store response, then signal waiting execution
+    approval_responses[approval_id] = response
+    event.set()
+    return True
@@ -5,18 +5,30 @@ Manages streaming infrastructure for a single session including:
 - StreamingHookRegistry for hook events
 - ExecutionRunner lifecycle
 
+Idle managers are evicted by the session reaper (session_stream_registry.py):
+evicting drops the warm runner, and the next get_runner() rebuilds it with
+the conversation rehydrated from the transcript.
+
 Note: Execution trace persistence is handled by hooks-logging (amplifier_core)
 which writes to events.jsonl. Trace is aggregated on-the-fly when requested.
 """
 
 import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
+from amplifier_library.execution.plan_diff import diff_mount_plans
 from amplifier_library.execution.runner import ExecutionRunner
 
 from ..hooks import StreamingHookRegistry
 from ..streaming import EventQueueEmitter  # type: ignore[attr-defined]
+from ..streaming import SubscriberQueue
+from ..streaming import get_content_coalescing
+from ..streaming import get_replay_ring_size
+from .session_viewers import has_viewers
+from .session_viewers import hold_viewer
+from .session_viewers import release_viewer
 
 if TYPE_CHECKING:
     from amplifier_library.models import Session
@@ -45,8 +57,15 @@ class SessionStreamManager:
         self.session_id = session_id
         self.mount_plan = mount_plan
 
-        # Create streaming infrastructure
-        self.emitter = EventQueueEmitter()
+        # Create streaming infrastructure (recent events kept so reconnecting clients can resume,
+        # content deltas batched before fan-out)
+        coalesce_ms, coalesce_bytes = get_content_coalescing()
+        self.emitter = EventQueueEmitter(
+            replay_size=get_replay_ring_size(),
+            coalesce_ms=coalesce_ms,
+            coalesce_bytes=coalesce_bytes,
+            channel=f"session:{session_id}",
+        )
         # StreamingHookRegistry created in mount_hooks() to wrap the session's registry
         self.hook_registry: StreamingHookRegistry | None = None
 
@@ -58,6 +77,12 @@ class SessionStreamManager:
         # Current execution task (for cancellation support)
         self._current_execution_task: asyncio.Task | None = None
 
+        # Monotonic time of the last use, for idle/LRU eviction
+        self.last_used = time.monotonic()
+
+        # Viewer presence shared with other processes while subscribers are connected
+        self._viewer_hold: int | None = None
+
         logger.info(f"Created SessionStreamManager for {session_id}")
 
     async def get_runner(self: "SessionStreamManager", session: "Session") -> ExecutionRunner:
@@ -69,14 +94,13 @@ class SessionStreamManager:
         Returns:
             ExecutionRunner configured with streaming hooks
         """
+        self.touch()
         if self._runner is None:
             # Import here to avoid circular dependency
-            from amplifier_library.sessions.manager import SessionManager
-            from amplifier_library.storage.paths import get_state_dir
+            from amplifier_library.sessions.manager import get_session_manager
 
-            # Create session manager
-            state_dir = get_state_dir()
-            session_manager = SessionManager(state_dir)
+            # Shared session manager (one metadata cache per process)
+            session_manager = get_session_manager()
 
             # Create runner
             self._runner = ExecutionRunner(
@@ -130,21 +154,32 @@ class SessionStreamManager:
 
             logger.info(f"Mounted StreamingHookRegistry (wrapping existing registry) for session {self.session_id}")
 
-    def subscribe(self: "SessionStreamManager") -> asyncio.Queue:
+    def subscribe(self: "SessionStreamManager", after_id: int | None = None) -> SubscriberQueue:
         """Create new SSE subscriber queue.
 
+        Args:
+            after_id: Last event id the client received, to replay what it missed
+
         Returns:
-            asyncio.Queue that will receive all emitted events
+            Bounded SubscriberQueue that will receive all emitted events
         """
-        return self.emitter.subscribe()
+        self.touch()
+        queue = self.emitter.subscribe(after_id)
+        if self._viewer_hold is None:
+            self._viewer_hold = hold_viewer(self.session_id)
+        return queue
 
-    def unsubscribe(self: "SessionStreamManager", queue: asyncio.Queue) -> None:
+    def unsubscribe(self: "SessionStreamManager", queue: SubscriberQueue) -> None:
         """Remove SSE subscriber.
 
         Args:
             queue: Queue to remove
         """
+        self.touch()
         self.emitter.unsubscribe(queue)
+        if not self.emitter.queues:
+            release_viewer(self._viewer_hold)
+            self._viewer_hold = None
 
     def set_execution_task(self: "SessionStreamManager", task: asyncio.Task) -> None:
         """Set the current execution task for cancellation support.
@@ -157,6 +192,30 @@ class SessionStreamManager:
     def clear_execution_task(self: "SessionStreamManager") -> None:
         """Clear the current execution task reference."""
         self._current_execution_task = None
+        self.touch()
+
+    def touch(self: "SessionStreamManager") -> None:
+        """Mark the session as just used."""
+        self.last_used = time.monotonic()
+
+    @property
+    def is_warm(self: "SessionStreamManager") -> bool:
+        """Whether a runner (and its AmplifierSession) is held in memory."""
+        return self._runner is not None
+
+    @property
+    def warm_bytes(self: "SessionStreamManager") -> int:
+        """Approximate memory held by the warm runner's context."""
+        return self._runner.context_bytes if self._runner is not None else 0
+
+    @property
+    def subscriber_count(self: "SessionStreamManager") -> int:
+        """Number of connected SSE subscribers."""
+        return len(self.emitter.queues)
+
+    def has_viewers(self: "SessionStreamManager") -> bool:
+        """Check whether the session has SSE subscribers in this or any other process."""
+        return self.subscriber_count > 0 or has_viewers(self.session_id)
 
     def has_active_execution(self: "SessionStreamManager") -> bool:
         """Check if there is an active execution in progress.
@@ -179,18 +238,40 @@ class SessionStreamManager:
         return False
 
     async def update_mount_plan(self: "SessionStreamManager", new_mount_plan: dict) -> None:
-        """Update mount plan and invalidate runner.
+        """Update mount plan, invalidating the runner only if the plan changed.
+
+        The runner (and its warm AmplifierSession) is kept when the plans are
+        equivalent. Any change, including a config-only one, rebuilds it.
 
         Args:
             new_mount_plan: New mount plan configuration
         """
+        diff = diff_mount_plans(self.mount_plan, new_mount_plan)
+        if diff.is_empty:
+            logger.debug(f"Mount plan unchanged for session {self.session_id}, keeping runner")
+            return
+
         self.mount_plan = new_mount_plan
         if self._runner:
             await self._runner.cleanup()
             self._runner = None
         self._runner_initialized = False
         self._hooks_mounted = False
-        logger.info(f"Updated mount plan for session {self.session_id}")
+        logger.info(f"Updated mount plan for session {self.session_id} ({', '.join(diff.changes)})")
+
+    async def evict_runner(self: "SessionStreamManager") -> bool:
+        """Drop the warm runner to free memory, unless it is executing.
+
+        Subscribers stay connected; the next get_runner() rehydrates the
+        runner from the transcript.
+
+        Returns:
+            True if a runner was evicted
+        """
+        if self._runner is None or self.has_active_execution():
+            return False
+        await self.cleanup()
+        return True
 
     async def cleanup(self: "SessionStreamManager") -> None:
         """Clean up resources when session ends."""
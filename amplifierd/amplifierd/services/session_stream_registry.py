@@ -3,10 +3,22 @@
 Provides:
 - SessionStreamRegistry: Manages SessionStreamManager instances (for SSE streaming)
 - ExecutionRunnerRegistry: Manages ExecutionRunner instances (for profile switching)
+- A background reaper that evicts idle sessions from both
+
+Eviction:
+- A session idle longer than the idle timeout loses its warm runner; if no
+  SSE client is connected, its stream manager is removed as well.
+- Beyond that, warm runners are evicted least recently used first while
+  there are more than max_warm sessions or their contexts hold more than
+  max_bytes (the most recently used session is always kept).
+- Sessions that are executing are never evicted. An evicted session is
+  rebuilt on next use, with its conversation reloaded from the transcript.
 """
 
 import asyncio
+import contextlib
 import logging
+import time
 from datetime import datetime
 from datetime import timedelta
 from typing import Any
@@ -48,7 +60,9 @@ class SessionStreamRegistry:
             if session_id not in self._managers:
                 self._managers[session_id] = SessionStreamManager(session_id, mount_plan)
                 logger.info(f"Created SessionStreamManager for session {session_id}")
-            return self._managers[session_id]
+            manager = self._managers[session_id]
+            manager.touch()
+            return manager
 
     async def cleanup_session(self: "SessionStreamRegistry", session_id: str) -> None:
         """Remove manager when session ends.
@@ -86,6 +100,59 @@ class SessionStreamRegistry:
             await manager.update_mount_plan(new_mount_plan)
             logger.info(f"Updated mount plan for session {session_id}")
 
+    async def reap(
+        self: "SessionStreamRegistry",
+        idle_timeout: float | None = None,
+        max_warm: int | None = None,
+        max_bytes: int | None = None,
+    ) -> int:
+        """Evict idle sessions, then least recently used runners over budget.
+
+        Args:
+            idle_timeout: Seconds without use before a session is evicted (None = no idle eviction)
+            max_warm: Maximum sessions with a warm runner (None = unlimited)
+            max_bytes: Maximum context bytes held by warm runners (None = unlimited)
+
+        Returns:
+            Number of runners and managers evicted
+        """
+        evicted = 0
+        async with self._lock:
+            now = time.monotonic()
+            if idle_timeout is not None:
+                for session_id, manager in list(self._managers.items()):
+                    if now - manager.last_used <= idle_timeout or manager.has_active_execution():
+                        continue
+                    if manager.subscriber_count == 0:
+                        await manager.cleanup()
+                        del self._managers[session_id]
+                        evicted += 1
+                        logger.info(f"Evicted idle session {session_id}")
+                    elif await manager.evict_runner():
+                        evicted += 1
+                        logger.info(f"Evicted idle runner for session {session_id}")
+
+            warm = sorted((m for m in self._managers.values() if m.is_warm), key=lambda m: m.last_used)
+            total_bytes = sum(m.warm_bytes for m in warm)
+            # Oldest first; the most recently used session is never evicted for the budget
+            for manager in warm[:-1]:
+                over_count = max_warm is not None and len(warm) > max_warm
+                over_bytes = max_bytes is not None and total_bytes > max_bytes
+                if not over_count and not over_bytes:
+                    break
+                size = manager.warm_bytes
+                if await manager.evict_runner():
+                    warm.remove(manager)
+                    total_bytes -= size
+                    evicted += 1
+                    logger.info(f"Evicted least recently used runner for session {manager.session_id}")
+
+        return evicted
+
+    def get_warm_count(self: "SessionStreamRegistry") -> int:
+        """Get count of sessions holding a warm runner."""
+        return sum(1 for manager in self._managers.values() if manager.is_warm)
+
     async def cleanup_all(self: "SessionStreamRegistry") -> None:
         """Clean up all managers (for shutdown)."""
         async with self._lock:
@@ -126,12 +193,10 @@ class ExecutionRunnerRegistry:
         async with self._lock:
             if session_id not in self._runners:
                 # Import here to avoid circular dependency
-                from amplifier_library.sessions.manager import SessionManager
-                from amplifier_library.storage.paths import get_state_dir
+                from amplifier_library.sessions.manager import get_session_manager
 
-                # Create session manager
-                state_dir = get_state_dir()
-                session_manager = SessionManager(state_dir)
+                # Shared session manager (one metadata cache per process)
+                session_manager = get_session_manager()
 
                 self._runners[session_id] = ExecutionRunner(
                     session_manager=session_manager,
@@ -255,3 +320,75 @@ async def cleanup_idle_runners(idle_timeout: timedelta = timedelta(hours=1)) ->
 def get_active_runner_count() -> int:
     """Get count of active runners."""
     return _runner_registry.get_active_count()
+
+
+# --- Session reaper ---
+
+_reaper_task: asyncio.Task | None = None
+
+
+async def reap_sessions(
+    idle_timeout: float | None = None,
+    max_warm: int | None = None,
+    max_bytes: int | None = None,
+) -> int:
+    """Run one eviction pass over both registries.
+
+    Args:
+        idle_timeout: Seconds without use before a session is evicted (None = no idle eviction)
+        max_warm: Maximum sessions with a warm runner (None = unlimited)
+        max_bytes: Maximum context bytes held by warm runners (None = unlimited)
+
+    Returns:
+        Number of evicted runners and managers
+    """
+    evicted = await _stream_registry.reap(idle_timeout, max_warm, max_bytes)
+    if idle_timeout is not None:
+        evicted += await _runner_registry.cleanup_idle(timedelta(seconds=idle_timeout))
+    return evicted
+
+
+def start_session_reaper(
+    interval: float,
+    idle_timeout: float | None = None,
+    max_warm: int | None = None,
+    max_bytes: int | None = None,
+) -> None:
+    """Start evicting idle and over-budget sessions in the background.
+
+    Args:
+        interval: Seconds between eviction passes
+        idle_timeout: Seconds without use before a session is evicted (None = no idle eviction)
+        max_warm: Maximum sessions with a warm runner (None = unlimited)
+        max_bytes: Maximum context bytes held by warm runners (None = unlimited)
+
+    Raises:
+        ValueError: If interval is not positive
+    """
+    global _reaper_task
+
+    if interval <= 0:
+        raise ValueError(f"Reaper interval must be positive, got {interval}")
+
+    async def run() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await reap_sessions(idle_timeout, max_warm, max_bytes)
+            except Exception as e:
+                logger.error(f"Session reaper pass failed: {e}")
+
+    if _reaper_task is not None:
+        _reaper_task.cancel()
+    _reaper_task = asyncio.create_task(run())
+
+
+async def stop_session_reaper() -> None:
+    """Stop the background reaper, if running."""
+    global _reaper_task
+
+    task, _reaper_task = _reaper_task, None
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
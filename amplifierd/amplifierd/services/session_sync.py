@@ -0,0 +1,75 @@
+"""Keep session metadata caches coherent across daemon processes.
+
+Every process (API workers, execution workers) has its own SessionManager
+with an in-memory metadata cache over the shared store. Each metadata write
+is announced on the event bus ("sessions" channel), and the other processes
+drop their cached copy so the next read goes to the store.
+
+Contract:
+- Inputs: Event bus events, SessionManager metadata writes
+- Outputs: Event bus handler for the daemon
+- Side Effects: Publishes session changes on the event bus, invalidates cached metadata
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any
+
+from amplifier_library.sessions.manager import get_session_manager
+
+from ..event_bus import get_event_bus
+from ..streaming import deliver_remote_event
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_CHANNEL = "sessions"
+SESSION_CHANGED_EVENT = "session:changed"
+
+_sharing = False
+_sharing_lock = threading.Lock()
+
+
+def handle_bus_event(channel: str, event_type: str, data: dict[str, Any]) -> None:
+    """Event bus handler: apply session changes, pass stream events to emitters.
+
+    Args:
+        channel: Event bus channel
+        event_type: Event type identifier
+        data: Event payload
+    """
+    if channel == SESSIONS_CHANNEL:
+        session_id = data.get("session_id")
+        if event_type == SESSION_CHANGED_EVENT and isinstance(session_id, str):
+            get_session_manager().invalidate(session_id)
+        return
+    deliver_remote_event(channel, event_type, data)
+
+
+def share_session_changes() -> None:
+    """Announce this process's session metadata writes on the event bus.
+
+    Must be called from the event loop thread; writes made from other
+    threads are handed to the loop, since bus transports are not
+    thread-safe. Calling it again has no effect.
+    """
+    global _sharing
+
+    loop = asyncio.get_running_loop()
+    loop_thread = threading.get_ident()
+
+    def publish(session_id: str) -> None:
+        get_event_bus().publish(SESSIONS_CHANNEL, SESSION_CHANGED_EVENT, {"session_id": session_id})
+
+    def on_change(session_id: str) -> None:
+        if threading.get_ident() == loop_thread:
+            publish(session_id)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(publish, session_id)
+
+    with _sharing_lock:
+        if _sharing:
+            return
+        _sharing = True
+    get_session_manager().add_change_listener(on_change)
+    logger.debug("Sharing session metadata changes on the event bus")
@@ -0,0 +1,93 @@
+"""Track which sessions are being viewed, across daemon processes.
+
+A session's SSE subscribers live in whichever API process served the
+/stream request, while its execution may run in another API worker or in
+an execution worker (execution_pool.py). The executing process decides
+whether to mark the session unread, so it needs to know about viewers it
+cannot see in its own emitter.
+
+Every process with SSE subscribers for a session holds a shared flock on
+"{state}/sessions/{session_id}/viewers.lock". A session has viewers if an
+exclusive lock on that file cannot be taken. The kernel releases the
+locks of a process that exits, so a crashed API worker never leaves a
+stale viewer behind.
+
+Contract:
+- Inputs: Session IDs
+- Outputs: Viewer holds, viewer presence
+- Side Effects: Creates and flocks viewers.lock in the session directory
+
+Where flock is unavailable, holds are no-ops and has_viewers() is always
+False; callers combine it with their own subscriber count.
+"""
+
+import logging
+import os
+
+from amplifier_library.storage import get_state_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_path(session_id: str) -> str:
+    return str(get_state_dir() / "sessions" / session_id / "viewers.lock")
+
+
+def hold_viewer(session_id: str) -> int | None:
+    """Mark the session as viewed from this process until release_viewer().
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        Handle to pass to release_viewer(), or None if presence can't be shared
+    """
+    if fcntl is None:
+        return None
+    try:
+        fd = os.open(_lock_path(session_id), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError as e:
+        logger.debug(f"Cannot share viewer presence for session {session_id}: {e}")
+        return None
+    # Only blocks while another process is probing (see has_viewers)
+    fcntl.flock(fd, fcntl.LOCK_SH)
+    return fd
+
+
+def release_viewer(handle: int | None) -> None:
+    """Release a hold from hold_viewer().
+
+    Args:
+        handle: Handle returned by hold_viewer()
+    """
+    if handle is not None:
+        os.close(handle)
+
+
+def has_viewers(session_id: str) -> bool:
+    """Check whether any process holds a viewer on the session.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        True if some process has SSE subscribers for the session
+    """
+    if fcntl is None:
+        return False
+    try:
+        fd = os.open(_lock_path(session_id), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
@@ -1,18 +1,28 @@
 """Aggregates events.jsonl into execution trace turns.
 
-This module provides on-the-fly aggregation of raw events from events.jsonl
-(written by hooks-logging in amplifier_core) into structured trace turns
-for the frontend ExecutionPanel.
+This module provides aggregation of raw events from events.jsonl (written
+by hooks-logging in amplifier_core) into structured trace turns for the
+frontend ExecutionPanel.
 
 Single source of truth: events.jsonl is the only event storage.
-Trace views are generated on-demand from this file.
+Trace views are derived from this file and materialized incrementally:
+each file's trace remembers the byte offset it has consumed, so a request
+only parses events appended since the previous one. events.jsonl is
+append-only; if it shrinks or is replaced, the trace is rebuilt. Only the
+traces of the most recently requested files are kept in memory; an evicted
+trace is rebuilt from the start on its next request.
+
+IDs are derived from the byte offset of the event that created the item
+(e.g. "turn-1024"), so they are stable across requests and restarts.
 """
 
 import json
 import logging
+import threading
+from collections import OrderedDict
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from uuid import uuid4
 
 from ..models.trace import TraceThinking
 from ..models.trace import TraceTool
@@ -20,6 +30,9 @@ from ..models.trace import TraceTurn
 
 logger = logging.getLogger(__name__)
 
+# Most events files whose materialized trace is kept in memory
+MAX_CACHED_TRACES = 64
+
 
 def _parse_timestamp(ts: str) -> int:
     """Parse ISO timestamp to milliseconds since epoch.
@@ -53,159 +66,233 @@ def _truncate(text: str, max_length: int = 1000) -> str:
     return text[:max_length] + "... (truncated)"
 
 
-def aggregate_events_to_turns(events_file: Path) -> list[TraceTurn]:
-    """Aggregate raw events from events.jsonl into UI-friendly turns.
-
-    Parses the events file line by line and groups events into turns.
-    Each turn starts with prompt:submit and ends with session:end.
-
-    Args:
-        events_file: Path to events.jsonl file
+class SessionTrace:
+    """Incrementally materialized trace of one events.jsonl file.
 
-    Returns:
-        List of TraceTurn objects ready for frontend consumption
-
-    Event types handled:
-        - prompt:submit: Start new turn with user message
-        - tool:pre: Add tool to current turn
-        - tool:post: Update tool with result and timing
-        - thinking:delta: Record thinking block content
-        - session:end: Complete current turn
+    Not thread-safe on its own; aggregate_events_to_turns serializes access.
     """
-    if not events_file.exists():
-        return []
 
-    turns: list[TraceTurn] = []
-    current_turn: TraceTurn | None = None
-
-    try:
-        with open(events_file, encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
+    def __init__(self: "SessionTrace", events_file: Path) -> None:
+        """Initialize an empty trace.
+
+        Args:
+            events_file: Path to events.jsonl file
+        """
+        self.events_file = events_file
+        self.reset()
+
+    def reset(self: "SessionTrace") -> None:
+        """Discard everything materialized so far."""
+        self.offset = 0
+        self.line_count = 0
+        self.file_id: tuple[int, int] | None = None
+
+        self.turns: list[TraceTurn] = []
+        self.current_turn: TraceTurn | None = None
+        # Running tools of the current turn, oldest first per (tool_name, parallel_group_id)
+        self._running: dict[tuple[str, str], deque[TraceTool]] = {}
+
+    def update(self: "SessionTrace") -> None:
+        """Parse events appended since the last update.
+
+        A trailing line without a newline is still being written and is left
+        for the next update.
+        """
+        try:
+            stat = self.events_file.stat()
+        except FileNotFoundError:
+            self.reset()
+            return
+
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:
+            self.reset()
+            self.file_id = file_id
+        if stat.st_size == self.offset:
+            return
+
+        with open(self.events_file, "rb") as f:
+            f.seek(self.offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+
+                position = self.offset
+                self.offset += len(raw)
+                self.line_count += 1
+                if not raw.strip():
                     continue
 
                 try:
-                    event = json.loads(line)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Skipping malformed line {line_num} in {events_file}: {e}")
+                    event = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.warning(f"Skipping malformed line {self.line_count} in {self.events_file}: {e}")
                     continue
 
-                event_type = event.get("event", "")
-                data = event.get("data", {})
-                ts = event.get("ts", "")
-
-                if event_type == "prompt:submit":
-                    # Start new turn
-                    # If there's an unclosed turn, save it first
-                    if current_turn is not None:
-                        current_turn.status = "completed"
-                        turns.append(current_turn)
-
-                    current_turn = TraceTurn(
-                        id=str(uuid4()),
-                        user_message=data.get("prompt", ""),
-                        status="active",
-                        start_time=_parse_timestamp(ts),
-                    )
-
-                elif event_type == "tool:pre" and current_turn is not None:
-                    # Add tool to current turn
-                    tool_name = data.get("tool_name", "")
-                    tool_input = data.get("tool_input", {})
-                    parallel_group_id = data.get("parallel_group_id", "")
-
-                    # Detect sub-agent calls (task tool with agent param)
-                    is_sub_agent = tool_name.lower() == "task"
-                    sub_agent_name = tool_input.get("agent") if is_sub_agent else None
-
-                    tool = TraceTool(
-                        id=parallel_group_id or str(uuid4()),
-                        name=tool_name,
-                        parallel_group_id=parallel_group_id,
-                        status="running",
-                        start_time=_parse_timestamp(ts),
-                        arguments=tool_input,
-                        is_sub_agent=is_sub_agent,
-                        sub_agent_name=sub_agent_name,
-                    )
-                    current_turn.tools.append(tool)
-
-                elif event_type == "tool:post" and current_turn is not None:
-                    # Find and update matching tool by tool_name + parallel_group_id
-                    tool_name = data.get("tool_name", "")
-                    parallel_group_id = data.get("parallel_group_id", "")
-
-                    # Find matching tool (running status, same name and parallel_group_id)
-                    tool = next(
-                        (
-                            t
-                            for t in current_turn.tools
-                            if t.name == tool_name
-                            and t.parallel_group_id == parallel_group_id
-                            and t.status in ("starting", "running")
-                        ),
-                        None,
-                    )
-
-                    if tool is not None:
-                        end_time = _parse_timestamp(ts)
-                        tool.status = "completed"
-                        tool.end_time = end_time
-                        tool.duration = round(end_time - tool.start_time, 2) if tool.start_time else None
-
-                        # Handle result - can be dict with success/output/error or direct value
-                        result = data.get("result", "")
-                        if isinstance(result, dict):
-                            # Extract child session ID for sub-agent (Task) tools
-                            # The session_id is at result.output.session_id
-                            if tool.is_sub_agent:
-                                output = result.get("output", {})
-                                if isinstance(output, dict) and "session_id" in output:
-                                    tool.child_session_id = output.get("session_id")
-
-                            if result.get("success", True):
-                                tool.result = _truncate(str(result.get("output", "")))
-                            else:
-                                error_info = result.get("error", {})
-                                error_msg = (
-                                    error_info.get("message", str(error_info))
-                                    if isinstance(error_info, dict)
-                                    else str(error_info)
-                                )
-                                tool.error = _truncate(error_msg)
-                                tool.status = "error"
-                        else:
-                            tool.result = _truncate(str(result))
+                self._apply(event, position)
+
+    def snapshot(self: "SessionTrace") -> list[TraceTurn]:
+        """Get the turns materialized so far.
+
+        Completed turns never change once closed and are shared; the turn
+        still in progress is copied since later updates modify it.
+        """
+        if self.current_turn is None:
+            return list(self.turns)
+        return [*self.turns, self.current_turn.model_copy(deep=True)]
+
+    def _close_turn(self: "SessionTrace", turn: TraceTurn) -> None:
+        self.turns.append(turn)
+        self.current_turn = None
+        self._running.clear()
+
+    def _apply(self: "SessionTrace", event: dict, position: int) -> None:
+        """Apply one event to the trace.
+
+        Event types handled:
+            - prompt:submit: Start new turn with user message
+            - tool:pre: Add tool to current turn
+            - tool:post: Update tool with result and timing
+            - thinking:delta: Record thinking block content
+            - session:end: Complete current turn
+        """
+        event_type = event.get("event", "")
+        data = event.get("data", {})
+        ts = event.get("ts", "")
+        current_turn = self.current_turn
+
+        if event_type == "prompt:submit":
+            # Start new turn
+            # If there's an unclosed turn, save it first
+            if current_turn is not None:
+                current_turn.status = "completed"
+                self._close_turn(current_turn)
+
+            self.current_turn = TraceTurn(
+                id=f"turn-{position}",
+                user_message=data.get("prompt", ""),
+                status="active",
+                start_time=_parse_timestamp(ts),
+            )
+
+        elif event_type == "tool:pre" and current_turn is not None:
+            # Add tool to current turn
+            tool_name = data.get("tool_name", "")
+            tool_input = data.get("tool_input", {})
+            parallel_group_id = data.get("parallel_group_id", "")
+
+            # Detect sub-agent calls (task tool with agent param)
+            is_sub_agent = tool_name.lower() == "task"
+            sub_agent_name = tool_input.get("agent") if is_sub_agent else None
+
+            tool = TraceTool(
+                id=parallel_group_id or f"tool-{position}",
+                name=tool_name,
+                parallel_group_id=parallel_group_id,
+                status="running",
+                start_time=_parse_timestamp(ts),
+                arguments=tool_input,
+                is_sub_agent=is_sub_agent,
+                sub_agent_name=sub_agent_name,
+            )
+            current_turn.tools.append(tool)
+            self._running.setdefault((tool_name, parallel_group_id), deque()).append(tool)
+
+        elif event_type == "tool:post" and current_turn is not None:
+            # Find and update the oldest running tool with the same tool_name + parallel_group_id
+            tool_name = data.get("tool_name", "")
+            parallel_group_id = data.get("parallel_group_id", "")
+
+            running = self._running.get((tool_name, parallel_group_id))
+            tool = running.popleft() if running else None
+
+            if tool is not None:
+                end_time = _parse_timestamp(ts)
+                tool.status = "completed"
+                tool.end_time = end_time
+                tool.duration = round(end_time - tool.start_time, 2) if tool.start_time else None
+
+                # Handle result - can be dict with success/output/error or direct value
+                result = data.get("result", "")
+                if isinstance(result, dict):
+                    # Extract child session ID for sub-agent (Task) tools
+                    # The session_id is at result.output.session_id
+                    if tool.is_sub_agent:
+                        output = result.get("output", {})
+                        if isinstance(output, dict) and "session_id" in output:
+                            tool.child_session_id = output.get("session_id")
+
+                    if result.get("success", True):
+                        tool.result = _truncate(str(result.get("output", "")))
                     else:
-                        logger.debug(
-                            f"No matching tool found for tool:post: {tool_name} (parallel_group_id={parallel_group_id})"
+                        error_info = result.get("error", {})
+                        error_msg = (
+                            error_info.get("message", str(error_info))
+                            if isinstance(error_info, dict)
+                            else str(error_info)
                         )
+                        tool.error = _truncate(error_msg)
+                        tool.status = "error"
+                else:
+                    tool.result = _truncate(str(result))
+            else:
+                logger.debug(
+                    f"No matching tool found for tool:post: {tool_name} (parallel_group_id={parallel_group_id})"
+                )
+
+        elif event_type == "thinking:delta" and current_turn is not None:
+            # Record thinking block
+            thinking = TraceThinking(
+                id=f"thinking-{position}",
+                content=data.get("delta", ""),
+                timestamp=_parse_timestamp(ts),
+            )
+            current_turn.thinking.append(thinking)
+
+        elif event_type == "session:end" and current_turn is not None:
+            # Complete current turn
+            current_turn.status = "completed"
+            current_turn.end_time = _parse_timestamp(ts)
+            self._close_turn(current_turn)
+
+
+# Materialized traces by events file, least recently used first
+_traces: OrderedDict[Path, SessionTrace] = OrderedDict()
+_traces_lock = threading.Lock()
 
-                elif event_type == "thinking:delta" and current_turn is not None:
-                    # Record thinking block
-                    thinking = TraceThinking(
-                        id=str(uuid4()),
-                        content=data.get("delta", ""),
-                        timestamp=_parse_timestamp(ts),
-                    )
-                    current_turn.thinking.append(thinking)
-
-                elif event_type == "session:end" and current_turn is not None:
-                    # Complete current turn
-                    current_turn.status = "completed"
-                    current_turn.end_time = _parse_timestamp(ts)
-                    turns.append(current_turn)
-                    current_turn = None
-
-        # Handle any unclosed turn at end of file
-        if current_turn is not None:
-            # Turn still in progress
-            turns.append(current_turn)
-
-    except Exception as e:
-        logger.error(f"Failed to aggregate events from {events_file}: {e}")
-        # Return whatever we've collected so far
-        pass
-
-    return turns
+
+def aggregate_events_to_turns(events_file: Path) -> list[TraceTurn]:
+    """Aggregate raw events from events.jsonl into UI-friendly turns.
+
+    Each turn starts with prompt:submit and ends with session:end. Only
+    events appended since the previous call for the same file are parsed.
+
+    Args:
+        events_file: Path to events.jsonl file
+
+    Returns:
+        List of TraceTurn objects ready for frontend consumption (callers
+        must not modify them; completed turns are shared between calls)
+    """
+    key = events_file.resolve()
+
+    with _traces_lock:
+        if not events_file.exists():
+            _traces.pop(key, None)
+            return []
+
+        trace = _traces.get(key)
+        if trace is None:
+            trace = _traces[key] = SessionTrace(events_file)
+            while len(_traces) > MAX_CACHED_TRACES:
+                _traces.popitem(last=False)
+        else:
+            _traces.move_to_end(key)
+
+        try:
+            trace.update()
+        except Exception as e:
+            logger.error(f"Failed to aggregate events from {events_file}: {e}")
+            # Return whatever we've collected so far
+
+        return trace.snapshot()
@@ -23,6 +23,9 @@ def save_profile_source(
 ) -> None:
     """Save profile source YAML and copy component assets.
 
+    Asset files are linked from the content-addressed blob store, so
+    profiles sharing components share their files on disk.
+
     Args:
         profile_id: Profile identifier
         profile_yaml: Profile YAML dictionary
@@ -40,6 +43,9 @@ def save_profile_source(
 
     # Copy component assets if they exist in source
     if source_dir.is_dir():
+        from amplifierd.services.blob_store import get_blob_store
+
+        blob_store = get_blob_store()
         for item in source_dir.iterdir():
             if item.is_dir() and item.name in [
                 "behaviors",
@@ -53,8 +59,8 @@ def save_profile_source(
                 dest_item = profile_dir / item.name
                 if dest_item.exists():
                     shutil.rmtree(dest_item)
-                shutil.copytree(item, dest_item)
-                logger.debug(f"Copied {item.name}/ to profile")
+                blob_store.place_tree(item, dest_item)
+                logger.debug(f"Linked {item.name}/ into profile")
 
 
 async def handle_startup_updates(config: StartupConfig) -> None:
@@ -1,16 +1,142 @@
 """SSE streaming utilities for amplifierd.
 
 Provides utilities for Server-Sent Events (SSE) streaming.
+
+EventQueueEmitter fans events out to per-subscriber bounded ring buffers.
+Emitting never blocks or takes a lock: each event is appended to every
+buffer synchronously, and a subscriber that falls behind is handled by its
+overflow policy instead of slowing down the emitter or other subscribers:
+
+- drop_oldest: discard the oldest buffered event
+- coalesce: merge buffered content deltas into one event, then drop oldest if still full
+- disconnect: close the subscriber; its next get() raises SubscriberOverflowError
+
+Every emitted event gets a sequence number ("id") that increases
+monotonically within the emitter's stream (identified by stream_id). An
+emitter created with a replay ring keeps its most recent events so a
+reconnecting subscriber can resume after the last id it saw.
+
+Emitters can also coalesce content deltas at the source: consecutive
+"content" events are accumulated and published as one event when the
+pending text reaches a byte limit, when a time limit passes, or before any
+other event (so ordering is preserved). Published events are SSE-encoded
+at most once (encode_sse_event) and the bytes are shared by all subscribers.
+
+An emitter created with a channel ("global", "session:{id}") also publishes
+its events on the event bus (event_bus.py) so subscribers in other daemon
+workers see them; events arriving from other workers are passed to
+deliver_remote_event and fanned out to the local emitter for that channel.
 """
 
 import asyncio
 import json
 import logging
+import uuid
+import weakref
+from collections import deque
 from collections.abc import AsyncIterator
+from enum import StrEnum
 from typing import Any
 
+from sse_starlette.event import ServerSentEvent
+
+from .event_bus import get_event_bus
+
 logger = logging.getLogger(__name__)
 
+# Events whose payloads are text deltas that can be merged ({"content": str})
+COALESCIBLE_EVENTS = frozenset({"content"})
+
+
+class OverflowPolicy(StrEnum):
+    """What a full subscriber buffer does with a new event."""
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 1000
+DEFAULT_OVERFLOW_POLICY = OverflowPolicy.COALESCE
+
+DEFAULT_REPLAY_SIZE = 2000
+DEFAULT_COALESCE_MS = 20
+DEFAULT_COALESCE_BYTES = 1024
+
+_subscriber_queue_size = DEFAULT_SUBSCRIBER_QUEUE_SIZE
+_overflow_policy = DEFAULT_OVERFLOW_POLICY
+_replay_size = DEFAULT_REPLAY_SIZE
+_coalesce_ms = DEFAULT_COALESCE_MS
+_coalesce_bytes = DEFAULT_COALESCE_BYTES
+
+
+def configure_subscriber_queues(maxsize: int, policy: OverflowPolicy | str) -> None:
+    """Set the buffer size and overflow policy for emitters created afterwards.
+
+    Args:
+        maxsize: Maximum buffered events per subscriber
+        policy: Overflow policy (OverflowPolicy or its value)
+
+    Raises:
+        ValueError: If maxsize < 1 or the policy is unknown
+    """
+    global _subscriber_queue_size, _overflow_policy
+
+    if maxsize < 1:
+        raise ValueError(f"Subscriber queue size must be at least 1, got {maxsize}")
+    _subscriber_queue_size = maxsize
+    _overflow_policy = OverflowPolicy(policy)
+
+
+def configure_replay_ring(size: int) -> None:
+    """Set how many recent events session streams keep for resuming subscribers.
+
+    Args:
+        size: Events kept per session stream (0 disables replay)
+
+    Raises:
+        ValueError: If size is negative
+    """
+    global _replay_size
+
+    if size < 0:
+        raise ValueError(f"Replay ring size must not be negative, got {size}")
+    _replay_size = size
+
+
+def get_replay_ring_size() -> int:
+    """Get the configured replay ring size for session streams."""
+    return _replay_size
+
+
+def configure_content_coalescing(interval_ms: int, max_bytes: int) -> None:
+    """Set how session streams batch content deltas.
+
+    Args:
+        interval_ms: Longest time a delta is held before publishing (0 disables coalescing)
+        max_bytes: Pending UTF-8 bytes that trigger an immediate publish
+
+    Raises:
+        ValueError: If interval_ms is negative or max_bytes < 1
+    """
+    global _coalesce_ms, _coalesce_bytes
+
+    if interval_ms < 0:
+        raise ValueError(f"Coalescing interval must not be negative, got {interval_ms}")
+    if max_bytes < 1:
+        raise ValueError(f"Coalescing byte limit must be at least 1, got {max_bytes}")
+    _coalesce_ms = interval_ms
+    _coalesce_bytes = max_bytes
+
+
+def get_content_coalescing() -> tuple[int, int]:
+    """Get the configured (interval_ms, max_bytes) for session stream coalescing."""
+    return _coalesce_ms, _coalesce_bytes
+
+
+class SubscriberOverflowError(Exception):
+    """Raised to a subscriber that was disconnected for falling too far behind."""
+
 
 async def sse_event_stream(
     generator: AsyncIterator[dict[str, Any]],
@@ -43,6 +169,27 @@ async def sse_event_stream(
         yield format_sse_event("error", {"error": str(e)})
 
 
+def encode_sse_event(event: dict[str, Any], stream_id: str | None = None) -> bytes:
+    """Encode an emitted event as SSE wire bytes, once per event.
+
+    The bytes are cached on the event, so every subscriber (and replays)
+    reuse the same encoding instead of re-serializing per queue.
+
+    Args:
+        event: Event dict from EventQueueEmitter ({"id", "event", "data"})
+        stream_id: Emitter stream_id; if given, the SSE id is "{stream_id}-{id}"
+
+    Returns:
+        Encoded SSE event
+    """
+    encoded = event.get("encoded")
+    if encoded is None:
+        event_id = f"{stream_id}-{event['id']}" if stream_id is not None else None
+        encoded = ServerSentEvent(data=json.dumps(event["data"]), event=event["event"], id=event_id).encode()
+        event["encoded"] = encoded
+    return encoded
+
+
 def format_sse_event(event_type: str, data: dict[str, Any]) -> str:
     """Format an SSE event.
 
@@ -86,47 +233,358 @@ async def wrap_execution_stream(
         yield {"event": "error", "data": {"type": "error", "error": str(e)}}
 
 
+class SubscriberQueue:
+    """Bounded ring buffer of events for one subscriber.
+
+    Consumed like an asyncio.Queue (await get()); filled synchronously by
+    EventQueueEmitter via offer().
+    """
+
+    def __init__(self: "SubscriberQueue", maxsize: int, policy: OverflowPolicy) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            maxsize: Maximum buffered events
+            policy: What to do when an event arrives while full
+        """
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+
+        # False if the subscriber resumed after events no longer held for replay
+        self.replay_complete = True
+
+        # Counters for the lag metric
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._not_empty = asyncio.Event()
+
+    @property
+    def lag(self: "SubscriberQueue") -> int:
+        """Number of events emitted but not yet consumed."""
+        return len(self._buffer)
+
+    def qsize(self: "SubscriberQueue") -> int:
+        """Get the number of buffered events."""
+        return len(self._buffer)
+
+    def empty(self: "SubscriberQueue") -> bool:
+        """Check whether no events are buffered."""
+        return not self._buffer
+
+    def offer(self: "SubscriberQueue", event: dict[str, Any]) -> bool:
+        """Buffer an event without blocking, applying the overflow policy when full.
+
+        Args:
+            event: Event dict ({"event": str, "data": dict})
+
+        Returns:
+            False if the subscriber is (now) disconnected, True otherwise
+        """
+        if self.closed:
+            return False
+
+        if len(self._buffer) >= self.maxsize:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                self.close()
+                return False
+            if self.policy == OverflowPolicy.COALESCE:
+                if self._merge_into_tail(event):
+                    return True
+                self._compact()
+            if len(self._buffer) >= self.maxsize:
+                self._buffer.popleft()
+                self.dropped += 1
+
+        self._buffer.append(event)
+        self._not_empty.set()
+        return True
+
+    async def get(self: "SubscriberQueue") -> dict[str, Any]:
+        """Wait for and remove the next event.
+
+        Raises:
+            SubscriberOverflowError: If the subscriber was disconnected for falling behind
+        """
+        while not self._buffer:
+            if self.closed:
+                raise SubscriberOverflowError(f"Subscriber fell more than {self.maxsize} events behind")
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        self.delivered += 1
+        return self._buffer.popleft()
+
+    def get_nowait(self: "SubscriberQueue") -> dict[str, Any]:
+        """Remove the next event without waiting.
+
+        Raises:
+            asyncio.QueueEmpty: If no events are buffered
+        """
+        if not self._buffer:
+            raise asyncio.QueueEmpty
+        self.delivered += 1
+        return self._buffer.popleft()
+
+    def close(self: "SubscriberQueue") -> None:
+        """Disconnect the subscriber, discarding buffered events and waking its reader."""
+        self.closed = True
+        self.dropped += len(self._buffer)
+        self._buffer.clear()
+        self._not_empty.set()
+
+    def stats(self: "SubscriberQueue") -> dict[str, Any]:
+        """Get lag metrics for this subscriber."""
+        return {
+            "lag": self.lag,
+            "maxsize": self.maxsize,
+            "policy": self.policy.value,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "closed": self.closed,
+        }
+
+    def _merge_into_tail(self: "SubscriberQueue", event: dict[str, Any]) -> bool:
+        """Append a content delta to the last buffered event if it is one too."""
+        if not self._buffer or not _is_delta(event) or not _is_delta(self._buffer[-1]):
+            return False
+        tail = self._buffer[-1]
+        if tail["event"] != event["event"]:
+            return False
+
+        self._buffer[-1] = _merge_deltas(tail, event)
+        self.coalesced += 1
+        return True
+
+    def _compact(self: "SubscriberQueue") -> None:
+        """Merge runs of adjacent content deltas to free space."""
+        compacted: deque[dict[str, Any]] = deque()
+        for buffered in self._buffer:
+            tail = compacted[-1] if compacted else None
+            if tail is not None and _is_delta(buffered) and _is_delta(tail) and tail["event"] == buffered["event"]:
+                compacted[-1] = _merge_deltas(tail, buffered)
+                self.coalesced += 1
+                continue
+            compacted.append(buffered)
+        self._buffer = compacted
+
+
+def _is_delta(event: dict[str, Any]) -> bool:
+    return event["event"] in COALESCIBLE_EVENTS and isinstance(event["data"].get("content"), str)
+
+
+def _merge_deltas(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any]:
+    """Merge two deltas into one event carrying the later event's id."""
+    data = {**first["data"], "content": first["data"]["content"] + second["data"]["content"]}
+    return {"id": second["id"], "event": second["event"], "data": data}
+
+
+# Emitters by event bus channel (weak: a channel goes away with its emitter)
+_channel_emitters: "weakref.WeakValueDictionary[str, EventQueueEmitter]" = weakref.WeakValueDictionary()
+
+
+def deliver_remote_event(channel: str, event_type: str, data: dict[str, Any]) -> None:
+    """Pass an event from another worker to this worker's emitter for the channel.
+
+    Used as the event bus handler. Channels without a local emitter have no
+    local subscribers, so their events are ignored.
+
+    Args:
+        channel: Event bus channel
+        event_type: Event type identifier
+        data: Event payload
+    """
+    emitter = _channel_emitters.get(channel)
+    if emitter is not None:
+        emitter.deliver_remote(event_type, data)
+
+
 class EventQueueEmitter:
     """SSE emitter that queues events for async consumption.
 
     Allows multiple subscribers to receive events emitted during execution.
-    Each subscriber gets their own queue to prevent blocking.
+    Each subscriber gets its own bounded buffer, so a slow subscriber never
+    blocks the emitter or other subscribers.
     """
 
-    def __init__(self: "EventQueueEmitter") -> None:
-        self.queues: list[asyncio.Queue[dict[str, Any]]] = []
-        self._lock = asyncio.Lock()
+    def __init__(
+        self: "EventQueueEmitter",
+        maxsize: int | None = None,
+        overflow_policy: OverflowPolicy | None = None,
+        replay_size: int = 0,
+        coalesce_ms: int = 0,
+        coalesce_bytes: int = DEFAULT_COALESCE_BYTES,
+        channel: str | None = None,
+    ) -> None:
+        """Initialize emitter.
+
+        Args:
+            maxsize: Per-subscriber buffer size (default: configured daemon-wide)
+            overflow_policy: Per-subscriber overflow policy (default: configured daemon-wide)
+            replay_size: Number of recent events kept for resuming subscribers (0 = no replay)
+            coalesce_ms: Longest time content deltas are held for batching (0 = publish each delta)
+            coalesce_bytes: Pending content size that publishes immediately
+            channel: Event bus channel shared with other workers (None = this process only)
+        """
+        self.maxsize = maxsize if maxsize is not None else _subscriber_queue_size
+        self.overflow_policy = overflow_policy if overflow_policy is not None else _overflow_policy
+        self.coalesce_ms = coalesce_ms
+        self.coalesce_bytes = coalesce_bytes
+        self.channel = channel
+        if channel is not None:
+            _channel_emitters[channel] = self
+
+        # Event ids are only comparable within one stream_id (a new emitter starts a new stream)
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.last_id = 0
+        self._replay: deque[dict[str, Any]] = deque(maxlen=replay_size)
+
+        # Replaced (not mutated) on subscribe/unsubscribe so emit can iterate without a lock
+        self._queues: tuple[SubscriberQueue, ...] = ()
+
+        # Content deltas waiting to be published as one event
+        self._pending_type: str | None = None
+        self._pending_data: dict[str, Any] = {}
+        self._pending_parts: list[str] = []
+        self._pending_bytes = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
 
-    def subscribe(self: "EventQueueEmitter") -> asyncio.Queue[dict[str, Any]]:
+    @property
+    def queues(self: "EventQueueEmitter") -> list[SubscriberQueue]:
+        """Current subscriber queues."""
+        return list(self._queues)
+
+    def subscribe(self: "EventQueueEmitter", after_id: int | None = None) -> SubscriberQueue:
         """Create new subscriber queue.
 
+        Args:
+            after_id: Resume after this event id, pre-filling the queue with
+                      later events from the replay ring
+
         Returns:
-            asyncio.Queue that will receive all emitted events
+            SubscriberQueue that will receive all emitted events. Its
+            replay_complete is False if events after after_id were already
+            evicted from the replay ring.
         """
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-        self.queues.append(queue)
+        queue = SubscriberQueue(self.maxsize, self.overflow_policy)
+        if after_id is not None:
+            queue.replay_complete = self._replay_into(queue, after_id)
+        self._queues = (*self._queues, queue)
         return queue
 
     async def emit(self: "EventQueueEmitter", event_type: str, data: dict[str, Any]) -> None:
         """Emit event to all subscriber queues.
 
+        Never waits on subscribers; see the module docstring for overflow
+        handling and content coalescing.
+
         Args:
             event_type: Event type identifier (e.g., "hook:tool:pre")
             data: Event payload
         """
-        event = {"event": event_type, "data": data}
-        async with self._lock:
-            for queue in self.queues:
-                try:
-                    await queue.put(event)
-                except Exception as e:
-                    logger.error(f"Failed to emit event to queue: {e}")
-
-    def unsubscribe(self: "EventQueueEmitter", queue: asyncio.Queue[dict[str, Any]]) -> None:
+        self.emit_nowait(event_type, data)
+
+    def emit_nowait(self: "EventQueueEmitter", event_type: str, data: dict[str, Any]) -> None:
+        """Emit event synchronously (same as emit, usable from callbacks).
+
+        Args:
+            event_type: Event type identifier
+            data: Event payload
+        """
+        if self.coalesce_ms and event_type in COALESCIBLE_EVENTS and isinstance(data.get("content"), str):
+            self._add_pending(event_type, data)
+            return
+
+        self.flush()
+        self._publish(event_type, data)
+
+    def deliver_remote(self: "EventQueueEmitter", event_type: str, data: dict[str, Any]) -> None:
+        """Fan out an event emitted by another worker (not published on the bus again).
+
+        Args:
+            event_type: Event type identifier
+            data: Event payload
+        """
+        self.flush()
+        self._publish(event_type, data, relay=False)
+
+    def flush(self: "EventQueueEmitter") -> None:
+        """Publish pending coalesced content now."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending_type is None:
+            return
+
+        event_type = self._pending_type
+        data = {**self._pending_data, "content": "".join(self._pending_parts)}
+        self._pending_type = None
+        self._pending_parts = []
+        self._pending_bytes = 0
+        self._publish(event_type, data)
+
+    def _add_pending(self: "EventQueueEmitter", event_type: str, data: dict[str, Any]) -> None:
+        if self._pending_type is not None and self._pending_type != event_type:
+            self.flush()
+
+        if self._pending_type is None:
+            self._pending_type = event_type
+            self._pending_data = data
+        self._pending_parts.append(data["content"])
+        self._pending_bytes += len(data["content"].encode("utf-8"))
+
+        if self._pending_bytes >= self.coalesce_bytes:
+            self.flush()
+        elif self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._flush_handle = loop.call_later(self.coalesce_ms / 1000, self.flush)
+
+    def _publish(self: "EventQueueEmitter", event_type: str, data: dict[str, Any], relay: bool = True) -> None:
+        if relay and self.channel is not None:
+            get_event_bus().publish(self.channel, event_type, data)
+
+        self.last_id += 1
+        event = {"id": self.last_id, "event": event_type, "data": data}
+        if self._replay.maxlen:
+            self._replay.append(event)
+
+        for queue in self._queues:
+            if not queue.offer(event):
+                logger.warning(f"Disconnecting slow subscriber ({queue.maxsize} events behind)")
+                self.unsubscribe(queue)
+
+    def unsubscribe(self: "EventQueueEmitter", queue: SubscriberQueue) -> None:
         """Remove subscriber queue.
 
         Args:
             queue: Queue to remove
         """
-        if queue in self.queues:
-            self.queues.remove(queue)
+        if queue in self._queues:
+            self._queues = tuple(q for q in self._queues if q is not queue)
+
+    def stats(self: "EventQueueEmitter") -> list[dict[str, Any]]:
+        """Get lag metrics for every subscriber."""
+        return [queue.stats() for queue in self._queues]
+
+    def _replay_into(self: "EventQueueEmitter", queue: SubscriberQueue, after_id: int) -> bool:
+        """Queue replayed events newer than after_id.
+
+        Returns:
+            True if every event after after_id was replayed
+        """
+        if after_id >= self.last_id:
+            return after_id == self.last_id
+
+        oldest = self._replay[0]["id"] if self._replay else self.last_id + 1
+        for event in self._replay:
+            if event["id"] > after_id:
+                queue.offer(event)
+        return after_id >= oldest - 1
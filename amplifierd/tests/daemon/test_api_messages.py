@@ -6,6 +6,7 @@ Tests message sending and transcript retrieval.
 
 from datetime import UTC
 from datetime import datetime
+from unittest.mock import AsyncMock
 from unittest.mock import Mock
 
 import pytest
@@ -343,7 +344,13 @@ class TestMessagesAPI:
 
         # Mock the service to return appropriate messages for each session
         # We capture the session IDs in the closure
-        def get_transcript_side_effect(session_id: str, limit: int | None = None):
+        def get_transcript_side_effect(
+            session_id: str,
+            limit: int | None = None,
+            before: int | None = None,
+            after: int | None = None,
+            reverse: bool = False,
+        ):
             messages_map = {
                 session1: [
                     SessionMessage(
@@ -376,3 +383,32 @@ class TestMessagesAPI:
         assert len(transcript2) == 1
         assert transcript1[0]["content"] == "Session 1 message"
         assert transcript2[0]["content"] == "Session 2 message"
+
+    def test_delete_last_message_evicts_runner(
+        self, client: TestClient, mock_session_state_service: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test deleting the last message drops the warm runner so its context is rebuilt."""
+        evict = AsyncMock(return_value=True)
+        monkeypatch.setattr("amplifierd.routers.messages.evict_session_runner", evict)
+        mock_session_state_service.delete_last_message.return_value = SessionMessage(
+            timestamp=datetime.now(UTC), role="assistant", content="Regenerate me"
+        )
+
+        response = client.delete("/api/v1/sessions/test_session_123/messages/last")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "deleted"
+        evict.assert_awaited_once_with("test_session_123")
+
+    def test_delete_without_messages_keeps_runner(
+        self, client: TestClient, mock_session_state_service: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an empty transcript leaves the runner alone."""
+        evict = AsyncMock(return_value=False)
+        monkeypatch.setattr("amplifierd.routers.messages.evict_session_runner", evict)
+        mock_session_state_service.delete_last_message.return_value = None
+
+        response = client.delete("/api/v1/sessions/test_session_123/messages/last")
+
+        assert response.json()["status"] == "no_messages"
+        evict.assert_not_awaited()
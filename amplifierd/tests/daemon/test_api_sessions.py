@@ -8,6 +8,7 @@ from unittest.mock import Mock
 import pytest
 from fastapi.testclient import TestClient
 
+from amplifier_library.models.sessions import SessionIndexEntry
 from amplifier_library.models.sessions import SessionMetadata
 from amplifier_library.models.sessions import SessionStatus
 from amplifierd.main import app
@@ -452,7 +453,9 @@ class TestSessionsAPI:
         assert response.status_code == 200
 
         # Verify service was called with limit
-        mock_session_state_service.get_transcript.assert_called_once_with("test_session_123", limit=10)
+        mock_session_state_service.get_transcript.assert_called_once_with(
+            "test_session_123", limit=10, before=None, after=None, reverse=False
+        )
 
     def test_get_transcript_session_not_found(self, client: TestClient, mock_session_state_service: Mock) -> None:
         """Test GET /api/v1/sessions/{session_id}/transcript returns 404 for missing session."""
@@ -625,9 +628,6 @@ class TestSessionsAPI:
         original_get_state_dir = amplifierd.routers.sessions.get_state_dir
         amplifierd.routers.sessions.get_state_dir = lambda: tmp_path
 
-        # Setup mock to return empty list for subsessions
-        mock_session_state_service.list_sessions.return_value = []
-
         # Track the created session ID and metadata
         created_session_id: str | None = None
         source_metadata = SessionMetadata(
@@ -641,6 +641,9 @@ class TestSessionsAPI:
             name="Test Session",
         )
 
+        # Session tree contains only the source (no subsessions)
+        mock_session_state_service.get_session_tree.return_value = [SessionIndexEntry.from_metadata(source_metadata)]
+
         def mock_get_session(sid: str) -> SessionMetadata | None:
             nonlocal created_session_id
             if sid == "test_session_123":
@@ -728,8 +731,6 @@ class TestSessionsAPI:
         amplifierd.routers.sessions.get_state_dir = lambda: tmp_path
 
         # Setup mocks
-        mock_session_state_service.list_sessions.return_value = []
-
         source_metadata = SessionMetadata(
             session_id="test_session_123",
             status=SessionStatus.ACTIVE,
@@ -741,6 +742,7 @@ class TestSessionsAPI:
             message_count=2,
             agent_invocations=1,
         )
+        mock_session_state_service.get_session_tree.return_value = [SessionIndexEntry.from_metadata(source_metadata)]
 
         # Track created session ID
         created_session_id = None
@@ -783,18 +785,15 @@ class TestSessionsAPI:
             # Assert response
             assert response.status_code == 201
 
-            # Verify files were copied to new session directory
+            # Verify transcript was copied through the session store
             assert created_session_id is not None
+            mock_session_state_service.copy_transcript.assert_called_once_with("test_session_123", created_session_id)
+
+            # Verify files were copied to new session directory
             new_dir = tmp_path / "sessions" / created_session_id
-            assert (new_dir / "transcript.jsonl").exists()
             assert (new_dir / "events.jsonl").exists()
             assert (new_dir / "profile_context_messages.json").exists()
 
-            # Verify content was copied
-            transcript_content = (new_dir / "transcript.jsonl").read_text()
-            assert "Hello" in transcript_content
-            assert "Hi there!" in transcript_content
-
             events_content = (new_dir / "events.jsonl").read_text()
             assert "tool:pre" in events_content
             assert "tool:post" in events_content
@@ -886,15 +885,14 @@ class TestSessionsAPI:
                     name="Parent Session (copy)" if created_sessions and sid == created_sessions[0] else "Child Session",
                 )
 
-        # list_sessions returns child when querying parent's subsessions
-        def mock_list_sessions(parent_session_id=None, **kwargs):
-            if parent_session_id == "parent_session":
-                return [child_metadata]
-            return []
+        # Session tree of the parent contains the parent followed by its child
+        mock_session_state_service.get_session_tree.return_value = [
+            SessionIndexEntry.from_metadata(parent_metadata),
+            SessionIndexEntry.from_metadata(child_metadata),
+        ]
 
         mock_session_state_service.create_session.side_effect = mock_create_session
         mock_session_state_service.get_session.side_effect = mock_get_session
-        mock_session_state_service.list_sessions.side_effect = mock_list_sessions
 
         try:
             # Make request to clone parent
@@ -905,6 +903,9 @@ class TestSessionsAPI:
 
             # Verify both parent and child were cloned (2 sessions created)
             assert len(created_sessions) == 2
+            assert mock_session_state_service.create_session.call_args_list[1].kwargs["parent_session_id"] == (
+                created_sessions[0]
+            )
 
             # Verify directories were created
             for session_id in created_sessions:
@@ -0,0 +1,147 @@
+"""
+Unit tests for the cross-worker event bus.
+
+Tests the unix socket backend with several buses in one process standing
+in for daemon workers, and the channel relay through EventQueueEmitter.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from amplifierd.event_bus import LocalEventBus
+from amplifierd.event_bus import UnixSocketEventBus
+from amplifierd.event_bus import create_event_bus
+from amplifierd.streaming import EventQueueEmitter
+from amplifierd.streaming import deliver_remote_event
+
+from amplifierd import event_bus
+
+
+class Worker:
+    """A bus plus the events it received."""
+
+    def __init__(self, socket_path: Path) -> None:
+        self.bus = UnixSocketEventBus(socket_path)
+        self.received: list[tuple[str, str, dict]] = []
+        self.bus.set_handler(lambda channel, event_type, data: self.received.append((channel, event_type, data)))
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def socket_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Short socket path (Unix socket paths are limited to ~100 bytes)."""
+    return tmp_path_factory.mktemp("bus") / "bus.sock"
+
+
+@pytest.mark.unit
+class TestUnixSocketEventBus:
+    """Test event delivery between workers over the unix socket."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_every_other_worker(self, socket_path: Path) -> None:
+        """Test an event from any worker is delivered to all others, not back to itself."""
+        workers = [Worker(socket_path) for _ in range(3)]
+        for worker in workers:
+            await worker.bus.start()
+        hub, first, second = workers
+        assert hub.bus.is_hub
+        await _wait_for(lambda: len(hub.bus._peers) == 2)
+
+        try:
+            first.bus.publish("session:a", "content", {"content": "hi"})
+            await _wait_for(lambda: hub.received and second.received)
+            hub.bus.publish("global", "session:created", {"id": "a"})
+            await _wait_for(lambda: len(first.received) == 1 and len(second.received) == 2)
+
+            assert hub.received == [("session:a", "content", {"content": "hi"})]
+            assert first.received == [("global", "session:created", {"id": "a"})]
+            assert second.received == [*hub.received, *first.received]
+        finally:
+            for worker in workers:
+                await worker.bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_worker_takes_over_from_stopped_hub(self, socket_path: Path) -> None:
+        """Test the remaining workers elect a new hub and keep exchanging events."""
+        hub, first, second = (Worker(socket_path) for _ in range(3))
+        for worker in (hub, first, second):
+            await worker.bus.start()
+        await _wait_for(lambda: len(hub.bus._peers) == 2)
+
+        await hub.bus.stop()
+        await _wait_for(lambda: first.bus.is_hub or second.bus.is_hub)
+        new_hub, client = (first, second) if first.bus.is_hub else (second, first)
+        await _wait_for(lambda: client.bus._upstream is not None)
+
+        try:
+            client.bus.publish("global", "ping", {})
+            await _wait_for(lambda: new_hub.received)
+            assert new_hub.received == [("global", "ping", {})]
+        finally:
+            await first.bus.stop()
+            await second.bus.stop()
+
+    def test_unknown_backend(self) -> None:
+        """Test create_event_bus validates the backend name."""
+        assert isinstance(create_event_bus("local"), LocalEventBus)
+        with pytest.raises(ValueError, match="Unknown event bus backend"):
+            create_event_bus("redis")
+
+    def test_unix_falls_back_without_flock(self, socket_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test platforms without flock get the in-process bus instead of failing."""
+        monkeypatch.setattr(event_bus, "fcntl", None)
+
+        assert isinstance(create_event_bus("unix", socket_path), LocalEventBus)
+        with pytest.raises(RuntimeError, match="flock"):
+            UnixSocketEventBus(socket_path)
+
+
+class RecordingBus(LocalEventBus):
+    """Local bus that records what emitters publish."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[str, str, dict]] = []
+
+    def publish(self, channel: str, event_type: str, data: dict) -> None:
+        self.published.append((channel, event_type, data))
+
+
+@pytest.mark.unit
+class TestEmitterChannels:
+    """Test EventQueueEmitter publishing to and receiving from the bus."""
+
+    @pytest.mark.asyncio
+    async def test_channel_events_published(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test events on a channel go to the bus and local subscribers."""
+        bus = RecordingBus()
+        monkeypatch.setattr(event_bus, "_event_bus", bus)
+        emitter = EventQueueEmitter(maxsize=10, channel="session:abc")
+        queue = emitter.subscribe()
+
+        await emitter.emit("tool_call", {"name": "bash"})
+
+        assert bus.published == [("session:abc", "tool_call", {"name": "bash"})]
+        assert queue.get_nowait()["data"] == {"name": "bash"}
+
+    @pytest.mark.asyncio
+    async def test_remote_events_delivered_locally_only(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test events from other workers reach local subscribers without being re-published."""
+        bus = RecordingBus()
+        monkeypatch.setattr(event_bus, "_event_bus", bus)
+        emitter = EventQueueEmitter(maxsize=10, channel="session:remote")
+        queue = emitter.subscribe()
+
+        deliver_remote_event("session:remote", "content", {"content": "hi"})
+        deliver_remote_event("session:unknown", "content", {"content": "ignored"})
+
+        assert queue.get_nowait()["data"] == {"content": "hi"}
+        assert queue.empty()
+        assert bus.published == []
@@ -4,11 +4,24 @@ Integration tests for SSE streaming.
 Tests Server-Sent Events streaming functionality.
 """
 
+import asyncio
 import json
 
 import pytest
 
+from amplifierd.streaming import DEFAULT_OVERFLOW_POLICY
+from amplifierd.streaming import DEFAULT_REPLAY_SIZE
+from amplifierd.streaming import DEFAULT_SUBSCRIBER_QUEUE_SIZE
+from amplifierd.streaming import EventQueueEmitter
+from amplifierd.streaming import OverflowPolicy
+from amplifierd.streaming import SubscriberOverflowError
+from amplifierd.streaming import configure_content_coalescing
+from amplifierd.streaming import configure_replay_ring
+from amplifierd.streaming import configure_subscriber_queues
+from amplifierd.streaming import encode_sse_event
 from amplifierd.streaming import format_sse_event
+from amplifierd.streaming import get_content_coalescing
+from amplifierd.streaming import get_replay_ring_size
 from amplifierd.streaming import sse_event_stream
 from amplifierd.streaming import wrap_execution_stream
 
@@ -177,3 +190,279 @@ class TestExecutionStreamWrapping:
         done_event = events[1]
         assert done_event["event"] == "done"
         assert done_event["data"]["type"] == "done"
+
+
+@pytest.mark.integration
+class TestEventQueueEmitter:
+    """Test bounded subscriber queues and overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_subscribers(self) -> None:
+        """Test every subscriber receives every event in order."""
+        emitter = EventQueueEmitter(maxsize=10)
+        first = emitter.subscribe()
+        second = emitter.subscribe()
+
+        await emitter.emit("content", {"content": "a"})
+        await emitter.emit("done", {})
+
+        for queue in (first, second):
+            assert [(await queue.get())["event"] for _ in range(2)] == ["content", "done"]
+
+    @pytest.mark.asyncio
+    async def test_get_waits_for_emit(self) -> None:
+        """Test get() blocks until an event is emitted."""
+        emitter = EventQueueEmitter(maxsize=10)
+        queue = emitter.subscribe()
+
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await emitter.emit("done", {})
+
+        assert (await asyncio.wait_for(waiter, timeout=1))["event"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self) -> None:
+        """Test a full buffer discards its oldest event."""
+        emitter = EventQueueEmitter(maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        queue = emitter.subscribe()
+
+        for i in range(3):
+            await emitter.emit("tick", {"n": i})
+
+        assert [queue.get_nowait()["data"]["n"] for _ in range(2)] == [1, 2]
+        assert queue.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_content_deltas(self) -> None:
+        """Test a full buffer merges content deltas instead of dropping text."""
+        emitter = EventQueueEmitter(maxsize=2, overflow_policy=OverflowPolicy.COALESCE)
+        queue = emitter.subscribe()
+
+        await emitter.emit("assistant_message_start", {})
+        for token in ("Hel", "lo", " world"):
+            await emitter.emit("content", {"type": "content", "content": token})
+
+        assert queue.get_nowait()["event"] == "assistant_message_start"
+        assert queue.get_nowait()["data"] == {"type": "content", "content": "Hello world"}
+        assert queue.dropped == 0
+        assert queue.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_slow_subscriber(self) -> None:
+        """Test the disconnect policy drops a slow subscriber without affecting others."""
+        emitter = EventQueueEmitter(maxsize=1, overflow_policy=OverflowPolicy.DISCONNECT)
+        slow = emitter.subscribe()
+        fast = emitter.subscribe()
+
+        await emitter.emit("tick", {"n": 0})
+        fast.get_nowait()
+        await emitter.emit("tick", {"n": 1})
+
+        assert emitter.queues == [fast]
+        assert fast.get_nowait()["data"] == {"n": 1}
+        with pytest.raises(SubscriberOverflowError):
+            await slow.get()
+
+    @pytest.mark.asyncio
+    async def test_lag_stats(self) -> None:
+        """Test per-subscriber lag is reported."""
+        emitter = EventQueueEmitter(maxsize=5, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        queue = emitter.subscribe()
+        for i in range(3):
+            await emitter.emit("tick", {"n": i})
+        await queue.get()
+
+        assert emitter.stats() == [
+            {
+                "lag": 2,
+                "maxsize": 5,
+                "policy": "drop_oldest",
+                "delivered": 1,
+                "dropped": 0,
+                "coalesced": 0,
+                "closed": False,
+            }
+        ]
+
+    def test_configure_defaults(self) -> None:
+        """Test configured limits apply to new emitters and are validated."""
+        try:
+            configure_subscriber_queues(7, "disconnect")
+            configure_replay_ring(50)
+            emitter = EventQueueEmitter()
+            assert emitter.maxsize == 7
+            assert emitter.overflow_policy == OverflowPolicy.DISCONNECT
+            assert get_replay_ring_size() == 50
+
+            with pytest.raises(ValueError):
+                configure_subscriber_queues(0, "coalesce")
+            with pytest.raises(ValueError):
+                configure_replay_ring(-1)
+        finally:
+            configure_subscriber_queues(DEFAULT_SUBSCRIBER_QUEUE_SIZE, DEFAULT_OVERFLOW_POLICY)
+            configure_replay_ring(DEFAULT_REPLAY_SIZE)
+
+
+@pytest.mark.integration
+class TestEventReplay:
+    """Test event ids and replay for resuming subscribers."""
+
+    @pytest.mark.asyncio
+    async def test_ids_increase_monotonically(self) -> None:
+        """Test every emitted event gets the next id."""
+        emitter = EventQueueEmitter(maxsize=10)
+        queue = emitter.subscribe()
+
+        for i in range(3):
+            await emitter.emit("tick", {"n": i})
+
+        assert [queue.get_nowait()["id"] for _ in range(3)] == [1, 2, 3]
+        assert emitter.last_id == 3
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_only_missed_events(self) -> None:
+        """Test subscribing after an id replays later events, then continues live."""
+        emitter = EventQueueEmitter(maxsize=10, replay_size=10)
+        for i in range(5):
+            await emitter.emit("tick", {"n": i})
+
+        queue = emitter.subscribe(after_id=3)
+        await emitter.emit("tick", {"n": 5})
+
+        assert queue.replay_complete
+        assert [queue.get_nowait()["id"] for _ in range(3)] == [4, 5, 6]
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_resume_up_to_date(self) -> None:
+        """Test resuming at the latest id replays nothing."""
+        emitter = EventQueueEmitter(maxsize=10, replay_size=10)
+        await emitter.emit("tick", {})
+
+        queue = emitter.subscribe(after_id=1)
+
+        assert queue.replay_complete
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_resume_past_ring_reports_gap(self) -> None:
+        """Test resuming before the oldest retained event is flagged incomplete."""
+        emitter = EventQueueEmitter(maxsize=10, replay_size=2)
+        for i in range(5):
+            await emitter.emit("tick", {"n": i})
+
+        queue = emitter.subscribe(after_id=1)
+
+        assert not queue.replay_complete
+        assert [queue.get_nowait()["id"] for _ in range(2)] == [4, 5]
+
+    @pytest.mark.asyncio
+    async def test_resume_unknown_future_id_reports_gap(self) -> None:
+        """Test an id this stream never emitted can't be resumed."""
+        emitter = EventQueueEmitter(maxsize=10, replay_size=10)
+        await emitter.emit("tick", {})
+
+        assert not emitter.subscribe(after_id=42).replay_complete
+
+    @pytest.mark.asyncio
+    async def test_coalesced_event_keeps_latest_id(self) -> None:
+        """Test merged deltas carry the id of the newest delta."""
+        emitter = EventQueueEmitter(maxsize=1, overflow_policy=OverflowPolicy.COALESCE)
+        queue = emitter.subscribe()
+
+        await emitter.emit("content", {"content": "a"})
+        await emitter.emit("content", {"content": "b"})
+
+        assert queue.get_nowait() == {"id": 2, "event": "content", "data": {"content": "ab"}}
+
+
+@pytest.mark.unit
+class TestContentCoalescing:
+    """Test source-side batching of content deltas and shared SSE encoding."""
+
+    @pytest.mark.asyncio
+    async def test_flush_on_byte_limit(self) -> None:
+        """Test pending content is published once it reaches the byte limit."""
+        emitter = EventQueueEmitter(maxsize=10, coalesce_ms=1000, coalesce_bytes=4)
+        queue = emitter.subscribe()
+
+        await emitter.emit("content", {"type": "content", "content": "ab"})
+        assert queue.empty()
+        await emitter.emit("content", {"type": "content", "content": "cd"})
+
+        assert queue.get_nowait() == {"id": 1, "event": "content", "data": {"type": "content", "content": "abcd"}}
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_flush_on_interval(self) -> None:
+        """Test pending content is published after the interval without further events."""
+        emitter = EventQueueEmitter(maxsize=10, coalesce_ms=5, coalesce_bytes=1024)
+        queue = emitter.subscribe()
+
+        await emitter.emit("content", {"content": "a"})
+        await emitter.emit("content", {"content": "b"})
+
+        event = await asyncio.wait_for(queue.get(), timeout=1.0)
+        assert event["data"] == {"content": "ab"}
+
+    @pytest.mark.asyncio
+    async def test_other_events_flush_first(self) -> None:
+        """Test a non-content event publishes pending content before itself."""
+        emitter = EventQueueEmitter(maxsize=10, coalesce_ms=1000, coalesce_bytes=1024)
+        queue = emitter.subscribe()
+
+        await emitter.emit("content", {"content": "hi"})
+        await emitter.emit("message_complete", {"content": "hi"})
+
+        assert [queue.get_nowait()["event"] for _ in range(2)] == ["content", "message_complete"]
+
+    def test_no_loop_publishes_immediately(self) -> None:
+        """Test deltas emitted without a running loop aren't held."""
+        emitter = EventQueueEmitter(maxsize=10, coalesce_ms=1000, coalesce_bytes=1024)
+        queue = emitter.subscribe()
+
+        emitter.emit_nowait("content", {"content": "x"})
+
+        assert queue.get_nowait()["data"] == {"content": "x"}
+
+    @pytest.mark.asyncio
+    async def test_encoded_once_for_all_subscribers(self) -> None:
+        """Test every subscriber yields the same encoded bytes."""
+        emitter = EventQueueEmitter(maxsize=10)
+        first = emitter.subscribe()
+        second = emitter.subscribe()
+
+        await emitter.emit("tool_call", {"name": "bash"})
+
+        encoded = encode_sse_event(first.get_nowait(), emitter.stream_id)
+        assert encode_sse_event(second.get_nowait(), emitter.stream_id) is encoded
+        assert encoded.startswith(b"id: " + emitter.stream_id.encode() + b"-1")
+        assert b'data: {"name": "bash"}' in encoded
+
+    @pytest.mark.asyncio
+    async def test_merged_deltas_reencode(self) -> None:
+        """Test a subscriber-side merge doesn't reuse a stale encoding."""
+        emitter = EventQueueEmitter(maxsize=1, overflow_policy=OverflowPolicy.COALESCE)
+        queue = emitter.subscribe()
+        await emitter.emit("content", {"content": "a"})
+        encode_sse_event(queue._buffer[-1])
+
+        await emitter.emit("content", {"content": "b"})
+
+        assert b'"ab"' in encode_sse_event(queue.get_nowait())
+
+    def test_configure_content_coalescing(self) -> None:
+        """Test validation of the daemon-wide coalescing settings."""
+        original = get_content_coalescing()
+        try:
+            configure_content_coalescing(0, 1)
+            assert get_content_coalescing() == (0, 1)
+            with pytest.raises(ValueError):
+                configure_content_coalescing(-1, 1)
+            with pytest.raises(ValueError):
+                configure_content_coalescing(10, 0)
+        finally:
+            configure_content_coalescing(*original)
@@ -4,9 +4,17 @@ Unit tests for execution runner.
 Tests ExecutionRunner with mocked amplifier-core to avoid real LLM calls.
 """
 
-import pytest
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import Mock
 
+import pytest
+
+from amplifier_library.execution import context_snapshot
+from amplifier_library.execution.context_snapshot import add_messages
+from amplifier_library.execution.response import ResponseBuffer
 from amplifier_library.execution.runner import ExecutionRunner
 from amplifier_library.models import Session
 from amplifier_library.sessions import state
@@ -145,6 +153,28 @@ class TestExecutionRunner:
         with pytest.raises(RuntimeError, match="amplifier-core is required"):
             await runner.execute(sample_session, "Test")
 
+        # The prompt is recorded before the session is started
+        transcript = state.get_transcript(sample_session.session_id)
+        assert [(m.role, m.content) for m in transcript] == [("user", "Test")]
+
+    @pytest.mark.asyncio
+    async def test_history_excludes_current_turn(self, mock_session_manager: Mock) -> None:
+        """Test the current turn's prompt isn't loaded into the context as history."""
+        mock_session_manager.get_transcript.return_value = [
+            SimpleNamespace(role="user", content="Earlier"),
+            SimpleNamespace(role="assistant", content="Reply"),
+            SimpleNamespace(role="user", content="Now"),
+        ]
+        runner = ExecutionRunner(
+            session_manager=mock_session_manager,
+            config={},
+            session_id="test-session",
+        )
+
+        history = await runner._load_transcript_history(current_messages=1)
+
+        assert history == [{"role": "user", "content": "Earlier"}, {"role": "assistant", "content": "Reply"}]
+
     @pytest.mark.asyncio
     async def test_execute_handles_execution_error(
         self, sample_session: Session, mock_session_manager: Mock, mock_amplifier_module
@@ -193,6 +223,23 @@ class TestExecutionRunner:
         await runner.cleanup()
         assert runner._session is None
 
+    @pytest.mark.asyncio
+    async def test_context_bytes_tracked(
+        self, sample_session: Session, mock_session_manager: Mock, mock_amplifier_module
+    ) -> None:
+        """Test the context size grows with each turn and resets on cleanup."""
+        runner = ExecutionRunner(
+            session_manager=mock_session_manager,
+            config={},
+            session_id="test-session",
+        )
+
+        response = await runner.execute(sample_session, "Test")
+        assert runner.context_bytes == len("Test") + len(response)
+
+        await runner.cleanup()
+        assert runner.context_bytes == 0
+
     @pytest.mark.asyncio
     async def test_multiple_executions_update_transcript(
         self, sample_session: Session, mock_session_manager: Mock, mock_amplifier_module
@@ -217,3 +264,139 @@ class TestExecutionRunner:
         assert transcript[0].content == "First question"
         assert transcript[2].content == "Second question"
         assert transcript[4].content == "Third question"
+
+
+@pytest.mark.unit
+class TestResponseBuffer:
+    """Test ResponseBuffer and its use by execute_stream."""
+
+    def test_joins_chunks(self) -> None:
+        """Test chunks are joined in order and empty chunks ignored."""
+        response = ResponseBuffer()
+        assert not response
+        assert response.text == ""
+
+        for chunk in ["Hel", "", "lo", " world"]:
+            response.append(chunk)
+
+        assert response.text == "Hello world"
+        assert len(response) == 11
+        response.append("!")
+        assert response.text == "Hello world!"
+
+    @pytest.mark.asyncio
+    async def test_execute_stream_fills_buffer(
+        self, sample_session: Session, mock_session_manager: Mock, tmp_path
+    ) -> None:
+        """Test execute_stream records its tokens once for the caller and the transcript."""
+
+        async def stream(*args):
+            for token in ["mocked ", "stream"]:
+                yield token, None
+
+        orchestrator = Mock()
+        orchestrator._execute_stream = stream
+        live_session = Mock()
+        live_session.coordinator.get = Mock(side_effect=lambda name: orchestrator if name == "orchestrator" else None)
+        mock_session_manager.storage_dir = tmp_path
+        runner = ExecutionRunner(session_manager=mock_session_manager, config={}, session_id="test-session")
+        runner._session = live_session
+
+        response = ResponseBuffer()
+        tokens = [token async for token in runner.execute_stream(sample_session, "Hi", response=response)]
+
+        assert tokens == ["mocked ", "stream"]
+        assert response.text == "mocked stream"
+        transcript = state.get_transcript(sample_session.session_id)
+        assert transcript[-1].content == "mocked stream"
+
+
+class FakeContext:
+    """Context module holding messages in a list."""
+
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+        self.calls: list[str] = []
+
+    async def add_message(self, message: dict[str, Any]) -> None:
+        self.calls.append("add_message")
+        self.messages.append(message)
+
+    async def get_messages(self) -> list[dict[str, Any]]:
+        return list(self.messages)
+
+    async def set_messages(self, messages: list[dict[str, Any]]) -> None:
+        self.calls.append("set_messages")
+        self.messages = list(messages)
+
+
+def _live_session(context: FakeContext) -> Mock:
+    async def stream(*args):
+        yield "answer", None
+
+    orchestrator = Mock()
+    orchestrator._execute_stream = stream
+    modules = {"orchestrator": orchestrator, "context": context}
+    live_session = Mock()
+    live_session.coordinator.get = Mock(side_effect=modules.get)
+    return live_session
+
+
+@pytest.mark.unit
+class TestContextSnapshot:
+    """Test context snapshots, bulk message adds and one-time profile context."""
+
+    def test_snapshot_matches_session_state(self, tmp_path: Path) -> None:
+        """Test a snapshot is only loaded for the same message count and profile context."""
+        messages = [{"role": "user", "content": "Hi"}]
+        context_snapshot.save_context_snapshot(tmp_path, messages, message_count=2, profile_context="abc")
+
+        assert context_snapshot.load_context_snapshot(tmp_path, 2, "abc") == messages
+        assert context_snapshot.load_context_snapshot(tmp_path, 3, "abc") is None
+        assert context_snapshot.load_context_snapshot(tmp_path, 2, None) is None
+
+    def test_unserializable_context_not_snapshotted(self, tmp_path: Path) -> None:
+        """Test a context that can't be serialized removes the old snapshot."""
+        context_snapshot.save_context_snapshot(tmp_path, [], message_count=0, profile_context=None)
+
+        context_snapshot.save_context_snapshot(tmp_path, [{"content": object()}], message_count=2, profile_context=None)
+
+        assert not (tmp_path / context_snapshot.SNAPSHOT_FILENAME).exists()
+
+    @pytest.mark.asyncio
+    async def test_add_messages_in_one_call(self) -> None:
+        """Test messages are appended with one set_messages call instead of one call each."""
+        context = FakeContext()
+        await context.add_message({"role": "user", "content": "first"})
+
+        await add_messages(context, [{"role": "user", "content": "second"}, {"role": "user", "content": "third"}])
+
+        assert [m["content"] for m in context.messages] == ["first", "second", "third"]
+        assert context.calls == ["add_message", "set_messages"]
+
+    @pytest.mark.asyncio
+    async def test_profile_context_once_and_restored(
+        self, sample_session: Session, mock_session_manager: Mock, tmp_path: Path
+    ) -> None:
+        """Test profile context is injected once, and a new runner restores the context from its snapshot."""
+        session_dir = tmp_path / "test-session"
+        session_dir.mkdir()
+        (session_dir / "profile_context_messages.json").write_text(json.dumps([{"role": "user", "content": "ctx"}]))
+        mock_session_manager.storage_dir = tmp_path
+        mock_session_manager.get_session = Mock(return_value=SimpleNamespace(message_count=4))
+        context = FakeContext()
+        runner = ExecutionRunner(session_manager=mock_session_manager, config={}, session_id="test-session")
+        runner._session = _live_session(context)
+
+        for prompt in ["one", "two"]:
+            [_ async for _ in runner.execute_stream(sample_session, prompt)]
+
+        assert [m["content"] for m in context.messages].count("ctx") == 1
+
+        restored = FakeContext()
+        rehydrated = ExecutionRunner(session_manager=mock_session_manager, config={}, session_id="test-session")
+        rehydrated._session = _live_session(restored)
+
+        assert await rehydrated._restore_context_snapshot()
+        assert restored.messages == context.messages
+        assert restored.calls == ["set_messages"]
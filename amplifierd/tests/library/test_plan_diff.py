@@ -0,0 +1,91 @@
+"""
+Unit tests for mount plan diffing and runner invalidation.
+
+Tests that an equivalent mount plan keeps the warm runner and that any
+change, including a config-only one, rebuilds it.
+"""
+
+import copy
+from typing import Any
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+
+import pytest
+from amplifierd.services.session_stream_manager import SessionStreamManager
+
+from amplifier_library.execution.plan_diff import diff_mount_plans
+
+
+def _plan() -> dict[str, Any]:
+    return {
+        "session": {"orchestrator": "loop-streaming", "context": "context-simple"},
+        "providers": [{"module": "provider-anthropic", "source": "git+x@main", "config": {"api_key": "old"}}],
+        "tools": [{"module": "tool-bash", "config": {}}],
+        "hooks": [{"module": "hooks-logging", "config": {"level": "info"}}],
+    }
+
+
+@pytest.mark.unit
+class TestDiffMountPlans:
+    """Test diff_mount_plans classification."""
+
+    def test_identical_plans(self) -> None:
+        """Test equal plans produce an empty diff."""
+        assert diff_mount_plans(_plan(), _plan()).is_empty
+
+    @pytest.mark.parametrize(
+        ("mutate", "path"),
+        [
+            (lambda p: p["session"].update(orchestrator="loop-basic"), "session"),
+            (lambda p: p["tools"].append({"module": "tool-web"}), "tools"),
+            (lambda p: p["providers"][0].update(source="git+x@v2"), "providers.provider-anthropic"),
+            (lambda p: p["providers"][0]["config"].update(api_key="new"), "providers.provider-anthropic.config"),
+            (lambda p: p["hooks"][0]["config"].update(level="debug"), "hooks.hooks-logging.config"),
+        ],
+    )
+    def test_changes(self, mutate, path: str) -> None:
+        """Test a change is reported at its most specific path."""
+        new = _plan()
+        mutate(new)
+
+        diff = diff_mount_plans(_plan(), new)
+
+        assert not diff.is_empty
+        assert diff.changes == [path]
+
+
+@pytest.mark.unit
+class TestUpdateMountPlan:
+    """Test SessionStreamManager.update_mount_plan runner invalidation."""
+
+    def _manager(self) -> tuple[SessionStreamManager, Mock]:
+        manager = SessionStreamManager("test-session", _plan())
+        runner = Mock()
+        runner.cleanup = AsyncMock()
+        manager._runner = runner
+        manager._runner_initialized = True
+        return manager, runner
+
+    @pytest.mark.asyncio
+    async def test_unchanged_plan_keeps_runner(self) -> None:
+        """Test an equivalent plan leaves the warm runner alone."""
+        manager, runner = self._manager()
+
+        await manager.update_mount_plan(copy.deepcopy(manager.mount_plan))
+
+        assert manager._runner is runner
+        runner.cleanup.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_config_change_rebuilds_runner(self) -> None:
+        """Test a config-only change (e.g. a new API key) drops the runner for rebuild."""
+        manager, runner = self._manager()
+        new = _plan()
+        new["providers"][0]["config"]["api_key"] = "new"
+
+        await manager.update_mount_plan(new)
+
+        assert manager._runner is None
+        assert manager._runner_initialized is False
+        assert manager.mount_plan == new
+        runner.cleanup.assert_awaited_once()
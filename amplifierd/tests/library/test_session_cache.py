@@ -0,0 +1,186 @@
+"""
+Unit tests for the shared SessionManager and its metadata cache.
+
+Tests that get_session is served from memory after the first read, that
+writes through the manager keep the cache current, that other processes'
+writes can be announced and invalidated, and that one manager is shared
+per state directory.
+"""
+
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from amplifier_library.sessions.manager import SessionManager
+from amplifier_library.sessions.manager import get_session_manager
+from amplifier_library.storage import paths
+
+
+def _create(manager: SessionManager, **kwargs) -> str:
+    session_id = str(uuid.uuid4())
+    manager.create_session(session_id=session_id, profile_name="default", **kwargs)
+    return session_id
+
+
+@pytest.mark.unit
+class TestMetadataCache:
+    """Test SessionManager's metadata LRU cache."""
+
+    def test_get_served_from_cache(self, tmp_path: Path) -> None:
+        """Test repeated get_session calls don't read the store."""
+        manager = SessionManager(storage_dir=tmp_path)
+        session_id = _create(manager)
+
+        with patch.object(manager.store, "get", wraps=manager.store.get) as get:
+            assert manager.get_session(session_id) is not None
+            assert manager.get_session(session_id) is not None
+
+        get.assert_not_called()
+
+    def test_returns_copies(self, tmp_path: Path) -> None:
+        """Test mutating a returned session doesn't change the cached one."""
+        manager = SessionManager(storage_dir=tmp_path)
+        session_id = _create(manager)
+
+        session = manager.get_session(session_id)
+        assert session is not None
+        session.name = "mutated"
+
+        cached = manager.get_session(session_id)
+        assert cached is not None
+        assert cached.name is None
+
+    def test_updates_refresh_cache(self, tmp_path: Path) -> None:
+        """Test writes through the manager are visible on the next read."""
+        manager = SessionManager(storage_dir=tmp_path)
+        session_id = _create(manager)
+        manager.get_session(session_id)
+
+        manager.append_message(session_id, "user", "Hello", token_count=3)
+        manager.update_session_fields(session_id, name="Renamed")
+
+        session = manager.get_session(session_id)
+        assert session is not None
+        assert session.message_count == 1
+        assert session.token_usage == 3
+        assert session.name == "Renamed"
+
+    def test_delete_invalidates_tree(self, tmp_path: Path) -> None:
+        """Test deleting a session drops it and its children from the cache."""
+        manager = SessionManager(storage_dir=tmp_path)
+        parent = _create(manager)
+        child = _create(manager, parent_session_id=parent)
+        manager.get_session(child)
+
+        manager.delete_session(parent)
+
+        assert manager.get_session(parent) is None
+        assert manager.get_session(child) is None
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """Test the least recently used entry is evicted beyond the cache size."""
+        manager = SessionManager(storage_dir=tmp_path, metadata_cache_size=2)
+        first = _create(manager)
+        second = _create(manager)
+        manager.get_session(first)
+        third = _create(manager)
+
+        assert list(manager._metadata_cache) == [first, third]
+        assert second not in manager._metadata_cache
+
+    def test_cache_disabled(self, tmp_path: Path) -> None:
+        """Test a cache size of 0 always reads the store."""
+        manager = SessionManager(storage_dir=tmp_path, metadata_cache_size=0)
+        session_id = _create(manager)
+
+        with patch.object(manager.store, "get", wraps=manager.store.get) as get:
+            manager.get_session(session_id)
+
+        get.assert_called_once_with(session_id)
+
+
+@pytest.mark.unit
+class TestCrossProcessCoherence:
+    """Test change listeners and invalidation for managers sharing a store."""
+
+    def test_writes_notify_listeners(self, tmp_path: Path) -> None:
+        """Test create, update and delete each announce the changed session."""
+        manager = SessionManager(storage_dir=tmp_path)
+        changed: list[str] = []
+        manager.add_change_listener(changed.append)
+
+        session_id = _create(manager)
+        manager.update_session_fields(session_id, name="Renamed")
+        manager.delete_session(session_id)
+
+        assert changed == [session_id, session_id, session_id]
+
+    def test_failing_listener_does_not_fail_write(self, tmp_path: Path) -> None:
+        """Test a listener error is logged, not raised."""
+        manager = SessionManager(storage_dir=tmp_path)
+
+        def failing_listener(session_id: str) -> None:
+            raise RuntimeError(f"listener failed for {session_id}")
+
+        manager.add_change_listener(failing_listener)
+
+        session_id = _create(manager)
+
+        assert manager.get_session(session_id) is not None
+
+    def test_invalidate_rereads_other_writer(self, tmp_path: Path) -> None:
+        """Test a write by another manager is seen once invalidated."""
+        reader = SessionManager(storage_dir=tmp_path)
+        writer = SessionManager(storage_dir=tmp_path)
+        writer.add_change_listener(reader.invalidate)
+        session_id = _create(writer)
+        reader.get_session(session_id)
+
+        writer.update_session_fields(session_id, name="Renamed")
+
+        session = reader.get_session(session_id)
+        assert session is not None
+        assert session.name == "Renamed"
+
+
+@pytest.mark.unit
+class TestSharedManager:
+    """Test get_session_manager() and directory creation memoization."""
+
+    def test_one_manager_per_state_dir(self, tmp_path: Path) -> None:
+        """Test the same manager is returned for the same directory."""
+        first = get_session_manager(tmp_path / "a")
+        second = get_session_manager(tmp_path / "a" / ".." / "a")
+        other = get_session_manager(tmp_path / "b")
+
+        assert first is second
+        assert first is not other
+
+    def test_defaults_to_state_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the default manager uses $AMPLIFIERD_STATE_DIR."""
+        monkeypatch.setenv("AMPLIFIERD_STATE_DIR", str(tmp_path / "state"))
+
+        manager = get_session_manager()
+
+        assert manager.storage_dir == (tmp_path / "state" / "sessions").resolve()
+
+    def test_state_dir_created_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test get_state_dir doesn't call mkdir once the directory exists."""
+        monkeypatch.setenv("AMPLIFIERD_STATE_DIR", str(tmp_path / "state"))
+
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+            assert paths.get_state_dir().is_dir()
+            paths.get_state_dir()
+
+        mkdir.assert_called_once()
+
+    def test_removed_dir_recreated(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a directory removed while the process runs is created again."""
+        monkeypatch.setenv("AMPLIFIERD_CACHE_DIR", str(tmp_path / "cache"))
+        mount_plans = paths.get_mount_plan_cache_dir()
+
+        mount_plans.rmdir()
+
+        assert paths.get_mount_plan_cache_dir().is_dir()
@@ -0,0 +1,210 @@
+"""
+Unit tests for the journaled session index.
+
+Tests that mutations append to the journal instead of rewriting index.json,
+and that snapshot + journal replay reproduce the index.
+"""
+
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+
+from amplifier_library.sessions.filesystem_store import FilesystemSessionStore
+from amplifier_library.sessions.index import SessionIndexJournal
+from amplifier_library.sessions.manager import SessionManager
+
+
+def _filesystem_store(manager: SessionManager) -> FilesystemSessionStore:
+    """Get the manager's store, which these tests reach into."""
+    store = manager.store
+    assert isinstance(store, FilesystemSessionStore)
+    return store
+
+
+@pytest.fixture
+def store(session_manager: SessionManager) -> FilesystemSessionStore:
+    """Filesystem store behind the session_manager fixture."""
+    return _filesystem_store(session_manager)
+
+
+@pytest.mark.unit
+class TestSessionIndexJournal:
+    """Test SessionIndexJournal persistence."""
+
+    def test_mutations_append_to_journal(self, session_manager: SessionManager) -> None:
+        """Test session changes append journal records without writing a snapshot."""
+        session_id = str(uuid.uuid4())
+        session_manager.create_session(session_id=session_id, profile_name="default")
+        session_manager.append_message(session_id, "user", "Hello")
+
+        journal_path = session_manager.storage_dir / "index.journal.jsonl"
+        records = [json.loads(line) for line in journal_path.read_text().splitlines()]
+
+        assert [r["op"] for r in records] == ["put", "put"]
+        assert records[-1]["entry"]["message_count"] == 1
+        assert not session_manager.index_path.exists()
+
+    def test_unchanged_entry_is_not_journaled(self, session_manager: SessionManager) -> None:
+        """Test updates that don't touch indexed fields append nothing."""
+        session_id = str(uuid.uuid4())
+        session_manager.create_session(session_id=session_id, profile_name="default")
+        journal_path = session_manager.storage_dir / "index.journal.jsonl"
+        size_before = journal_path.stat().st_size
+
+        session_manager.update_session_fields(session_id, agent_invocations=3)
+
+        assert journal_path.stat().st_size == size_before
+
+    def test_reload_replays_snapshot_and_journal(
+        self, session_manager: SessionManager, store: FilesystemSessionStore
+    ) -> None:
+        """Test a fresh process sees the same index from snapshot + journal."""
+        kept = session_manager.create_session(session_id=str(uuid.uuid4()), profile_name="kept")
+        store._index.compact()
+        deleted = session_manager.create_session(session_id=str(uuid.uuid4()), profile_name="deleted")
+        session_manager.complete_session(kept.session_id)
+        session_manager.delete_session(deleted.session_id)
+
+        reloaded = SessionIndexJournal(session_manager.storage_dir)
+
+        entry = reloaded.get(kept.session_id)
+        assert entry is not None
+        assert entry.status == "completed"
+        assert reloaded.get(deleted.session_id) is None
+        assert len(reloaded) == 1
+
+    def test_compaction_truncates_journal(self, tmp_path: Path) -> None:
+        """Test the journal is folded into index.json once it passes the threshold."""
+        manager = SessionManager(storage_dir=tmp_path)
+        _filesystem_store(manager)._index.compact_threshold = 3
+        session = manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        for i in range(3):
+            manager.append_message(session.session_id, "user", f"Message {i}")
+
+        assert manager.index_path.exists()
+        assert (manager.storage_dir / "index.journal.jsonl").read_text() == ""
+        entry = SessionIndexJournal(manager.storage_dir).get(session.session_id)
+        assert entry is not None
+        assert entry.message_count == 3
+
+    def test_picks_up_writes_from_other_instances(self, tmp_path: Path) -> None:
+        """Test an index notices journal records appended by another process."""
+        reader = SessionIndexJournal(tmp_path / "sessions")
+        writer = SessionManager(storage_dir=tmp_path)
+        _filesystem_store(writer)._index = SessionIndexJournal(writer.storage_dir)
+
+        session = writer.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+
+        assert reader.get(session.session_id) is not None
+
+    def test_ignores_torn_trailing_record(self, session_manager: SessionManager) -> None:
+        """Test a partially written last line is skipped on load."""
+        session = session_manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        journal_path = session_manager.storage_dir / "index.journal.jsonl"
+        with open(journal_path, "a") as f:
+            f.write('{"op": "delete", "sess')
+
+        reloaded = SessionIndexJournal(session_manager.storage_dir)
+
+        assert reloaded.get(session.session_id) is not None
+
+    def test_list_sessions_loads_only_returned_page(
+        self, session_manager: SessionManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test filtering, sorting and limit happen before any session.json read."""
+        parent = session_manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        children = [
+            session_manager.create_session(
+                session_id=str(uuid.uuid4()), profile_name="default", parent_session_id=parent.session_id
+            )
+            for _ in range(5)
+        ]
+        loaded: list[str] = []
+        original_get = session_manager.store.get
+
+        def tracking_get(session_id: str):
+            loaded.append(session_id)
+            return original_get(session_id)
+
+        monkeypatch.setattr(session_manager.store, "get", tracking_get)
+
+        page = session_manager.list_sessions(parent_session_id=parent.session_id, limit=2)
+        entries = session_manager.list_session_entries(parent_session_id=parent.session_id)
+
+        assert [s.session_id for s in page] == [children[4].session_id, children[3].session_id]
+        assert loaded == [children[4].session_id, children[3].session_id]
+        assert len(entries) == 5
+
+    def test_backfills_entries_from_older_index(self, tmp_path: Path) -> None:
+        """Test entries missing list-view fields are refreshed from session.json once."""
+        manager = SessionManager(storage_dir=tmp_path)
+        parent = manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        child = manager.create_session(
+            session_id=str(uuid.uuid4()), profile_name="default", parent_session_id=parent.session_id
+        )
+        manager.update_session_fields(child.session_id, is_unread=True)
+        store = _filesystem_store(manager)
+        store._index.compact()
+
+        # Rewrite the snapshot in the old format (no parent/name/unread/token fields)
+        snapshot = json.loads(manager.index_path.read_text())
+        for entry in snapshot["sessions"].values():
+            for field in ("name", "parent_session_id", "token_usage", "is_unread"):
+                entry.pop(field, None)
+        manager.index_path.write_text(json.dumps(snapshot))
+
+        index = SessionIndexJournal(manager.storage_dir)
+        store._index = index
+        store._backfill_index()
+
+        entry = index.get(child.session_id)
+        assert entry is not None
+        assert entry.parent_session_id == parent.session_id
+        assert entry.is_unread is True
+        assert "is_unread" in next(iter(json.loads(manager.index_path.read_text())["sessions"].values()))
+
+    def test_backfill_drops_orphaned_entries(self, tmp_path: Path) -> None:
+        """Test old entries without a session.json are removed so the backfill runs only once."""
+        manager = SessionManager(storage_dir=tmp_path)
+        kept = manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        orphan = manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        store = _filesystem_store(manager)
+        store._index.compact()
+        (manager.storage_dir / orphan.session_id / "session.json").unlink()
+
+        snapshot = json.loads(manager.index_path.read_text())
+        for entry in snapshot["sessions"].values():
+            entry.pop("is_unread")
+        manager.index_path.write_text(json.dumps(snapshot))
+
+        index = SessionIndexJournal(manager.storage_dir)
+        store._index = index
+        store._backfill_index()
+        snapshot_after_backfill = manager.index_path.read_text()
+
+        assert [e.session_id for e in index.entries()] == [kept.session_id]
+        assert all("is_unread" in e.model_fields_set for e in SessionIndexJournal(manager.storage_dir).entries())
+
+        store._backfill_index()
+
+        assert manager.index_path.read_text() == snapshot_after_backfill
+
+    def test_children_map_follows_journal(self, session_manager: SessionManager, store: FilesystemSessionStore) -> None:
+        """Test the parent -> children map is rebuilt on reload and updated on delete."""
+        parent = session_manager.create_session(session_id=str(uuid.uuid4()), profile_name="default")
+        child = session_manager.create_session(
+            session_id=str(uuid.uuid4()), profile_name="default", parent_session_id=parent.session_id
+        )
+        store._index.compact()
+        other = session_manager.create_session(
+            session_id=str(uuid.uuid4()), profile_name="default", parent_session_id=parent.session_id
+        )
+
+        reloaded = SessionIndexJournal(session_manager.storage_dir)
+        assert [e.session_id for e in reloaded.children(parent.session_id)] == [child.session_id, other.session_id]
+
+        session_manager.delete_session(other.session_id)
+
+        assert [e.session_id for e in reloaded.children(parent.session_id)] == [child.session_id]
@@ -0,0 +1,187 @@
+"""
+Unit tests for SessionStore backends.
+
+Runs the same SessionManager scenarios against the filesystem and SQLite
+stores to check both backends behave identically.
+"""
+
+import uuid
+from pathlib import Path
+
+import pytest
+
+from amplifier_library.models.sessions import SessionStatus
+from amplifier_library.sessions.manager import SessionManager
+from amplifier_library.sessions.sqlite_store import SQLiteSessionStore
+from amplifier_library.sessions.store import configure_session_store
+from amplifier_library.sessions.store import create_session_store
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def manager(request: pytest.FixtureRequest, tmp_path: Path) -> SessionManager:
+    """SessionManager backed by each store implementation."""
+    return SessionManager(storage_dir=tmp_path, store=create_session_store(tmp_path / "sessions", request.param))
+
+
+def _create(manager: SessionManager, **kwargs) -> str:
+    session_id = str(uuid.uuid4())
+    manager.create_session(session_id=session_id, profile_name=kwargs.pop("profile_name", "default"), **kwargs)
+    return session_id
+
+
+@pytest.mark.unit
+class TestSessionStoreBackends:
+    """Test SessionManager behaves the same with every backend."""
+
+    def test_create_and_get(self, manager: SessionManager) -> None:
+        """Test created sessions round-trip through the store."""
+        session_id = _create(manager, amplified_dir="proj")
+
+        session = manager.get_session(session_id)
+
+        assert session is not None
+        assert session.amplified_dir == "proj"
+        assert manager.get_session("missing") is None
+
+    def test_list_filters_and_order(self, manager: SessionManager) -> None:
+        """Test list_sessions filters, sorts newest first and limits."""
+        parent = _create(manager, profile_name="a")
+        child = _create(manager, profile_name="b", parent_session_id=parent)
+        newest = _create(manager, profile_name="a")
+        manager.complete_session(newest)
+
+        assert [s.session_id for s in manager.list_sessions()] == [newest, child, parent]
+        assert [s.session_id for s in manager.list_sessions(profile_name="a")] == [newest, parent]
+        assert [s.session_id for s in manager.list_sessions(parent_session_id=parent)] == [child]
+        assert [s.session_id for s in manager.list_sessions(status=SessionStatus.COMPLETED)] == [newest]
+        assert [s.session_id for s in manager.list_sessions(limit=1)] == [newest]
+
+    def test_unread_counts(self, manager: SessionManager) -> None:
+        """Test unread counts are grouped by amplified directory."""
+        first = _create(manager, amplified_dir="one")
+        _create(manager, amplified_dir="one")
+        second = _create(manager, amplified_dir="two")
+        for session_id in (first, second):
+            manager.update_session_fields(session_id, is_unread=True)
+
+        assert manager.get_unread_counts() == {"one": 1, "two": 1}
+
+    def test_transcript_operations(self, manager: SessionManager) -> None:
+        """Test append, limited reads and delete_last_message."""
+        session_id = _create(manager)
+        for i in range(3):
+            manager.append_message(session_id, "user", f"Message {i}")
+
+        assert [m.content for m in manager.get_transcript(session_id, limit=2)] == ["Message 1", "Message 2"]
+
+        deleted = manager.delete_last_message(session_id)
+
+        assert deleted is not None
+        assert deleted.content == "Message 2"
+        assert len(manager.get_transcript(session_id)) == 2
+        session = manager.get_session(session_id)
+        assert session is not None
+        assert session.message_count == 2
+
+    def test_transcript_cursors(self, manager: SessionManager) -> None:
+        """Test before/after cursors, limit and reverse reads."""
+        session_id = _create(manager)
+        for i in range(6):
+            manager.append_message(session_id, "user", f"m{i}")
+
+        def contents(**kwargs) -> list[str]:
+            return [m.content for m in manager.get_transcript(session_id, **kwargs)]
+
+        assert contents(limit=2) == ["m4", "m5"]
+        assert contents(limit=2, before=4) == ["m2", "m3"]
+        assert contents(limit=2, after=1) == ["m2", "m3"]
+        assert contents(after=1, before=4) == ["m2", "m3"]
+        assert contents(limit=3, reverse=True) == ["m5", "m4", "m3"]
+        assert contents(after=10) == []
+        assert contents(before=0) == []
+
+    def test_copy_transcript(self, manager: SessionManager) -> None:
+        """Test transcripts are copied between sessions."""
+        source = _create(manager)
+        target = _create(manager)
+        manager.append_message(source, "user", "Hello")
+
+        manager.copy_transcript(source, target)
+
+        assert [m.content for m in manager.get_transcript(target)] == ["Hello"]
+
+    def test_session_tree(self, manager: SessionManager) -> None:
+        """Test get_session_tree returns the whole subtree, parents first."""
+        root = _create(manager)
+        child = _create(manager, parent_session_id=root)
+        grandchild = _create(manager, parent_session_id=child)
+        sibling = _create(manager, parent_session_id=root)
+        _create(manager)
+
+        tree = [entry.session_id for entry in manager.get_session_tree(root)]
+
+        assert tree == [root, child, sibling, grandchild]
+        assert [entry.session_id for entry in manager.get_session_tree(child)] == [child, grandchild]
+        assert manager.get_session_tree("missing") == []
+
+    def test_delete_cascades_to_children(self, manager: SessionManager) -> None:
+        """Test deleting a parent removes its sub-sessions."""
+        parent = _create(manager)
+        child = _create(manager, parent_session_id=parent)
+        grandchild = _create(manager, parent_session_id=child)
+        manager.append_message(child, "user", "Hello")
+
+        assert manager.delete_session(parent) is True
+
+        assert manager.get_session(parent) is None
+        assert manager.get_session(child) is None
+        assert manager.get_session(grandchild) is None
+        assert not (manager.storage_dir / grandchild).exists()
+        assert manager.get_transcript(child) == []
+        assert manager.list_sessions() == []
+        assert manager.delete_session(parent) is False
+
+
+@pytest.mark.unit
+class TestSQLiteSessionStore:
+    """Test SQLite-specific behavior."""
+
+    def test_uses_wal_mode(self, tmp_path: Path) -> None:
+        """Test the database is opened in WAL mode."""
+        store = SQLiteSessionStore(tmp_path / "sessions.db")
+
+        assert store._fetchall("PRAGMA journal_mode") == [("wal",)]
+
+    def test_unknown_backend_raises(self, tmp_path: Path) -> None:
+        """Test an unknown backend name is rejected."""
+        with pytest.raises(ValueError, match="Unknown session store backend"):
+            create_session_store(tmp_path, "redis")
+
+    def test_configured_backend_is_default(self, tmp_path: Path) -> None:
+        """Test stores created without a backend use the configured one."""
+        configure_session_store("sqlite")
+        try:
+            store = create_session_store(tmp_path / "sessions")
+        finally:
+            configure_session_store("filesystem")
+
+        assert isinstance(store, SQLiteSessionStore)
+
+    def test_filesystem_sessions_imported_once(self, tmp_path: Path) -> None:
+        """Test switching to SQLite keeps existing sessions, and deleted ones don't come back."""
+        filesystem = SessionManager(storage_dir=tmp_path, store=create_session_store(tmp_path / "sessions"))
+        session_id = _create(filesystem, amplified_dir="proj")
+        filesystem.append_message(session_id, "user", "hello")
+        filesystem.append_message(session_id, "assistant", "hi")
+
+        sqlite = SessionManager(storage_dir=tmp_path, store=create_session_store(tmp_path / "sessions", "sqlite"))
+
+        session = sqlite.get_session(session_id)
+        assert session is not None
+        assert session.amplified_dir == "proj"
+        assert [m.content for m in sqlite.get_transcript(session_id)] == ["hello", "hi"]
+
+        sqlite.store.delete(session_id)
+        create_session_store(tmp_path / "sessions", "sqlite")
+
+        assert sqlite.store.get(session_id) is None
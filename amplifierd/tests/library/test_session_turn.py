@@ -0,0 +1,100 @@
+"""
+Unit tests for turn-scoped session write batching.
+
+Tests that a turn's messages are appended together, counters are committed
+with one metadata write, and the fsync policy controls when writes happen.
+"""
+
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from amplifier_library.sessions.manager import SessionManager
+from amplifier_library.sessions.turn import FsyncPolicy
+from amplifier_library.sessions.turn import configure_transcript_fsync
+from amplifier_library.sessions.turn import get_fsync_policy
+
+
+def _manager(tmp_path: Path, policy: FsyncPolicy) -> tuple[SessionManager, str]:
+    manager = SessionManager(storage_dir=tmp_path, fsync_policy=policy)
+    session_id = str(uuid.uuid4())
+    manager.create_session(session_id=session_id, profile_name="default")
+    return manager, session_id
+
+
+@pytest.mark.unit
+class TestSessionTurn:
+    """Test SessionManager.turn() batching."""
+
+    def test_turn_commits_once(self, tmp_path: Path) -> None:
+        """Test a turn appends all messages and updates metadata in one write each."""
+        manager, session_id = _manager(tmp_path, FsyncPolicy.NONE)
+
+        with (
+            patch.object(manager.store, "append_messages", wraps=manager.store.append_messages) as append,
+            patch.object(manager.store, "update", wraps=manager.store.update) as update,
+            manager.turn(session_id) as turn,
+        ):
+            turn.add_message("system", "Context")
+            turn.add_message("user", "Hello")
+            turn.add_message("assistant", "Hi", token_count=5)
+            turn.add_message("assistant", "Done")
+            assert [m.content for m in manager.get_transcript(session_id)] == ["Context", "Hello"]
+
+        assert [len(call.args[1]) for call in append.call_args_list] == [2, 2]
+        assert all(call.kwargs["fsync"] is False for call in append.call_args_list)
+        update.assert_called_once()
+        session = manager.get_session(session_id)
+        assert session is not None
+        assert session.message_count == 4
+        assert session.token_usage == 5
+        assert [m.content for m in manager.get_transcript(session_id)] == ["Context", "Hello", "Hi", "Done"]
+
+    def test_per_message_policy_writes_immediately(self, tmp_path: Path) -> None:
+        """Test the message policy appends and fsyncs each message as it is added."""
+        manager, session_id = _manager(tmp_path, FsyncPolicy.MESSAGE)
+
+        with patch("amplifier_library.sessions.transcript.os.fsync") as fsync, manager.turn(session_id) as turn:
+            turn.add_message("user", "Hello")
+            assert [m.content for m in manager.get_transcript(session_id)] == ["Hello"]
+
+        assert fsync.call_count == 2  # transcript + offset index
+        session = manager.get_session(session_id)
+        assert session is not None
+        assert session.message_count == 1
+
+    def test_turn_policy_fsyncs_once(self, tmp_path: Path) -> None:
+        """Test the turn policy fsyncs once at commit."""
+        manager, session_id = _manager(tmp_path, FsyncPolicy.TURN)
+
+        with patch("amplifier_library.sessions.transcript.os.fsync") as fsync, manager.turn(session_id) as turn:
+            turn.add_message("user", "Hello")
+            turn.add_message("assistant", "Hi")
+
+        assert fsync.call_count == 2
+
+    def test_turn_commits_on_error(self, tmp_path: Path) -> None:
+        """Test messages recorded before an error are still persisted."""
+        manager, session_id = _manager(tmp_path, FsyncPolicy.NONE)
+
+        with pytest.raises(RuntimeError), manager.turn(session_id) as turn:
+            turn.add_message("user", "Hello")
+            raise RuntimeError("execution failed")
+
+        assert [m.content for m in manager.get_transcript(session_id)] == ["Hello"]
+
+    def test_configured_policy(self, tmp_path: Path) -> None:
+        """Test managers created after configure_transcript_fsync() use the configured policy."""
+        configure_transcript_fsync("turn")
+        try:
+            assert get_fsync_policy() == FsyncPolicy.TURN
+            assert SessionManager(storage_dir=tmp_path).fsync_policy == FsyncPolicy.TURN
+        finally:
+            configure_transcript_fsync(FsyncPolicy.NONE)
+
+    def test_invalid_policy(self) -> None:
+        """Test an unknown policy is rejected."""
+        with pytest.raises(ValueError, match="sometimes"):
+            configure_transcript_fsync("sometimes")
@@ -0,0 +1,125 @@
+"""
+Unit tests for the indexed transcript file.
+
+Tests that the offset index tracks appends, survives a crash between the
+transcript and index writes, and serves ranges without parsing everything.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from amplifier_library.sessions import transcript as transcript_module
+from amplifier_library.sessions.transcript import TranscriptFile
+
+
+def _lines(n: int) -> list[str]:
+    return [json.dumps({"n": i}) for i in range(n)]
+
+
+@pytest.mark.unit
+class TestTranscriptFile:
+    """Test TranscriptFile offset index."""
+
+    def test_append_maintains_offsets(self, tmp_path: Path) -> None:
+        """Test each appended line gets one 8-byte index entry."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(3))
+        transcript.append(_lines(2))
+
+        assert transcript.count() == 5
+        assert transcript.index_path.stat().st_size == 5 * 8
+        assert transcript.read(1, 3) == [json.dumps({"n": 1}), json.dumps({"n": 2})]
+        assert transcript.read(3, 100) == _lines(2)
+        assert transcript.read(4, 2) == []
+
+    def test_rebuilds_index_missing_last_append(self, tmp_path: Path) -> None:
+        """Test an index left behind by a crash after the transcript write is rebuilt."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(2))
+        with open(transcript.path, "a") as f:
+            f.write(json.dumps({"n": "crashed"}) + "\n")
+
+        assert transcript.count() == 3
+        assert transcript.read(2, 3) == [json.dumps({"n": "crashed"})]
+
+    def test_builds_index_for_legacy_transcript(self, tmp_path: Path) -> None:
+        """Test transcripts written before the index existed are indexed on first read."""
+        path = tmp_path / "transcript.jsonl"
+        path.write_text("\n".join(_lines(4)) + "\n")
+        transcript = TranscriptFile(path)
+
+        assert transcript.read(0, 2) == _lines(2)
+        assert transcript.index_path.exists()
+
+    def test_read_seeks_to_range(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test reading a range doesn't rebuild or scan an up-to-date index."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(50))
+        monkeypatch.setattr(transcript, "_rebuild_index", lambda: pytest.fail("index rebuilt"))
+
+        assert transcript.read(48, 50) == [json.dumps({"n": 48}), json.dumps({"n": 49})]
+
+    def test_pop_truncates_at_last_offset(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test pop removes only the last line without rewriting the transcript."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(3))
+        inode = transcript.path.stat().st_ino
+        monkeypatch.setattr(transcript, "_rebuild_index", lambda: pytest.fail("index rebuilt"))
+
+        assert transcript.pop() == json.dumps({"n": 2})
+
+        assert transcript.path.stat().st_ino == inode
+        assert transcript.path.read_text() == "\n".join(_lines(2)) + "\n"
+        assert transcript.count() == 2
+
+    def test_pop_recovers_from_crash_between_truncates(self, tmp_path: Path) -> None:
+        """Test an index not yet truncated after the transcript was is detected as stale."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(3))
+        index_bytes = transcript.index_path.read_bytes()
+        transcript.pop()
+        transcript.index_path.write_bytes(index_bytes)
+
+        assert transcript.count() == 2
+        assert transcript.read(0, 10) == _lines(2)
+
+    def test_pop_empty_transcript(self, tmp_path: Path) -> None:
+        """Test pop on a missing or empty transcript returns None."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+
+        assert transcript.pop() is None
+
+    def test_known_sizes_skip_tail_check(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the tail is re-read only when the file sizes changed since the last check."""
+        transcript = TranscriptFile(tmp_path / "transcript.jsonl")
+        transcript.append(_lines(3))
+        checks: list[tuple[int, int]] = []
+        original_matches = TranscriptFile._index_matches
+
+        def tracking_matches(self: TranscriptFile, size: int, index_size: int) -> bool:
+            checks.append((size, index_size))
+            return original_matches(self, size, index_size)
+
+        monkeypatch.setattr(TranscriptFile, "_index_matches", tracking_matches)
+
+        TranscriptFile(transcript.path).count()
+        TranscriptFile(transcript.path).read(0, 2)
+        assert checks == []
+
+        with open(transcript.path, "a") as f:
+            f.write(json.dumps({"n": "crashed"}) + "\n")
+
+        assert TranscriptFile(transcript.path).count() == 4
+        assert len(checks) == 1
+
+    def test_known_sizes_bounded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test only the most recently used transcripts keep their known sizes."""
+        monkeypatch.setattr(transcript_module, "MAX_VERIFIED_TRANSCRIPTS", 2)
+        paths = [tmp_path / f"{i}.jsonl" for i in range(3)]
+        for path in paths:
+            TranscriptFile(path).append(_lines(1))
+
+        assert paths[0] not in transcript_module._verified_sizes
+        assert [p in transcript_module._verified_sizes for p in paths[1:]] == [True, True]
@@ -0,0 +1,84 @@
+"""Tests for the content-addressed store profile trees link to."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifierd.services.blob_store import BlobStore
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Module directory with a nested file, an executable, a symlink and an empty directory."""
+    module = tmp_path / "module"
+    (module / "pkg").mkdir(parents=True)
+    (module / "empty").mkdir()
+    (module / "pyproject.toml").write_text("[project]\nname = 'tool'\n")
+    (module / "pkg" / "tool.py").write_text("print('tool')\n")
+    (module / "run.sh").write_text("#!/bin/sh\n")
+    (module / "run.sh").chmod(0o755)
+    (module / "link.py").symlink_to("pkg/tool.py")
+    return module
+
+
+@pytest.mark.unit
+class TestBlobStore:
+    """Test trees are assembled from shared blobs and unreferenced blobs are collected."""
+
+    def test_trees_share_files(self, tmp_path: Path, source: Path) -> None:
+        """Test two copies of a tree are hardlinks to the same blobs."""
+        store = BlobStore(tmp_path / "blobs")
+
+        assert store.place_tree(source, tmp_path / "a") == 3
+        assert store.place_tree(source, tmp_path / "b") == 3
+
+        tool_a = tmp_path / "a" / "pkg" / "tool.py"
+        tool_b = tmp_path / "b" / "pkg" / "tool.py"
+        assert tool_a.read_text() == "print('tool')\n"
+        assert os.path.samefile(tool_a, tool_b)
+        assert tool_a.stat().st_nlink == 3
+        assert os.readlink(tmp_path / "b" / "link.py") == "pkg/tool.py"
+        assert (tmp_path / "b" / "empty").is_dir()
+        assert os.access(tmp_path / "b" / "run.sh", os.X_OK)
+        assert tool_b.stat().st_mode & 0o222 == 0
+
+    def test_identical_contents_stored_once(self, tmp_path: Path) -> None:
+        """Test files are keyed by contents (and executable bit), not name."""
+        store = BlobStore(tmp_path / "blobs")
+        (tmp_path / "one.py").write_text("same")
+        (tmp_path / "two.py").write_text("same")
+        (tmp_path / "three.sh").write_text("same")
+        (tmp_path / "three.sh").chmod(0o755)
+
+        assert store.add(tmp_path / "one.py") == store.add(tmp_path / "two.py")
+        assert store.add(tmp_path / "one.py") != store.add(tmp_path / "three.sh")
+
+    def test_copy_fallback(self, tmp_path: Path, source: Path) -> None:
+        """Test files are copied where hardlinks and reflinks aren't possible."""
+        store = BlobStore(tmp_path / "blobs")
+
+        with (
+            patch("amplifierd.services.blob_store.os.link", side_effect=OSError(18, "Invalid cross-device link")),
+            patch("amplifierd.services.blob_store._reflink", return_value=False),
+        ):
+            store.place_tree(source, tmp_path / "copy")
+
+        copied = tmp_path / "copy" / "pkg" / "tool.py"
+        assert copied.read_text() == "print('tool')\n"
+        assert copied.stat().st_nlink == 1
+
+    def test_gc_removes_unreferenced_blobs(self, tmp_path: Path, source: Path) -> None:
+        """Test gc keeps linked blobs and drops ones whose trees were deleted."""
+        store = BlobStore(tmp_path / "blobs")
+        store.place_tree(source, tmp_path / "kept")
+        (tmp_path / "other.py").write_text("only in a deleted profile")
+        (tmp_path / "deleted").mkdir()
+        store.place_file(tmp_path / "other.py", tmp_path / "deleted" / "other.py")
+
+        (tmp_path / "deleted" / "other.py").unlink()
+
+        assert store.gc(min_age_seconds=3600) == (0, 0)
+        assert store.gc(min_age_seconds=0) == (1, len("only in a deleted profile"))
+        assert (tmp_path / "kept" / "pkg" / "tool.py").read_text() == "print('tool')\n"
+        assert store.gc(min_age_seconds=0) == (0, 0)
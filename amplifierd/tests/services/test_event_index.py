@@ -0,0 +1,134 @@
+"""Tests for the events.jsonl sidecar index and paged event queries."""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifierd.services import event_index
+from amplifierd.services.event_index import query_events
+
+
+@pytest.fixture(autouse=True)
+def isolated_indexes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test with no in-memory indexes."""
+    monkeypatch.setattr(event_index, "_indexes", OrderedDict())
+
+
+def _write(events_file: Path, *events: dict) -> None:
+    events_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(events_file, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def _event(n: int, event: str = "tool:pre", lvl: str = "INFO", ts: str | None = None) -> dict:
+    return {"event": event, "lvl": lvl, "ts": ts or f"2025-01-01T00:00:{n:02d}+00:00", "n": n}
+
+
+@pytest.mark.unit
+class TestQueryEvents:
+    """Test paging, filtering and merging through the index."""
+
+    def test_page_reads_only_returned_events(self, tmp_path: Path) -> None:
+        """Test a page is read by seeking, without parsing the rest of the log."""
+        events_file = tmp_path / "s1" / "events.jsonl"
+        _write(events_file, *(_event(n) for n in range(10)))
+        query_events([("s1", events_file)])
+
+        with patch.object(event_index.json, "loads", wraps=json.loads) as loads:
+            events, total = query_events([("s1", events_file)], limit=2, offset=3)
+
+        assert total == 10
+        assert [e["n"] for e in events] == [3, 4]
+        assert events[0]["session_id"] == "s1"
+        assert loads.call_count == 2
+
+    def test_filters(self, tmp_path: Path) -> None:
+        """Test event_type prefix and case-insensitive level filters."""
+        events_file = tmp_path / "s1" / "events.jsonl"
+        _write(
+            events_file,
+            _event(0, "tool:pre"),
+            _event(1, "tool:post", lvl="DEBUG"),
+            _event(2, "llm:request"),
+            _event(3, "tool:post"),
+        )
+
+        events, total = query_events([("s1", events_file)], event_type="tool:", level="info")
+
+        assert total == 2
+        assert [e["n"] for e in events] == [0, 3]
+
+    def test_children_merged_by_timestamp(self, tmp_path: Path) -> None:
+        """Test several sessions are merged in timestamp order and paged."""
+        parent = tmp_path / "parent" / "events.jsonl"
+        child = tmp_path / "child" / "events.jsonl"
+        _write(parent, _event(0), _event(2), _event(4))
+        _write(child, _event(1), _event(3))
+
+        events, total = query_events([("parent", parent), ("child", child)], limit=3, offset=1)
+
+        assert total == 5
+        assert [(e["n"], e["session_id"]) for e in events] == [(1, "child"), (2, "parent"), (3, "child")]
+
+    def test_appended_events_indexed_incrementally(self, tmp_path: Path) -> None:
+        """Test only new lines are indexed, and a partial line waits until complete."""
+        events_file = tmp_path / "s1" / "events.jsonl"
+        _write(events_file, _event(0))
+        query_events([("s1", events_file)])
+
+        with open(events_file, "a", encoding="utf-8") as f:
+            f.write("not json\n" + json.dumps(_event(1)) + "\n" + '{"event": "tool')
+
+        events, total = query_events([("s1", events_file)])
+
+        assert total == 2
+        assert [e["n"] for e in events] == [0, 1]
+
+    def test_sidecar_reused_after_restart(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a new process resumes from the sidecar instead of rescanning."""
+        events_file = tmp_path / "s1" / "events.jsonl"
+        _write(events_file, _event(0), _event(1))
+        query_events([("s1", events_file)])
+        assert (tmp_path / "s1" / "events.jsonl.idx").exists()
+
+        monkeypatch.setattr(event_index, "_indexes", OrderedDict())
+        with patch.object(event_index.json, "loads", wraps=json.loads) as loads:
+            _, total = query_events([("s1", events_file)], limit=0)
+
+        assert total == 2
+        loads.assert_not_called()
+
+    def test_shrunk_log_rebuilds(self, tmp_path: Path) -> None:
+        """Test a log that got shorter is re-indexed from the start."""
+        events_file = tmp_path / "s1" / "events.jsonl"
+        _write(events_file, _event(0), _event(1))
+        query_events([("s1", events_file)])
+
+        events_file.write_text(json.dumps(_event(5)) + "\n")
+
+        events, total = query_events([("s1", events_file)])
+
+        assert total == 1
+        assert events[0]["n"] == 5
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test sessions without an events file contribute nothing."""
+        assert query_events([("s1", tmp_path / "events.jsonl")]) == ([], 0)
+
+    def test_least_recently_used_index_dropped(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test only the most recently queried files keep an in-memory index."""
+        monkeypatch.setattr(event_index, "MAX_CACHED_INDEXES", 2)
+        files = [tmp_path / f"s{n}" / "events.jsonl" for n in range(3)]
+        for n, events_file in enumerate(files):
+            _write(events_file, _event(n))
+
+        query_events([("s0", files[0])])
+        query_events([("s1", files[1])])
+        query_events([("s0", files[0])])
+        query_events([("s2", files[2])])
+
+        assert list(event_index._indexes) == [files[0].resolve(), files[2].resolve()]
+        assert query_events([("s1", files[1])])[1] == 1
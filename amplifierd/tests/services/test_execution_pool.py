@@ -0,0 +1,171 @@
+"""Tests for routing execution calls to worker processes by session."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from amplifierd.services import execution_pool
+from amplifierd.services.execution_pool import ExecutionPool
+from amplifierd.services.execution_pool import get_execution_pool
+from amplifierd.services.execution_pool import start_execution_pool
+from amplifierd.services.execution_pool import worker_index
+
+
+class FakeWorker:
+    """Unix socket server answering pool requests like an execution worker."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.requests: list[dict[str, Any]] = []
+        # None: drop the connection without replying
+        self.replies: dict[str, dict[str, Any] | None] = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = json.loads(await reader.readline())
+        self.requests.append(request)
+        reply = self.replies.get(request["op"], {"result": self.index})
+        if reply is not None:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+def socket_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Short socket directory (Unix socket paths are limited to ~100 bytes)."""
+    return tmp_path_factory.mktemp("exec")
+
+
+async def _serve(pool: ExecutionPool) -> tuple[list[FakeWorker], list[asyncio.AbstractServer]]:
+    workers = [FakeWorker(i) for i in range(pool.size)]
+    servers: list[asyncio.AbstractServer] = [
+        await asyncio.start_unix_server(w.handle, path=str(pool.socket_path(w.index))) for w in workers
+    ]
+    return workers, servers
+
+
+@pytest.mark.unit
+class TestExecutionPool:
+    """Test session affinity and the request protocol."""
+
+    def test_worker_index_stable(self) -> None:
+        """Test a session always maps to the same worker and sessions spread out."""
+        sessions = [f"session-{n}" for n in range(100)]
+
+        assert [worker_index(s, 4) for s in sessions] == [worker_index(s, 4) for s in sessions]
+        assert {worker_index(s, 4) for s in sessions} == {0, 1, 2, 3}
+
+    @pytest.mark.asyncio
+    async def test_calls_routed_to_owning_worker(self, socket_dir: Path) -> None:
+        """Test send, cancel, active and evict calls for a session go to its worker only."""
+        pool = ExecutionPool(3, socket_dir, socket_dir / "bus.sock")
+        workers, servers = await _serve(pool)
+        owner = workers[worker_index("abc", 3)]
+        owner.replies["send_message"] = {"result": {"status": "executing", "session_id": "abc"}}
+
+        try:
+            assert await pool.send_message("abc", "Hello") == {"status": "executing", "session_id": "abc"}
+            await pool.cancel("abc")
+            await pool.has_active_execution("abc")
+            await pool.evict_runner("abc")
+        finally:
+            for server in servers:
+                server.close()
+
+        assert [r["op"] for r in owner.requests] == ["send_message", "cancel", "active", "evict"]
+        assert owner.requests[0]["content"] == "Hello"
+        assert sum(len(w.requests) for w in workers) == 4
+
+    @pytest.mark.asyncio
+    async def test_approval_asks_every_worker(self, socket_dir: Path) -> None:
+        """Test an approval is resolved if any worker was waiting on it."""
+        pool = ExecutionPool(2, socket_dir, socket_dir / "bus.sock")
+        workers, servers = await _serve(pool)
+        workers[0].replies["approval"] = {"result": False}
+        workers[1].replies["approval"] = {"result": True}
+
+        try:
+            assert await pool.resolve_approval("approval-1", "yes") is True
+        finally:
+            for server in servers:
+                server.close()
+
+        assert all(w.requests == [{"op": "approval", "approval_id": "approval-1", "response": "yes"}] for w in workers)
+
+    @pytest.mark.asyncio
+    async def test_worker_errors(self, socket_dir: Path) -> None:
+        """Test worker error replies become FileNotFoundError and RuntimeError."""
+        pool = ExecutionPool(1, socket_dir, socket_dir / "bus.sock")
+        [worker], servers = await _serve(pool)
+        worker.replies["send_message"] = {"error": "not_found", "detail": "Session abc not found"}
+        worker.replies["cancel"] = {"error": "failed", "detail": "boom"}
+
+        try:
+            with pytest.raises(FileNotFoundError, match="abc"):
+                await pool.send_message("abc", "Hello")
+            with pytest.raises(RuntimeError, match="boom"):
+                await pool.cancel("abc")
+        finally:
+            for server in servers:
+                server.close()
+
+    @pytest.mark.asyncio
+    async def test_dropped_reply_not_retried(self, socket_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a request the worker already read is not sent again when the reply is lost."""
+        pool = ExecutionPool(1, socket_dir, socket_dir / "bus.sock")
+        [worker], servers = await _serve(pool)
+        worker.replies["send_message"] = None
+        respawns = []
+
+        async def ensure_workers() -> None:
+            respawns.append(True)
+
+        monkeypatch.setattr(pool, "_ensure_workers", ensure_workers)
+
+        try:
+            with pytest.raises(ConnectionError):
+                await pool.send_message("abc", "Hello")
+        finally:
+            for server in servers:
+                server.close()
+
+        assert len(worker.requests) == 1
+        assert respawns == []
+
+    @pytest.mark.asyncio
+    async def test_unreachable_worker_respawned(self, socket_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a failed connect respawns the pool and retries once."""
+        pool = ExecutionPool(1, socket_dir, socket_dir / "bus.sock")
+        servers: list[asyncio.AbstractServer] = []
+        workers: list[FakeWorker] = []
+
+        async def ensure_workers() -> None:
+            started, listening = await _serve(pool)
+            workers.extend(started)
+            servers.extend(listening)
+
+        monkeypatch.setattr(pool, "_ensure_workers", ensure_workers)
+
+        try:
+            assert await pool.cancel("abc") == 0
+        finally:
+            for server in servers:
+                server.close()
+
+        assert [r["op"] for w in workers for r in w.requests] == ["cancel"]
+
+    def test_rejects_bad_size(self, socket_dir: Path) -> None:
+        """Test the pool needs at least one worker."""
+        with pytest.raises(ValueError, match="positive"):
+            ExecutionPool(0, socket_dir, socket_dir / "bus.sock")
+
+    @pytest.mark.asyncio
+    async def test_refused_without_flock(self, socket_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test platforms without flock keep executions in-process instead of failing at import."""
+        monkeypatch.setattr(execution_pool, "fcntl", None)
+
+        with pytest.raises(RuntimeError, match="flock"):
+            await start_execution_pool(2, socket_dir, socket_dir / "bus.sock")
+        assert get_execution_pool() is None
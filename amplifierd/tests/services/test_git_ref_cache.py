@@ -0,0 +1,86 @@
+"""Tests for the shared git ref → commit cache."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifierd.services.git_ref_cache import GitRefCache
+from amplifierd.services.git_ref_cache import is_commit_sha
+
+REPO = "https://github.com/example/repo"
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    """Ref cache file in a temporary directory."""
+    return tmp_path / "refs.json"
+
+
+def _ls_remote(commit_hash: str | None):
+    return patch("amplifierd.services.git_ref_cache.ls_remote", return_value=commit_hash)
+
+
+@pytest.mark.unit
+class TestGitRefCache:
+    """Test TTL, pinned commits, offline fallback and refresh."""
+
+    def test_pinned_commit_needs_no_lookup(self, cache_path: Path) -> None:
+        """Test a 40-character commit hash resolves to itself without ls-remote."""
+        cache = GitRefCache(cache_path)
+
+        with _ls_remote("b" * 40) as ls_remote:
+            assert cache.lookup(REPO, "A" * 40) == "a" * 40
+
+        ls_remote.assert_not_called()
+        assert is_commit_sha("a" * 40)
+        assert not is_commit_sha("main")
+        assert not is_commit_sha("a" * 7)
+
+    def test_fresh_entry_shared_until_ttl(self, cache_path: Path) -> None:
+        """Test a looked-up ref is reused by other instances until the TTL expires."""
+        with _ls_remote("a" * 40) as ls_remote:
+            assert GitRefCache(cache_path, ttl_seconds=300).lookup(REPO, "main") == "a" * 40
+            assert GitRefCache(cache_path, ttl_seconds=300).lookup(REPO, "main") == "a" * 40
+
+        assert ls_remote.call_count == 1
+
+        with _ls_remote("b" * 40) as ls_remote:
+            assert GitRefCache(cache_path, ttl_seconds=0).lookup(REPO, "main") == "b" * 40
+
+        assert ls_remote.call_count == 1
+
+    def test_offline_uses_last_known_commit(self, cache_path: Path) -> None:
+        """Test an unreachable remote falls back to the cached commit, however old."""
+        cache = GitRefCache(cache_path, ttl_seconds=0)
+        cache.record(REPO, "main", "a" * 40)
+
+        with _ls_remote(None):
+            assert cache.lookup(REPO, "main") == "a" * 40
+            assert cache.lookup(REPO, "unknown") is None
+
+    def test_refresh_reports_moved_refs(self, cache_path: Path) -> None:
+        """Test refresh asks the remote for fresh entries and reports what moved."""
+        cache = GitRefCache(cache_path, ttl_seconds=300)
+        cache.record(REPO, "main", "a" * 40)
+        cache.record(REPO, "dev", "c" * 40)
+
+        with patch(
+            "amplifierd.services.git_ref_cache.ls_remote",
+            side_effect=lambda _url, ref: "b" * 40 if ref == "main" else "c" * 40,
+        ):
+            moved = cache.refresh()
+
+        assert moved == {f"{REPO}@main": "b" * 40}
+        assert cache.lookup(REPO, "main") == "b" * 40
+
+    def test_persisted_format(self, cache_path: Path) -> None:
+        """Test entries are written to disk and unreadable files are ignored."""
+        GitRefCache(cache_path).record(REPO, "main", "a" * 40)
+
+        data = json.loads(cache_path.read_text())
+        assert data["refs"][f"{REPO}@main"]["commit"] == "a" * 40
+
+        cache_path.write_text("{not json")
+        with _ls_remote(None):
+            assert GitRefCache(cache_path).lookup(REPO, "main") is None
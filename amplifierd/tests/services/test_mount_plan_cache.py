@@ -0,0 +1,127 @@
+"""Tests for MountPlanService's content-addressed mount plan cache."""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifierd.services import mount_plan_service
+from amplifierd.services.mount_plan_service import MountPlanService
+
+REPO = "https://github.com/org/modules"
+
+
+@pytest.fixture
+def share_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Share directory with one profile, and an isolated cache directory."""
+    monkeypatch.setenv("AMPLIFIERD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(mount_plan_service, "_plan_cache", OrderedDict())
+
+    for profile_id in ("dev", "foundation/base"):
+        profile_dir = tmp_path / "share" / "profiles" / profile_id
+        profile_dir.mkdir(parents=True)
+        (profile_dir / "profile.yaml").write_text(f"profile:\n  name: {profile_id}\n")
+    return tmp_path / "share"
+
+
+def _fake_compile(commit_hash: str):
+    """Build a compile_profile replacement that records one git source."""
+
+    def compile_profile(self, profile_id: str, profile_yaml: dict, config_yaml: dict) -> Path:
+        self.ref_resolution.resolved_commits[(REPO, "main")] = commit_hash
+        profile_dir = self.share_dir / "profiles" / profile_id
+        (profile_dir / "mount_plan.json").write_text(json.dumps({"session": {}, "tools": [{"module": "tool-bash"}]}))
+        return profile_dir
+
+    return compile_profile
+
+
+@pytest.mark.unit
+class TestMountPlanCache:
+    """Test compiled mount plans are reused until an input changes."""
+
+    def _generate(
+        self, share_dir: Path, remote_commit: str | None, compile_commit: str = "a" * 40, profile_id: str = "dev"
+    ) -> tuple[dict, int]:
+        with (
+            patch(
+                "amplifierd.services.profile_compilation.ProfileCompilationService.compile_profile",
+                autospec=True,
+                side_effect=_fake_compile(compile_commit),
+            ) as compile_profile,
+            patch(
+                "amplifierd.services.ref_resolution.RefResolutionService.resolve_commit",
+                return_value=remote_commit,
+            ),
+        ):
+            plan = MountPlanService(share_dir=share_dir).generate_mount_plan(profile_id, Path("/work"))
+        return plan, compile_profile.call_count
+
+    def test_second_request_uses_cache(self, share_dir: Path) -> None:
+        """Test an unchanged profile is compiled once."""
+        first, compiled = self._generate(share_dir, "a" * 40)
+        second, recompiled = self._generate(share_dir, "a" * 40)
+
+        assert compiled == 1
+        assert recompiled == 0
+        assert second == first
+        assert second["session"]["settings"]["amplified_dir"] == "/work"
+
+    def test_profile_change_recompiles(self, share_dir: Path) -> None:
+        """Test editing profile.yaml invalidates the cached plan."""
+        self._generate(share_dir, "a" * 40)
+        (share_dir / "profiles" / "dev" / "profile.yaml").write_text("profile:\n  name: changed\n")
+
+        _, compiled = self._generate(share_dir, "a" * 40)
+
+        assert compiled == 1
+
+    def test_moved_source_recompiles(self, share_dir: Path) -> None:
+        """Test a git source resolving to a new commit invalidates the cached plan."""
+        self._generate(share_dir, "a" * 40)
+
+        _, compiled = self._generate(share_dir, "b" * 40, compile_commit="b" * 40)
+
+        assert compiled == 1
+
+    def test_unreachable_source_keeps_cache(self, share_dir: Path) -> None:
+        """Test sources that can't be looked up keep their recorded commit."""
+        self._generate(share_dir, "a" * 40)
+
+        _, compiled = self._generate(share_dir, None)
+
+        assert compiled == 0
+
+    def test_cached_plan_not_mutated_by_callers(self, share_dir: Path) -> None:
+        """Test callers get their own copy of the cached plan."""
+        first, _ = self._generate(share_dir, "a" * 40)
+        first["tools"].append({"module": "tool-extra"})
+
+        second, _ = self._generate(share_dir, "a" * 40)
+
+        assert second["tools"] == [{"module": "tool-bash"}]
+
+    def test_collection_profile_id(self, share_dir: Path) -> None:
+        """Test a "collection/profile" ID is cached like a flat one."""
+        first, compiled = self._generate(share_dir, "a" * 40, profile_id="foundation/base")
+        second, recompiled = self._generate(share_dir, "a" * 40, profile_id="foundation/base")
+
+        assert compiled == 1
+        assert recompiled == 0
+        assert second == first
+        assert second["session"]["settings"]["profile_name"] == "foundation/base"
+
+    def test_memory_cache_bounded(self, share_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test only the most recently used plans stay in memory, and evicted ones reload from disk."""
+        monkeypatch.setattr(mount_plan_service, "MAX_CACHED_PLANS", 1)
+        for commit_hash in ("a" * 40, "b" * 40, "c" * 40):
+            self._generate(share_dir, commit_hash, compile_commit=commit_hash)
+
+        assert len(mount_plan_service._plan_cache) == 1
+
+        mount_plan_service._plan_cache.clear()
+        plan, compiled = self._generate(share_dir, "c" * 40)
+
+        assert compiled == 0
+        assert plan["tools"] == [{"module": "tool-bash"}]
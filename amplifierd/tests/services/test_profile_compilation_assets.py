@@ -0,0 +1,102 @@
+"""Tests for concurrent component source resolution during profile compilation."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from amplifierd.services.profile_compilation import ComponentRefInternal
+from amplifierd.services.profile_compilation import ProfileCompilationError
+from amplifierd.services.profile_compilation import ProfileCompilationService
+
+
+class FakeRefResolution:
+    """Ref resolver that records calls and how many ran at once."""
+
+    def __init__(self, fail: str | None = None) -> None:
+        self.fail = fail
+        self.calls: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def resolve_ref(self, source_ref: str) -> Path:
+        with self._lock:
+            self.calls.append(source_ref)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+        if source_ref == self.fail:
+            raise RuntimeError("clone failed")
+        return Path("/cache") / source_ref.rsplit("/", 1)[-1]
+
+
+def _service(tmp_path: Path, ref_resolution: FakeRefResolution, max_parallel_fetches: int = 8):
+    registry_service = MagicMock()
+    registry_service.resolve_amp_uri.side_effect = lambda uri: uri.replace("amp://", "git+https://example.com/")
+    return ProfileCompilationService(
+        share_dir=tmp_path,
+        cache_dir=tmp_path,
+        ref_resolution=ref_resolution,  # type: ignore[arg-type]
+        registry_service=registry_service,
+        max_parallel_fetches=max_parallel_fetches,
+    )
+
+
+@pytest.mark.unit
+class TestResolveAssets:
+    """Test _resolve_assets fetches distinct sources concurrently."""
+
+    def test_sources_fetched_concurrently_once(self, tmp_path: Path) -> None:
+        """Test distinct sources run in parallel and shared sources are fetched once."""
+        ref_resolution = FakeRefResolution()
+        refs = [
+            ComponentRefInternal(id="tool-a", type="tools", source="amp://repo@main/a"),
+            ComponentRefInternal(id="tool-b", type="tools", source="amp://repo@main/b"),
+            ComponentRefInternal(id="tool-c", type="tools", source="amp://repo@main/c"),
+            ComponentRefInternal(id="tool-a2", type="tools", source="amp://repo@main/a"),
+        ]
+
+        asset_map = _service(tmp_path, ref_resolution)._resolve_assets(refs, {})
+
+        assert asset_map == {
+            "tool-a": Path("/cache/a"),
+            "tool-b": Path("/cache/b"),
+            "tool-c": Path("/cache/c"),
+            "tool-a2": Path("/cache/a"),
+        }
+        assert sorted(ref_resolution.calls) == [f"git+https://example.com/repo@main/{n}" for n in "abc"]
+        assert ref_resolution.max_running > 1
+
+    def test_parallelism_bounded(self, tmp_path: Path) -> None:
+        """Test no more than max_parallel_fetches sources are fetched at once."""
+        ref_resolution = FakeRefResolution()
+        refs = [ComponentRefInternal(id=f"t{n}", type="tools", source=f"amp://repo@main/{n}") for n in range(6)]
+
+        _service(tmp_path, ref_resolution, max_parallel_fetches=2)._resolve_assets(refs, {})
+
+        assert ref_resolution.max_running == 2
+
+    def test_failure_names_component(self, tmp_path: Path) -> None:
+        """Test a failed fetch raises ProfileCompilationError for the component that needed it."""
+        ref_resolution = FakeRefResolution(fail="git+https://example.com/repo@main/b")
+        refs = [
+            ComponentRefInternal(id="tool-a", type="tools", source="amp://repo@main/a"),
+            ComponentRefInternal(id="tool-b", type="tools", source="amp://repo@main/b"),
+        ]
+
+        with pytest.raises(ProfileCompilationError, match="tool-b.*clone failed"):
+            _service(tmp_path, ref_resolution)._resolve_assets(refs, {})
+
+    def test_missing_source_rejected(self, tmp_path: Path) -> None:
+        """Test a component without a source fails before anything is fetched."""
+        ref_resolution = FakeRefResolution()
+        refs = [ComponentRefInternal(id="tool-a", type="tools")]
+
+        with pytest.raises(ProfileCompilationError, match="has no source"):
+            _service(tmp_path, ref_resolution)._resolve_assets(refs, {})
+
+        assert ref_resolution.calls == []
@@ -0,0 +1,159 @@
+"""Tests for incremental profile compilation driven by the compile manifest."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from amplifierd.services.profile_compilation import COMPILE_MANIFEST_FILENAME
+from amplifierd.services.profile_compilation import ProfileCompilationService
+
+PROVIDERS = "https://example.com/providers"
+TOOLS = "https://example.com/tools"
+
+
+class FakeRefResolution:
+    """Resolves git+ refs to published directories, like RefResolutionService with warm caches."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.commits = {PROVIDERS: "a" * 40, TOOLS: "b" * 40}
+        self.calls: list[str] = []
+        self.resolved_commits: dict[tuple[str, str], str] = {}
+        self.unpinned_refs: set[str] = set()
+
+    def publish(self, repo_url: str, commit_hash: str, files: dict[str, str]) -> None:
+        self.commits[repo_url] = commit_hash
+        for name, content in files.items():
+            path = self.root / commit_hash / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def resolve_ref(self, source_ref: str) -> Path:
+        self.calls.append(source_ref)
+        repo_url, _, ref_and_path = source_ref.removeprefix("git+").rpartition("@")
+        ref, _, asset_path = ref_and_path.partition("/")
+        commit_hash = self.commits[repo_url]
+        self.resolved_commits[(repo_url, ref)] = commit_hash
+        return self.root / commit_hash / asset_path
+
+    def resolve_commit(self, repo_url: str, ref: str, refresh: bool = False) -> str | None:
+        return self.commits[repo_url]
+
+
+PROFILE = {
+    "profile": {"name": "dev", "schema_version": 3, "version": "1.0.0"},
+    "providers": [{"id": "provider-test", "source": f"git+{PROVIDERS}@main/provider-test"}],
+    "behaviors": [{"id": "coding", "source": f"git+{TOOLS}@main/coding"}],
+}
+
+
+@pytest.fixture
+def refs(tmp_path: Path) -> FakeRefResolution:
+    """Published provider, behavior and tool sources."""
+    ref_resolution = FakeRefResolution(tmp_path / "sources")
+    ref_resolution.publish(PROVIDERS, "a" * 40, {"provider-test/provider.py": "provider v1"})
+    behavior = {"behavior": {"id": "coding"}, "tools": [{"id": "tool-bash", "source": f"git+{TOOLS}@main/tool-bash"}]}
+    ref_resolution.publish(
+        TOOLS, "b" * 40, {"coding/behavior.yaml": yaml.dump(behavior), "tool-bash/tool.py": "bash v1"}
+    )
+    return ref_resolution
+
+
+@pytest.fixture
+def install() -> MagicMock:
+    """Stand-in for dependency installs; returns the refs that failed to install."""
+    return MagicMock(return_value=set())
+
+
+@pytest.fixture
+def service(
+    tmp_path: Path, refs: FakeRefResolution, install: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> ProfileCompilationService:
+    """Compilation service with dependency installs stubbed out."""
+    registry_service = MagicMock()
+    registry_service.load_registries.return_value = {}
+    registry_service.resolve_amp_uri.side_effect = lambda uri: uri
+    service = ProfileCompilationService(
+        share_dir=tmp_path / "share",
+        cache_dir=tmp_path / "cache",
+        ref_resolution=refs,  # type: ignore[arg-type]
+        registry_service=registry_service,
+    )
+    monkeypatch.setattr(service, "_install_module_dependencies", install)
+    return service
+
+
+def _installed(install: MagicMock) -> set[str]:
+    return {ref_id for call in install.call_args_list for ref_id in call.args[0]}
+
+
+@pytest.mark.unit
+class TestCompileManifest:
+    """Test recompilation is skipped or limited to what changed."""
+
+    def test_unchanged_profile_short_circuits(self, service: ProfileCompilationService, refs, install) -> None:
+        """Test a second compilation reuses the first without loading or resolving anything."""
+        profile_dir = service.compile_profile("dev", PROFILE, {})
+        mount_plan = json.loads((profile_dir / "mount_plan.json").read_text())
+        (profile_dir / "mount_plan.json").unlink()
+        refs.calls.clear()
+        refs.resolved_commits.clear()
+        install.reset_mock()
+
+        assert service.compile_profile("dev", PROFILE, {}) == profile_dir
+
+        assert refs.calls == []
+        assert _installed(install) == set()
+        assert json.loads((profile_dir / "mount_plan.json").read_text()) == mount_plan
+        assert refs.resolved_commits == {(PROVIDERS, "main"): "a" * 40, (TOOLS, "main"): "b" * 40}
+        assert (profile_dir / COMPILE_MANIFEST_FILENAME).exists()
+
+    def test_moved_source_replaces_only_its_components(self, service: ProfileCompilationService, refs, install) -> None:
+        """Test a moved repository re-places and reinstalls only the components it provides."""
+        profile_dir = service.compile_profile("dev", PROFILE, {})
+        provider_file = profile_dir / "session" / "providers" / "provider-test" / "provider.py"
+        provider_inode = provider_file.stat().st_ino
+        install.reset_mock()
+
+        behavior = (refs.root / ("b" * 40) / "coding" / "behavior.yaml").read_text()
+        refs.publish(TOOLS, "c" * 40, {"coding/behavior.yaml": behavior, "tool-bash/tool.py": "bash v2"})
+        service.compile_profile("dev", PROFILE, {})
+
+        tool_file = profile_dir / "behaviors" / "coding" / "tools" / "tool-bash" / "tool.py"
+        assert tool_file.read_text() == "bash v2"
+        assert provider_file.stat().st_ino == provider_inode
+        assert _installed(install) == {"tool-bash"}
+
+    def test_removed_component_deleted(self, service: ProfileCompilationService) -> None:
+        """Test components the profile no longer uses are removed from the profile directory."""
+        profile_dir = service.compile_profile("dev", PROFILE, {})
+
+        service.compile_profile("dev", {**PROFILE, "providers": []}, {})
+
+        assert not (profile_dir / "session" / "providers" / "provider-test").exists()
+        assert (profile_dir / "behaviors" / "coding" / "tools" / "tool-bash").exists()
+
+    def test_unpinned_sources_always_recompile(self, service: ProfileCompilationService, refs) -> None:
+        """Test profiles with local or fsspec sources are never short-circuited."""
+        refs.unpinned_refs.add("/local/agent.md")
+        service.compile_profile("dev", PROFILE, {})
+        refs.calls.clear()
+
+        service.compile_profile("dev", PROFILE, {})
+
+        assert refs.calls != []
+
+    def test_failed_install_retried(self, service: ProfileCompilationService, refs, install) -> None:
+        """Test a component whose dependencies failed to install is retried by the next compilation."""
+        install.return_value = {"tool-bash"}
+        service.compile_profile("dev", PROFILE, {})
+        install.reset_mock()
+        install.return_value = set()
+        refs.calls.clear()
+
+        service.compile_profile("dev", PROFILE, {})
+
+        assert refs.calls != []
+        assert _installed(install) == {"tool-bash"}
@@ -1,7 +1,9 @@
 """Tests for reference resolution service."""
 
 import tempfile
+from contextlib import AbstractContextManager
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -552,3 +554,147 @@ class TestIntegration:
         assert result.exists()
         assert result.read_text() == "downloaded"
         assert result.name == "file.txt"  # Preserves original filename
+
+
+@pytest.fixture
+def git_service(isolated_service: RefResolutionService, tmp_path: Path):
+    """Service with an isolated git cache and ref cache (no network)."""
+    from amplifierd.services.git_ref_cache import GitRefCache
+
+    isolated_service.git_cache_dir = tmp_path / "git"
+    isolated_service.git_cache_dir.mkdir()
+    with patch(
+        "amplifierd.services.ref_resolution.get_git_ref_cache",
+        return_value=GitRefCache(tmp_path / "refs.json", ttl_seconds=0),
+    ):
+        yield isolated_service
+
+
+@pytest.fixture
+def upstream(tmp_path: Path):
+    """Local git repository standing in for a remote."""
+    from git import Actor
+    from git import Repo
+
+    repo = Repo.init(tmp_path / "upstream", initial_branch="main")
+    work_dir = tmp_path / "upstream"
+    author = Actor("Test", "test@example.com")
+
+    def commit(files: dict[str, str]) -> str:
+        for name, content in files.items():
+            path = work_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+            repo.index.add([name])
+        return repo.index.commit("update", author=author, committer=author).hexsha
+
+    commit({"README.md": "v1", "tools/bash/tool.py": "bash", "tools/grep/tool.py": "grep"})
+    return repo, commit
+
+
+def _fetches() -> tuple[list[tuple], AbstractContextManager[Any]]:
+    """Patch that records fetches into mirrors while still performing them."""
+    fetches: list[tuple] = []
+    original = RefResolutionService._fetch_commit
+
+    def fetch_commit(self, mirror, repo_url, ref, commit_hash):
+        fetched = not (commit_hash and self._has_commit(mirror, commit_hash))
+        result = original(self, mirror, repo_url, ref, commit_hash)
+        if fetched:
+            fetches.append((ref, result))
+        return result
+
+    return fetches, patch.object(RefResolutionService, "_fetch_commit", fetch_commit)
+
+
+class TestGitMirror:
+    """Tests for fetching through one bare mirror per remote."""
+
+    def test_exports_branch_and_subdirectories(self, git_service: RefResolutionService, upstream):
+        """Test a branch is exported from the mirror, and subdirectories of a commit share one fetch."""
+        repo, _ = upstream
+        url = f"git+file://{repo.working_tree_dir}@main"
+        head = repo.head.commit.hexsha
+        fetches, patcher = _fetches()
+
+        with patcher:
+            root = git_service._fetch_git(url)
+            bash = git_service._fetch_git(f"{url}#subdirectory=tools/bash")
+            grep = git_service._fetch_git(f"{url}#subdirectory=tools/grep")
+
+        assert root == git_service.git_cache_dir / head
+        assert (root / "README.md").read_text() == "v1"
+        assert (bash / "tool.py").read_text() == "bash"
+        assert (grep / "tool.py").read_text() == "grep"
+        assert fetches == [("main", head)]
+        assert len(list((git_service.git_cache_dir / "mirrors").iterdir())) == 1
+
+    def test_new_commit_fetched_into_same_mirror(self, git_service: RefResolutionService, upstream):
+        """Test a moved branch is fetched into the existing mirror and exported separately."""
+        repo, commit = upstream
+        url = f"git+file://{repo.working_tree_dir}@main"
+        first = git_service._fetch_git(url)
+
+        second_commit = commit({"README.md": "v2"})
+        second = git_service._fetch_git(url)
+
+        assert second == git_service.git_cache_dir / second_commit
+        assert (first / "README.md").read_text() == "v1"
+        assert (second / "README.md").read_text() == "v2"
+        assert len(list((git_service.git_cache_dir / "mirrors").iterdir())) == 1
+
+    def test_pinned_commit(self, git_service: RefResolutionService, upstream):
+        """Test a ref given as a commit hash is fetched and exported by hash."""
+        repo, commit = upstream
+        first_commit = repo.head.commit.hexsha
+        commit({"README.md": "v2"})
+
+        path = git_service._fetch_git(f"git+file://{repo.working_tree_dir}@{first_commit}")
+
+        assert (path / "README.md").read_text() == "v1"
+
+    def test_tag_refs(self, git_service: RefResolutionService, upstream):
+        """Test lightweight and annotated tags resolve and export like branches."""
+        from amplifierd.services.git_ref_cache import ls_remote
+
+        repo, commit = upstream
+        tagged = repo.head.commit.hexsha
+        repo.create_tag("v1.0")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test").set_value("user", "email", "test@example.com")
+        repo.create_tag("v1.1", message="release")
+        commit({"README.md": "v2"})
+        url = f"file://{repo.working_tree_dir}"
+
+        assert ls_remote(url, "v1.0") == tagged
+        assert ls_remote(url, "v1.1") == tagged
+        assert ls_remote(url, "main") == repo.head.commit.hexsha
+        assert ls_remote(url, "missing") is None
+
+        for tag in ("v1.0", "v1.1"):
+            path = git_service._fetch_git(f"git+{url}@{tag}")
+            assert path == git_service.git_cache_dir / tagged
+            assert (path / "README.md").read_text() == "v1"
+
+    def test_missing_subdirectory(self, git_service: RefResolutionService, upstream):
+        """Test a subdirectory that isn't in the commit raises and leaves no temp dirs."""
+        repo, _ = upstream
+
+        with pytest.raises(RefResolutionError, match="not found"):
+            git_service._fetch_git(f"git+file://{repo.working_tree_dir}@main#subdirectory=missing")
+
+        assert not list(git_service.git_cache_dir.glob("temp_*"))
+
+    def test_concurrent_fetches_share_one_fetch(self, git_service: RefResolutionService, upstream):
+        """Test threads fetching the same ref take turns instead of racing on temp dirs."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        repo, _ = upstream
+        fetches, patcher = _fetches()
+
+        with patcher, ThreadPoolExecutor(max_workers=4) as executor:
+            paths = list(executor.map(git_service._fetch_git, [f"git+file://{repo.working_tree_dir}@main"] * 4))
+
+        assert len(fetches) == 1
+        assert set(paths) == {git_service.git_cache_dir / repo.head.commit.hexsha}
+        assert not list(git_service.git_cache_dir.glob("temp_*"))
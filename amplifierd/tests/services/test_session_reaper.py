@@ -0,0 +1,97 @@
+"""Tests for idle and LRU eviction of warm sessions."""
+
+import asyncio
+from typing import cast
+
+import pytest
+from amplifierd.services.session_stream_registry import SessionStreamRegistry
+
+from amplifier_library.execution.runner import ExecutionRunner
+
+
+class FakeRunner:
+    """Runner stand-in with a context size."""
+
+    def __init__(self, context_bytes: int = 0) -> None:
+        self.context_bytes = context_bytes
+        self.cleaned_up = False
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+async def _warm(registry: SessionStreamRegistry, session_id: str, last_used: float, context_bytes: int = 0):
+    manager = await registry.get_or_create(session_id, {})
+    manager._runner = cast(ExecutionRunner, FakeRunner(context_bytes))
+    manager.last_used = last_used
+    return manager
+
+
+def _is_warm(registry: SessionStreamRegistry, session_id: str) -> bool:
+    manager = registry.get(session_id)
+    assert manager is not None
+    return manager.is_warm
+
+
+@pytest.mark.unit
+class TestSessionReaper:
+    """Test SessionStreamRegistry.reap."""
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_evicted(self) -> None:
+        """Test idle managers are removed, or only lose their runner while a client is connected."""
+        registry = SessionStreamRegistry()
+        idle = await _warm(registry, "idle", last_used=0)
+        watched = await _warm(registry, "watched", last_used=0)
+        watched.subscribe()
+        watched.last_used = 0
+        recent = await _warm(registry, "recent", last_used=float("inf"))
+        runner = idle._runner
+        assert isinstance(runner, FakeRunner)
+
+        assert await registry.reap(idle_timeout=60) == 2
+
+        assert registry.get("idle") is None
+        assert runner.cleaned_up
+        assert registry.get("watched") is watched
+        assert not watched.is_warm
+        assert recent.is_warm
+
+    @pytest.mark.asyncio
+    async def test_executing_session_kept(self) -> None:
+        """Test a session with a running execution is never evicted."""
+        registry = SessionStreamRegistry()
+        manager = await _warm(registry, "busy", last_used=0)
+        task = asyncio.create_task(asyncio.sleep(10))
+        manager.set_execution_task(task)
+
+        try:
+            assert await registry.reap(idle_timeout=0, max_warm=0) == 0
+        finally:
+            task.cancel()
+
+        assert manager.is_warm
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted_over_count(self) -> None:
+        """Test the oldest runners are evicted down to max_warm."""
+        registry = SessionStreamRegistry()
+        for n in range(4):
+            await _warm(registry, f"s{n}", last_used=n)
+
+        assert await registry.reap(max_warm=2) == 2
+
+        assert [_is_warm(registry, f"s{n}") for n in range(4)] == [False, False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted_over_bytes(self) -> None:
+        """Test runners are evicted until their contexts fit, keeping the newest."""
+        registry = SessionStreamRegistry()
+        await _warm(registry, "old", last_used=1, context_bytes=500)
+        await _warm(registry, "mid", last_used=2, context_bytes=300)
+        await _warm(registry, "new", last_used=3, context_bytes=2000)
+
+        assert await registry.reap(max_bytes=1000) == 2
+
+        assert registry.get_warm_count() == 1
+        assert _is_warm(registry, "new")
@@ -0,0 +1,55 @@
+"""Tests for viewer presence shared across daemon processes."""
+
+from pathlib import Path
+
+import pytest
+from amplifierd.services import session_viewers
+from amplifierd.services.session_stream_manager import SessionStreamManager
+
+
+@pytest.fixture
+def session_dir(mock_storage_env: Path) -> Path:
+    path = mock_storage_env / "state" / "sessions" / "viewed"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.mark.unit
+class TestSessionViewers:
+    """Test viewer holds and presence checks."""
+
+    def test_hold_and_release(self, session_dir: Path) -> None:
+        """Test a held viewer is visible until released."""
+        assert session_viewers.has_viewers("viewed") is False
+
+        first = session_viewers.hold_viewer("viewed")
+        second = session_viewers.hold_viewer("viewed")
+        assert first is not None
+        assert second is not None
+        assert session_viewers.has_viewers("viewed") is True
+
+        session_viewers.release_viewer(first)
+        assert session_viewers.has_viewers("viewed") is True
+        session_viewers.release_viewer(second)
+        assert session_viewers.has_viewers("viewed") is False
+
+    def test_missing_session_dir(self, mock_storage_env: Path) -> None:
+        """Test a session without a directory has no viewers and can't be held."""
+        assert session_viewers.hold_viewer("missing") is None
+        assert session_viewers.has_viewers("missing") is False
+
+    def test_subscribers_in_another_manager(self, session_dir: Path) -> None:
+        """Test a manager sees subscribers of another process's manager for the session."""
+        api_manager = SessionStreamManager("viewed", {})
+        worker_manager = SessionStreamManager("viewed", {})
+        assert worker_manager.has_viewers() is False
+
+        first = api_manager.subscribe()
+        second = api_manager.subscribe()
+        assert worker_manager.subscriber_count == 0
+        assert worker_manager.has_viewers() is True
+
+        api_manager.unsubscribe(first)
+        assert worker_manager.has_viewers() is True
+        api_manager.unsubscribe(second)
+        assert worker_manager.has_viewers() is False
@@ -0,0 +1,125 @@
+"""Tests for incremental execution-trace aggregation from events.jsonl."""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifierd.services import trace_aggregator
+from amplifierd.services.trace_aggregator import aggregate_events_to_turns
+
+TS = "2025-12-17T20:21:22.000+00:00"
+
+
+@pytest.fixture
+def events_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Empty events.jsonl with an isolated trace cache."""
+    monkeypatch.setattr(trace_aggregator, "_traces", OrderedDict())
+    path = tmp_path / "events.jsonl"
+    path.touch()
+    return path
+
+
+def _append(events_file: Path, *events: tuple[str, dict]) -> None:
+    with open(events_file, "a", encoding="utf-8") as f:
+        for event_type, data in events:
+            f.write(json.dumps({"event": event_type, "data": data, "ts": TS}) + "\n")
+
+
+@pytest.mark.unit
+class TestAggregateEventsToTurns:
+    """Test trace turns are materialized incrementally with stable ids."""
+
+    def test_turn_with_tools(self, events_file: Path) -> None:
+        """Test tool:post events complete the oldest matching running tool."""
+        _append(
+            events_file,
+            ("prompt:submit", {"prompt": "List files"}),
+            ("tool:pre", {"tool_name": "bash", "tool_input": {"cmd": "ls"}}),
+            ("tool:pre", {"tool_name": "bash", "tool_input": {"cmd": "pwd"}}),
+            ("tool:post", {"tool_name": "bash", "result": {"success": True, "output": "a.txt"}}),
+            ("session:end", {}),
+        )
+
+        [turn] = aggregate_events_to_turns(events_file)
+
+        assert turn.status == "completed"
+        assert [(t.arguments, t.status) for t in turn.tools] == [
+            ({"cmd": "ls"}, "completed"),
+            ({"cmd": "pwd"}, "running"),
+        ]
+        assert turn.tools[0].result == "a.txt"
+
+    def test_ids_stable_across_calls(self, events_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test ids don't change between requests or after a restart."""
+        _append(events_file, ("prompt:submit", {"prompt": "Hi"}), ("thinking:delta", {"delta": "hmm"}))
+
+        first = aggregate_events_to_turns(events_file)
+        monkeypatch.setattr(trace_aggregator, "_traces", OrderedDict())
+        second = aggregate_events_to_turns(events_file)
+
+        assert first[0].id == second[0].id == "turn-0"
+        assert first[0].thinking[0].id == second[0].thinking[0].id
+
+    def test_only_new_events_parsed(self, events_file: Path) -> None:
+        """Test a second call parses only the appended events."""
+        _append(events_file, ("prompt:submit", {"prompt": "One"}), ("session:end", {}))
+        aggregate_events_to_turns(events_file)
+        _append(events_file, ("prompt:submit", {"prompt": "Two"}))
+
+        with patch.object(trace_aggregator.json, "loads", wraps=json.loads) as loads:
+            turns = aggregate_events_to_turns(events_file)
+
+        assert loads.call_count == 1
+        assert [(t.user_message, t.status) for t in turns] == [("One", "completed"), ("Two", "active")]
+
+    def test_partial_line_waits(self, events_file: Path) -> None:
+        """Test an event still being written is picked up once complete."""
+        line = json.dumps({"event": "prompt:submit", "data": {"prompt": "Hi"}, "ts": TS})
+        events_file.write_text(line[:10])
+        assert aggregate_events_to_turns(events_file) == []
+
+        events_file.write_text(line + "\n")
+
+        assert [t.user_message for t in aggregate_events_to_turns(events_file)] == ["Hi"]
+
+    def test_active_turn_is_copied(self, events_file: Path) -> None:
+        """Test a returned in-progress turn isn't changed by later events."""
+        _append(events_file, ("prompt:submit", {"prompt": "Hi"}))
+        [active] = aggregate_events_to_turns(events_file)
+
+        _append(events_file, ("session:end", {}))
+        [completed] = aggregate_events_to_turns(events_file)
+
+        assert active.status == "active"
+        assert completed.status == "completed"
+
+    def test_truncated_file_rebuilds(self, events_file: Path) -> None:
+        """Test a file that shrank is re-read from the start."""
+        _append(events_file, ("prompt:submit", {"prompt": "Old"}), ("session:end", {}))
+        aggregate_events_to_turns(events_file)
+
+        events_file.write_text("")
+        _append(events_file, ("prompt:submit", {"prompt": "New"}))
+
+        assert [t.user_message for t in aggregate_events_to_turns(events_file)] == ["New"]
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test a session without events has no turns."""
+        assert aggregate_events_to_turns(tmp_path / "events.jsonl") == []
+
+    def test_least_recently_used_trace_dropped(
+        self, events_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test only the most recently requested files keep a materialized trace."""
+        monkeypatch.setattr(trace_aggregator, "MAX_CACHED_TRACES", 2)
+        files = [events_file, tmp_path / "b.jsonl", tmp_path / "c.jsonl"]
+        for path in files:
+            _append(path, ("prompt:submit", {"prompt": path.stem}))
+
+        for path in (files[0], files[1], files[0], files[2]):
+            aggregate_events_to_turns(path)
+
+        assert list(trace_aggregator._traces) == [files[0].resolve(), files[2].resolve()]
+        assert [t.user_message for t in aggregate_events_to_turns(files[1])] == ["b"]